@@ -9,6 +9,7 @@ from typing import List, Dict, Any
 from playwright.async_api import Page, TimeoutError
 from Core.Intelligence.selector_manager import SelectorManager
 from Core.Browser.site_helpers import fs_universal_popup_dismissal
+from Core.System.metrics import traced_goto
 
 CTX = "fs_league_page"
 
@@ -28,7 +29,7 @@ async def extract_league_match_urls(page: Page, league_url: str, mode: str = "re
     print(f"      [League Extractor] Visiting: {target_url}")
 
     try:
-        await page.goto(target_url, wait_until="domcontentloaded", timeout=60000)
+        await traced_goto(page, target_url, wait_until="domcontentloaded", timeout=60000)
         await asyncio.sleep(2)
         await fs_universal_popup_dismissal(page)
 
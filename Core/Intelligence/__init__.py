@@ -13,11 +13,16 @@ This package contains the core intelligence components for LeoBook:
 - Betting Markets: Market-specific math and probability
 """
 
-from .rule_engine import RuleEngine
-from .selector_manager import SelectorManager
-from .visual_analyzer import VisualAnalyzer
-from .popup_handler import PopupHandler
-from .page_analyzer import PageAnalyzer
+from Core.System.lazy_loader import lazy_exports
+
+# Resolved on first access: importing one submodule must not load them all
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "RuleEngine": ".rule_engine",
+    "SelectorManager": ".selector_manager",
+    "VisualAnalyzer": ".visual_analyzer",
+    "PopupHandler": ".popup_handler",
+    "PageAnalyzer": ".page_analyzer",
+})
 
 __version__ = "2.6.0"
 __all__ = [
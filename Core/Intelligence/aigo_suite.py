@@ -7,7 +7,6 @@ import asyncio
 import functools
 import time
 from typing import Callable, Any, Optional, Dict
-from playwright.async_api import Page, TimeoutError
 
 class AIGOSuite:
     """
@@ -38,6 +37,7 @@ class AIGOSuite:
                 # Attempt to extract 'page' from arguments
                 page = kwargs.get('page')
                 if not page:
+                    from playwright.async_api import Page
                     for arg in args:
                         if isinstance(arg, Page):
                             page = arg
@@ -1,19 +1,106 @@
 # api_manager.py: Manages AI API interactions (Grok, Gemini Fallback).
 # Part of LeoBook Core — Intelligence (AI Engine)
 #
-# Functions: unified_api_call(), grok_api_call(), gemini_api_call()
+# Functions: unified_api_call(), grok_api_call(), gemini_api_call(), json_reply()
 
 import os
-import requests
+import time
 import json
 import base64
 import asyncio
 
-# AI API configurations
-GROK_API_URL = "https://api.x.ai/v1/chat/completions"
+from .llm_cache import get_llm_cache, cache_key, caller_name
+from .llm_client_pool import get_client_pool
+from Core.System.metrics import get_metrics
+
+# AI API configurations (GROK_API_URL may point at a local mock / proxy)
+GROK_API_URL = os.getenv("GROK_API_URL", "https://api.x.ai/v1/chat/completions")
+GROK_MODEL = "grok-beta"
+
+
+def _has_image(prompt_content) -> bool:
+    """Screenshot prompts: each capture hashes differently, so they never hit."""
+    return isinstance(prompt_content, list) and any(isinstance(item, dict) for item in prompt_content)
+
+
+def _wants_json(generation_config) -> bool:
+    if isinstance(generation_config, dict):
+        return generation_config.get('response_mime_type') == "application/json"
+    return getattr(generation_config, 'response_mime_type', None) == "application/json"
+
+
+def json_reply(text: str) -> bool:
+    """Default cache validator for JSON prompts: the reply parses to a non-empty value."""
+    from .utils import clean_json_response
+    return bool(json.loads(clean_json_response(text)))
+
+
+def _accepted(validate, text: str) -> bool:
+    try:
+        return bool(validate(text))
+    except Exception:
+        return False
+
+
+async def _cached_call(family, prompt_content, generation_config, kwargs, call):
+    """Serve a response from the LLM cache, else await call() and store its text.
+
+    Pops the cache controls from the caller's kwargs: cache=False bypasses the
+    cache (the default for screenshot prompts), caller='name' overrides the
+    auto-detected module.function label used for per-caller hit rates, and
+    validate=fn(text) -> bool decides whether a live reply may be stored.
+    JSON prompts default to json_reply, so an unparseable or empty answer is
+    returned to the caller (whose retry then asks again) but never cached."""
+    use_cache = kwargs.pop('cache', not _has_image(prompt_content))
+    caller = kwargs.pop('caller', None) or caller_name(3)
+    validate = kwargs.pop('validate', json_reply if _wants_json(generation_config) else None)
+    cache = get_llm_cache()
+    if not (use_cache and cache.enabled):
+        return await call()
+
+    key = cache_key(family, prompt_content, generation_config)
+    hit = cache.get(key, caller)
+    get_metrics().counter("leo_llm_cache_total", family=family, outcome="miss" if hit is None else "hit")
+    if hit is not None:
+        print(f"    [AI] Cache hit ({family})")
+        return hit
+
+    start = time.perf_counter()
+    response = await call()
+    text = getattr(response, 'text', None)
+    if text and (validate is None or _accepted(validate, text)):
+        cache.put(key, family, text, (time.perf_counter() - start) * 1000)
+    return response
 
 
 async def grok_api_call(prompt_content, generation_config=None, **kwargs):
+    """Grok call through the LLM response cache (see _grok_request)."""
+    return await _cached_call(
+        f"grok:{GROK_MODEL}", prompt_content, generation_config, kwargs,
+        lambda: _grok_request(prompt_content, generation_config, **kwargs))
+
+
+async def gemini_api_call(prompt_content, generation_config=None, **kwargs):
+    """Gemini call through the LLM response cache (see _gemini_request)."""
+    return await _cached_call(
+        f"gemini:{kwargs.get('model', 'gemini-2.5-flash')}", prompt_content, generation_config, kwargs,
+        lambda: _gemini_request(prompt_content, generation_config, **kwargs))
+
+
+async def unified_api_call(prompt_content, generation_config=None, **kwargs):
+    """Provider-routed call through the LLM response cache (see _unified_request).
+
+    Keyed on the llm_context model chain rather than the model that answered,
+    since any model in the chain is an acceptable answer for that context.
+    An explicit validate= also reaches the scheduler, which then moves a
+    rejected reply on to the next model instead of returning it."""
+    validate = kwargs.get('validate')
+    return await _cached_call(
+        f"unified:{kwargs.get('llm_context', 'aigo')}", prompt_content, generation_config, kwargs,
+        lambda: _unified_request(prompt_content, generation_config, validate=validate, **kwargs))
+
+
+async def _grok_request(prompt_content, generation_config=None, **kwargs):
     """
     Calls Grok API for AI analysis (vision and text).
     Uses asyncio.to_thread to keep the event loop running during the blocking request.
@@ -74,7 +161,7 @@ async def grok_api_call(prompt_content, generation_config=None, **kwargs):
         }
     ]
     payload = {
-        "model": "grok-beta",
+        "model": GROK_MODEL,
         "messages": messages_list,
         "temperature": temperature,
         "max_tokens": 4096,
@@ -84,16 +171,20 @@ async def grok_api_call(prompt_content, generation_config=None, **kwargs):
     if response_format:
         payload["response_format"] = response_format
 
-    # 4. Execute Request
+    # 4. Execute Request (pooled keep-alive session)
+    pool = get_client_pool()
+
     def _make_grok_request():
         headers = {
             "Authorization": f"Bearer {grok_api_key}",
             "Content-Type": "application/json"
         }
-        return requests.post(GROK_API_URL, json=payload, headers=headers, timeout=180)
+        with pool.track("Grok", grok_api_key):
+            response = pool.http_session().post(GROK_API_URL, json=payload, headers=headers, timeout=180)
+            response.raise_for_status()
+            return response
 
     response = await asyncio.to_thread(_make_grok_request)
-    response.raise_for_status()
 
     data = response.json()
     content = data['choices'][0]['message']['content']
@@ -113,20 +204,20 @@ async def grok_api_call(prompt_content, generation_config=None, **kwargs):
     return MockLeoResponse(content)
 
 
-async def gemini_api_call(prompt_content, generation_config=None, **kwargs):
+async def _gemini_request(prompt_content, generation_config=None, **kwargs):
     """
     Calls Google Gemini API for AI analysis.
-    Uses google-genai SDK v1.64+ (Client-based API).
+    Uses google-genai SDK v1.64+ (Client-based API); one pooled Client per key.
     Accepts optional api_key and model kwargs for multi-key/model rotation.
     """
     gemini_api_key = kwargs.get('api_key') or os.getenv("GEMINI_API_KEY", "").split(",")[0].strip()
     if not gemini_api_key:
         raise ValueError("GEMINI_API_KEY environment variable not set")
 
-    import google.genai as genai
     from google.genai import types
 
-    client = genai.Client(api_key=gemini_api_key)
+    pool = get_client_pool()
+    client = pool.gemini_client(gemini_api_key)
 
     # 1. Parse Input (Text + Images)
     contents = []
@@ -181,11 +272,12 @@ async def gemini_api_call(prompt_content, generation_config=None, **kwargs):
     model_name = kwargs.get('model', 'gemini-2.5-flash')
 
     def _make_gemini_request():
-        return client.models.generate_content(
-            model=model_name,
-            contents=contents,
-            config=gen_config,
-        )
+        with pool.track("Gemini", gemini_api_key):
+            return client.models.generate_content(
+                model=model_name,
+                contents=contents,
+                config=gen_config,
+            )
 
     # 4. Execute Request with timeout to prevent SSL/Network hangs
     try:
@@ -201,92 +293,21 @@ async def gemini_api_call(prompt_content, generation_config=None, **kwargs):
     return MockGeminiResponse(response.text)
 
 
-async def unified_api_call(prompt_content, generation_config=None, **kwargs):
+async def _unified_request(prompt_content, generation_config=None, **kwargs):
     """
-    Unified API call with adaptive provider routing, multi-model + multi-key
-    Gemini rotation, and auto-fallback.
-    
-    Uses MODELS_DESCENDING chain: tries best model across all keys first,
-    then downgrades model on exhaustion.
+    Provider-routed call via the LLM scheduler: adaptive provider order,
+    multi-model + multi-key Gemini rotation paced by per-key/per-model token
+    buckets, identical in-flight prompts coalesced, auto-fallback to Grok.
+
+    kwargs: llm_context ("aigo" = pro-first chain, "search_dict" = lite-first),
+    priority (llm_scheduler.Priority, default INTERACTIVE), validate
+    (text -> bool; rejected replies are retried on the next route).
     """
-    from .llm_health_manager import health_manager
-
-    # Ensure health check has run (pings every 15 min)
-    await health_manager.ensure_initialized()
-    ordered = health_manager.get_ordered_providers()
-
-    # Get model chain for this context (default: AIGO = DESCENDING)
-    context = kwargs.pop('llm_context', 'aigo')
-    model_chain = health_manager.get_model_chain(context)
-
-    last_error = None
-    for provider_name in ordered:
-        # Skip providers known to be inactive
-        if not health_manager.is_provider_active(provider_name):
-            print(f"    [AI] Skipping {provider_name} (inactive per health check)")
-            continue
-
-        if provider_name == "Gemini":
-            # Model-chain rotation: try each model, exhaust ALL keys per model
-            for model_name in model_chain:
-                while True: # Try all available keys for this model
-                    api_key = health_manager.get_next_gemini_key(model=model_name)
-                    if not api_key:
-                        # All keys truly exhausted for this model — downgrade
-                        print(f"    [AI] All keys exhausted for {model_name}, downgrading...")
-                        break
-                    try:
-                        key_suffix = api_key[-4:]
-                        print(f"    [AI] Attempting Gemini {model_name} (key ...{key_suffix})...")
-                        response = await gemini_api_call(
-                            prompt_content, generation_config,
-                            api_key=api_key, model=model_name
-                        )
-                        if response and hasattr(response, 'text') and response.text:
-                            return response
-                    except Exception as e:
-                        last_error = e
-                        err_str = str(e)
-                        if "429" in err_str or "RESOURCE_EXHAUSTED" in err_str:
-                            health_manager.on_gemini_429(api_key, model=model_name)
-                            print(f"    [AI] Key ...{key_suffix} rate-limited on {model_name}, rotating...")
-                            await asyncio.sleep(1)
-                            continue
-                        elif "400" in err_str and "INVALID_ARGUMENT" in err_str:
-                            health_manager.on_gemini_fatal_error(api_key, "400 Invalid Argument")
-                            continue
-                        elif "401" in err_str or "UNAUTHORIZED" in err_str:
-                            health_manager.on_gemini_fatal_error(api_key, "401 Unauthorized")
-                            continue
-                        elif "403" in err_str:
-                            health_manager.on_gemini_fatal_error(api_key, "403 Forbidden")
-                            continue
-                        elif "503" in err_str or "UNAVAILABLE" in err_str:
-                            print(f"    [AI WARNING] Gemini {model_name} failed: 503 UNAVAILABLE. Backing off 8s...")
-                            await asyncio.sleep(8)
-                            continue  # Retry same key — 503 is transient
-                        else:
-                            print(f"    [AI WARNING] Gemini {model_name} failed: {e}")
-                            break  # Non-rate-limit error, try next model
-
-        elif provider_name == "Grok":
-            try:
-                print(f"    [AI] Attempting with Grok...")
-                response = await grok_api_call(prompt_content, generation_config, **kwargs)
-                if response and hasattr(response, 'text') and response.text:
-                    return response
-            except Exception as e:
-                last_error = e
-                print(f"    [AI WARNING] Grok failed: {e}")
-
-    # All-inactive fallback: try Grok as last resort
-    if not health_manager.is_provider_active("Grok"):
-        try:
-            print(f"    [AI] Last-resort attempt with Grok...")
-            response = await grok_api_call(prompt_content, generation_config, **kwargs)
-            if response and hasattr(response, 'text') and response.text:
-                return response
-        except Exception as e:
-            last_error = e
-
-    raise ValueError(f"All AI providers failed. Last error: {last_error}")
\ No newline at end of file
+    from .llm_scheduler import get_scheduler, Priority
+
+    return await get_scheduler().submit(
+        prompt_content, generation_config,
+        priority=kwargs.get('priority', Priority.INTERACTIVE),
+        llm_context=kwargs.get('llm_context', 'aigo'),
+        validate=kwargs.get('validate'),
+    )
@@ -1,18 +1,144 @@
 """
 LearningEngine Module
 Handles prediction learning, performance analysis, and weight adaptation with region-specific granularity.
+
+Weights are served from a WeightsStore: learning_weights.json parsed once and
+re-read only when its mtime/size changes, with each region_league's merged
+weights resolved once into a read-only mapping. save_all_weights() writes
+through the store, so a run holding it sees its own updates without a re-read.
 """
 
+import copy
 import json
 import os
+import threading
 from collections import defaultdict
-from typing import Dict, Any, List, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 LEARNING_DB = PROJECT_ROOT / "Data" / "Store" / "learning_weights.json"
 
 
+def _frozen(weights: Dict[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of a weights dict (and its confidence_calibration)."""
+    weights = dict(weights)
+    if isinstance(weights.get("confidence_calibration"), Mapping):
+        weights["confidence_calibration"] = MappingProxyType(dict(weights["confidence_calibration"]))
+    return MappingProxyType(weights)
+
+
+def _thawed(weights: Mapping[str, Any]) -> Dict[str, Any]:
+    """Mutable deep copy of a (possibly frozen) weights mapping."""
+    return {k: dict(v) if isinstance(v, Mapping) else copy.deepcopy(v) for k, v in weights.items()}
+
+
+class WeightsStore:
+    """In-memory learning_weights.json keyed by region_league.
+
+    get() is a dict lookup returning a shared read-only mapping; refresh()
+    re-reads the file only if its (mtime, size) changed; save() writes the
+    file atomically and replaces the in-memory copy (write-through).
+    """
+
+    def __init__(self, path: Path = LEARNING_DB):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        self._raw: Dict[str, Any] = {}
+        self._resolved: Dict[str, Mapping[str, Any]] = {}
+        self.stats = {"reads": 0, "writes": 0, "resolved": 0}
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _normalize(all_weights: Dict[str, Any]) -> Dict[str, Any]:
+        # If the file is the old flat format, migrate it to the new structure
+        if "h2h_home_win" in all_weights:
+            return {"GLOBAL": all_weights}
+        return all_weights
+
+    def refresh(self) -> bool:
+        """Reload if the file changed since the last read/write. Returns True if it did."""
+        stamp = self._file_stamp()
+        if self._loaded and stamp == self._stamp:
+            return False
+        with self._lock:
+            raw = {}
+            if stamp is not None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        raw = json.load(f)
+                except Exception:
+                    pass
+            self._raw = self._normalize(raw if isinstance(raw, dict) else {})
+            self._resolved = {}
+            self._stamp = stamp
+            self._loaded = True
+            self.stats["reads"] += 1
+        return True
+
+    def get(self, region_league: str = "GLOBAL") -> Mapping[str, Any]:
+        """Merged weights for a region/league (GLOBAL fallback), shared and read-only."""
+        weights = self._resolved.get(region_league)
+        if weights is None:
+            if not self._loaded:
+                self.refresh()
+            weights = self._resolved[region_league] = self._resolve(region_league)
+            self.stats["resolved"] += 1
+        return weights
+
+    def _resolve(self, region_league: str) -> Mapping[str, Any]:
+        all_weights = self._raw
+
+        # 1. Try exact match
+        if region_league in all_weights:
+            return _frozen(LearningEngine._merge_defaults(all_weights[region_league]))
+
+        # 2. Try Region match (if "Region - League" format)
+        if " - " in region_league:
+            # Check for partial matches (same league, different round)
+            for key in all_weights:
+                if key.startswith(region_league.rsplit(" - ", 1)[0]):
+                    return _frozen(LearningEngine._merge_defaults(all_weights[key]))
+
+        # 3. Fallback to GLOBAL (one shared object for every unmatched key)
+        if region_league != "GLOBAL":
+            return self.get("GLOBAL")
+        return _frozen(LearningEngine._merge_defaults(all_weights.get("GLOBAL", {})))
+
+    def all(self) -> Dict[str, Any]:
+        """Mutable deep copy of every region_league's stored weights."""
+        if not self._loaded:
+            self.refresh()
+        return copy.deepcopy(self._raw)
+
+    def save(self, all_weights: Dict[str, Any]) -> None:
+        """Write the whole weights dict to disk (atomic replace) and into memory."""
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with self._lock:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(all_weights, f, indent=2)
+            os.replace(tmp, self.path)
+            self._raw = self._normalize(copy.deepcopy(all_weights))
+            self._resolved = {}
+            self._stamp = self._file_stamp()
+            self._loaded = True
+            self.stats["writes"] += 1
+
+
+_store: Optional[WeightsStore] = None
+_store_lock = threading.Lock()
+
+
 class LearningEngine:
     """Self-learning component that analyzes prediction performance and adjusts weights per region/league."""
 
@@ -32,7 +158,8 @@ class LearningEngine:
         "Close xG suggests draw": "xg_draw"
     }
 
-    DEFAULT_WEIGHTS = {
+    # Shared and read-only; _thawed() gives a mutable copy
+    DEFAULT_WEIGHTS = _frozen({
         "h2h_home_win": 3.0,
         "h2h_away_win": 3.0,
         "h2h_draw": 3.0,
@@ -55,46 +182,35 @@ class LearningEngine:
             "Medium": 0.50,
             "Low": 0.40
         }
-    }
+    })
 
     @staticmethod
-    def load_weights(region_league: str = "GLOBAL") -> Dict[str, Any]:
+    def weights_store() -> WeightsStore:
+        """The process-wide WeightsStore, refreshed if learning_weights.json changed.
+
+        Hold the returned store for a whole run (pass it to RuleEngine.analyze)
+        so per-fixture lookups skip even the mtime check."""
+        global _store
+        if _store is None:
+            with _store_lock:
+                if _store is None:
+                    _store = WeightsStore()
+        _store.refresh()
+        return _store
+
+    @staticmethod
+    def load_weights(region_league: str = "GLOBAL") -> Mapping[str, Any]:
         """
         Load learned weights for a specific region/league.
         Falls back to GLOBAL if specific weights don't exist.
+        Returns the store's shared read-only mapping.
         """
-        all_weights = {}
-        if LEARNING_DB.exists():
-            try:
-                with open(LEARNING_DB, 'r', encoding='utf-8') as f:
-                    all_weights = json.load(f)
-            except Exception:
-                pass
-
-        # If the file is the old flat format, migrate it to the new structure
-        if "h2h_home_win" in all_weights:
-            all_weights = {"GLOBAL": all_weights}
-
-        # 1. Try exact match
-        if region_league in all_weights:
-            return LearningEngine._merge_defaults(all_weights[region_league])
-
-        # 2. Try Region match (if "Region - League" format)
-        if " - " in region_league:
-            region = region_league.split(" - ")[0]
-            # Check for partial matches (same league, different round)
-            for key in all_weights:
-                if key.startswith(region_league.rsplit(" - ", 1)[0]):
-                    return LearningEngine._merge_defaults(all_weights[key])
-
-        # 3. Fallback to GLOBAL
-        return LearningEngine._merge_defaults(all_weights.get("GLOBAL", {}))
+        return LearningEngine.weights_store().get(region_league)
 
     @staticmethod
     def _merge_defaults(weights: Dict[str, Any]) -> Dict[str, Any]:
         """Ensure all keys exist by merging with defaults."""
-        import copy
-        merged = copy.deepcopy(LearningEngine.DEFAULT_WEIGHTS)
+        merged = _thawed(LearningEngine.DEFAULT_WEIGHTS)
         # Deep merge for confidence_calibration
         if "confidence_calibration" in weights:
             merged["confidence_calibration"].update(weights["confidence_calibration"])
@@ -105,10 +221,8 @@ class LearningEngine:
 
     @staticmethod
     def save_all_weights(all_weights: Dict[str, Any]):
-        """Save the entire weights dictionary to file."""
-        os.makedirs(LEARNING_DB.parent, exist_ok=True)
-        with open(LEARNING_DB, 'w', encoding='utf-8') as f:
-            json.dump(all_weights, f, indent=2)
+        """Save the entire weights dictionary to file (write-through the WeightsStore)."""
+        LearningEngine.weights_store().save(all_weights)
 
     @staticmethod
     def analyze_performance() -> Tuple[Dict[str, Dict[str, Dict[str, int]]], Dict[str, Dict[str, Dict[str, int]]]]:
@@ -161,24 +275,14 @@ class LearningEngine:
         rule_perf, conf_perf = LearningEngine.analyze_performance()
 
         # Load existing (or init new structure)
-        if LEARNING_DB.exists():
-            try:
-                with open(LEARNING_DB, 'r', encoding='utf-8') as f:
-                    all_weights = json.load(f)
-                # Migration check
-                if "h2h_home_win" in all_weights:
-                    all_weights = {"GLOBAL": all_weights}
-            except Exception:
-                all_weights = {"GLOBAL": LearningEngine.DEFAULT_WEIGHTS.copy()}
-        else:
-            all_weights = {"GLOBAL": LearningEngine.DEFAULT_WEIGHTS.copy()}
+        all_weights = LearningEngine.weights_store().all() or {"GLOBAL": _thawed(LearningEngine.DEFAULT_WEIGHTS)}
 
         # Update weights for each league found in performance history
         leagues_to_update = set(rule_perf.keys()) | set(conf_perf.keys()) | {"GLOBAL"}
 
         for league in leagues_to_update:
             if league not in all_weights:
-                all_weights[league] = LearningEngine.DEFAULT_WEIGHTS.copy()
+                all_weights[league] = _thawed(LearningEngine.DEFAULT_WEIGHTS)
 
             league_weights = all_weights[league]
 
@@ -202,7 +306,7 @@ class LearningEngine:
             # 2. Update Confidence Calibration
             if league in conf_perf:
                 if "confidence_calibration" not in league_weights:
-                    league_weights["confidence_calibration"] = LearningEngine.DEFAULT_WEIGHTS["confidence_calibration"].copy()
+                    league_weights["confidence_calibration"] = dict(LearningEngine.DEFAULT_WEIGHTS["confidence_calibration"])
 
                 for level, stats in conf_perf[league].items():
                     if stats["total"] >= 10 and level in league_weights["confidence_calibration"]:
@@ -0,0 +1,300 @@
+# llm_cache.py: Persistent content-addressed cache for LLM responses.
+# Part of LeoBook Core — Intelligence (AI Engine)
+#
+# Classes: CachedLLMResponse, LLMResponseCache
+# Functions: cache_key(), caller_name(), get_llm_cache()
+# Called by: api_manager.py | Leo.py (--llm-cache-stats)
+
+"""
+LLM Response Cache
+Responses are stored in their own SQLite file (Data/Store/llm_cache.db, so
+cache churn never contends with leobook.db writers), keyed by a SHA-256 of
+(model family, normalized prompt, generation parameters). Images are hashed
+by their decoded bytes, so base64 and raw-bytes payloads of the same
+screenshot share a key.
+
+Entries expire after LLM_CACHE_TTL_S; when the file passes LLM_CACHE_MAX_MB
+the least recently hit entries are evicted. Hit/miss counters are kept per
+caller (module.function that issued the call) and persisted, so hit rates
+survive restarts. A small in-memory front keeps repeat hits off SQLite.
+Set LLM_CACHE=0 to bypass the cache entirely.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DB_PATH = os.path.join(PROJECT_ROOT, "Data", "Store", "llm_cache.db")
+
+LLM_CACHE_TTL_S = int(os.getenv("LLM_CACHE_TTL_S", 7 * 24 * 3600))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", 64))
+MEMORY_ENTRIES = 256          # in-memory front (most recent hits/puts)
+FLUSH_EVERY = 64              # buffered hit/miss bookkeeping rows per write
+FLUSH_INTERVAL_S = 30.0
+EVICT_TO = 0.9                # evict down to this fraction of the size cap
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        key        TEXT PRIMARY KEY,
+        family     TEXT NOT NULL,
+        response   TEXT NOT NULL,
+        size       INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        last_hit   REAL NOT NULL,
+        hits       INTEGER NOT NULL DEFAULT 0,
+        latency_ms REAL NOT NULL DEFAULT 0   -- live call time, credited to each hit
+    );
+    CREATE INDEX IF NOT EXISTS idx_llm_cache_last_hit ON llm_cache(last_hit);
+    CREATE TABLE IF NOT EXISTS llm_cache_stats (
+        caller     TEXT PRIMARY KEY,
+        hits       INTEGER NOT NULL DEFAULT 0,
+        misses     INTEGER NOT NULL DEFAULT 0,
+        saved_ms   REAL NOT NULL DEFAULT 0,
+        updated_at REAL
+    );
+"""
+
+
+def _param(config, name: str):
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return config.get(name)
+    return getattr(config, name, None)
+
+
+def _normalize_part(item) -> Any:
+    """Text with whitespace runs collapsed; images reduced to a digest of their bytes."""
+    if isinstance(item, str):
+        return " ".join(item.split())
+    if isinstance(item, dict):
+        data = item.get("inline_data", {}).get("data") if "inline_data" in item else item.get("data")
+        if isinstance(data, str):
+            try:
+                data = base64.b64decode(data)
+            except (ValueError, TypeError):
+                data = data.encode()
+        if isinstance(data, bytes):
+            return {"image": hashlib.sha256(data).hexdigest()}
+    return repr(item)
+
+
+def cache_key(family: str, prompt_content, generation_config=None) -> str:
+    """Content address for one request."""
+    parts = prompt_content if isinstance(prompt_content, list) else [prompt_content]
+    material = {
+        "family": family,
+        "prompt": [_normalize_part(p) for p in parts],
+        "params": {
+            "temperature": _param(generation_config, "temperature"),
+            "response_mime_type": _param(generation_config, "response_mime_type"),
+        },
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+def caller_name(depth: int = 2) -> str:
+    """module.function of the frame `depth` levels above the caller."""
+    frame = sys._getframe(depth)
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+class CachedLLMResponse:
+    """Same surface as the provider responses in api_manager (text + candidates)."""
+
+    cached = True
+
+    def __init__(self, content: str):
+        self.text = content
+        self.candidates = [
+            type('MockCandidate', (), {
+                'content': type('MockContent', (), {
+                    'parts': [type('MockPart', (), {'text': content})]
+                })
+            })
+        ]
+
+
+class LLMResponseCache:
+    """SQLite-backed response store with TTL, size cap and per-caller counters."""
+
+    def __init__(self, db_path: str = CACHE_DB_PATH, ttl_s: int = LLM_CACHE_TTL_S,
+                 max_mb: float = LLM_CACHE_MAX_MB):
+        self.db_path = db_path
+        self.ttl_s = ttl_s
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = os.getenv("LLM_CACHE", "1") != "0"
+        # Deferred: Data.Access imports Core.Intelligence back through outcome_reviewer
+        from Data.Access.db_pool import get_pool
+        self._pool = get_pool(db_path)
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()   # key -> (response, created_at, latency_ms)
+        self._pending_hits: Dict[str, float] = {}                  # key -> last hit time
+        self._pending_hit_counts: Dict[str, int] = {}
+        self._pending_stats: Dict[str, list] = {}                  # caller -> [hits, misses, saved_ms]
+        self._pending_rows = 0
+        self._last_flush = time.time()
+        self._size: Optional[int] = None
+        if self.enabled:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._conn().executescript(_SCHEMA)
+            atexit.register(self.flush)
+
+    def _conn(self):
+        return self._pool.acquire()
+
+    # ── Lookup / store ──────────────────────────────────────────
+
+    def get(self, key: str, caller: str) -> Optional[CachedLLMResponse]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            row = self._conn().execute(
+                "SELECT response, created_at, latency_ms FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            entry = tuple(row) if row else None
+        if entry is not None and now - entry[1] > self.ttl_s:
+            self._drop(key)
+            entry = None
+
+        with self._lock:
+            stats = self._pending_stats.setdefault(caller, [0, 0, 0.0])
+            if entry is None:
+                stats[1] += 1
+            else:
+                stats[0] += 1
+                stats[2] += entry[2]
+                self._pending_hits[key] = now
+                self._pending_hit_counts[key] = self._pending_hit_counts.get(key, 0) + 1
+                self._remember(key, entry)
+            self._pending_rows += 1
+            due = self._pending_rows >= FLUSH_EVERY or now - self._last_flush >= FLUSH_INTERVAL_S
+        if due:
+            self.flush()
+        return CachedLLMResponse(entry[0]) if entry is not None else None
+
+    def put(self, key: str, family: str, response: str, elapsed_ms: float) -> None:
+        """Store a live response; elapsed_ms is credited as time saved on each later hit."""
+        if not self.enabled or not response:
+            return
+        now = time.time()
+        size = len(response.encode("utf-8", "replace")) + len(key) + len(family)
+        with self._lock:
+            self._remember(key, (response, now, elapsed_ms))
+        with self._pool.transaction(self._conn()) as conn:
+            old = conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, family, response, size, created_at, last_hit, hits, latency_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, ?)", (key, family, response, size, now, now, elapsed_ms))
+            if self._size is None:
+                self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            else:
+                self._size += size - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict(conn, now)
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        with self._pool.transaction(self._conn()) as conn:
+            row = conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+        if row and self._size is not None:
+            self._size -= row[0]
+
+    def _evict(self, conn, now: float) -> None:
+        """Expired entries first, then least recently hit until under EVICT_TO of the cap."""
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_s,))
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        target = int(self.max_bytes * EVICT_TO)
+        if self._size > target:
+            excess = self._size - target
+            # Shortest least-recently-hit prefix whose sizes cover the excess
+            conn.execute("""
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_hit, key) - size AS before
+                        FROM llm_cache
+                    ) WHERE before < ?
+                )""", (excess,))
+            remaining = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            print(f"    [LLM Cache] Evicted {(self._size - remaining) / 1024:.0f} KB (cap {self.max_bytes / 1048576:.1f} MB)")
+            self._size = remaining
+        with self._lock:
+            self._memory.clear()
+
+    # ── Bookkeeping ─────────────────────────────────────────────
+
+    def flush(self) -> None:
+        """Write buffered hit times and per-caller counters."""
+        if not self.enabled:
+            return
+        with self._lock:
+            hits, counts, stats = self._pending_hits, self._pending_hit_counts, self._pending_stats
+            self._pending_hits, self._pending_hit_counts, self._pending_stats = {}, {}, {}
+            self._pending_rows = 0
+            self._last_flush = time.time()
+        if not (hits or stats):
+            return
+        now = time.time()
+        with self._pool.transaction(self._conn()) as conn:
+            conn.executemany(
+                "UPDATE llm_cache SET last_hit = ?, hits = hits + ? WHERE key = ?",
+                [(ts, counts.get(key, 1), key) for key, ts in hits.items()])
+            conn.executemany(
+                "INSERT INTO llm_cache_stats (caller, hits, misses, saved_ms, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(caller) DO UPDATE SET "
+                "hits = hits + excluded.hits, misses = misses + excluded.misses, "
+                "saved_ms = saved_ms + excluded.saved_ms, updated_at = excluded.updated_at",
+                [(caller, h, m, ms, now) for caller, (h, m, ms) in stats.items()])
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-caller hit rates plus store size (persisted counters, flushed first)."""
+        if not self.enabled:
+            return {"enabled": False, "callers": {}}
+        self.flush()
+        conn = self._conn()
+        callers = {}
+        for caller, hits, misses, saved_ms in conn.execute(
+                "SELECT caller, hits, misses, saved_ms FROM llm_cache_stats ORDER BY hits + misses DESC"):
+            total = hits + misses
+            callers[caller] = {
+                "hits": hits, "misses": misses,
+                "hit_rate": round(hits / total, 3) if total else 0.0,
+                "saved_s": round(saved_ms / 1000, 1),
+            }
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        return {"enabled": True, "entries": entries, "size_mb": round(size / 1048576, 2),
+                "max_mb": round(self.max_bytes / 1048576, 1), "ttl_s": self.ttl_s, "callers": callers}
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide cache instance."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
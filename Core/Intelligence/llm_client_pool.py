@@ -0,0 +1,149 @@
+# llm_client_pool.py: Reusable LLM provider clients with per-key stats.
+# Part of LeoBook Core — Intelligence (AI Engine)
+#
+# Classes: LLMClientPool
+# Functions: get_client_pool()
+# Called by: api_manager.py | llm_health_manager.py
+
+"""
+LLM Client Pool
+One google-genai Client per Gemini API key and one keep-alive requests.Session
+for the OpenAI-compatible endpoints (Grok, health pings), built
+on first use and reused for the life of the process. Callers therefore stop
+paying client construction, SSL-context setup and a TLS handshake per request.
+
+Every call made through track() records latency and errors per (provider, key),
+so a slow or failing key is visible without trawling the logs.
+GEMINI_BASE_URL overrides the Gemini SDK endpoint (local mock / proxy).
+"""
+
+import os
+import time
+import atexit
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "").strip() or None
+HTTP_POOL_MAXSIZE = 16        # keep-alive connections per host
+LATENCY_WINDOW = 200          # recent calls per key kept for percentiles
+
+
+def _key_label(provider: str, api_key: str) -> str:
+    return f"{provider} ...{api_key[-4:]}" if api_key else provider
+
+
+class LLMClientPool:
+    """Per-key provider clients, one shared HTTP session, per-key call stats."""
+
+    def __init__(self, gemini_base_url: Optional[str] = GEMINI_BASE_URL):
+        self.gemini_base_url = gemini_base_url
+        self._lock = threading.Lock()
+        self._gemini: Dict[str, Any] = {}
+        self._session: Optional[requests.Session] = None
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._latencies: Dict[str, deque] = {}
+
+    # ── Clients ─────────────────────────────────────────────────
+
+    def gemini_client(self, api_key: str):
+        """The genai.Client for this key (created once, thread-safe to share)."""
+        client = self._gemini.get(api_key)
+        if client is None:
+            import google.genai as genai
+            from google.genai import types
+            with self._lock:
+                client = self._gemini.get(api_key)
+                if client is None:
+                    http_options = types.HttpOptions(base_url=self.gemini_base_url) if self.gemini_base_url else None
+                    client = genai.Client(api_key=api_key, http_options=http_options)
+                    self._gemini[api_key] = client
+        return client
+
+    def http_session(self) -> requests.Session:
+        """Shared keep-alive session for OpenAI-compatible chat endpoints."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._gemini.values():
+                try:
+                    client.close()
+                except Exception:
+                    pass
+            self._gemini.clear()
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    # ── Stats ───────────────────────────────────────────────────
+
+    @contextmanager
+    def track(self, provider: str, api_key: str = ""):
+        """Time one call; exceptions are recorded against the key and re-raised."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.record(provider, api_key, (time.perf_counter() - start) * 1000, error=e)
+            raise
+        self.record(provider, api_key, (time.perf_counter() - start) * 1000)
+
+    def record(self, provider: str, api_key: str, latency_ms: float, error: BaseException = None) -> None:
+        label = _key_label(provider, api_key)
+        with self._lock:
+            s = self._stats.get(label)
+            if s is None:
+                s = self._stats[label] = {"calls": 0, "errors": 0, "total_ms": 0.0, "last_error": None}
+                self._latencies[label] = deque(maxlen=LATENCY_WINDOW)
+            s["calls"] += 1
+            s["total_ms"] += latency_ms
+            self._latencies[label].append(latency_ms)
+            if error is not None:
+                s["errors"] += 1
+                s["last_error"] = f"{type(error).__name__}: {str(error)[:120]}"
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-key calls, error count/rate, mean and recent p50/p95 latency (ms)."""
+        out = {}
+        with self._lock:
+            for label, s in self._stats.items():
+                recent = sorted(self._latencies[label])
+                pct = lambda q: round(recent[min(len(recent) - 1, int(q * len(recent)))], 1)
+                out[label] = {
+                    "calls": s["calls"],
+                    "errors": s["errors"],
+                    "error_rate": round(s["errors"] / s["calls"], 3),
+                    "mean_ms": round(s["total_ms"] / s["calls"], 1),
+                    "p50_ms": pct(0.5),
+                    "p95_ms": pct(0.95),
+                    "last_error": s["last_error"],
+                }
+        return out
+
+
+_pool: Optional[LLMClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> LLMClientPool:
+    """Process-wide pool (closed at exit)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = LLMClientPool()
+                atexit.register(_pool.close)
+    return _pool
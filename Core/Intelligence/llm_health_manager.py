@@ -2,7 +2,7 @@
 # Part of LeoBook Core — Intelligence (AI Engine)
 #
 # Classes: LLMHealthManager
-# Called by: api_manager.py, build_search_dict.py
+# Called by: api_manager.py, llm_scheduler.py, build_search_dict.py
 """
 Multi-key, multi-model LLM health manager.
 - Grok: single key (GROK_API_KEY)
@@ -21,9 +21,9 @@ ASCENDING = lite-first (search-dict metadata enrichment)
 import os
 import time
 import asyncio
-import requests
 import threading
 from dotenv import load_dotenv
+from Core.Intelligence.llm_client_pool import get_client_pool
 load_dotenv()
 PING_INTERVAL = 900 # 15 minutes
 class LLMHealthManager:
@@ -132,6 +132,12 @@ class LLMHealthManager:
             key = available[self._gemini_index % len(available)]
             self._gemini_index += 1
             return key
+    def available_gemini_keys(self, model: str) -> list:
+        """Active keys not exhausted for model, in rotation order (scheduler routing)."""
+        with self._state_lock:
+            pool = self._gemini_active if self._gemini_active else self._gemini_keys
+            exhausted = self._model_exhausted_keys.get(model, set())
+            return [k for k in pool if k not in exhausted]
     def on_gemini_429(self, failed_key: str, model: str = None):
         """
         Called when a Gemini key hits 429 for a specific model.
@@ -239,9 +245,11 @@ class LLMHealthManager:
             "max_tokens": 5,
             "temperature": 0,
         }
+        pool = get_client_pool()
         def _do_ping():
             try:
-                resp = requests.post(api_url, headers=headers, json=payload, timeout=10)
+                with pool.track(name, api_key):
+                    resp = pool.http_session().post(api_url, headers=headers, json=payload, timeout=10)
                 # 400 Bad Request with INVALID_ARGUMENT is a dead key (usually bad API key)
                 if resp.status_code in (401, 403) or (resp.status_code == 400 and "INVALID_ARGUMENT" in resp.text):
                     return "FATAL"
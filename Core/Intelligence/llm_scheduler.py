@@ -0,0 +1,392 @@
+# llm_scheduler.py: Rate-limit-aware async scheduler for provider-routed LLM calls.
+# Part of LeoBook Core — Intelligence (AI Engine)
+#
+# Classes: Priority, TokenBucket, LLMScheduler
+# Functions: get_scheduler()
+# Called by: api_manager.py (unified_api_call) | unified_matcher.py | build_search_dict.py
+
+"""
+LLM Scheduler
+Callers submit a prompt and await a future; one dispatcher per event loop
+picks the provider, model and key. Each (key, model) pair has a token bucket
+sized to its free-tier RPM (MODEL_RPM, scaled by LLM_RPM_MULTIPLIER for paid
+tiers), so requests are released at the quota ceiling instead of being fired
+and rotated away from after a 429.
+
+- Priority: CRITICAL (booking path) before INTERACTIVE (default) before
+  BACKGROUND (bulk enrichment); FIFO within a class. A lower class may only
+  use a bucket the jobs ahead of it cannot use right now.
+- Coalescing: an identical prompt already queued or in flight is awaited, not
+  re-sent (a higher-priority duplicate promotes the queued job).
+- Backpressure: submit() waits while MAX_QUEUE jobs are queued.
+- Validation: a reply the caller's validate(text) rejects counts as a
+  failed attempt, so the job moves on to the next model or provider.
+- 429s still reach LLMHealthManager (key exhausted for that model, i.e. a
+  daily quota) and cool the bucket; 503s cool the bucket and retry.
+Buckets are process-wide; queues are per event loop (Leo runs several
+asyncio.run() cycles).
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import weakref
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from .api_manager import _gemini_request, _grok_request, _accepted
+from .llm_cache import cache_key
+from .llm_health_manager import health_manager
+from Core.System.metrics import get_metrics
+
+# Free-tier requests per minute per key (see llm_health_manager model chains)
+MODEL_RPM = {
+    "gemini-2.5-pro": 5,
+    "gemini-3-flash-preview": 5,
+    "gemini-2.5-flash": 10,
+    "gemini-2.0-flash": 15,
+    "gemini-2.5-flash-lite": 15,
+    "gemini-3.1-flash-lite-preview": 15,
+}
+DEFAULT_RPM = 5
+GROK_RPM = int(os.getenv("GROK_RPM", 60))
+RPM_MULTIPLIER = float(os.getenv("LLM_RPM_MULTIPLIER", 1))
+BURST_FRACTION = 0.2          # of a minute's budget usable back-to-back
+
+MAX_QUEUE = 256               # queued jobs before submit() blocks
+MAX_INFLIGHT = 32             # concurrent provider requests per loop
+MAX_ATTEMPTS = 12             # dispatches per job before it fails
+COOLDOWN_429_S = 60.0
+COOLDOWN_503_S = 8.0
+IDLE_WAIT_S = 5.0             # re-check interval when nothing is routable
+
+
+class Priority(IntEnum):
+    CRITICAL = 0        # booking path (fixture matching, bet placement)
+    INTERACTIVE = 1     # default: analysis, selector healing
+    BACKGROUND = 2      # bulk enrichment (search dict)
+
+
+class TokenBucket:
+    """Paces one (key, model) to `rpm`; block() empties it for a cool-down.
+
+    The per-minute budget is split into a burst (BURST_FRACTION of rpm) and a
+    refill of the rest, so no rolling 60s window ever exceeds rpm requests."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated", "blocked_until")
+
+    def __init__(self, rpm: float):
+        self.capacity = max(1.0, int(rpm * BURST_FRACTION))
+        self.rate = max(rpm - self.capacity, 1.0) / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 = take it now)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def block(self, seconds: float) -> None:
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = now
+
+
+_buckets: Dict[tuple, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _bucket(slot: tuple) -> TokenBucket:
+    bucket = _buckets.get(slot)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(slot)
+            if bucket is None:
+                rpm = GROK_RPM if slot[0] == "Grok" else MODEL_RPM.get(slot[2], DEFAULT_RPM)
+                bucket = _buckets[slot] = TokenBucket(rpm * RPM_MULTIPLIER)
+    return bucket
+
+
+class _Job:
+    __slots__ = ("key", "prompt", "config", "context", "priority", "seq", "future",
+                 "entry", "queued", "attempts", "skip_models", "skip_grok", "last_error", "submitted_at", "span",
+                 "validate")
+
+    def __init__(self, key, prompt, config, context, priority, seq, future, validate=None):
+        self.key = key
+        self.prompt = prompt
+        self.config = config
+        self.context = context
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+        self.entry = None         # live heap entry; older ones for this job are stale
+        self.queued = False
+        self.attempts = 0
+        self.skip_models = set()
+        self.skip_grok = False
+        self.last_error = None
+        self.submitted_at = time.monotonic()
+        self.span = get_metrics().current_span()   # the dispatcher task runs outside the caller's span
+        self.validate = validate  # text -> bool; a rejected reply is retried elsewhere
+
+
+class LLMScheduler:
+    """Priority queue + token-bucket dispatcher for one event loop."""
+
+    def __init__(self, max_queue: int = MAX_QUEUE, max_inflight: int = MAX_INFLIGHT):
+        self.max_queue = max_queue
+        self.max_inflight = max_inflight
+        self._heap: List[tuple] = []            # (priority, seq, entry id, job); stale entries skipped
+        self._queued = 0
+        self._inflight = 0
+        self._jobs: Dict[str, _Job] = {}        # cache key -> queued or in-flight job
+        self._cond = asyncio.Condition()
+        self._seq = itertools.count()
+        self._entry_ids = itertools.count()
+        self._rr = itertools.count()            # key rotation offset
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._stats = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0,
+                       "rate_limited": 0, "retried": 0, "wait_ms": 0.0, "peak_queue": 0}
+
+    # ── Public API ──────────────────────────────────────────────
+
+    async def submit(self, prompt_content, generation_config=None,
+                     priority: Priority = Priority.INTERACTIVE, llm_context: str = "aigo",
+                     validate=None):
+        """Queue one request and await its response (same surface as _gemini_request).
+
+        validate(text) -> bool, if given, must accept the reply; a coalesced
+        duplicate shares the first submitter's validator."""
+        await health_manager.ensure_initialized()
+        priority = Priority(priority)
+        key = cache_key(f"unified:{llm_context}", prompt_content, generation_config)
+
+        job = self._jobs.get(key)
+        if job is not None:
+            self._stats["coalesced"] += 1
+            if job.queued and priority < job.priority:
+                async with self._cond:
+                    job.priority = priority
+                    self._push(job)
+                    self._cond.notify_all()
+            return await asyncio.shield(job.future)
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch_loop())
+        job = _Job(key, prompt_content, generation_config, llm_context, priority,
+                   next(self._seq), asyncio.get_running_loop().create_future(), validate)
+        self._jobs[key] = job
+        self._stats["submitted"] += 1
+        try:
+            async with self._cond:
+                await self._cond.wait_for(lambda: self._queued < self.max_queue)
+                self._enqueue(job)
+        except BaseException:
+            self._jobs.pop(key, None)
+            raise
+        return await asyncio.shield(job.future)
+
+    def stats(self) -> dict:
+        s = dict(self._stats)
+        done = s["completed"] + s["failed"]
+        s["mean_wait_ms"] = round(s.pop("wait_ms") / done, 1) if done else 0.0
+        s["queued"] = self._queued
+        s["inflight"] = self._inflight
+        return s
+
+    # ── Dispatch ────────────────────────────────────────────────
+
+    def _push(self, job: _Job) -> None:
+        job.entry = (job.priority, job.seq, next(self._entry_ids), job)
+        heapq.heappush(self._heap, job.entry)
+
+    def _enqueue(self, job: _Job) -> None:
+        job.queued = True
+        self._push(job)
+        self._queued += 1
+        self._stats["peak_queue"] = max(self._stats["peak_queue"], self._queued)
+        self._cond.notify_all()
+
+    def _next_routable(self) -> Tuple[Optional[_Job], Optional[tuple], Optional[float]]:
+        """First queued job (priority, then FIFO) with a ready slot; reserves its token.
+
+        Returns (job, slot, None), or (None, None, seconds until a slot frees).
+        A job with no remaining route is failed on the way past."""
+        live = lambda e: e[3].queued and e[3].entry is e
+        while self._heap and not live(self._heap[0]):
+            heapq.heappop(self._heap)
+        if len(self._heap) > 2 * self._queued + 64:
+            self._heap = [e for e in self._heap if live(e)]
+            heapq.heapify(self._heap)
+
+        now = time.monotonic()
+        soonest = None
+        for entry in sorted(self._heap):
+            job = entry[3]
+            if not live(entry):
+                continue
+            slot, wait = self._route(job, now)
+            if slot is not None:
+                _bucket(slot).take()
+                return job, slot, None
+            if wait is None:
+                self._dequeue(job)
+                self._finish(job, error=ValueError(f"All AI providers failed. Last error: {job.last_error}"))
+                continue
+            soonest = wait if soonest is None else min(soonest, wait)
+        return None, None, soonest
+
+    def _route(self, job: _Job, now: float) -> Tuple[Optional[tuple], Optional[float]]:
+        """(slot, None) if one is ready, (None, wait) if one will be, (None, None) if none remain."""
+        soonest = None
+        candidates = []
+        for provider in health_manager.get_ordered_providers():
+            if not health_manager.is_provider_active(provider):
+                continue
+            if provider == "Gemini":
+                for model in health_manager.get_model_chain(job.context):
+                    if model in job.skip_models:
+                        continue
+                    keys = health_manager.available_gemini_keys(model)
+                    if keys:
+                        offset = next(self._rr) % len(keys)
+                        candidates += [("Gemini", k, model) for k in keys[offset:] + keys[:offset]]
+            elif not job.skip_grok:
+                candidates.append(("Grok", "", "grok"))
+        # All-inactive fallback: Grok as last resort
+        if not candidates and not job.skip_grok and os.getenv("GROK_API_KEY", "").strip():
+            candidates.append(("Grok", "", "grok"))
+
+        for slot in candidates:
+            wait = _bucket(slot).wait_time(now)
+            if wait == 0:
+                return slot, None
+            soonest = wait if soonest is None else min(soonest, wait)
+        return None, soonest
+
+    def _dequeue(self, job: _Job) -> None:
+        job.queued = False
+        self._queued -= 1
+        self._cond.notify_all()
+
+    def _finish(self, job: _Job, response=None, error: BaseException = None) -> None:
+        self._jobs.pop(job.key, None)
+        self._stats["wait_ms"] += (time.monotonic() - job.submitted_at) * 1000
+        if job.future.done():
+            return
+        if error is not None:
+            self._stats["failed"] += 1
+            job.future.set_exception(error)
+        else:
+            self._stats["completed"] += 1
+            job.future.set_result(response)
+
+    async def _dispatch_loop(self):
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: self._queued > 0 and self._inflight < self.max_inflight)
+                job, slot, wait = self._next_routable()
+                if job is None:
+                    if wait is not None:
+                        try:
+                            await asyncio.wait_for(self._cond.wait(), timeout=min(wait, IDLE_WAIT_S))
+                        except asyncio.TimeoutError:
+                            pass
+                    continue
+                self._dequeue(job)
+                self._inflight += 1
+            asyncio.get_running_loop().create_task(self._execute(job, slot))
+
+    async def _execute(self, job: _Job, slot: tuple):
+        provider, api_key, model = slot
+        job.attempts += 1
+        metrics = get_metrics()
+        if job.attempts == 1:
+            metrics.observe("leo_llm_queue_wait_seconds", time.monotonic() - job.submitted_at,
+                            priority=job.priority.name.lower())
+        outcome = "error"
+        try:
+            with metrics.span("llm.request", parent=job.span, provider=provider, model=model):
+                if provider == "Gemini":
+                    print(f"    [AI] Gemini {model} (key ...{api_key[-4:]}) [{job.priority.name.lower()}]")
+                    response = await _gemini_request(job.prompt, job.config, api_key=api_key, model=model)
+                else:
+                    print(f"    [AI] Grok [{job.priority.name.lower()}]")
+                    response = await _grok_request(job.prompt, job.config)
+            if response and getattr(response, 'text', None):
+                if job.validate is None or _accepted(job.validate, response.text):
+                    outcome = "success"
+                    self._finish(job, response)
+                    return
+                outcome = "invalid"
+                raise ValueError(f"{provider} {model} returned a reply the caller rejected")
+            outcome = "empty"
+            raise ValueError(f"{provider} {model} returned an empty response")
+        except Exception as e:
+            if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
+                outcome = "rate_limited"
+            job.last_error = e
+            self._on_error(job, slot, e)
+        finally:
+            metrics.counter("leo_llm_requests_total", provider=provider, model=model,
+                            outcome=outcome)
+            async with self._cond:
+                self._inflight -= 1
+                if not job.future.done():
+                    if job.attempts >= MAX_ATTEMPTS:
+                        self._finish(job, error=ValueError(
+                            f"All AI providers failed after {job.attempts} attempts. Last error: {job.last_error}"))
+                    else:
+                        self._stats["retried"] += 1
+                        self._enqueue(job)
+                self._cond.notify_all()
+
+    def _on_error(self, job: _Job, slot: tuple, e: Exception) -> None:
+        """Feed the failure back into health state / buckets; the job is then requeued."""
+        provider, api_key, model = slot
+        err_str = str(e)
+        if provider == "Grok":
+            print(f"    [AI WARNING] Grok failed: {e}")
+            job.skip_grok = True
+        elif "429" in err_str or "RESOURCE_EXHAUSTED" in err_str:
+            self._stats["rate_limited"] += 1
+            health_manager.on_gemini_429(api_key, model=model)
+            _bucket(slot).block(COOLDOWN_429_S)
+        elif "400" in err_str and "INVALID_ARGUMENT" in err_str:
+            health_manager.on_gemini_fatal_error(api_key, "400 Invalid Argument")
+        elif "401" in err_str or "UNAUTHORIZED" in err_str:
+            health_manager.on_gemini_fatal_error(api_key, "401 Unauthorized")
+        elif "403" in err_str:
+            health_manager.on_gemini_fatal_error(api_key, "403 Forbidden")
+        elif "503" in err_str or "UNAVAILABLE" in err_str:
+            print(f"    [AI WARNING] Gemini {model} failed: 503 UNAVAILABLE. Cooling {COOLDOWN_503_S:.0f}s...")
+            _bucket(slot).block(COOLDOWN_503_S)
+        else:
+            print(f"    [AI WARNING] Gemini {model} failed: {e}")
+            job.skip_models.add(model)
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMScheduler]" = weakref.WeakKeyDictionary()
+
+
+def get_scheduler() -> LLMScheduler:
+    """The scheduler bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = LLMScheduler()
+    return scheduler
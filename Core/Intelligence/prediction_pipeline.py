@@ -1,8 +1,8 @@
 # prediction_pipeline.py: Pure DB-driven prediction pipeline for Chapter 1 Page 2.
 # Part of LeoBook Core — Intelligence
 #
-# Functions: get_weekly_fixtures(), compute_team_form(), compute_h2h(),
-#            build_rule_engine_input(), run_predictions(), apply_smart_scheduling()
+# Functions: get_weekly_fixtures(), batch_team_form(), batch_h2h(),
+#            build_rule_engine_inputs(), run_predictions(), apply_smart_scheduling()
 # Called by: Leo.py (Chapter 1 Page 2)
 
 """
@@ -11,20 +11,38 @@ All data sourced from the schedules table (populated by weekly enrichment).
 """
 
 import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from typing import List, Dict, Any, Optional
 
-from Data.Access.league_db import init_db, computed_standings
-from Data.Access.db_helpers import save_prediction
+from Data.Access import league_db
+from Data.Access.league_db import init_db, get_connection, computed_standings
+from Data.Access.db_pool import pool_stats
+from Data.Access.db_helpers import save_predictions
 from Core.Intelligence.rule_engine import RuleEngine
-from Core.Intelligence.rl.inference import RLPredictor
+from Core.Intelligence.learning_engine import LearningEngine, WeightsStore
 from Core.Intelligence.ensemble import EnsembleEngine
 from Core.Utils.constants import now_ng
+from Core.System.lazy_loader import lazy
+
+# torch loads on the first run_predictions(), not when the input builders are imported
+RLPredictor = lazy("Core.Intelligence.rl.inference:RLPredictor")
 
 logger = logging.getLogger(__name__)
 NIGERIA_TZ = ZoneInfo("Africa/Lagos")
 
+# Parallel mode: worker processes per run (1 = serial, in-process). Below
+# PARALLEL_MIN_FIXTURES, spawning workers and loading the model costs more than it saves.
+PREDICTION_WORKERS = int(os.getenv("PREDICTION_WORKERS", "1"))
+PARALLEL_MIN_FIXTURES = int(os.getenv("PREDICTION_PARALLEL_MIN", "200"))
+SHARDS_PER_WORKER = 4
+# Results saved per write transaction by the run's single writer
+WRITE_BATCH = 500
+
 
 def _schedule_to_match_dict(row: Dict) -> Dict:
     """Convert a schedules table row into the match dict format RuleEngine/TagGenerator expects.
@@ -91,85 +109,124 @@ def get_weekly_fixtures(conn=None, days: int = 7) -> List[Dict]:
     return [dict(r) for r in rows]
 
 
-def compute_team_form(conn, team_id: str, limit: int = 10) -> List[Dict]:
-    """Get last N completed matches for a team from the schedules table.
+# Completed-match predicate shared by the form and H2H batch queries
+_COMPLETED = """s.home_score IS NOT NULL AND s.away_score IS NOT NULL
+                 AND s.home_score != '' AND s.away_score != ''"""
+
+# Last N completed matches for every team in one statement (home or away side)
+_TEAM_FORM_BATCH_SQL = """
+    WITH wanted(team_id) AS (VALUES {values}),
+    ranked AS (
+        SELECT w.team_id AS for_team, s.*,
+               ROW_NUMBER() OVER (PARTITION BY w.team_id ORDER BY s.date DESC) AS rn
+        FROM wanted w
+        JOIN schedules s ON (s.home_team_id = w.team_id OR s.away_team_id = w.team_id)
+        WHERE {completed}
+    )
+    SELECT * FROM ranked WHERE rn <= ? ORDER BY for_team, rn
+"""
 
-    Searches where team is either home or away and a result exists.
-    Returns in RuleEngine-compatible format.
-    """
-    rows = conn.execute(
-        """SELECT * FROM schedules
-           WHERE (home_team_id = ? OR away_team_id = ?)
-             AND home_score IS NOT NULL AND away_score IS NOT NULL
-             AND home_score != '' AND away_score != ''
-           ORDER BY date DESC
-           LIMIT ?""",
-        (team_id, team_id, limit),
-    ).fetchall()
+# Last N completed meetings for every (home, away) pair, either venue
+_H2H_BATCH_SQL = """
+    WITH wanted(team_a, team_b) AS (VALUES {values}),
+    ranked AS (
+        SELECT w.team_a AS pair_a, w.team_b AS pair_b, s.*,
+               ROW_NUMBER() OVER (PARTITION BY w.team_a, w.team_b ORDER BY s.date DESC) AS rn
+        FROM wanted w
+        JOIN schedules s ON ((s.home_team_id = w.team_a AND s.away_team_id = w.team_b)
+                          OR (s.home_team_id = w.team_b AND s.away_team_id = w.team_a))
+        WHERE {completed}
+    )
+    SELECT * FROM ranked WHERE rn <= ? ORDER BY pair_a, pair_b, rn
+"""
 
-    return [_schedule_to_match_dict(dict(r)) for r in rows]
+# Keeps each VALUES list well under SQLite's bound-parameter limit
+_BATCH_CHUNK = 400
 
 
-def compute_h2h(conn, home_team_id: str, away_team_id: str, limit: int = 10) -> List[Dict]:
-    """Get direct head-to-head matches between two teams from schedules.
+def _chunks(items: List, size: int = _BATCH_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
 
-    Either team can be home or away in historical matchups.
-    Returns in RuleEngine-compatible format.
-    """
-    rows = conn.execute(
-        """SELECT * FROM schedules
-           WHERE ((home_team_id = ? AND away_team_id = ?)
-               OR (home_team_id = ? AND away_team_id = ?))
-             AND home_score IS NOT NULL AND away_score IS NOT NULL
-             AND home_score != '' AND away_score != ''
-           ORDER BY date DESC
-           LIMIT ?""",
-        (home_team_id, away_team_id, away_team_id, home_team_id, limit),
-    ).fetchall()
 
-    return [_schedule_to_match_dict(dict(r)) for r in rows]
+def batch_team_form(conn, team_ids: List[str], limit: int = 10) -> Dict[str, List[Dict]]:
+    """Last N completed matches for each team, newest first, in RuleEngine format."""
+    form = {tid: [] for tid in team_ids}
+    for chunk in _chunks(list(form)):
+        sql = _TEAM_FORM_BATCH_SQL.format(values=",".join(["(?)"] * len(chunk)), completed=_COMPLETED)
+        for r in conn.execute(sql, [*chunk, limit]).fetchall():
+            row = dict(r)
+            form[row["for_team"]].append(_schedule_to_match_dict(row))
+    return form
+
 
+def batch_h2h(conn, pairs: List[tuple], limit: int = 10) -> Dict[tuple, List[Dict]]:
+    """Last N completed meetings for each (home_team_id, away_team_id) pair."""
+    h2h = {pair: [] for pair in pairs}
+    for chunk in _chunks(list(h2h)):
+        sql = _H2H_BATCH_SQL.format(values=",".join(["(?, ?)"] * len(chunk)), completed=_COMPLETED)
+        params = [tid for pair in chunk for tid in pair] + [limit]
+        for r in conn.execute(sql, params).fetchall():
+            row = dict(r)
+            h2h[(row["pair_a"], row["pair_b"])].append(_schedule_to_match_dict(row))
+    return h2h
 
-def build_rule_engine_input(conn, fixture: Dict) -> Dict[str, Any]:
-    """Assemble the h2h_data + standings dict that RuleEngine.analyze expects.
+
+def build_rule_engine_inputs(conn, fixtures: List[Dict]) -> tuple:
+    """Assemble the h2h_data + standings dict RuleEngine.analyze expects, for every fixture.
+
+    Form, H2H and standings are loaded set-wise for all involved teams, pairs and
+    leagues instead of per fixture.
 
     Args:
         conn: SQLite connection
-        fixture: A schedule row dict for the fixture to predict
+        fixtures: Schedule row dicts (e.g. from get_weekly_fixtures)
 
     Returns:
-        Dict with {"h2h_data": {...}, "standings": [...]}
+        (inputs, stats) — inputs[i] is {"h2h_data": {...}, "standings": [...]} for
+        fixtures[i]; stats has the query count and wall time of the assembly.
     """
-    home_team_id = fixture.get("home_team_id", "")
-    away_team_id = fixture.get("away_team_id", "")
-    home_team = fixture.get("home_team_name", "")
-    away_team = fixture.get("away_team_name", "")
-    league_id = fixture.get("league_id", "")
-    region_league = fixture.get("region_league", "")
-    season = fixture.get("season", "")
-
-    # 1. Team form (last 10 completed matches per team)
-    home_form = compute_team_form(conn, home_team_id, limit=10)
-    away_form = compute_team_form(conn, away_team_id, limit=10)
-
-    # 2. Direct H2H
-    h2h = compute_h2h(conn, home_team_id, away_team_id, limit=10)
-
-    # 3. Standings (computed on-the-fly from schedules)
-    standings = []
-    if league_id:
-        standings = computed_standings(conn=conn, league_id=league_id, season=season)
-
-    h2h_data = {
-        "home_team": home_team,
-        "away_team": away_team,
-        "region_league": region_league or "GLOBAL",
-        "home_last_10_matches": home_form,
-        "away_last_10_matches": away_form,
-        "head_to_head": h2h,
+    # Counted on the pooled connection itself; its trace callback is not ours to take
+    statements_before = getattr(conn, "statements", 0)
+    start = time.perf_counter()
+    team_ids = list(dict.fromkeys(
+        tid for f in fixtures
+        for tid in (f.get("home_team_id", ""), f.get("away_team_id", ""))
+    ))
+    pairs = list(dict.fromkeys((f.get("home_team_id", ""), f.get("away_team_id", "")) for f in fixtures))
+    form = batch_team_form(conn, team_ids, limit=10)
+    h2h = batch_h2h(conn, pairs, limit=10)
+
+    # Standings (computed on-the-fly from schedules, cached per league/season)
+    standings = {}
+    for f in fixtures:
+        key = (f.get("league_id", ""), f.get("season", ""))
+        if key[0] and key not in standings:
+            standings[key] = computed_standings(conn=conn, league_id=key[0], season=key[1])
+
+    inputs = []
+    for f in fixtures:
+        home_team_id = f.get("home_team_id", "")
+        away_team_id = f.get("away_team_id", "")
+        key = (f.get("league_id", ""), f.get("season", ""))
+        h2h_data = {
+            "home_team": f.get("home_team_name", ""),
+            "away_team": f.get("away_team_name", ""),
+            "region_league": f.get("region_league", "") or "GLOBAL",
+            "home_last_10_matches": list(form[home_team_id]),
+            "away_last_10_matches": list(form[away_team_id]),
+            "head_to_head": list(h2h[(home_team_id, away_team_id)]),
+        }
+        inputs.append({"h2h_data": h2h_data, "standings": [dict(r) for r in standings.get(key, [])]})
+
+    stats = {
+        "fixtures": len(fixtures),
+        "teams": len(team_ids),
+        "leagues": len(standings),
+        "queries": getattr(conn, "statements", 0) - statements_before,
+        "ms": round((time.perf_counter() - start) * 1000, 1),
     }
-
-    return {"h2h_data": h2h_data, "standings": standings}
+    return inputs, stats
 
 
 def _get_existing_prediction_ids(conn) -> set:
@@ -181,17 +238,205 @@ def _get_existing_prediction_ids(conn) -> set:
         return set()
 
 
-async def run_predictions(conn=None, fixtures: List[Dict] = None, scheduler=None) -> List[Dict]:
+def _predict_fixtures(fixtures: List[Dict], all_inputs: List[Dict]) -> List[tuple]:
+    """Rule engine + RL + ensemble for fixtures whose inputs are already assembled.
+
+    Returns one outcome per fixture, in order: ("ok", (match_data, prediction)),
+    ("skip", None) or ("error", message). Pure computation, no DB writes, so it
+    runs unchanged in the parent (serial) or in a pool worker (parallel).
+    """
+    # Neural predictions for every fixture that passes the data-quality gate, in one batch
+    rl_predictor = RLPredictor.get_instance()
+    gated = [
+        i for i, v in enumerate(all_inputs)
+        if len(v["h2h_data"]["home_last_10_matches"]) >= 3 and len(v["h2h_data"]["away_last_10_matches"]) >= 3
+    ]
+    rl_results = rl_predictor.predict_batch([
+        {
+            "vision_data": all_inputs[i],
+            "fs_league_id": fixtures[i].get("league_id", "GLOBAL"),
+            "home_team_id": fixtures[i].get("home_team_id", ""),
+            "away_team_id": fixtures[i].get("away_team_id", ""),
+        }
+        for i in gated
+    ])
+    rl_by_idx = dict(zip(gated, rl_results))
+    if rl_predictor.batch_stats:
+        logger.info(f"    [RL] predict_batch: {rl_predictor.batch_stats}")
+
+    # Learned weights for the whole batch: one store, per-fixture dict lookups
+    weights_store = LearningEngine.weights_store()
+
+    outcomes = []
+    for idx, (fixture, vision_data) in enumerate(zip(fixtures, all_inputs)):
+        try:
+            # Data quality gate: need at least 3 form matches per team
+            if idx not in rl_by_idx:
+                outcomes.append(("skip", None))
+                continue
+            result = _predict_fixture(fixture, vision_data, rl_by_idx[idx], weights_store)
+            outcomes.append(("ok", result) if result else ("skip", None))
+        except Exception as e:
+            outcomes.append(("error", str(e)))
+    return outcomes
+
+
+def _predict_fixture(fixture: Dict, vision_data: Dict, rl_prediction: Dict,
+                     weights_store: Optional[WeightsStore] = None) -> Optional[tuple]:
+    """(match_data, prediction) for one gated fixture, or None if the engine skips it."""
+    # Run symbolic prediction
+    rule_prediction = RuleEngine.analyze(vision_data, weights_store=weights_store)
+
+    # Ensemble Merge
+    merged = EnsembleEngine.merge(
+        rule_logits=rule_prediction.get("raw_scores", {"home": 1.0, "draw": 1.0, "away": 1.0}),
+        rule_conf=rule_prediction.get("market_reliability", 50) / 100.0,
+        rl_logits=rl_prediction.get("rl_action_probs"),
+        rl_conf=rl_prediction.get("ml_confidence"),
+        league_id=fixture.get("league_id", "GLOBAL")
+    )
+
+    # Integrate merged data into final prediction
+    # We keep Rule Engine's structural fields but update confidence and add ensemble metadata
+    prediction = rule_prediction.copy()
+    prediction["ensemble_path"] = merged["path"]
+    prediction["ensemble_weights"] = merged["weights"]
+    prediction["market_reliability"] = round(merged["confidence"] * 100, 1)
+
+    # Update confidence label based on merged confidence
+    conf = merged["confidence"]
+    if conf > 0.75: prediction["confidence"] = "Very High"
+    elif conf > 0.60: prediction["confidence"] = "High"
+    elif conf > 0.45: prediction["confidence"] = "Medium"
+    else: prediction["confidence"] = "Low"
+
+    if prediction.get("type", "SKIP") == "SKIP":
+        return None
+
+    # Record reference data
+    h2h_ids = [m.get("fixture_id", "") for m in vision_data["h2h_data"]["head_to_head"] if m.get("fixture_id")]
+    home_form_ids = [m.get("fixture_id", "") for m in vision_data["h2h_data"]["home_last_10_matches"] if m.get("fixture_id")]
+    away_form_ids = [m.get("fixture_id", "") for m in vision_data["h2h_data"]["away_last_10_matches"] if m.get("fixture_id")]
+
+    prediction["h2h_fixture_ids"] = h2h_ids
+    prediction["form_fixture_ids"] = home_form_ids + away_form_ids
+    prediction["standings_snapshot"] = vision_data["standings"]
+
+    # Build match_data for save_prediction
+    match_data = {
+        "fixture_id": fixture.get("fixture_id", "unknown"),
+        "date": fixture.get("date", ""),
+        "match_time": fixture.get("time", ""),
+        "region_league": fixture.get("region_league", ""),
+        "home_team": fixture.get("home_team_name", "?"),
+        "away_team": fixture.get("away_team_name", "?"),
+        "home_team_id": fixture.get("home_team_id", ""),
+        "away_team_id": fixture.get("away_team_id", ""),
+        "match_link": fixture.get("match_link", ""),
+    }
+    return match_data, prediction
+
+
+class _PredictionWriter:
+    """The run's single writer: buffers results, saving WRITE_BATCH per transaction."""
+
+    def __init__(self, batch: int = WRITE_BATCH):
+        self.batch = batch
+        self.pending: List[tuple] = []
+        self.written = 0
+        self.transactions = 0
+
+    def add(self, match_data: Dict, prediction: Dict) -> None:
+        self.pending.append((match_data, prediction))
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            self.written += save_predictions(self.pending)
+            self.transactions += 1
+            self.pending = []
+
+
+# ── Process-pool shards ─────────────────────────────────────
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(db_path: str):
+    """Each worker preloads the RL model once and reads through its own query_only connection.
+
+    A load failure is kept for _predict_shard to report; raising here would
+    break the pool and abort the whole run."""
+    league_db.DB_PATH = db_path
+    try:
+        _worker_state["rl_loaded"] = RLPredictor.get_instance()._ensure_loaded()
+    except Exception as e:
+        _worker_state["init_error"] = f"worker init failed: {type(e).__name__}: {e}"
+
+
+def _predict_shard(fixtures: List[Dict]) -> tuple:
+    """Assemble and predict one contiguous shard; returns (outcomes, assembly stats, CPU seconds).
+
+    Any failure becomes an ("error", message) outcome for each of the
+    shard's fixtures, so one bad shard never takes down the run."""
+    start = time.process_time()
+    try:
+        if "init_error" in _worker_state:
+            raise RuntimeError(_worker_state["init_error"])
+        conn = get_connection(readonly=True)
+        conn.execute("BEGIN")          # one read snapshot for the whole shard
+        try:
+            inputs, assembly = build_rule_engine_inputs(conn, fixtures)
+        finally:
+            conn.rollback()
+        outcomes = _predict_fixtures(fixtures, inputs)
+    except Exception as e:
+        return [("error", f"shard failed: {e}")] * len(fixtures), {"queries": 0}, time.process_time() - start
+    return outcomes, assembly, time.process_time() - start
+
+
+def _predict_parallel(eligible: List[Dict], workers: int, stats: Dict[str, Any]):
+    """Yield outcomes for `eligible`, in order, as the pool finishes each shard.
+
+    stats gets shards, the shards' summed CPU time (work_s, roughly what a serial
+    run would take), pool wall time including startup (wall_s) and the query
+    total once the last shard is in."""
+    size = max(1, -(-len(eligible) // (workers * SHARDS_PER_WORKER)))
+    shards = [eligible[i:i + size] for i in range(0, len(eligible), size)]
+    start = time.perf_counter()
+    work_s, queries = 0.0, 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(league_db.DB_PATH,),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        # map() yields shards in submission order, so results stay in fixture order
+        for outcomes, assembly, seconds in pool.map(_predict_shard, shards):
+            work_s += seconds
+            queries += assembly["queries"]
+            yield from outcomes
+    stats.update(shards=len(shards), workers=workers, work_s=work_s, queries=queries,
+                 wall_s=time.perf_counter() - start)
+
+
+async def run_predictions(conn=None, fixtures: List[Dict] = None, scheduler=None,
+                          workers: Optional[int] = None) -> List[Dict]:
     """Main prediction loop — pure DB computation, zero browser.
 
+    With workers > 1 (default PREDICTION_WORKERS) and at least
+    PARALLEL_MIN_FIXTURES eligible fixtures, contiguous shards are assembled
+    and predicted in a process pool; each worker reads from its own read-only
+    snapshot with the RL model preloaded. Either way results are saved by one
+    writer in batched transactions, in fixture order.
+
     Args:
         conn: SQLite connection (optional)
         fixtures: Pre-fetched list of fixture dicts (optional, fetched if None)
         scheduler: TaskScheduler for smart scheduling (optional)
+        workers: Worker processes (optional, PREDICTION_WORKERS if None)
 
     Returns:
         List of generated prediction dicts
     """
+    run_start = time.perf_counter()
     conn = conn or init_db()
 
     if fixtures is None:
@@ -231,103 +476,61 @@ async def run_predictions(conn=None, fixtures: List[Dict] = None, scheduler=None
         print("    [Predictions] No eligible fixtures (all already started or predicted).")
         return []
 
-    print(f"    [Predictions] Processing {len(eligible)} fixtures (pure DB computation)...")
-
-    predictions_made = []
-    skipped = 0
+    workers = max(1, min(PREDICTION_WORKERS if workers is None else workers, os.cpu_count() or 1))
+    parallel = workers > 1 and len(eligible) >= PARALLEL_MIN_FIXTURES
+    print(f"    [Predictions] Processing {len(eligible)} fixtures (pure DB computation"
+          f"{f', {workers} worker processes' if parallel else ''})...")
 
-    for fixture in eligible:
-        fixture_id = fixture.get("fixture_id", "unknown")
-        home = fixture.get("home_team_name", "?")
-        away = fixture.get("away_team_name", "?")
-
-        try:
-            # Build input from DB
-            vision_data = build_rule_engine_input(conn, fixture)
+    pool_stats_run: Dict[str, Any] = {}
+    if parallel:
+        outcomes = _predict_parallel(eligible, workers, pool_stats_run)
+    else:
+        # Feature assembly is read-only: use the thread's query_only connection
+        read_conn = get_connection(readonly=True)
 
-            # Data quality gate: need at least 3 form matches per team
-            home_form_n = len(vision_data["h2h_data"]["home_last_10_matches"])
-            away_form_n = len(vision_data["h2h_data"]["away_last_10_matches"])
+        # Form, H2H and standings for every eligible fixture in a handful of queries
+        all_inputs, assembly = build_rule_engine_inputs(read_conn, eligible)
+        print(f"    [Predictions] Features: {assembly['fixtures']} fixtures, {assembly['teams']} teams, "
+              f"{assembly['leagues']} tables in {assembly['queries']} queries ({assembly['ms']:.0f} ms)")
+        outcomes = _predict_fixtures(eligible, all_inputs)
 
-            if home_form_n < 3 or away_form_n < 3:
-                skipped += 1
-                continue
+    predictions_made = []
+    skipped = 0
+    writer = _PredictionWriter()
 
-            # Run symbolic prediction
-            rule_prediction = RuleEngine.analyze(vision_data)
-
-            # Run neural prediction
-            rl_predictor = RLPredictor.get_instance()
-            rl_prediction = rl_predictor.predict(
-                vision_data,
-                fs_league_id=fixture.get("league_id", "GLOBAL"),
-                home_team_id=fixture.get("home_team_id", ""),
-                away_team_id=fixture.get("away_team_id", "")
-            )
-
-            # Ensemble Merge
-            merged = EnsembleEngine.merge(
-                rule_logits=rule_prediction.get("raw_scores", {"home": 1.0, "draw": 1.0, "away": 1.0}),
-                rule_conf=rule_prediction.get("market_reliability", 50) / 100.0,
-                rl_logits=rl_prediction.get("rl_action_probs"),
-                rl_conf=rl_prediction.get("ml_confidence"),
-                league_id=fixture.get("league_id", "GLOBAL")
-            )
-
-            # Integrate merged data into final prediction
-            # We keep Rule Engine's structural fields but update confidence and add ensemble metadata
-            prediction = rule_prediction.copy()
-            prediction["ensemble_path"] = merged["path"]
-            prediction["ensemble_weights"] = merged["weights"]
-            prediction["market_reliability"] = round(merged["confidence"] * 100, 1)
-
-            # Update confidence label based on merged confidence
-            conf = merged["confidence"]
-            if conf > 0.75: prediction["confidence"] = "Very High"
-            elif conf > 0.60: prediction["confidence"] = "High"
-            elif conf > 0.45: prediction["confidence"] = "Medium"
-            else: prediction["confidence"] = "Low"
-
-            p_type = prediction.get("type", "SKIP")
-            if p_type == "SKIP":
+    try:
+        for idx, (status, payload) in enumerate(outcomes):
+            fixture = eligible[idx]
+            home = fixture.get("home_team_name", "?")
+            away = fixture.get("away_team_name", "?")
+            if status == "ok":
+                match_data, prediction = payload
+                writer.add(match_data, prediction)
+                predictions_made.append({**match_data, **prediction})
+                print(f"      [✓] {home} vs {away} → {prediction.get('type')} ({prediction.get('confidence', '?')})")
+            else:
+                if status == "error":
+                    logger.error(f"      [✗] Prediction failed for {home} vs {away}: {payload}")
                 skipped += 1
-                continue
-
-            # Record reference data
-            h2h_ids = [m.get("fixture_id", "") for m in vision_data["h2h_data"]["head_to_head"] if m.get("fixture_id")]
-            home_form_ids = [m.get("fixture_id", "") for m in vision_data["h2h_data"]["home_last_10_matches"] if m.get("fixture_id")]
-            away_form_ids = [m.get("fixture_id", "") for m in vision_data["h2h_data"]["away_last_10_matches"] if m.get("fixture_id")]
-
-            prediction["h2h_fixture_ids"] = h2h_ids
-            prediction["form_fixture_ids"] = home_form_ids + away_form_ids
-            prediction["standings_snapshot"] = vision_data["standings"]
-
-            # Build match_data for save_prediction
-            match_data = {
-                "fixture_id": fixture_id,
-                "date": fixture.get("date", ""),
-                "match_time": fixture.get("time", ""),
-                "region_league": fixture.get("region_league", ""),
-                "home_team": home,
-                "away_team": away,
-                "home_team_id": fixture.get("home_team_id", ""),
-                "away_team_id": fixture.get("away_team_id", ""),
-                "match_link": fixture.get("match_link", ""),
-            }
-
-            save_prediction(match_data, prediction)
-            predictions_made.append({**match_data, **prediction})
-            print(f"      [✓] {home} vs {away} → {p_type} ({prediction.get('confidence', '?')})")
+    finally:
+        # A pool failure still raises, but never strands results already received
+        writer.flush()
 
-        except Exception as e:
-            logger.error(f"      [✗] Prediction failed for {home} vs {away}: {e}")
-            skipped += 1
+    if parallel:
+        s = pool_stats_run
+        print(f"    [Predictions] Parallel: {s['shards']} shards on {s['workers']} workers, "
+              f"{s['work_s']:.1f} CPU-s of shard work in {s['wall_s']:.1f}s wall "
+              f"(~{s['work_s'] / max(s['wall_s'], 1e-9):.1f}x vs serial, {s['queries']} queries)")
 
     # Apply smart scheduling if scheduler provided
     if scheduler and predictions_made:
         predictions_made = apply_smart_scheduling(predictions_made, scheduler, conn)
 
-    print(f"\n    [Predictions] Done: {len(predictions_made)} predictions, {skipped} skipped.")
+    print(f"\n    [Predictions] Done: {len(predictions_made)} predictions, {skipped} skipped "
+          f"in {time.perf_counter() - run_start:.1f}s ({writer.written} saved in "
+          f"{writer.transactions} transaction(s)).")
+    for path, stats in pool_stats().items():
+        logger.info(f"    [DB Pool] {os.path.basename(path)}: {stats}")
     return predictions_made
 
 
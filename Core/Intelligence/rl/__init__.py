@@ -3,6 +3,9 @@
 #
 # Modules: feature_encoder, model, adapter_registry, trainer, inference
 
-from .inference import RLPredictor
+from Core.System.lazy_loader import lazy_exports
+
+# torch is only imported once RLPredictor is actually used
+__getattr__, __dir__ = lazy_exports(__name__, {"RLPredictor": ".inference"})
 
 __all__ = ["RLPredictor"]
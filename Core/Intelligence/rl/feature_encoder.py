@@ -2,6 +2,7 @@
 # Part of LeoBook Core — Intelligence (RL Engine)
 #
 # Classes: FeatureEncoder
+# Functions: encode_batch() helpers (_encode_team_block, _encode_h2h_parsed, _rest_days_parsed)
 # Called by: trainer.py, inference.py
 
 """
@@ -94,6 +95,70 @@ class FeatureEncoder:
         tensor = torch.tensor([features], dtype=torch.float32)
         return tensor
 
+    @staticmethod
+    def encode_batch(vision_datas: List[Dict[str, Any]],
+                     league_metas: Optional[List[Optional[Dict[str, Any]]]] = None) -> np.ndarray:
+        """
+        Vectorized encode() for N fixtures → float32 array of shape [N, FEATURE_DIM].
+
+        Scores and dates are parsed once per distinct string, and the xG/form/goal
+        blocks of a team are computed once per distinct (team, form) across the
+        batch. Each standings table is indexed by team name once, not scanned per
+        fixture. Produces exactly the numbers encode() does.
+        """
+        out = np.zeros((len(vision_datas), FEATURE_DIM), dtype=np.float32)
+        scores: Dict[Any, Optional[tuple]] = {}
+        dates: Dict[Any, Optional[datetime]] = {}
+        team_blocks: Dict[tuple, np.ndarray] = {}
+        # Fixtures of one league share a standings list: index it by team once.
+        standings_index: Dict[int, Dict[str, Dict]] = {}
+
+        def team_block(form: List[Dict], team_name: str, is_home: bool) -> np.ndarray:
+            # [xG, form(30), goal stats(20)]
+            key = (team_name, is_home, tuple((m.get("home", ""), m.get("score", "0-0")) for m in form))
+            block = team_blocks.get(key)
+            if block is None:
+                block = _encode_team_block(form, team_name, is_home, scores)
+                team_blocks[key] = block
+            return block
+
+        for row, vision_data in enumerate(vision_datas):
+            h2h_data = vision_data.get("h2h_data", {})
+            home_team = h2h_data.get("home_team", "")
+            away_team = h2h_data.get("away_team", "")
+
+            home_form = [m for m in h2h_data.get("home_last_10_matches", []) if m][:10]
+            away_form = [m for m in h2h_data.get("away_last_10_matches", []) if m][:10]
+            h2h_matches = [m for m in h2h_data.get("head_to_head", []) if m]
+
+            home = team_block(home_form, home_team, True)
+            away = team_block(away_form, away_team, False)
+            meta = league_metas[row] if league_metas else None
+
+            vec = out[row]
+            vec[0] = home[0]                       # 1. xG (4)
+            vec[1] = away[0]
+            vec[2] = home[0] - away[0]
+            vec[3] = home[0] + away[0]
+            vec[4:34] = home[1:31]                 # 2. Home form (30)
+            vec[34:64] = away[1:31]                # 3. Away form (30)
+            vec[64:84] = home[31:51]               # 4. Home goal stats (20)
+            vec[84:104] = away[31:51]              # 5. Away goal stats (20)
+            vec[104:112] = _encode_h2h_parsed(h2h_matches, home_team, scores)      # 6. (8)
+            standings = vision_data.get("standings", [])
+            if standings:                                                          # 7. (10)
+                index = standings_index.get(id(standings))
+                if index is None:
+                    index = standings_index[id(standings)] = _standings_index(standings)
+                vec[112:122] = FeatureEncoder._encode_standings_indexed(
+                    index, len(standings), home_team, away_team)
+            vec[122:128] = FeatureEncoder._rest_context(                           # 8. (6)
+                _rest_days_parsed(home_form, dates), _rest_days_parsed(away_form, dates))
+            vec[128:132] = FeatureEncoder._encode_league_meta(meta)               # 9. (4)
+            # 10. Remaining dims stay zero (padding)
+
+        return out
+
     # -----------------------------------------------------------------------
     # Private helpers
     # -----------------------------------------------------------------------
@@ -243,26 +308,17 @@ class FeatureEncoder:
         """Encode standings context (10 floats)."""
         if not standings:
             return [0.0] * 10
+        return FeatureEncoder._encode_standings_indexed(
+            _standings_index(standings), len(standings), home_team, away_team)
 
-        home_pos = away_pos = 0
-        home_pts = away_pts = 0
-        home_gd = away_gd = 0
-        league_size = len(standings)
-
-        for row in standings:
-            name = row.get("team", row.get("team_name", ""))
-            pos = row.get("position", row.get("rank", 0))
-            pts = row.get("points", 0)
-            gd = row.get("goal_difference", row.get("gd", 0))
-
-            if name == home_team:
-                home_pos = pos
-                home_pts = pts
-                home_gd = gd
-            elif name == away_team:
-                away_pos = pos
-                away_pts = pts
-                away_gd = gd
+    @staticmethod
+    def _encode_standings_indexed(index: Dict[str, Dict], league_size: int,
+                                  home_team: str, away_team: str) -> List[float]:
+        """_encode_standings over a {team_name: row} index (see _standings_index)."""
+        home = index.get(home_team)
+        away = index.get(away_team) if away_team != home_team else None
+        home_pos, home_pts, home_gd = _standings_values(home)
+        away_pos, away_pts, away_gd = _standings_values(away)
 
         ls = max(league_size, 1)
         return [
@@ -282,9 +338,13 @@ class FeatureEncoder:
     def _encode_schedule_context(home_form: List[Dict],
                                   away_form: List[Dict]) -> List[float]:
         """Encode schedule/rest context (6 floats)."""
-        home_rest = FeatureEncoder._estimate_rest_days(home_form)
-        away_rest = FeatureEncoder._estimate_rest_days(away_form)
+        return FeatureEncoder._rest_context(
+            FeatureEncoder._estimate_rest_days(home_form),
+            FeatureEncoder._estimate_rest_days(away_form),
+        )
 
+    @staticmethod
+    def _rest_context(home_rest: float, away_rest: float) -> List[float]:
         return [
             min(home_rest, 14) / 14.0,  # Normalized home rest
             min(away_rest, 14) / 14.0,  # Normalized away rest
@@ -327,3 +387,163 @@ class FeatureEncoder:
             meta.get("home_advantage_factor", 0.45), # Home win %
             meta.get("draw_rate", 0.25),             # League draw rate
         ]
+
+
+# ---------------------------------------------------------------------------
+# encode_batch() helpers — same arithmetic as the FeatureEncoder methods above,
+# on pre-parsed integer arrays.
+# ---------------------------------------------------------------------------
+
+_FORM_WEIGHTS = np.array([w / _RECENCY_SUM for w in _RECENCY_WEIGHTS])
+
+
+def _standings_index(standings: List[Dict]) -> Dict[str, Dict]:
+    """{team_name: row} for a standings table; a repeated name keeps its last row."""
+    return {row.get("team", row.get("team_name", "")): row for row in standings}
+
+
+def _standings_values(row: Optional[Dict]) -> tuple:
+    """(position, points, goal difference) of a standings row, zeros if absent."""
+    if row is None:
+        return 0, 0, 0
+    return (row.get("position", row.get("rank", 0)), row.get("points", 0),
+            row.get("goal_difference", row.get("gd", 0)))
+
+
+def _parse_score(score: Any, cache: Dict[Any, Optional[tuple]]) -> Optional[tuple]:
+    """"2-1" → (2, 1), or None where the scalar path would skip the match."""
+    try:
+        return cache[score]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable
+        return None
+    try:
+        gf, ga = map(int, score.replace(" ", "").split("-"))
+        parsed = (gf, ga)
+    except (ValueError, AttributeError):
+        parsed = None
+    cache[score] = parsed
+    return parsed
+
+
+def _encode_team_block(form: List[Dict], team_name: str, is_home: bool,
+                       scores: Dict[Any, Optional[tuple]]) -> np.ndarray:
+    """xG (1) + recency-weighted form (30) + goal stats (20) for one team."""
+    block = np.zeros(51)
+    positions, gf, ga, home_match = [], [], [], []
+    for i, m in enumerate(form):
+        parsed = _parse_score(m.get("score", "0-0"), scores)
+        if parsed is None:
+            continue
+        positions.append(i)
+        gf.append(parsed[0])
+        ga.append(parsed[1])
+        home_match.append(m.get("home", "") == team_name)
+
+    if not form:
+        block[0] = 1.2  # League average default
+        return block
+    if not positions:
+        return block
+
+    pos = np.array(positions)
+    gf = np.array(gf)
+    ga = np.array(ga)
+    home_match = np.array(home_match)
+    scored = np.where(home_match, gf, ga)
+    conceded = np.where(home_match, ga, gf)
+
+    # xG — Python sum keeps the scalar path's left-to-right accumulation
+    if is_home:
+        goals = np.where(home_match, scored, scored * 1.15)
+    else:
+        goals = np.where(home_match, scored * 0.85, scored)
+    block[0] = sum(goals.tolist()) / len(positions)
+
+    # Form: one-hot W/D/L at the match's original slot
+    outcome = np.where(scored > conceded, 0, np.where(scored == conceded, 1, 2))
+    in_window = pos < 10
+    block[1 + pos[in_window] * 3 + outcome[in_window]] = _FORM_WEIGHTS[pos[in_window]]
+
+    # Goal stats
+    n = len(scored)
+    block[31:46] = [
+        np.mean(scored),
+        np.std(scored) if n > 1 else 0,
+        scored.max(),
+        scored.min(),
+        int(np.count_nonzero(scored >= 2)) / n,
+        int(np.count_nonzero(scored == 0)) / n,
+        np.mean(conceded),
+        np.std(conceded) if n > 1 else 0,
+        conceded.max(),
+        conceded.min(),
+        int(np.count_nonzero(conceded >= 2)) / n,
+        int(np.count_nonzero(conceded == 0)) / n,
+        np.mean(scored) + np.mean(conceded),
+        int(np.count_nonzero((scored > 0) & (conceded > 0))) / n,
+        int(np.count_nonzero(scored + conceded > 2.5)) / n,
+    ]
+    return block
+
+
+def _encode_h2h_parsed(h2h: List[Dict], home_team: str,
+                       scores: Dict[Any, Optional[tuple]]) -> List[float]:
+    """FeatureEncoder._encode_h2h on cached parsed scores (8 floats)."""
+    if not h2h:
+        return [0.0] * 8
+
+    home_wins = away_wins = draws = total_goals = 0
+    for m in h2h[:10]:
+        parsed = _parse_score(m.get("score", "0-0"), scores)
+        if parsed is None:
+            continue
+        gf, ga = parsed
+        total_goals += gf + ga
+        is_home = m.get("home", "") == home_team
+        home_g = gf if is_home else ga
+        away_g = ga if is_home else gf
+        if home_g > away_g:
+            home_wins += 1
+        elif away_g > home_g:
+            away_wins += 1
+        else:
+            draws += 1
+
+    n = max(home_wins + away_wins + draws, 1)
+    avg_goals = total_goals / n
+    return [
+        home_wins / n, away_wins / n, draws / n, avg_goals, float(n),
+        float(home_wins > away_wins), float(away_wins > home_wins), float(avg_goals > 2.5),
+    ]
+
+
+def _rest_days_parsed(form: List[Dict], dates: Dict[Any, Optional[datetime]]) -> float:
+    """FeatureEncoder._estimate_rest_days with a per-batch date-parse cache."""
+    if len(form) < 2:
+        return 7.0
+
+    parsed = []
+    for m in form[:2]:
+        d = m.get("date", "")
+        try:
+            dt = dates[d]
+        except KeyError:
+            dt = None
+            try:
+                if "-" in d and len(d.split("-")[0]) == 4:
+                    dt = datetime.strptime(d, "%Y-%m-%d")
+                elif "." in d:
+                    dt = datetime.strptime(d, "%d.%m.%Y")
+            except (ValueError, AttributeError):
+                pass
+            dates[d] = dt
+        except TypeError:  # unhashable
+            continue
+        if dt is not None:
+            parsed.append(dt)
+
+    if len(parsed) >= 2:
+        return abs((parsed[0] - parsed[1]).days)
+    return 7.0
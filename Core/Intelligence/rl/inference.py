@@ -2,7 +2,7 @@
 # Part of LeoBook Core — Intelligence (RL Engine)
 #
 # Classes: RLPredictor
-# Called by: rule_engine_manager.py (as "rl_v1" engine)
+# Called by: rule_engine_manager.py (as "rl_v1" engine) | prediction_pipeline.py (predict_batch)
 
 """
 RL Predictor Module
@@ -10,12 +10,14 @@ Provides sub-millisecond inference that returns predictions in the same format
 as RuleEngine.analyze() for drop-in compatibility with the existing pipeline.
 """
 
+import time
+import numpy as np
 import torch
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from .model import LeoBookRLModel
-from .feature_encoder import FeatureEncoder
+from .feature_encoder import FeatureEncoder, FEATURE_DIM
 from .adapter_registry import AdapterRegistry
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
@@ -33,6 +35,7 @@ class RLPredictor:
     Usage:
         predictor = RLPredictor()
         result = predictor.predict(vision_data, fs_league_id, home_team_id, away_team_id)
+        results = predictor.predict_batch([{"vision_data": ..., "fs_league_id": ...}, ...])
     """
 
     _instance: Optional["RLPredictor"] = None
@@ -42,6 +45,8 @@ class RLPredictor:
         self.registry = AdapterRegistry()
         self.device = torch.device("cpu")
         self._loaded = False
+        # Size/latency of the last predict_batch() call
+        self.batch_stats: Dict[str, Any] = {}
 
     @classmethod
     def get_instance(cls) -> "RLPredictor":
@@ -97,10 +102,6 @@ class RLPredictor:
                 "reason": ["RL model not trained yet — run: python Leo.py --train-rl"],
             }
 
-        h2h_data = vision_data.get("h2h_data", {})
-        home_team = h2h_data.get("home_team", "Unknown")
-        away_team = h2h_data.get("away_team", "Unknown")
-
         # Encode features
         features = FeatureEncoder.encode(vision_data)
         features = features.to(self.device)
@@ -114,12 +115,98 @@ class RLPredictor:
         with torch.no_grad():
             policy_logits, value, stake = self.model(features, l_idx, h_idx, a_idx)
             action_probs = torch.softmax(policy_logits, dim=-1).squeeze()
-            predicted_action = action_probs.argmax().item()
-            confidence_score = action_probs[predicted_action].item()
+
+        return self._to_prediction(vision_data, action_probs.tolist(), value.item(), stake.item())
+
+    def predict_batch(self, fixtures: List[Dict[str, Any]],
+                      max_batch: int = 256) -> List[Dict[str, Any]]:
+        """
+        Batched predict(): one vectorized encode for all fixtures, one routed
+        forward pass per chunk of up to max_batch mixed-league samples.
+
+        Args:
+            fixtures: Dicts with the predict() keyword arguments —
+                      vision_data, fs_league_id, home_team_id, away_team_id.
+            max_batch: Samples per forward pass (bounds gathered adapter weights).
+
+        Returns:
+            Prediction dicts in the same order as fixtures.
+        """
+        if not fixtures:
+            return []
+        if not self._ensure_loaded():
+            return [self.predict(**f) for f in fixtures]
+
+        start = time.perf_counter()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(fixtures)
+
+        try:
+            encoded = FeatureEncoder.encode_batch([f["vision_data"] for f in fixtures])
+            rows = list(range(len(fixtures)))
+        except Exception:
+            # Isolate the fixtures that cannot be encoded; the rest still run batched
+            rows, good = [], []
+            for i, f in enumerate(fixtures):
+                try:
+                    good.append(FeatureEncoder.encode_batch([f["vision_data"]]))
+                    rows.append(i)
+                except Exception as e:
+                    results[i] = {"type": "SKIP", "confidence": "Low", "reason": [f"RL encode failed: {e}"]}
+            encoded = np.concatenate(good) if good else np.zeros((0, FEATURE_DIM), dtype=np.float32)
+        features = torch.from_numpy(encoded)
+
+        indices: List[Tuple[int, int, int]] = []
+        for i in rows:
+            f = fixtures[i]
+            key = (
+                self.registry.get_league_idx(f.get("fs_league_id", "GLOBAL")),
+                self.registry.get_team_idx(f.get("home_team_id", "GLOBAL")),
+                self.registry.get_team_idx(f.get("away_team_id", "GLOBAL")),
+            )
+            # Cold-start adapters are created here, in the same order predict() would,
+            # so their parameters are never inference-mode tensors
+            self.model.ensure_league_adapter(key[0])
+            self.model.ensure_team_adapter(key[0], key[1])
+            self.model.ensure_team_adapter(key[0], key[2])
+            indices.append(key)
+
+        passes = 0
+        with torch.inference_mode():
+            for lo in range(0, len(rows), max_batch):
+                hi = lo + max_batch
+                x = features[lo:hi].to(self.device)
+                l_idx, h_idx, a_idx = torch.tensor(indices[lo:hi], dtype=torch.long).T
+                policy_logits, value, stake = self.model(x, l_idx, h_idx, a_idx)
+                probs = torch.softmax(policy_logits, dim=-1).tolist()
+                values = value.squeeze(-1).tolist()
+                stakes = stake.squeeze(-1).tolist()
+                for j, i in enumerate(rows[lo:hi]):
+                    results[i] = self._to_prediction(
+                        fixtures[i]["vision_data"], probs[j], values[j], stakes[j]
+                    )
+                passes += 1
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.batch_stats = {
+            "batch_size": len(fixtures),
+            "forward_passes": passes,
+            "latency_ms": round(elapsed_ms, 2),
+            "per_sample_ms": round(elapsed_ms / len(fixtures), 3),
+        }
+        return results
+
+    def _to_prediction(self, vision_data: Dict[str, Any], action_probs: List[float],
+                       ev: float, stake: float) -> Dict[str, Any]:
+        """Map one sample's model outputs to the RuleEngine.analyze() format."""
+        h2h_data = vision_data.get("h2h_data", {})
+        home_team = h2h_data.get("home_team", "Unknown")
+        away_team = h2h_data.get("away_team", "Unknown")
+
+        predicted_action = max(range(len(action_probs)), key=action_probs.__getitem__)
+        confidence_score = action_probs[predicted_action]
 
         action_name = LeoBookRLModel.ACTION_NAMES[predicted_action]
-        ev = value.item()
-        kelly = stake.item() * 0.05  # Scale to 0-5%
+        kelly = stake * 0.05  # Scale to 0-5%
 
         # --- Map to existing pipeline format ---
         prediction_text = self._action_to_prediction_text(
@@ -162,9 +249,9 @@ class RLPredictor:
         ]
 
         # 1X2 probabilities for downstream
-        p_home = action_probs[0].item()
-        p_draw = action_probs[1].item()
-        p_away = action_probs[2].item()
+        p_home = action_probs[0]
+        p_draw = action_probs[1]
+        p_away = action_probs[2]
 
         return {
             "market_prediction": prediction_text,
@@ -176,8 +263,8 @@ class RLPredictor:
             "reason": reasoning,
             "xg_home": round(home_xg, 2),
             "xg_away": round(away_xg, 2),
-            "btts": "YES" if action_probs[5].item() > action_probs[6].item() else "NO",
-            "over_2.5": "YES" if action_probs[3].item() > action_probs[4].item() else "NO",
+            "btts": "YES" if action_probs[5] > action_probs[6] else "NO",
+            "over_2.5": "YES" if action_probs[3] > action_probs[4] else "NO",
             "best_score": "1-0" if p_home > max(p_draw, p_away) else "0-1" if p_away > p_draw else "1-1",
             "top_scores": [],
             "home_tags": [],
@@ -192,7 +279,7 @@ class RLPredictor:
             "total_xg": round(home_xg + away_xg, 2),
             # RL-specific fields
             "rl_action_probs": {
-                name: round(action_probs[i].item(), 4)
+                name: round(action_probs[i], 4)
                 for i, name in enumerate(LeoBookRLModel.ACTION_NAMES)
             },
             "rl_expected_value": round(ev, 4),
@@ -13,7 +13,7 @@ Same team produces different behaviour in different competitions.
 
 import torch
 import torch.nn as nn
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 
 class LeagueAdapter(nn.Module):
@@ -41,7 +41,7 @@ class ConditionedTeamAdapter(nn.Module):
     Premier League vs Champions League.
 
     Architecture: small MLP conditioner + LoRA delta (rank=8).
-    Input: (team_features [B, dim], league_embedding [1, league_dim])
+    Input: (team_features [B, dim], league_embedding [1 or B, league_dim])
     Output: adapted features [B, dim]
     """
 
@@ -175,6 +175,16 @@ class LeoBookRLModel(nn.Module):
                 self.trunk_out_dim, self.league_emb_dim, self._team_lora_rank
             ).to(next(self.parameters()).device)
 
+    def ensure_adapters_from_state(self, state_dict: Dict[str, torch.Tensor]) -> None:
+        """Create every adapter named in a saved state_dict so loading can fill it."""
+        for key in state_dict:
+            parts = key.split(".")
+            if parts[0] == "league_adapters":
+                self.ensure_league_adapter(int(parts[1]))
+            elif parts[0] == "team_adapters":
+                league_idx, team_idx = parts[1].split("_")
+                self.ensure_team_adapter(int(league_idx), int(team_idx))
+
     # -------------------------------------------------------------------
     # Forward pass
     # -------------------------------------------------------------------
@@ -182,24 +192,27 @@ class LeoBookRLModel(nn.Module):
     def forward(
         self,
         x: torch.Tensor,
-        league_idx: int = 0,
-        home_team_idx: int = 0,
-        away_team_idx: int = 0,
+        league_idx: Union[int, torch.Tensor] = 0,
+        home_team_idx: Union[int, torch.Tensor] = 0,
+        away_team_idx: Union[int, torch.Tensor] = 0,
     ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         """
         Forward pass with league and team conditioning.
 
         Args:
             x: Feature tensor [B, feature_dim]
-            league_idx: Integer index for the league
-            home_team_idx: Integer index for the home team
-            away_team_idx: Integer index for the away team
+            league_idx: Integer index for the league, or a LongTensor [B] (one per sample)
+            home_team_idx: Integer index for the home team, or a LongTensor [B]
+            away_team_idx: Integer index for the away team, or a LongTensor [B]
 
         Returns:
             policy_logits: [B, NUM_ACTIONS]
             value: [B, 1]
             stake_fraction: [B, 1] in [0, 1] (multiply by 0.05 for Kelly %)
         """
+        if isinstance(league_idx, torch.Tensor):
+            return self._forward_routed(x, league_idx, home_team_idx, away_team_idx)
+
         # 1. Shared trunk
         features = self.trunk(x)
 
@@ -233,12 +246,69 @@ class LeoBookRLModel(nn.Module):
 
         return policy_logits, value, stake
 
+    def _forward_routed(
+        self,
+        x: torch.Tensor,
+        league_idx: torch.Tensor,
+        home_team_idx: torch.Tensor,
+        away_team_idx: torch.Tensor,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Heterogeneous batch: every sample is routed to its own league/team adapters.
+
+        Same steps as the scalar path. Rows are grouped by adapter key and each
+        adapter runs once over its rows, so a mixed-league batch is a single call.
+        """
+        leagues = league_idx.tolist()
+        homes = home_team_idx.tolist()
+        aways = away_team_idx.tolist()
+
+        # Cold-start adapters, created in per-sample order (league, home, away)
+        for l_idx, h_idx, a_idx in zip(leagues, homes, aways):
+            self.ensure_league_adapter(l_idx)
+            self.ensure_team_adapter(l_idx, h_idx)
+            self.ensure_team_adapter(l_idx, a_idx)
+
+        # 1. Shared trunk
+        features = self.trunk(x)
+
+        # 2. League adaptation
+        features = _dispatch(
+            self.league_adapters, [str(l) for l in leagues],
+            lambda adapter, rows: adapter(features[rows]),
+            x.device,
+        )
+
+        # 3. League embedding (for conditioning team adapters)
+        league_emb = self.league_embedding(league_idx.to(x.device))
+
+        # 4-5. Home and away team adaptation (one dispatch over both sides)
+        batch = x.size(0)
+        both = features.repeat(2, 1)
+        both_emb = league_emb.repeat(2, 1)
+        adapted = _dispatch(
+            self.team_adapters,
+            [f"{l}_{t}" for l, t in zip(leagues, homes)] + [f"{l}_{t}" for l, t in zip(leagues, aways)],
+            lambda adapter, rows: adapter(both[rows], both_emb[rows]),
+            x.device,
+        )
+        features_home, features_away = adapted[:batch], adapted[batch:]
+
+        # 6. Combine home + away team-adapted features
+        combined = (features_home + features_away) / 2.0
+
+        # 7. Output heads
+        policy_logits = self.policy_head(combined)
+        value = self.value_head(combined)
+        stake = self.stake_head(combined)
+
+        return policy_logits, value, stake
+
     def get_action_probs(
         self,
         x: torch.Tensor,
-        league_idx: int = 0,
-        home_team_idx: int = 0,
-        away_team_idx: int = 0,
+        league_idx: Union[int, torch.Tensor] = 0,
+        home_team_idx: Union[int, torch.Tensor] = 0,
+        away_team_idx: Union[int, torch.Tensor] = 0,
     ) -> torch.Tensor:
         """Get softmax action probabilities."""
         logits, _, _ = self.forward(x, league_idx, home_team_idx, away_team_idx)
@@ -268,3 +338,21 @@ class LeoBookRLModel(nn.Module):
             "league_embeddings": emb_params,
             "total": trunk_params + head_params + league_params + team_params + emb_params,
         }
+
+
+def _dispatch(adapters: nn.ModuleDict, keys: List[str], apply,
+              device: torch.device) -> torch.Tensor:
+    """Run apply(adapter, rows) once per distinct key and scatter results back in row order."""
+    groups: Dict[str, List[int]] = {}
+    for row, key in enumerate(keys):
+        groups.setdefault(key, []).append(row)
+
+    outputs, order = [], []
+    for key, rows in groups.items():
+        index = torch.tensor(rows, dtype=torch.long, device=device)
+        outputs.append(apply(adapters[key], index))
+        order.append(index)
+    order = torch.cat(order)
+    stacked = torch.cat(outputs)
+    # index_copy keeps the result differentiable for batched training
+    return torch.zeros_like(stacked).index_copy(0, order, stacked)
@@ -0,0 +1,67 @@
+# rollout_buffer.py: Experience buffer for minibatch PPO updates.
+# Part of LeoBook Core — Intelligence (RL Engine)
+#
+# Classes: RolloutBuffer
+# Called by: trainer.py
+
+"""
+Rollout Buffer
+Holds encoded states, adapter indices, sampled actions, rewards and the
+behaviour policy's log-probs/values for a window of fixtures, so the trainer
+can run several epochs of clipped PPO over shuffled minibatches.
+Serialisable via state_dict() for checkpoint-resume.
+"""
+
+import torch
+from typing import Dict, Iterator, List
+
+
+class RolloutBuffer:
+    """Append-only store of single-step transitions (one match = one episode)."""
+
+    FIELDS = ("states", "league_idx", "home_idx", "away_idx",
+              "actions", "rewards", "log_probs", "values")
+
+    def __init__(self):
+        self._chunks: Dict[str, List[torch.Tensor]] = {f: [] for f in self.FIELDS}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_batch(self, **batch: torch.Tensor) -> None:
+        """Append N transitions; every field is a tensor with leading dim N."""
+        n = batch["actions"].size(0)
+        for f in self.FIELDS:
+            self._chunks[f].append(batch[f].detach().cpu())
+        self._size += n
+
+    def tensors(self) -> Dict[str, torch.Tensor]:
+        """All transitions as one tensor per field (chunks are merged in place)."""
+        for f in self.FIELDS:
+            if len(self._chunks[f]) > 1:
+                self._chunks[f] = [torch.cat(self._chunks[f])]
+        return {f: (c[0] if c else torch.empty(0)) for f, c in self._chunks.items()}
+
+    def minibatches(self, batch_size: int,
+                    generator: torch.Generator = None) -> Iterator[torch.Tensor]:
+        """Shuffled index tensors covering the buffer once."""
+        order = torch.randperm(self._size, generator=generator)
+        for start in range(0, self._size, batch_size):
+            yield order[start:start + batch_size]
+
+    def clear(self) -> None:
+        self._chunks = {f: [] for f in self.FIELDS}
+        self._size = 0
+
+    # -------------------------------------------------------------------
+    # Checkpointing
+    # -------------------------------------------------------------------
+
+    def state_dict(self) -> Dict[str, torch.Tensor]:
+        return self.tensors() if self._size else {}
+
+    def load_state_dict(self, state: Dict[str, torch.Tensor]) -> None:
+        self.clear()
+        if state:
+            self.add_batch(**state)
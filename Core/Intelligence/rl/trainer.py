@@ -2,7 +2,7 @@
 # Part of LeoBook Core — Intelligence (RL Engine)
 #
 # Classes: RLTrainer
-# Called by: Leo.py (--train-rl)
+# Called by: Leo.py (--train-rl [--rl-resume] [--rl-per-match])
 
 """
 RL Trainer Module
@@ -14,9 +14,13 @@ Training constraints:
 - Max 2-season lookback window
 - Last-10 matches prioritized via recency weighting
 - Prediction accuracy is the primary reward signal
+
+Offline training collects a rollout of matches with the current policy, then
+runs several epochs of clipped PPO over shuffled minibatches of it.
 """
 
 import os
+import time
 import torch
 import torch.nn as nn
 import torch.optim as optim
@@ -28,6 +32,7 @@ from collections import defaultdict
 from .model import LeoBookRLModel
 from .feature_encoder import FeatureEncoder
 from .adapter_registry import AdapterRegistry
+from .rollout_buffer import RolloutBuffer
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 MODELS_DIR = PROJECT_ROOT / "Data" / "Store" / "models"
@@ -35,6 +40,7 @@ MODELS_DIR = PROJECT_ROOT / "Data" / "Store" / "models"
 # Paths
 BASE_MODEL_PATH = MODELS_DIR / "leobook_base.pth"
 TRAINING_CONFIG_PATH = MODELS_DIR / "training_config.json"
+CHECKPOINT_PATH = MODELS_DIR / "rl_checkpoint.pth"
 
 
 class RLTrainer:
@@ -44,11 +50,10 @@ class RLTrainer:
     Training proceeds chronologically day-by-day:
     For each day D:
         1. Build features using ONLY data before D (max 2 seasons back)
-        2. For each fixture on day D:
-            a. Encode features
-            b. Model predicts action (market + stake)
-            c. After outcome: compute composite reward
-            d. PPO gradient update
+        2. Encode all fixtures on day D in one batch
+        3. Model samples actions (market + stake); composite reward per outcome
+        4. Transitions go to the rollout buffer; once it holds rollout_size
+           matches, run ppo_epochs of minibatch PPO over it
     """
 
     def __init__(
@@ -59,12 +64,19 @@ class RLTrainer:
         gamma: float = 0.99,
         clip_epsilon: float = 0.2,
         max_seasons_back: int = 2,
+        rollout_size: int = 512,
+        ppo_epochs: int = 4,
+        minibatch_size: int = 64,
         device: str = "cpu",
     ):
         self.device = torch.device(device)
         self.max_seasons_back = max_seasons_back
         self.gamma = gamma
         self.clip_epsilon = clip_epsilon
+        self.rollout_size = rollout_size
+        self.ppo_epochs = ppo_epochs
+        self.minibatch_size = minibatch_size
+        self.buffer = RolloutBuffer()
 
         # Model & registry
         self.model = LeoBookRLModel().to(self.device)
@@ -255,19 +267,118 @@ class RLTrainer:
             "step": self._step_count,
         }
 
+    # -------------------------------------------------------------------
+    # Rollout collection + minibatch PPO
+    # -------------------------------------------------------------------
+
+    def collect(
+        self,
+        features: torch.Tensor,
+        indices: List[Tuple[int, int, int]],
+        outcomes: List[Dict[str, Any]],
+    ) -> Tuple[List[int], List[float]]:
+        """
+        Sample actions from the current policy for N matches (one routed forward
+        pass) and store the transitions in the rollout buffer.
+
+        Returns (actions, rewards) for logging.
+        """
+        self.model.eval()
+        l_idx, h_idx, a_idx = torch.tensor(indices, dtype=torch.long).T
+        with torch.no_grad():
+            policy_logits, value, _ = self.model(features.to(self.device), l_idx, h_idx, a_idx)
+            action_probs = torch.softmax(policy_logits, dim=-1)
+            dist = torch.distributions.Categorical(action_probs)
+            actions = dist.sample()
+            log_probs = dist.log_prob(actions)
+
+        probs_cpu = action_probs.cpu()
+        rewards = [
+            self.compute_reward(action, outcome, probs_cpu[i])
+            for i, (action, outcome) in enumerate(zip(actions.tolist(), outcomes))
+        ]
+        self.buffer.add_batch(
+            states=features, league_idx=l_idx, home_idx=h_idx, away_idx=a_idx,
+            actions=actions, rewards=torch.tensor(rewards, dtype=torch.float32),
+            log_probs=log_probs, values=value.squeeze(-1),
+        )
+        return actions.tolist(), rewards
+
+    def ppo_update(self) -> Dict[str, float]:
+        """
+        K epochs of clipped PPO over shuffled minibatches of the rollout buffer,
+        then clear it. Advantage = reward - behaviour value (single-step episodes),
+        normalised over the rollout.
+
+        Runs in eval() mode, like collect(): the behaviour log-probs come from
+        the dropout-free network, so the ratio must too, or it starts away
+        from 1 and clipping fires on dropout noise.
+        """
+        data = self.buffer.tensors()
+        advantages = data["rewards"] - data["values"]
+        if advantages.numel() > 1:
+            advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-8)
+
+        self.model.eval()   # gradients still flow; only dropout is off
+        totals = defaultdict(float)
+        updates = 0
+        for _ in range(self.ppo_epochs):
+            for mb in self.buffer.minibatches(self.minibatch_size):
+                policy_logits, value, _ = self.model(
+                    data["states"][mb].to(self.device),
+                    data["league_idx"][mb], data["home_idx"][mb], data["away_idx"][mb],
+                )
+                dist = torch.distributions.Categorical(logits=policy_logits)
+                log_prob = dist.log_prob(data["actions"][mb].to(self.device))
+                adv = advantages[mb].to(self.device)
+
+                # PPO clipped loss against the behaviour policy
+                ratio = torch.exp(log_prob - data["log_probs"][mb].to(self.device))
+                clipped = torch.clamp(ratio, 1.0 - self.clip_epsilon, 1.0 + self.clip_epsilon)
+                policy_loss = -torch.min(ratio * adv, clipped * adv).mean()
+
+                value_loss = torch.nn.functional.mse_loss(
+                    value.squeeze(-1), data["rewards"][mb].to(self.device)
+                )
+                entropy = dist.entropy().mean()
+                total_loss = policy_loss + 0.5 * value_loss - 0.01 * entropy
+
+                self.optimizer.zero_grad()
+                total_loss.backward()
+                torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=0.5)
+                self.optimizer.step()
+                self.scheduler.step()
+                self._step_count += 1
+
+                totals["total_loss"] += total_loss.item()
+                totals["policy_loss"] += policy_loss.item()
+                totals["value_loss"] += value_loss.item()
+                totals["entropy"] += entropy.item()
+                updates += 1
+
+        samples = len(self.buffer)
+        self.buffer.clear()
+        metrics = {k: v / max(updates, 1) for k, v in totals.items()}
+        metrics.update({"samples": samples, "updates": updates, "step": self._step_count})
+        return metrics
+
     # -------------------------------------------------------------------
     # Chronological training from fixtures
     # -------------------------------------------------------------------
 
-    def train_from_fixtures(self, limit_days: Optional[int] = None):
+    def train_from_fixtures(self, limit_days: Optional[int] = None,
+                            resume: bool = False, per_match: bool = False):
         """
         Train chronologically from historical fixtures.
         Iterates day-by-day, using only data available before each day.
 
         Args:
             limit_days: Optional limit on number of training days (for testing).
+            resume: Continue from the last checkpoint (model, optimizer, buffer, position).
+            per_match: Legacy path — one PPO step per match (for throughput comparison).
         """
         from Data.Access.db_helpers import _get_conn
+        from Data.Access.standings_history import StandingsHistory
         import os
 
         conn = _get_conn()
@@ -305,12 +416,34 @@ class RLTrainer:
         if limit_days:
             all_dates = all_dates[:limit_days]
 
-        print(f"  [TRAIN] Training on {len(all_dates)} match days")
+        progress = {"matches": 0, "reward": 0.0, "correct": 0}
+        if resume:
+            checkpoint = self.load_checkpoint()
+            if checkpoint:
+                progress = checkpoint["progress"]
+                all_dates = [d for d in all_dates if d > checkpoint["last_date"]]
+                print(f"  [TRAIN] Resumed after {checkpoint['last_date']} "
+                      f"({progress['matches']} matches, {len(self.buffer)} buffered)")
+
+        if not all_dates:
+            print("  [TRAIN] Nothing left to train on.")
+            return
+
+        # Point-in-time standings for every league/season, one pass over schedules
+        history = StandingsHistory.build(conn)
+        print(f"  [TRAIN] Standings history: {history.stats['snapshots']} snapshots "
+              f"across {history.stats['timelines']} league-seasons "
+              f"({history.stats['build_ms']:.0f} ms)")
+
+        mode = "per-match PPO" if per_match else (
+            f"minibatch PPO (rollout {self.rollout_size}, {self.ppo_epochs} epochs, "
+            f"minibatch {self.minibatch_size})"
+        )
+        print(f"  [TRAIN] Training on {len(all_dates)} match days — {mode}")
         print(f"  [TRAIN] Date range: {all_dates[0]} → {all_dates[-1]}")
 
-        total_matches = 0
-        total_reward = 0.0
-        correct_predictions = 0
+        run_matches = 0
+        run_start = time.perf_counter()
         log_interval = max(1, len(all_dates) // 20)  # Log ~20 times
 
         for day_idx, match_date in enumerate(all_dates):
@@ -324,8 +457,8 @@ class RLTrainer:
             """, (match_date,))
             day_fixtures = cursor.fetchall()
 
+            outcomes, indices, vision_datas, results = [], [], [], []
             for fix in day_fixtures:
-                fix_id = fix[0]
                 league_id = fix[1] or "GLOBAL"
                 home_team_id = fix[2] or "GLOBAL"
                 away_team_id = fix[4] or "GLOBAL"
@@ -340,67 +473,96 @@ class RLTrainer:
                 else:
                     result = "draw"
 
-                outcome = {
+                outcomes.append({
                     "result": result,
                     "home_score": home_score,
                     "away_score": away_score,
-                }
+                })
+                results.append(result)
 
                 # Get adapter indices (auto-registers cold-start entities)
-                l_idx = self.registry.get_league_idx(league_id)
-                h_idx = self.registry.get_team_idx(home_team_id)
-                a_idx = self.registry.get_team_idx(away_team_id)
+                indices.append((
+                    self.registry.get_league_idx(league_id),
+                    self.registry.get_team_idx(home_team_id),
+                    self.registry.get_team_idx(away_team_id),
+                ))
 
                 # Build minimal features from fixture data
                 # (In production, full vision_data is used; here we use what's available)
-                vision_data = self._build_training_vision_data(
+                vision_datas.append(self._build_training_vision_data(
                     conn, match_date, league_id,
-                    home_team_id, fix[3], away_team_id, fix[5]
-                )
-
-                features = FeatureEncoder.encode(vision_data)
-
-                # Train step
-                metrics = self.train_step(features, l_idx, h_idx, a_idx, outcome)
-
-                total_matches += 1
-                total_reward += metrics["reward"]
-
-                # Track prediction accuracy
-                action_name = LeoBookRLModel.ACTION_NAMES[metrics["action"]]
-                if action_name == result:
-                    correct_predictions += 1
+                    home_team_id, fix[3], away_team_id, fix[5],
+                    history.as_of(fix[1], fix[8], match_date),
+                ))
 
                 # Record match for fine-tune threshold tracking
                 self.registry.record_match(league_id, home_team_id, away_team_id)
 
-            # Periodic logging
+            if not vision_datas:
+                continue
+
+            if per_match:
+                actions, rewards = [], []
+                for vd, (l_idx, h_idx, a_idx), outcome in zip(vision_datas, indices, outcomes):
+                    metrics = self.train_step(FeatureEncoder.encode(vd), l_idx, h_idx, a_idx, outcome)
+                    actions.append(metrics["action"])
+                    rewards.append(metrics["reward"])
+            else:
+                features = torch.from_numpy(FeatureEncoder.encode_batch(vision_datas))
+                actions, rewards = self.collect(features, indices, outcomes)
+                if len(self.buffer) >= self.rollout_size:
+                    self.ppo_update()
+
+            run_matches += len(actions)
+            progress["matches"] += len(actions)
+            progress["reward"] += sum(rewards)
+            # Track prediction accuracy
+            progress["correct"] += sum(
+                1 for action, result in zip(actions, results)
+                if LeoBookRLModel.ACTION_NAMES[action] == result
+            )
+
+            # Periodic logging + checkpoint (model, optimizer, buffer, position)
             if day_idx > 0 and day_idx % log_interval == 0:
-                acc = correct_predictions / max(total_matches, 1) * 100
-                avg_r = total_reward / max(total_matches, 1)
+                acc = progress["correct"] / max(progress["matches"], 1) * 100
+                avg_r = progress["reward"] / max(progress["matches"], 1)
+                rate = run_matches / max(time.perf_counter() - run_start, 1e-9)
                 print(f"  [TRAIN] Day {day_idx}/{len(all_dates)} | "
-                      f"Matches: {total_matches} | "
+                      f"Matches: {progress['matches']} | "
                       f"Accuracy: {acc:.1f}% | "
-                      f"Avg Reward: {avg_r:.3f}")
+                      f"Avg Reward: {avg_r:.3f} | "
+                      f"{rate:.1f} samples/s")
+                self.save_checkpoint(match_date, progress)
+
+        # Flush the partial rollout
+        if len(self.buffer):
+            self.ppo_update()
 
         # Final stats
-        acc = correct_predictions / max(total_matches, 1) * 100
-        avg_r = total_reward / max(total_matches, 1)
-        print(f"\n  [TRAIN] COMPLETE — {total_matches} matches, "
+        elapsed = time.perf_counter() - run_start
+        acc = progress["correct"] / max(progress["matches"], 1) * 100
+        avg_r = progress["reward"] / max(progress["matches"], 1)
+        print(f"\n  [TRAIN] COMPLETE — {progress['matches']} matches, "
               f"{acc:.1f}% accuracy, {avg_r:.3f} avg reward")
+        print(f"  [TRAIN] Throughput: {run_matches / max(elapsed, 1e-9):.1f} samples/s "
+              f"({run_matches} samples in {elapsed:.1f}s, {mode})")
 
         # Save
         self.save()
+        if CHECKPOINT_PATH.exists():
+            CHECKPOINT_PATH.unlink()
         print(f"  [TRAIN] Model saved to {MODELS_DIR}")
 
     def _build_training_vision_data(
         self, conn, match_date: str, league_id: str,
         home_team_id: str, home_team_name: str,
         away_team_id: str, away_team_name: str,
+        standings: List[Dict],
     ) -> Dict[str, Any]:
         """
         Build a vision_data dict from historical fixtures for training.
-        Uses ONLY data before match_date (no future leakage).
+        Uses ONLY data before match_date (no future leakage); standings come
+        from StandingsHistory.as_of(match_date).
         """
         # Get last 10 home team matches before this date
         home_form = self._get_team_form(conn, home_team_id, home_team_name, match_date)
@@ -416,7 +578,7 @@ class RLTrainer:
                 "head_to_head": h2h,
                 "region_league": league_id,
             },
-            "standings": [],  # Historical standings not easily reconstructable
+            "standings": standings,
         }
 
     def _get_team_form(self, conn, team_id: str, team_name: str,
@@ -534,6 +696,39 @@ class RLTrainer:
         torch.save(self.model.state_dict(), BASE_MODEL_PATH)
         self.registry.save()
 
+    def save_checkpoint(self, last_date: str, progress: Dict[str, Any]):
+        """Persist everything needed to resume training after last_date."""
+        os.makedirs(MODELS_DIR, exist_ok=True)
+        torch.save({
+            "model": self.model.state_dict(),
+            "optimizer": self.optimizer.state_dict(),
+            "scheduler": self.scheduler.state_dict(),
+            "step": self._step_count,
+            "buffer": self.buffer.state_dict(),
+            "last_date": last_date,
+            "progress": progress,
+        }, CHECKPOINT_PATH)
+        # Buffered adapter indices refer to this registry
+        self.registry.save()
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Restore model, optimizer, scheduler and buffer. Returns the checkpoint or None."""
+        if not CHECKPOINT_PATH.exists():
+            return None
+        try:
+            checkpoint = torch.load(CHECKPOINT_PATH, map_location=self.device, weights_only=True)
+            self.model.ensure_adapters_from_state(checkpoint["model"])
+            self.model.load_state_dict(checkpoint["model"])
+            self.optimizer.load_state_dict(checkpoint["optimizer"])
+            self.scheduler.load_state_dict(checkpoint["scheduler"])
+            self._step_count = checkpoint["step"]
+            self.buffer.load_state_dict(checkpoint["buffer"])
+            self.registry = AdapterRegistry()  # Reloads from disk
+            return checkpoint
+        except Exception as e:
+            print(f"  [RL] Could not load checkpoint: {e}")
+            return None
+
     def load(self):
         """Load model and registry if they exist."""
         if BASE_MODEL_PATH.exists():
@@ -13,7 +13,7 @@ from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import numpy as np
 
-from .learning_engine import LearningEngine
+from .learning_engine import LearningEngine, WeightsStore
 from .tag_generator import TagGenerator
 from .goal_predictor import GoalPredictor
 from .betting_markets import BettingMarkets
@@ -21,10 +21,12 @@ from .rule_config import RuleConfig
 
 class RuleEngine:
     @staticmethod
-    def analyze(vision_data: Dict[str, Any], config: RuleConfig = None) -> Dict[str, Any]:
+    def analyze(vision_data: Dict[str, Any], config: RuleConfig = None,
+                weights_store: WeightsStore = None) -> Dict[str, Any]:
         """
         MAIN PREDICTION ENGINE — Returns full market predictions
-        Accepts optional RuleConfig for custom logic.
+        Accepts optional RuleConfig for custom logic, and the run's WeightsStore
+        (LearningEngine.weights_store()) so learned weights are a dict lookup.
         """
         if config is None:
             config = RuleConfig()
@@ -81,7 +83,7 @@ class RuleEngine:
         ml_prediction = {"confidence": 0.5, "prediction": "UNKNOWN"}
 
         # --- LOAD REGION-SPECIFIC LEARNED WEIGHTS ---
-        weights = LearningEngine.load_weights(region_league)
+        weights = (weights_store or LearningEngine.weights_store()).get(region_league)
 
         # Weighted rule voting using config
         home_score = away_score = draw_score = over25_score = 0
@@ -0,0 +1,336 @@
+# team_name_index.py: Local fuzzy team-name matching (trigram index + fixture scoring).
+# Part of LeoBook Core — Intelligence (AI Engine)
+#
+# Classes: TrigramIndex, TeamNameIndex, FixtureMatcher
+# Functions: normalize_team_name(), name_similarity(), get_team_name_index()
+# Called by: unified_matcher.py | match_resolver.py (GrokMatcher) | fb_url_resolver.py
+
+"""
+Team Name Index
+Resolves Flashscore <-> Football.com fixture pairings locally, so only the
+ambiguous tail needs an LLM call.
+
+- TrigramIndex: character-trigram inverted index over normalized names;
+  search() returns the top-k keys by Dice similarity, touching only names
+  that share a trigram with the query.
+- TeamNameIndex: a TrigramIndex over `teams` (name, other_names,
+  abbreviations, search_terms — the search dictionary), used to expand a
+  team name to every alias known for that team.
+- FixtureMatcher: indexes one day's site matches by home/away name and
+  scores each prediction against its top-k candidates. Kick-off times more
+  than MAX_KICKOFF_DIFF_MIN apart, different dates, or differing squad
+  qualifiers (U21, women, II ...) rule a pairing out. A pairing is accepted
+  locally when it scores >= ACCEPT_SCORE and leads the runner-up by MARGIN.
+"""
+
+import re
+import json
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+ACCEPT_SCORE = 0.82           # pair score (mean of home/away similarity) to resolve locally
+MARGIN = 0.08                 # lead over the runner-up required to resolve locally
+MIN_NAME_SCORE = 0.45         # per-side similarity below which a candidate is dropped
+TOP_K = 5
+MAX_KICKOFF_DIFF_MIN = 90     # site times are shown in WAT, predictions may be UTC
+
+# Legal-form tokens that carry no identity ("FC Porto" == "Porto")
+_NOISE = {"fc", "sc", "cf", "afc", "ac", "fk", "sk", "nk", "cd", "sd", "ud", "sv",
+          "club", "clube", "calcio", "if", "bk", "the"}
+_EXPAND = {"utd": "united", "st": "saint", "intl": "international"}
+# Squad qualifiers: "Arsenal" and "Arsenal U21" are different teams
+_QUALIFIERS = {"u17", "u18", "u19", "u20", "u21", "u22", "u23", "ii", "iii", "b",
+               "w", "women", "wom", "reserves", "res", "youth"}
+_QUALIFIER_RE = re.compile(r"^u\d{2}$")
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+def normalize_team_name(name: str) -> str:
+    """Lowercase ASCII, punctuation stripped, legal-form tokens dropped."""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    tokens = re.sub(r"[^a-z0-9]+", " ", text).split()
+    tokens = [_EXPAND.get(t, t) for t in tokens]
+    kept = [t for t in tokens if t not in _NOISE]
+    return " ".join(kept or tokens)
+
+
+def _qualifiers(norm: str) -> frozenset:
+    return frozenset(t for t in norm.split() if t in _QUALIFIERS or _QUALIFIER_RE.match(t))
+
+
+def _trigrams(norm: str) -> frozenset:
+    padded = f"  {norm} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _score(a: str, b: str, grams_a: frozenset, grams_b: frozenset, shared: int = None) -> float:
+    """Similarity of two normalized names in [0, 1]."""
+    if a == b:
+        return 1.0
+    if _qualifiers(a) != _qualifiers(b):
+        return 0.0
+    if shared is None:
+        shared = len(grams_a & grams_b)
+    dice = 2.0 * shared / (len(grams_a) + len(grams_b))
+    # "Karagumruk" vs "Fatih Karagumruk": one name's tokens wholly inside the other's
+    short, long_ = (a, b) if len(a) <= len(b) else (b, a)
+    if len(short) >= 5 and set(short.split()) <= set(long_.split()):
+        return max(dice, 0.85)
+    return dice
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Similarity of two raw team names in [0, 1]."""
+    na, nb = normalize_team_name(a), normalize_team_name(b)
+    if not na or not nb:
+        return 0.0
+    return _score(na, nb, _trigrams(na), _trigrams(nb))
+
+
+class TrigramIndex:
+    """Inverted index trigram -> names; each name belongs to one key."""
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._names: List[str] = []
+        self._grams: List[frozenset] = []
+        self._keys: List[Hashable] = []
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, key: Hashable, names: Iterable[str]) -> None:
+        for name in {normalize_team_name(n) for n in names if n}:
+            if not name or any(self._keys[i] == key for i in self._exact.get(name, ())):
+                continue
+            idx = len(self._names)
+            grams = _trigrams(name)
+            self._names.append(name)
+            self._grams.append(grams)
+            self._keys.append(key)
+            self._exact[name].append(idx)
+            for g in grams:
+                self._postings[g].append(idx)
+
+    def exact(self, name: str) -> List[Hashable]:
+        """Keys with a name equal to `name` after normalization."""
+        return list(dict.fromkeys(self._keys[i] for i in self._exact.get(normalize_team_name(name), ())))
+
+    def search(self, name: str, k: int = TOP_K, min_score: float = MIN_NAME_SCORE) -> List[Tuple[Hashable, float]]:
+        """Top-k (key, score), best name per key, score descending."""
+        return self.search_many([name], k, min_score)
+
+    def search_many(self, names: Iterable[str], k: int = TOP_K,
+                    min_score: float = MIN_NAME_SCORE) -> List[Tuple[Hashable, float]]:
+        """Like search(), scoring each key by its best match against any of `names`."""
+        best: Dict[Hashable, float] = {}
+        for raw in names:
+            query = normalize_team_name(raw)
+            if not query:
+                continue
+            q_grams = _trigrams(query)
+            shared = Counter()
+            for g in q_grams:
+                shared.update(self._postings.get(g, ()))
+            for idx, n in shared.items():
+                s = _score(query, self._names[idx], q_grams, self._grams[idx], n)
+                if s >= min_score and s > best.get(self._keys[idx], 0.0):
+                    best[self._keys[idx]] = s
+        return sorted(best.items(), key=lambda kv: -kv[1])[:k]
+
+
+class TeamNameIndex(TrigramIndex):
+    """Trigram index over the `teams` table, keyed by team_id, for alias expansion."""
+
+    def __init__(self):
+        super().__init__()
+        self._aliases: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(self, key: Hashable, names: Iterable[str]) -> None:
+        names = [n for n in names if n]
+        self._aliases[key].update(names)
+        super().add(key, names)
+
+    @classmethod
+    def from_db(cls, conn) -> "TeamNameIndex":
+        index = cls()
+        rows = conn.execute(
+            "SELECT team_id, name, other_names, abbreviations, search_terms FROM teams"
+        ).fetchall()
+        for team_id, name, *alias_cols in rows:
+            if not team_id:
+                continue
+            names = [name]
+            for col in alias_cols:
+                names += _parse_alias_list(col)
+            index.add(team_id, names)
+        return index
+
+    def aliases(self, name: str, team_id: str = None) -> Set[str]:
+        """`name` plus every alias of its team (by team_id, exact name, or a near-certain match)."""
+        names = {name} if name else set()
+        if team_id and team_id in self._aliases:
+            return names | self._aliases[team_id]
+        keys = self.exact(name)
+        if not keys:
+            top = self.search(name, k=1, min_score=0.9)
+            keys = [top[0][0]] if top else []
+        if len(keys) == 1:
+            names |= self._aliases[keys[0]]
+        return names
+
+
+def _parse_alias_list(value) -> List[str]:
+    """Alias columns hold JSON arrays (search dict) or ';'/','-separated text."""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value if v]
+    text = str(value).strip()
+    if text.startswith("["):
+        try:
+            return [str(v) for v in json.loads(text) if v]
+        except ValueError:
+            pass
+    return [p.strip() for p in re.split(r"[;,]", text) if p.strip()]
+
+
+_team_index: Optional[TeamNameIndex] = None
+_team_index_lock = threading.Lock()
+
+
+def get_team_name_index(refresh: bool = False) -> TeamNameIndex:
+    """Process-wide TeamNameIndex, built from leobook.db on first use."""
+    global _team_index
+    if _team_index is None or refresh:
+        with _team_index_lock:
+            if _team_index is None or refresh:
+                from Data.Access.db_helpers import _get_conn
+                try:
+                    _team_index = TeamNameIndex.from_db(_get_conn())
+                except Exception as e:
+                    print(f"    [NameIndex] teams unavailable ({e}); matching on raw names only.")
+                    _team_index = TeamNameIndex()
+    return _team_index
+
+
+# ── Fixture matching ────────────────────────────────────────
+
+def _field(row: dict, *names):
+    for n in names:
+        v = row.get(n)
+        if v not in (None, "", "None"):
+            return str(v)
+    return ""
+
+
+def _home(row: dict) -> str:
+    return _field(row, "home_team", "home", "home_team_name")
+
+
+def _away(row: dict) -> str:
+    return _field(row, "away_team", "away", "away_team_name")
+
+
+def _kickoff_minute(row: dict) -> Optional[int]:
+    m = _TIME_RE.search(_field(row, "match_time", "time"))
+    return int(m.group(1)) * 60 + int(m.group(2)) if m else None
+
+
+def _date_key(row: dict) -> Optional[str]:
+    """YYYY-MM-DD from either YYYY-MM-DD or DD.MM.YYYY."""
+    d = _field(row, "date")
+    m = re.match(r"^(\d{4})-(\d{2})-(\d{2})", d)
+    if m:
+        return d[:10]
+    m = re.match(r"^(\d{2})\.(\d{2})\.(\d{4})", d)
+    return f"{m.group(3)}-{m.group(2)}-{m.group(1)}" if m else None
+
+
+class FixtureMatcher:
+    """Scores predictions against one set of site matches without an LLM."""
+
+    def __init__(self, site_matches: List[Dict], team_index: Optional[TeamNameIndex] = None,
+                 max_kickoff_diff_min: int = MAX_KICKOFF_DIFF_MIN):
+        self.site_matches = [m for m in site_matches if _home(m) and _away(m)]
+        self.team_index = team_index
+        self.max_kickoff_diff_min = max_kickoff_diff_min
+        self._home_index = TrigramIndex()
+        self._away_index = TrigramIndex()
+        for i, m in enumerate(self.site_matches):
+            self._home_index.add(i, [_home(m)])
+            self._away_index.add(i, [_away(m)])
+
+    def _names(self, row: dict, side: str) -> Set[str]:
+        name = _home(row) if side == "home" else _away(row)
+        if self.team_index is None:
+            return {name}
+        return self.team_index.aliases(name, row.get(f"{side}_team_id"))
+
+    def _compatible(self, pred: dict, site: dict) -> bool:
+        pd, sd = _date_key(pred), _date_key(site)
+        if pd and sd and pd != sd:
+            return False
+        pt, st = _kickoff_minute(pred), _kickoff_minute(site)
+        if pt is not None and st is not None:
+            diff = abs(pt - st)
+            if min(diff, 1440 - diff) > self.max_kickoff_diff_min:
+                return False
+        return True
+
+    def candidates(self, pred: dict, k: int = TOP_K) -> List[Tuple[float, Dict]]:
+        """Top-k (score, site_match) for one prediction, score descending."""
+        wide = max(4 * k, 20)
+        home_hits = dict(self._home_index.search_many(self._names(pred, "home"), wide))
+        if not home_hits:
+            return []
+        away_hits = dict(self._away_index.search_many(self._names(pred, "away"), wide))
+        scored = []
+        for i, hs in home_hits.items():
+            aw = away_hits.get(i)
+            if aw is None or not self._compatible(pred, self.site_matches[i]):
+                continue
+            scored.append(((hs + aw) / 2, i))
+        scored.sort(key=lambda t: (-t[0], t[1]))
+        return [(round(s, 4), self.site_matches[i]) for s, i in scored[:k]]
+
+    def resolve(self, pred: dict, k: int = TOP_K) -> Tuple[Optional[Dict], float, List[Tuple[float, Dict]]]:
+        """(match, score, candidates); match is None unless the top candidate is unambiguous."""
+        cands = self.candidates(pred, k)
+        if not cands:
+            return None, 0.0, cands
+        top = cands[0][0]
+        runner_up = cands[1][0] if len(cands) > 1 else 0.0
+        if top >= ACCEPT_SCORE and top - runner_up >= MARGIN:
+            return cands[0][1], top, cands
+        return None, top, cands
+
+    def resolve_all(self, predictions: List[Dict], k: int = TOP_K
+                    ) -> Tuple[Dict[str, Dict], List[Tuple[Dict, List[Tuple[float, Dict]]]]]:
+        """Split predictions into ({fixture_id: site_match} resolved locally, [(pred, candidates)] residual).
+
+        Each site match is claimed at most once; a prediction whose best match
+        was already claimed by a stronger pairing joins the residual."""
+        resolved: Dict[str, Dict] = {}
+        residual = []
+        claimed: Dict[int, float] = {}
+        pending = []
+        for pred in predictions:
+            match, score, cands = self.resolve(pred, k)
+            if match is not None:
+                pending.append((score, pred, match, cands))
+            else:
+                residual.append((pred, cands))
+        for score, pred, match, cands in sorted(pending, key=lambda t: -t[0]):
+            if id(match) in claimed:
+                residual.append((pred, [c for c in cands if c[1] is not match]))
+                continue
+            claimed[id(match)] = score
+            resolved[str(pred.get("fixture_id"))] = match
+        return resolved, residual
@@ -14,6 +14,8 @@ import asyncio
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 from .api_manager import unified_api_call
+from .llm_scheduler import Priority
+from .team_name_index import FixtureMatcher, get_team_name_index
 from .utils import clean_json_response
 from Core.Intelligence.aigo_suite import AIGOSuite
 
@@ -25,29 +27,63 @@ class UnifiedBatchMatcher:
     async def match_batch(self, date: str, predictions: List[Dict], site_matches: List[Dict]) -> Dict[str, str]:
         all_results = {}
         predictions = sorted(predictions, key=lambda x: x.get('fixture_id', ''))
-        total_chunks = (len(predictions) + self.chunk_size - 1) // self.chunk_size
-        
-        print(f"  [AI Matcher] Processing {len(predictions)} predictions in {total_chunks} chunks (size {self.chunk_size})...")
 
         if not site_matches or all(m.get('home') == 'None' or m.get('away') == 'None' for m in site_matches):
             print("  [AI Matcher] No valid site matches for date – skipping batch")
             return {}
 
-        for i in range(0, len(predictions), self.chunk_size):
-            chunk_preds = predictions[i:i + self.chunk_size]
-            chunk_idx = (i // self.chunk_size) + 1
-            print(f"  [AI Matcher] Chunk {chunk_idx}/{total_chunks} ({len(chunk_preds)} items)...")
-            
-            chunk_result = await self._process_single_chunk(date, chunk_preds, site_matches)
+        # Local pass: trigram index over site team names + team aliases.
+        # Unambiguous pairings never reach the LLM.
+        index = FixtureMatcher(site_matches, get_team_name_index())
+        resolved, residual = index.resolve_all(predictions)
+        all_results.update({fid: m.get('url') for fid, m in resolved.items() if m.get('url')})
+        print(f"  [AI Matcher] Local index resolved {len(all_results)}/{len(predictions)}; "
+              f"{len(residual)} ambiguous.")
+
+        # Only the ambiguous tail goes to the LLM, each with its top-k candidates.
+        # Predictions with no trigram candidate (renamed or transliterated teams)
+        # get the full site list for the date; they go last so they share chunks.
+        no_candidate = [p for p, cands in residual if not cands]
+        residual = [(p, [m for _, m in cands]) for p, cands in residual if cands]
+        if no_candidate:
+            print(f"  [AI Matcher] {len(no_candidate)} predictions had no local candidate; "
+                  f"sending them with all {len(site_matches)} site matches.")
+            residual += [(p, site_matches) for p in no_candidate]
+        if not residual:
+            print(f"  [AI Matcher] Final: {len(all_results)}/{len(predictions)} matched")
+            return all_results
+        total_chunks = (len(residual) + self.chunk_size - 1) // self.chunk_size
+        print(f"  [AI Matcher] Processing {len(residual)} predictions in {total_chunks} chunks (size {self.chunk_size})...")
+
+        # Chunks are independent: submit them together at booking priority and
+        # let the LLM scheduler pace them against the key/model quotas.
+        chunks = [residual[i:i + self.chunk_size] for i in range(0, len(residual), self.chunk_size)]
+        chunk_results = await asyncio.gather(
+            *(self._process_single_chunk(date, [p for p, _ in chunk], self._candidate_union(chunk))
+              for chunk in chunks))
+
+        for chunk_idx, (chunk, chunk_result) in enumerate(zip(chunks, chunk_results), 1):
             if chunk_result:
                 all_results.update(chunk_result)
-                print(f"  [AI Matcher] Chunk {chunk_idx} matched {len(chunk_result)} fixtures.")
+                print(f"  [AI Matcher] Chunk {chunk_idx}/{total_chunks} ({len(chunk)} items) "
+                      f"matched {len(chunk_result)} fixtures.")
             else:
-                print(f"  [AI Matcher] Chunk {chunk_idx} returned no matches.")
+                print(f"  [AI Matcher] Chunk {chunk_idx}/{total_chunks} returned no matches.")
 
         print(f"  [AI Matcher] Final: {len(all_results)}/{len(predictions)} matched")
         return all_results
 
+    @staticmethod
+    def _candidate_union(chunk: List[tuple]) -> List[Dict]:
+        """Distinct site candidates of a chunk's predictions, first-seen order."""
+        seen, union = set(), []
+        for _, cands in chunk:
+            for m in cands:
+                if id(m) not in seen:
+                    seen.add(id(m))
+                    union.append(m)
+        return union
+
     @AIGOSuite.aigo_retry(max_retries=2, delay=2.0)
     async def _process_single_chunk(self, date: str, predictions: List[Dict], site_matches: List[Dict]) -> Dict[str, str]:
         prompt = self._build_improved_prompt(date, predictions, site_matches)
@@ -56,7 +92,9 @@ class UnifiedBatchMatcher:
             print(f"    [AI Chunk] Requesting AI Match Resolution...")
             response = await unified_api_call(
                 prompt,
-                generation_config={"temperature": 0.0, "response_mime_type": "application/json"}
+                generation_config={"temperature": 0.0, "response_mime_type": "application/json"},
+                priority=Priority.CRITICAL,
+                validate=lambda text: bool(self._robust_parse(text)),
             )
             
             if response and hasattr(response, 'text') and response.text:
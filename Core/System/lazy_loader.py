@@ -0,0 +1,134 @@
+# lazy_loader.py: Deferred imports for the CLI startup path.
+# Part of LeoBook Core — System
+#
+# Classes: LazyAttr, Command, CommandRegistry
+# Functions: lazy(), lazy_exports()
+# Called by: Leo.py, package __init__ files, Scripts/check_startup_budget.py
+
+"""
+Nothing heavy (torch, pandas, playwright, supabase, the Modules and Scripts)
+is imported until a command actually touches it.
+
+  lazy("pkg.mod:attr")   a proxy that imports pkg.mod and fetches attr on
+                         first call / attribute access, then caches it.
+  lazy_exports(...)      PEP 562 __getattr__/__dir__ for package __init__
+                         files, so `from Data.Access.db_helpers import x`
+                         no longer runs every sibling module first.
+  CommandRegistry        every Leo.py CLI target with the LazyAttrs it needs;
+                         preload() resolves them so the startup budget can be
+                         measured per mode without running the command.
+"""
+
+import time
+import importlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class LazyAttr:
+    """Stands in for `from module import attr` until first use."""
+
+    __slots__ = ("target", "_module", "_attr", "_value", "_lock")
+
+    def __init__(self, target: str):
+        module, _, attr = target.partition(":")
+        if not module or not attr:
+            raise ValueError(f"lazy target must be 'package.module:attr', got {target!r}")
+        self.target = target
+        self._module = module
+        self._attr = attr
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def resolved(self) -> bool:
+        return self._value is not None
+
+    def resolve(self) -> Any:
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = getattr(importlib.import_module(self._module), self._attr)
+        return self._value
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        state = "resolved" if self.resolved else "pending"
+        return f"<lazy {self.target} ({state})>"
+
+
+def lazy(target: str) -> LazyAttr:
+    """lazy("Data.Access.sync_manager:run_full_sync") -> callable proxy."""
+    return LazyAttr(target)
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Module-level __getattr__/__dir__ for a package __init__.
+    `exports` maps public name -> submodule (relative, e.g. ".rule_engine").
+    """
+    def __getattr__(name: str) -> Any:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, package), name)
+        setattr(importlib.import_module(package), name, value)   # later lookups skip __getattr__
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(exports) | set(vars(importlib.import_module(package))))
+
+    return __getattr__, __dir__
+
+
+@dataclass(frozen=True)
+class Command:
+    """One CLI target: the argparse flag that selects it and the lazy imports it runs on."""
+    name: str
+    flag: Optional[str]
+    mode: str                                  # utility | granular | cycle
+    imports: Tuple[LazyAttr, ...] = field(default=())
+
+
+class CommandRegistry:
+    """Ordered CLI targets; the first whose flag is set on the parsed args wins."""
+
+    def __init__(self):
+        self._commands: Dict[str, Command] = {}
+
+    def register(self, name: str, *imports: LazyAttr, flag: Optional[str] = None,
+                 mode: str = "utility") -> Command:
+        command = Command(name, flag if flag is not None else name, mode, tuple(imports))
+        self._commands[name] = command
+        return command
+
+    def __iter__(self):
+        return iter(self._commands.values())
+
+    def __getitem__(self, name: str) -> Command:
+        return self._commands[name]
+
+    def names(self, mode: Optional[str] = None) -> List[str]:
+        return [c.name for c in self if mode is None or c.mode == mode]
+
+    def selected(self, args, mode: Optional[str] = None) -> Optional[Command]:
+        for command in self:
+            if (mode is None or command.mode == mode) and command.flag and getattr(args, command.flag, None):
+                return command
+        return None
+
+    def preload(self, name: str) -> float:
+        """Resolve every import of a command; returns the seconds it took."""
+        t0 = time.perf_counter()
+        for attr in self._commands[name].imports:
+            attr.resolve()
+        return time.perf_counter() - t0
+
+    def imports_of(self, names: Iterable[str]) -> List[str]:
+        return sorted({a.target for n in names for a in self._commands[n].imports})
@@ -139,6 +139,7 @@ Examples:
   python Leo.py --rule-engine --backtest   Progressive backtest default engine
   python Leo.py --rule-engine --backtest --id ENGINE_ID   Backtest a specific engine
   python Leo.py --rule-engine --backtest --from-date 2025-08-01   Set start date
+  python Leo.py --rule-engine --backtest --to-date 2026-05-31 --workers 4   End date, parallel shards
   python Leo.py --rule-engine --set-default "James' Law"   Set engine as default
   python Leo.py --assets                   Sync all team and league assets
   python Leo.py --assets --limit 10         Sync assets with a limit
@@ -152,10 +153,13 @@ Examples:
   python Leo.py --enrich-leagues --season 1  Extract only the most recent past season
   python Leo.py --enrich-leagues --all-seasons Extract all available seasons
   python Leo.py --train-rl               Train RL model from historical fixtures
+  python Leo.py --train-rl --rl-resume   Resume RL training from the last checkpoint
   python Leo.py --train-rl --league ID   Fine-tune a specific league adapter
   python Leo.py --train-rl --league ID   Fine-tune a specific league adapter
   python Leo.py --data-quality           Run diagnostics and immediate gap fixes
   python Leo.py --season-completeness    Refresh and print match coverage report
+  python Leo.py --llm-cache-stats        Show LLM response cache hit rates per caller
+  python Leo.py --metrics-report [RUN]   Break the latest (or given) run down by span and DB table
         """
     )
     # --- Granular Chapter / Page Selection ---
@@ -170,9 +174,9 @@ Examples:
     parser.add_argument('--sync', action='store_true',
                        help='Force push-only sync (local → Supabase)')
     parser.add_argument('--pull', action='store_true',
-                       help='Pull ALL data from Supabase → local SQLite (bootstrap/recovery)')
+                       help='Pull ALL data from Supabase → local SQLite (bootstrap/recovery; resumes an interrupted pull)')
     parser.add_argument('--reset-sync', type=str, metavar='TABLE',
-                       help='Reset sync watermark for a specific table (e.g. schedules, teams)')
+                       help='Reset sync watermark and re-queue every row of a table for push (e.g. schedules, teams)')
     parser.add_argument('--recommend', action='store_true',
                        help='Generate and display recommendations only')
     parser.add_argument('--accuracy', action='store_true',
@@ -209,14 +213,24 @@ Examples:
                         help='Run DataQualityScanner -> GapResolver IMMEDIATE -> stage STAGE_ENRICHMENT')
     parser.add_argument('--season-completeness', action='store_true',
                         help='Refresh and print season completeness metrics')
+    parser.add_argument('--standings-check', action='store_true',
+                        help='Rebuild the in-process standings cache and verify it against fresh computation')
     parser.add_argument('--set-expected-matches', type=str, nargs=3, metavar=('LEAGUE_ID', 'SEASON', 'COUNT'),
                         help='Manual override for expected matches in a season')
+    parser.add_argument('--llm-cache-stats', action='store_true',
+                        help='Print LLM response cache size and per-caller hit rates')
+    parser.add_argument('--metrics-report', type=str, nargs='?', const='latest', metavar='RUN_ID',
+                        help='Print span totals and DB query time for a run from Data/Store/metrics.db')
 
     # --- RL Training ---
     parser.add_argument('--train-rl', action='store_true',
                         help='Train/retrain the RL model from historical fixtures')
     parser.add_argument('--league', type=str, metavar='ID',
                         help='Fine-tune a specific league adapter (use with --train-rl)')
+    parser.add_argument('--rl-resume', action='store_true',
+                        help='Resume RL training from the last checkpoint (use with --train-rl)')
+    parser.add_argument('--rl-per-match', action='store_true',
+                        help='Legacy one-step-per-match PPO, for throughput comparison (use with --train-rl)')
 
     # --- Rule Engine Management ---
     parser.add_argument('--rule-engine', action='store_true',
@@ -231,6 +245,10 @@ Examples:
                        help='Target a specific engine by ID (use with --rule-engine --backtest)')
     parser.add_argument('--from-date', type=str, metavar='DATE',
                        help='Start date for backtest YYYY-MM-DD (use with --rule-engine --backtest)')
+    parser.add_argument('--to-date', type=str, metavar='DATE',
+                       help='End date for backtest YYYY-MM-DD, default today (use with --rule-engine --backtest)')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                       help='Split the backtest date range across N processes (use with --rule-engine --backtest)')
     parser.add_argument('--date', type=str, nargs='+', metavar='DATE',
                        help='Specific date(s) to process (DD.MM.YYYY)')
 
@@ -246,6 +264,8 @@ Examples:
         parser.error("--backtest requires --rule-engine")
     if args.league and not args.train_rl:
         parser.error("--league requires --train-rl")
+    if (args.rl_resume or args.rl_per_match) and not args.train_rl:
+        parser.error("--rl-resume/--rl-per-match require --train-rl")
     if args.season is not None and not args.enrich_leagues:
         parser.error("--season requires --enrich-leagues")
 
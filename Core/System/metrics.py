@@ -0,0 +1,516 @@
+# metrics.py: In-process metrics and tracing (counters, histograms, nested spans).
+# Part of LeoBook Core — System
+#
+# Classes: Histogram, Span, MetricsRegistry, MetricsHandler
+# Functions: get_metrics(), span(), traced_goto(), start_metrics_server()
+# Called by: supervisor.py | db_pool.py (query observer) | llm_scheduler.py | sync_manager.py |
+#            browser navigation call sites | Leo.py (--metrics-report)
+
+"""
+Metrics & Tracing
+Counters and histograms live in memory, labelled like Prometheus series.
+Spans nest through a ContextVar, so an LLM request made inside Chapter 1
+records Chapter1Worker as its parent; asyncio tasks inherit the span that was
+current when they were created. Every finished span also feeds a
+leo_<name>_seconds histogram.
+
+Instrumented: worker dispatches and whole cycles (supervisor), every pooled
+SQLite statement (leo_db_query_seconds by op/table; statements slower than
+METRICS_SLOW_QUERY_MS are kept as db.slow_query spans), LLM requests
+(llm_scheduler), browser navigations (traced_goto) and Supabase sync batches.
+
+Everything is flushed to Data/Store/metrics.db by a background thread (span
+exits never write it), a separate file so that metric writes never contend
+with leobook.db writers:
+  metrics       cumulative value per (run_id, name, labels)
+  metric_spans  one row per finished span, kept METRICS_RETENTION_DAYS
+GET /metrics on start_metrics_server() serves the Prometheus text format.
+`python Leo.py --metrics-report [RUN_ID]` breaks a run down by span.
+Set LEO_METRICS=0 to turn all of it into no-ops.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import atexit
+import bisect
+import logging
+import threading
+import contextvars
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+METRICS_DB_PATH = os.path.join(PROJECT_ROOT, "Data", "Store", "metrics.db")
+
+METRICS_ENABLED = os.getenv("LEO_METRICS", "1") != "0"
+METRICS_SLOW_QUERY_MS = float(os.getenv("METRICS_SLOW_QUERY_MS", 100))
+METRICS_RETENTION_DAYS = int(os.getenv("METRICS_RETENTION_DAYS", 14))
+METRICS_PORT = int(os.getenv("LEO_METRICS_PORT", 9464))       # 0 = no HTTP endpoint
+FLUSH_EVERY = 512             # buffered spans per write
+FLUSH_INTERVAL_S = 30.0
+PRUNE_INTERVAL_S = 3600.0
+
+# Seconds; covers a 1 ms SQLite read up to a 30 min worker timeout
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0, 300.0, 1800.0)
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS metrics (
+        run_id     TEXT NOT NULL,
+        name       TEXT NOT NULL,
+        kind       TEXT NOT NULL,            -- counter | histogram
+        labels     TEXT NOT NULL,            -- JSON object, sorted keys
+        value      REAL NOT NULL DEFAULT 0,  -- counter value / histogram sum
+        count      INTEGER NOT NULL DEFAULT 0,
+        buckets    TEXT,                     -- JSON cumulative counts per DEFAULT_BUCKETS bound
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (run_id, name, labels)
+    );
+    CREATE TABLE IF NOT EXISTS metric_spans (
+        span_id     TEXT PRIMARY KEY,
+        trace_id    TEXT NOT NULL,
+        parent_id   TEXT,
+        run_id      TEXT NOT NULL,
+        name        TEXT NOT NULL,
+        labels      TEXT NOT NULL,
+        started_at  REAL NOT NULL,
+        duration_ms REAL NOT NULL,
+        status      TEXT NOT NULL            -- ok | error:<ExceptionType>
+    );
+    CREATE INDEX IF NOT EXISTS idx_metric_spans_run ON metric_spans(run_id, name);
+    CREATE INDEX IF NOT EXISTS idx_metric_spans_started ON metric_spans(started_at);
+"""
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("leo_current_span", default=None)
+
+_SQL_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE(?:\s+IF\s+(?:NOT\s+)?EXISTS)?)\s+[\"`\[]?(\w+)", re.I)
+_SQL_LABEL_CACHE_MAX = 4096
+
+
+def _label_key(labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _sql_labels(sql: str) -> Tuple[str, str]:
+    """(op, table) for a statement, e.g. ('select', 'schedules')."""
+    words = sql.lstrip().split(None, 1)
+    op = words[0].lower() if words else "?"
+    if op == "with":
+        op = "select"
+    match = _SQL_TABLE.search(sql)
+    return op, match.group(1).lower() if match else "-"
+
+
+class Histogram:
+    """Fixed-bucket histogram (per-bucket counts; made cumulative on export)."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(DEFAULT_BUCKETS) + 1)    # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(DEFAULT_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        out, running = [], 0
+        for c in self.counts:
+            running += c
+            out.append(running)
+        return out
+
+
+class Span:
+    """One timed operation; use as `with` or `async with`. set() adds labels before it ends."""
+
+    __slots__ = ("registry", "name", "labels", "trace_id", "span_id", "parent_id",
+                 "started_at", "_t0", "_token")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: Dict[str, Any],
+                 parent: Optional["Span"] = None):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:16]
+        self.started_at = 0.0
+        self._t0 = 0.0
+        self._token = None
+
+    def set(self, **labels) -> None:
+        self.labels.update(labels)
+
+    def __enter__(self) -> "Span":
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed = time.perf_counter() - self._t0
+        try:
+            _current_span.reset(self._token)
+        except ValueError:      # exited in another context (e.g. a different task)
+            pass
+        status = "ok" if exc_type is None else f"error:{exc_type.__name__}"
+        self.registry._finish_span(self, elapsed, status)
+        return False
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+class _NoopSpan:
+    """Returned by span() when metrics are disabled."""
+
+    def set(self, **labels) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class MetricsRegistry:
+    """Process-wide counters, histograms and finished spans, flushed to metrics.db."""
+
+    def __init__(self, db_path: str = METRICS_DB_PATH, enabled: bool = METRICS_ENABLED):
+        self.db_path = db_path
+        self.enabled = enabled
+        self.run_id = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._counters: Dict[tuple, float] = {}                  # (name, label_key) -> value
+        self._histograms: Dict[tuple, Histogram] = {}
+        self._help: Dict[str, str] = {}
+        self._dirty: set = set()                                # series changed since last flush
+        self._pending_spans: List[tuple] = []
+        self._sql_labels: Dict[str, tuple] = {}                  # sql -> leo_db_query_seconds series key
+        self._last_flush = time.time()
+        self._last_prune = 0.0
+        self._flush_lock = threading.Lock()                     # one writer at a time, in order
+        self._flush_wanted = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_pid = 0
+        self._pool = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        if self.enabled:
+            from Data.Access.db_pool import get_pool, set_query_observer
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._pool = get_pool(db_path)
+            self._pool.observed = False          # our own writes are not DB metrics
+            self._pool.acquire().executescript(_SCHEMA)
+            set_query_observer(self._observe_query)
+            atexit.register(self.flush)
+
+    # ── Recording ───────────────────────────────────────────────
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def counter(self, name: str, value: float = 1.0, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+            self._dirty.add(key)
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        if not self.enabled:
+            return
+        self._observe_key((name, _label_key(labels)), seconds)
+
+    def _observe_key(self, key: tuple, seconds: float) -> None:
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram()
+            hist.observe(seconds)
+            self._dirty.add(key)
+
+    def span(self, name: str, parent: Optional[Span] = None, **labels):
+        """Nested timing span; parent defaults to the span current in this context."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, labels, parent if parent is not None else _current_span.get())
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def _finish_span(self, span: Span, elapsed: float, status: str) -> None:
+        self.observe(f"leo_{span.name.replace('.', '_')}_seconds", elapsed, **span.labels)
+        self._record_span(span.span_id, span.trace_id, span.parent_id, span.name,
+                          span.labels, span.started_at, elapsed, status)
+
+    def _record_span(self, span_id, trace_id, parent_id, name, labels, started_at, elapsed, status) -> None:
+        row = (span_id, trace_id, parent_id, self.run_id, name, json.dumps(labels, sort_keys=True, default=str),
+               started_at, round(elapsed * 1000, 3), status)
+        with self._lock:
+            self._pending_spans.append(row)
+            due = (len(self._pending_spans) >= FLUSH_EVERY
+                   or time.time() - self._last_flush >= FLUSH_INTERVAL_S)
+        if due:
+            self._request_flush()
+
+    def _observe_query(self, sql: str, elapsed: float) -> None:
+        """db_pool hook: one pooled statement took `elapsed` seconds."""
+        key = self._sql_labels.get(sql)
+        if key is None:
+            if len(self._sql_labels) >= _SQL_LABEL_CACHE_MAX:
+                self._sql_labels.clear()
+            op, table = _sql_labels(sql)
+            key = self._sql_labels[sql] = ("leo_db_query_seconds", _label_key({"op": op, "table": table}))
+        self._observe_key(key, elapsed)
+        if elapsed * 1000 >= METRICS_SLOW_QUERY_MS:
+            op, table = _sql_labels(sql)
+            parent = _current_span.get()
+            self._record_span(uuid.uuid4().hex[:16], parent.trace_id if parent else uuid.uuid4().hex[:16],
+                              parent.span_id if parent else None, "db.slow_query",
+                              {"op": op, "table": table, "sql": " ".join(sql.split())[:300]},
+                              time.time() - elapsed, elapsed, "ok")
+
+    # ── Persistence ─────────────────────────────────────────────
+
+    def _request_flush(self) -> None:
+        """Hand a due flush to the background flusher thread, so a span exit
+        (often on the event loop) never waits on a metrics.db write."""
+        if self._flusher is None or self._flusher_pid != os.getpid():
+            with self._lock:
+                if self._flusher is None or self._flusher_pid != os.getpid():
+                    self._flusher_pid = os.getpid()     # forked child: the parent's thread is gone
+                    self._flusher = threading.Thread(target=self._flush_loop, name="leo-metrics-flush",
+                                                     daemon=True)
+                    self._flusher.start()
+        self._flush_wanted.set()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._flush_wanted.wait()
+            self._flush_wanted.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write changed series (cumulative for this run) and finished spans."""
+        if not self.enabled:
+            return
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        now = time.time()
+        with self._lock:
+            spans, self._pending_spans = self._pending_spans, []
+            dirty, self._dirty = self._dirty, set()
+            self._last_flush = now
+            series = []
+            for key in dirty:
+                name, label_key = key
+                labels = json.dumps(dict(label_key), sort_keys=True)
+                if key in self._counters:
+                    series.append((self.run_id, name, "counter", labels, self._counters[key], 0, None, now))
+                else:
+                    hist = self._histograms[key]
+                    series.append((self.run_id, name, "histogram", labels, hist.sum, hist.count,
+                                   json.dumps(hist.cumulative()), now))
+        if not (spans or series):
+            return
+        try:
+            with self._pool.transaction(self._pool.acquire()) as conn:
+                conn.executemany(
+                    "INSERT INTO metrics (run_id, name, kind, labels, value, count, buckets, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(run_id, name, labels) DO UPDATE SET "
+                    "value = excluded.value, count = excluded.count, buckets = excluded.buckets, "
+                    "updated_at = excluded.updated_at", series)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO metric_spans (span_id, trace_id, parent_id, run_id, name, labels, "
+                    "started_at, duration_ms, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", spans)
+                if now - self._last_prune >= PRUNE_INTERVAL_S:
+                    self._last_prune = now
+                    conn.execute("DELETE FROM metric_spans WHERE started_at < ?",
+                                 (now - METRICS_RETENTION_DAYS * 86400,))
+        except Exception as e:
+            logger.warning(f"[Metrics] Flush failed: {e}")
+
+    # ── Export ──────────────────────────────────────────────────
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4) of every series in this process."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((k, (list(h.cumulative()), h.sum, h.count)) for k, h in self._histograms.items())
+        lines: List[str] = []
+        typed: set = set()
+
+        def _header(name: str, kind: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, label_key), value in counters:
+            _header(name, "counter")
+            lines.append(f"{name}{_fmt_labels(label_key)} {_fmt_value(value)}")
+        for (name, label_key), (cumulative, total, count) in histograms:
+            _header(name, "histogram")
+            for bound, c in zip(DEFAULT_BUCKETS + (float("inf"),), cumulative):
+                le = "+Inf" if bound == float("inf") else _fmt_value(bound)
+                lines.append(f"{name}_bucket{_fmt_labels(label_key + (('le', le),))} {c}")
+            lines.append(f"{name}_sum{_fmt_labels(label_key)} {_fmt_value(total)}")
+            lines.append(f"{name}_count{_fmt_labels(label_key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def report(self, run_id: Optional[str] = None, top: int = 25) -> Dict[str, Any]:
+        """Per-span totals for one run (default: the latest flushed run), slowest first."""
+        if not self.enabled:
+            return {"enabled": False}
+        self.flush()
+        conn = self._pool.acquire()
+        if run_id in (None, "latest"):
+            row = conn.execute("SELECT run_id FROM metric_spans ORDER BY started_at DESC LIMIT 1").fetchone()
+            if row is None:
+                return {"enabled": True, "run_id": None, "spans": [], "queries": []}
+            run_id = row[0]
+        durations: Dict[tuple, List[float]] = {}
+        errors: Dict[tuple, int] = {}
+        for name, labels, ms, status in conn.execute(
+                "SELECT name, labels, duration_ms, status FROM metric_spans WHERE run_id = ? AND name != ?",
+                (run_id, "db.slow_query")):
+            key = (name, labels)
+            durations.setdefault(key, []).append(ms)
+            if status != "ok":
+                errors[key] = errors.get(key, 0) + 1
+        spans = []
+        for (name, labels), values in durations.items():
+            values.sort()
+            spans.append({
+                "name": name, "labels": json.loads(labels), "count": len(values),
+                "total_s": round(sum(values) / 1000, 3), "p50_ms": round(values[len(values) // 2], 1),
+                "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 1),
+                "max_ms": round(values[-1], 1), "errors": errors.get((name, labels), 0),
+            })
+        spans.sort(key=lambda s: -s["total_s"])
+        queries = []
+        for labels, count, total, buckets in conn.execute(
+                "SELECT labels, count, value, buckets FROM metrics WHERE run_id = ? AND name = ? "
+                "ORDER BY value DESC LIMIT ?", (run_id, "leo_db_query_seconds", top)):
+            queries.append({"labels": json.loads(labels), "count": count, "total_s": round(total, 3)})
+        return {"enabled": True, "run_id": run_id, "spans": spans[:top], "queries": queries}
+
+    def start_server(self, port: int = METRICS_PORT, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+        """Serve GET /metrics from a daemon thread; None when disabled or the port is taken."""
+        if not self.enabled or not port:
+            return None
+        if self._server is None:
+            try:
+                server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError as e:
+                logger.warning(f"[Metrics] /metrics endpoint not started on {host}:{port}: {e}")
+                return None
+            server.registry = self
+            threading.Thread(target=server.serve_forever, name="leo-metrics-http", daemon=True).start()
+            self._server = server
+            logger.info(f"[Metrics] Prometheus endpoint on http://{host}:{port}/metrics")
+        return self._server
+
+
+def _fmt_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
+
+
+def _fmt_labels(label_key: tuple) -> str:
+    if not label_key:
+        return ""
+    parts = []
+    for k, v in label_key:
+        v = v.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics -> Prometheus text; anything else 404."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/metrics/"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Process-wide registry (created on first use; installs the DB query observer)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+                _describe_defaults(_registry)
+    return _registry
+
+
+def _describe_defaults(registry: MetricsRegistry) -> None:
+    registry.describe("leo_worker_runs_total", "Supervisor worker attempts by outcome")
+    registry.describe("leo_worker_seconds", "Wall time of one worker attempt")
+    registry.describe("leo_cycle_seconds", "Wall time of one autonomous cycle")
+    registry.describe("leo_db_query_seconds", "Execution time of pooled SQLite statements (excludes row fetch)")
+    registry.describe("leo_llm_requests_total", "LLM provider requests by outcome")
+    registry.describe("leo_llm_request_seconds", "LLM provider request latency")
+    registry.describe("leo_llm_cache_total", "LLM response cache lookups by outcome")
+    registry.describe("leo_llm_queue_wait_seconds", "Time an LLM job waited in the scheduler queue")
+    registry.describe("leo_browser_navigate_seconds", "page.goto latency by host")
+    registry.describe("leo_sync_batch_seconds", "Supabase upsert latency per HTTP batch")
+    registry.describe("leo_sync_rows_total", "Rows pushed to Supabase by outcome")
+
+
+def span(name: str, **labels):
+    """Shorthand for get_metrics().span(name, **labels)."""
+    return get_metrics().span(name, **labels)
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = "127.0.0.1"):
+    return get_metrics().start_server(port, host)
+
+
+async def traced_goto(page, url: str, **kwargs):
+    """page.goto() inside a browser.navigate span labelled with the target host."""
+    with span("browser.navigate", host=urlparse(url).netloc or "-"):
+        return await page.goto(url, **kwargs)
@@ -8,13 +8,13 @@
 import logging
 import json
 import asyncio
-import uuid
 from datetime import datetime
 from typing import Type, Dict, Any, Optional
 
 from Core.Utils.constants import now_ng
 from Data.Access.league_db import init_db
 from Core.System.worker_base import BaseWorker
+from Core.System.metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +27,8 @@ class Supervisor:
     def __init__(self):
         self.conn = init_db()
         self._ensure_table()
-        self.run_id = str(uuid.uuid4())[:8]
+        self.metrics = get_metrics()
+        self.run_id = self.metrics.run_id     # same id in system_state and metrics.db
         self.state = {
             "cycle_count": 0,
             "error_log": [],
@@ -77,18 +78,24 @@ class Supervisor:
 
         attempt = 0
         while attempt <= max_retries:
+            outcome = "error"
             try:
                 logger.info(f"[Supervisor] Dispatching {worker.name} (Attempt {attempt+1}/{max_retries+1})")
-                async with asyncio.timeout(timeout):
-                    success = await worker.execute(*args, **kwargs)
-                    if success:
-                        return True
-                    else:
-                        logger.warning(f"[Supervisor] Worker {worker.name} returned False.")
+                async with self.metrics.span("worker", worker=worker.name):
+                    async with asyncio.timeout(timeout):
+                        success = await worker.execute(*args, **kwargs)
+                outcome = "success" if success else "false"
+                if success:
+                    return True
+                else:
+                    logger.warning(f"[Supervisor] Worker {worker.name} returned False.")
             except asyncio.TimeoutError:
+                outcome = "timeout"
                 logger.error(f"[Supervisor] Worker {worker.name} timed out after {timeout} seconds.")
             except Exception as e:
                 await worker.on_failure(e)
+            finally:
+                self.metrics.counter("leo_worker_runs_total", worker=worker.name, outcome=outcome)
             
             attempt += 1
             if attempt <= max_retries:
@@ -102,6 +109,13 @@ class Supervisor:
         """
         Executes a sequence of chapters/workers as a single autonomous cycle.
         """
+        try:
+            async with self.metrics.span("cycle"):
+                return await self._run_cycle(scheduler, p)
+        finally:
+            self.metrics.flush()
+
+    async def _run_cycle(self, scheduler, p) -> bool:
         from Core.System.pipeline_workers import StartupWorker, PrologueWorker, Chapter1Worker, Chapter2Worker
         
         self.state["status"] = "running"
@@ -145,6 +159,7 @@ class Supervisor:
         from Leo import live_score_streamer, execute_scheduled_tasks, log_state, log_audit_event
         
         cycle_hours = int(os.getenv('LEO_CYCLE_WAIT_HOURS', '6'))
+        self.metrics.start_server()
         scheduler = TaskScheduler()
         scheduler.schedule_weekly_enrichment()
 
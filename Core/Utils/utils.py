@@ -15,9 +15,10 @@ import sys
 import traceback
 from datetime import datetime as dt
 from pathlib import Path
-from typing import Callable, List, TypeVar
+from typing import TYPE_CHECKING, Callable, List, TypeVar
 
-from playwright.async_api import Page
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 T = TypeVar('T')
 LOG_DIR = Path("Logs")
@@ -36,7 +37,7 @@ class Tee(object):
         for f in self.files:
             f.flush()
 
-async def log_error_state(page: Page, context_label: str, error: Exception):
+async def log_error_state(page: "Page", context_label: str, error: Exception):
     """Captures the state of the page upon an error."""
     ERROR_LOG_DIR.mkdir(parents=True, exist_ok=True)
     try:
@@ -57,7 +58,7 @@ async def log_error_state(page: Page, context_label: str, error: Exception):
         print(f"    [Logger Failure] Could not write error state: {log_e}")
 
 
-async def capture_debug_snapshot(page: Page, label: str, info_text: str = ""):
+async def capture_debug_snapshot(page: "Page", label: str, info_text: str = ""):
     """Captures a debug snapshot (PNG + HTML + TXT) for analysis."""
     DEBUG_DIR = LOG_DIR / "Debug"
     DEBUG_DIR.mkdir(parents=True, exist_ok=True)
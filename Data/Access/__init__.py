@@ -3,15 +3,18 @@ DB Helpers Package
 Database operations, outcome review, and data management utilities.
 """
 
-from .outcome_reviewer import (
-    get_predictions_to_review,
-    save_single_outcome,
-    process_review_task_offline,
-    run_review_process,
-    run_accuracy_generation,
-    start_review
-)
-from .db_helpers import evaluate_market_outcome
+from Core.System.lazy_loader import lazy_exports
+
+# Resolved on first access: outcome_reviewer pulls in playwright and Core.Intelligence
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'get_predictions_to_review': '.outcome_reviewer',
+    'save_single_outcome': '.outcome_reviewer',
+    'process_review_task_offline': '.outcome_reviewer',
+    'run_review_process': '.outcome_reviewer',
+    'run_accuracy_generation': '.outcome_reviewer',
+    'start_review': '.outcome_reviewer',
+    'evaluate_market_outcome': '.db_helpers',
+})
 
 __version__ = "3.0.0"
 __all__ = [
@@ -18,22 +18,18 @@ from typing import Dict, Any, List, Optional
 import uuid
 
 from Data.Access.league_db import (
-    init_db, get_connection, upsert_prediction, update_prediction,
+    init_db, get_connection, upsert_prediction, bulk_upsert_predictions, update_prediction,
     get_predictions, upsert_fixture, bulk_upsert_fixtures,
     upsert_standing, get_standings as _get_standings_db,
     upsert_league, upsert_team, upsert_fb_match, upsert_live_score,
     log_audit_event as _log_audit_db, upsert_country,
     upsert_accuracy_report, query_all, DB_PATH,
 )
-
-# Module-level connection (lazy init)
-_conn = None
+from Data.Access.market_settlement import settle_outcome
 
 def _get_conn():
-    global _conn
-    if _conn is None:
-        _conn = init_db()
-    return _conn
+    """The calling thread's pooled connection (schema migrated once per process)."""
+    return init_db()
 
 
 # ─── Initialization ───
@@ -81,11 +77,32 @@ def log_audit_event(event_type: str, description: str, balance_before: Optional[
 
 def save_prediction(match_data: Dict[str, Any], prediction_result: Dict[str, Any]):
     """UPSERTs a prediction into the database."""
+    row = _prediction_row(match_data, prediction_result, get_team_crest)
+    if row:
+        upsert_prediction(_get_conn(), row)
+
+
+def save_predictions(items: List[tuple]) -> int:
+    """save_prediction() for many (match_data, prediction_result) pairs.
+
+    Crests are looked up in one query and every row is written in a single
+    transaction. Returns the number of rows written."""
+    conn = _get_conn()
+    crests = _team_crests(conn, [(m.get(f'{side}_team_id'), m.get(f'{side}_team'))
+                                 for m, _ in items for side in ('home', 'away')])
+    rows = [_prediction_row(m, p, lambda tid, name: crests.get((tid, name), "")) for m, p in items]
+    rows = [r for r in rows if r]
+    return bulk_upsert_predictions(conn, rows) if rows else 0
+
+
+def _prediction_row(match_data: Dict[str, Any], prediction_result: Dict[str, Any],
+                    crest_of) -> Optional[Dict[str, Any]]:
+    """The predictions-table row for one result; None without a fixture_id."""
     fixture_id = match_data.get('fixture_id') or match_data.get('id')
     if not fixture_id or fixture_id == 'unknown':
         print(f"   [Warning] Skipping prediction save: Missing unique fixture_id for "
               f"{match_data.get('home_team')} v {match_data.get('away_team')}")
-        return
+        return None
 
     date = match_data.get('date', dt.now().strftime("%Y-%m-%d"))
 
@@ -119,8 +136,8 @@ def save_prediction(match_data: Dict[str, Any], prediction_result: Dict[str, Any
         'match_link': f"{match_data.get('match_link', '')}",
         'odds': str(prediction_result.get('odds', '')),
         'market_reliability_score': str(prediction_result.get('market_reliability', 0.0)),
-        'home_crest_url': get_team_crest(match_data.get('home_team_id'), match_data.get('home_team')),
-        'away_crest_url': get_team_crest(match_data.get('away_team_id'), match_data.get('away_team')),
+        'home_crest_url': crest_of(match_data.get('home_team_id'), match_data.get('home_team')),
+        'away_crest_url': crest_of(match_data.get('away_team_id'), match_data.get('away_team')),
         'recommendation_score': str(prediction_result.get('recommendation_score', 0)),
         'h2h_fixture_ids': json.dumps(prediction_result.get('h2h_fixture_ids', [])),
         'form_fixture_ids': json.dumps(prediction_result.get('form_fixture_ids', [])),
@@ -128,8 +145,7 @@ def save_prediction(match_data: Dict[str, Any], prediction_result: Dict[str, Any
         'league_stage': match_data.get('league_stage', ''),
         'last_updated': dt.now().isoformat(),
     }
-
-    upsert_prediction(_get_conn(), row)
+    return row
 
 
 def update_prediction_status(match_id: str, date: str, new_status: str, **kwargs):
@@ -420,6 +436,27 @@ def get_team_crest(team_id: str, team_name: str = "") -> str:
     return ""
 
 
+def _team_crests(conn, teams: List[tuple]) -> Dict[tuple, str]:
+    """get_team_crest() for many (team_id, team_name) pairs: by id, then by name."""
+    teams = list(dict.fromkeys(t for t in teams if t[0] or t[1]))
+    ids = list({str(tid) for tid, _ in teams if tid})
+    names = list({name for _, name in teams if name})
+    by_id, by_name = {}, {}
+    for start in range(0, max(len(ids), len(names)), 500):
+        id_chunk, name_chunk = ids[start:start + 500], names[start:start + 500]
+        if id_chunk:
+            by_id.update((r['team_id'], r['crest']) for r in conn.execute(
+                f"SELECT team_id, crest FROM teams WHERE crest IS NOT NULL AND crest != '' "
+                f"AND team_id IN ({','.join('?' * len(id_chunk))})", id_chunk))
+        if name_chunk:
+            for r in conn.execute(
+                    f"SELECT name, crest FROM teams WHERE crest IS NOT NULL AND crest != '' "
+                    f"AND name IN ({','.join('?' * len(name_chunk))})", name_chunk):
+                by_name.setdefault(r['name'], r['crest'])
+    return {(tid, name): by_id.get(str(tid)) if tid and str(tid) in by_id else by_name.get(name, "")
+            for tid, name in teams}
+
+
 def propagate_crest_urls():
     """Propagates Supabase crest URLs from teams into schedules.
     Call after enrichment to ensure home_crest/away_crest in schedules
@@ -527,7 +564,21 @@ def evaluate_market_outcome(prediction: str, home_score: str, away_score: str,
                             home_team: str = "", away_team: str = "",
                             match_status: str = "") -> Optional[str]:
     """
-    Unified First-Principles Outcome Evaluator (v5.0).
+    Returns '1' (Correct), '0' (Incorrect), or '' (Unknown/Void).
+
+    Settled by the compiled market engine (market_settlement.py): each
+    prediction string is parsed once into a MarketSpec and memoized. Same
+    rules and results as _reference_market_outcome below.
+    """
+    return settle_outcome(prediction, home_score, away_score, home_team, away_team, match_status)
+
+
+def _reference_market_outcome(prediction: str, home_score: str, away_score: str,
+                              home_team: str = "", away_team: str = "",
+                              match_status: str = "") -> Optional[str]:
+    """
+    Unified First-Principles Outcome Evaluator (v5.0). Kept as the reference
+    the compiled engine is checked against (Scripts/check_market_settlement.py).
     Returns '1' (Correct), '0' (Incorrect), or '' (Unknown/Void).
 
     Settlement is based on 90min + stoppage time (regulation FT) ONLY.
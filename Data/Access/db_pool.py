@@ -0,0 +1,246 @@
+# db_pool.py: Thread-aware SQLite connection pool for leobook.db.
+# Part of LeoBook Data — Access Layer
+#
+# Classes: PooledConnection, ConnectionPool
+# Functions: get_pool(), pool_stats(), set_query_observer()
+# Called by: league_db.py (get_connection) | prediction_pipeline.py
+
+"""
+One connection per (process, thread, mode), or per (asyncio task, mode) when
+called from inside a running task, opened once with its pragmas applied once.
+Tasks on one event loop therefore never share a handle, so one task's open
+transaction is never committed or rolled back by another. Callers keep using
+plain sqlite3.Connection semantics, except that close() on a pooled connection
+is a no-op (the handle is reused by later calls from the same thread or task).
+transaction() refuses a connection that already has a transaction open.
+Read-only connections (PRAGMA query_only) are kept separately for query paths.
+An optional query observer (Core/System/metrics.py) is told how long each
+execute()/executemany() took; each connection also counts its statements.
+"""
+
+import os
+import asyncio
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Optional
+
+
+_query_observer: Optional[Callable[[str, float], None]] = None
+
+
+def set_query_observer(observer: Optional[Callable[[str, float], None]]) -> None:
+    """Install observer(sql, seconds), called after every statement on observed pools."""
+    global _query_observer
+    _query_observer = observer
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() hands the handle back to the pool."""
+
+    _pool_owned = True
+    _observed = True
+    statements = 0                          # execute()/executemany() calls on this handle
+
+    def execute(self, sql, parameters=()):
+        self.statements += 1
+        observer = _query_observer
+        if observer is None or not self._observed:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            observer(sql, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        self.statements += 1
+        observer = _query_observer
+        if observer is None or not self._observed:
+            return super().executemany(sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            observer(sql, time.perf_counter() - start)
+
+    def close(self):
+        if self._pool_owned:
+            # Shared handle: another caller's open transaction is not ours to end.
+            return
+        super().close()
+
+    def _release(self):
+        """Actually close the underlying handle (pool shutdown only)."""
+        self._pool_owned = False
+        try:
+            super().close()
+        except sqlite3.Error:
+            pass
+
+
+class ConnectionPool:
+    """Per-thread SQLite connections for a single database file.
+
+    Stats: checkouts, connections opened, connect time, and write-lock
+    contention (time spent waiting in BEGIN IMMEDIATE via transaction()).
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0, busy_timeout_ms: int = 10000):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self.observed = True                # False: statements skip the query observer
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._live = weakref.WeakSet()
+        self._stats = {
+            "checkouts": 0,
+            "reuses": 0,
+            "opened": 0,
+            "connect_ms": 0.0,
+            "transactions": 0,
+            "lock_waits": 0,
+            "lock_wait_ms": 0.0,
+            "lock_timeouts": 0,
+        }
+
+    # ── Checkout ────────────────────────────────────────────────
+
+    def acquire(self, readonly: bool = False) -> sqlite3.Connection:
+        """Return this task's (or, outside a task, this thread's) connection, opening it on first use."""
+        if os.getpid() != self._pid:
+            # Forked child: inherited handles must never be reused.
+            self._pid = os.getpid()
+            self._local = threading.local()
+            self._live = weakref.WeakSet()
+
+        attr = "ro" if readonly else "rw"
+        slots = self._slots()
+        conn = slots.get(attr)
+        with self._stats_lock:
+            self._stats["checkouts"] += 1
+            if conn is not None:
+                self._stats["reuses"] += 1
+        if conn is None:
+            conn = slots[attr] = self._open(readonly)
+        return conn
+
+    def _slots(self) -> Dict[str, PooledConnection]:
+        """The connection slots of the running asyncio task, else of this thread.
+
+        Task slots are dropped with the task; its handles then close on collection."""
+        local = self._local
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:            # no running event loop on this thread
+            task = None
+        if task is None:
+            slots = getattr(local, "thread_slots", None)
+            if slots is None:
+                slots = local.thread_slots = {}
+            return slots
+        tasks = getattr(local, "task_slots", None)
+        if tasks is None:
+            tasks = local.task_slots = weakref.WeakKeyDictionary()
+        slots = tasks.get(task)
+        if slots is None:
+            slots = tasks[task] = {}
+        return slots
+
+    def _open(self, readonly: bool) -> PooledConnection:
+        start = time.perf_counter()
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.timeout,
+            check_same_thread=False, factory=PooledConnection,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if readonly:
+            conn.execute("PRAGMA query_only=ON")
+        conn.row_factory = sqlite3.Row
+        conn._observed = self.observed
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self._stats["opened"] += 1
+            self._stats["connect_ms"] += elapsed
+        self._live.add(conn)
+        return conn
+
+    # ── Write transactions ──────────────────────────────────────
+
+    @contextmanager
+    def transaction(self, conn: Optional[sqlite3.Connection] = None):
+        """BEGIN IMMEDIATE … COMMIT on this task's/thread's connection.
+
+        Time spent acquiring the write lock is recorded as contention.
+        Rolls back on any exception. A connection with a transaction already
+        open is refused: that work belongs to whoever opened it, and is not
+        ours to commit.
+        """
+        conn = conn or self.acquire()
+        if conn.in_transaction:
+            raise sqlite3.OperationalError(
+                "transaction(): connection already has an open transaction; commit or roll it back first")
+        start = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            with self._stats_lock:
+                self._stats["lock_timeouts"] += 1
+            raise
+        waited = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self._stats["transactions"] += 1
+            if waited >= 1.0:
+                self._stats["lock_waits"] += 1
+                self._stats["lock_wait_ms"] += waited
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    # ── Introspection / shutdown ────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            snap = dict(self._stats)
+        snap["open_connections"] = len(self._live)
+        snap["connect_ms"] = round(snap["connect_ms"], 2)
+        snap["lock_wait_ms"] = round(snap["lock_wait_ms"], 2)
+        return snap
+
+    def close_all(self):
+        """Close every connection opened by this pool (all threads)."""
+        for conn in list(self._live):
+            conn._release()
+        self._live = weakref.WeakSet()
+        self._local = threading.local()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Return the process-wide pool for a database file."""
+    key = os.path.abspath(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(key)
+                _pools[key] = pool
+    return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every pool in this process, keyed by database path."""
+    return {path: pool.stats() for path, pool in list(_pools.items())}
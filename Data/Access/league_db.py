@@ -2,48 +2,45 @@
 # Part of LeoBook Data — Access Layer
 #
 # This is THE SINGLE source of truth for all persistent data.
-# CSV files are auto-imported on first init_db() call, then renamed to .csv.bak.
+# Schema changes are versioned migrations (schema_version table) applied by init_db().
+# CSV files are auto-imported by the first migration run, then renamed to .csv.bak.
 
 import sqlite3
 import csv
 import json
 import os
+import time
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from Core.Utils.constants import now_ng
+from Data.Access.db_pool import get_pool
 
 DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Store")
 DB_PATH = os.path.join(DB_DIR, "leobook.db")
 
 
-def get_connection() -> sqlite3.Connection:
-    """Get a thread-safe SQLite connection with WAL mode.
-    Auto-recovers from corrupted DB by deleting and recreating."""
+def get_connection(readonly: bool = False) -> sqlite3.Connection:
+    """Get the calling thread's pooled SQLite connection (WAL mode).
+
+    Connections are opened once per thread with pragmas applied once; see
+    db_pool.py. readonly=True returns a separate query_only connection for
+    read paths. Auto-recovers from corrupted DB by deleting and recreating."""
     os.makedirs(DB_DIR, exist_ok=True)
+    pool = get_pool(DB_PATH)
     try:
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=30)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=10000")
-        conn.row_factory = sqlite3.Row
-        return conn
+        return pool.acquire(readonly=readonly)
     except sqlite3.DatabaseError as e:
         if "malformed" in str(e).lower():
             print(f"  [!] Corrupted DB detected — deleting and recreating: {DB_PATH}")
-            try:
-                conn.close()
-            except Exception:
-                pass
+            pool.close_all()
+            _initialized_dbs.discard(DB_PATH)
             # Remove corrupted DB + WAL/SHM files
             for suffix in ('', '-wal', '-shm'):
                 path = DB_PATH + suffix
                 if os.path.exists(path):
                     os.remove(path)
             # Recreate fresh
-            conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=30)
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA busy_timeout=10000")
-            conn.row_factory = sqlite3.Row
-            return conn
+            return pool.acquire(readonly=readonly)
         raise
 
 
@@ -382,23 +379,60 @@ _COMPUTED_STANDINGS_SQL = """
 """
 
 
-def computed_standings(conn=None, league_id=None, season=None):
-    """Compute league standings on-the-fly from the schedules table.
+# In-process standings cache, keyed by (league_id, season or None).
+# Each entry carries the league's _standings_gen counter at build time; the
+# schedules triggers bump that counter whenever a row that can affect the table
+# changes (from any connection or process), which invalidates the entry.
+# Nothing here is persisted — standings stay computed (RULEBOOK 2.5).
+_standings_cache: Dict[tuple, tuple] = {}
 
-    Always up-to-date, even during live matches (if scores are propagated).
-    Replaces the old standings table (removed in v7.0).
+_STANDINGS_GEN_SQL = """
+    CREATE TABLE IF NOT EXISTS _standings_gen (
+        league_id   TEXT PRIMARY KEY,
+        gen         INTEGER NOT NULL DEFAULT 0
+    );
 
-    Args:
-        conn: SQLite connection (optional, uses default)
-        league_id: Filter by league_id (optional)
-        season: Filter by season (optional)
+    CREATE TRIGGER IF NOT EXISTS trg_standings_gen_ins AFTER INSERT ON schedules
+    WHEN NEW.home_score IS NOT NULL
+    BEGIN
+        INSERT INTO _standings_gen (league_id, gen) VALUES (COALESCE(NEW.league_id, ''), 1)
+        ON CONFLICT(league_id) DO UPDATE SET gen = gen + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_standings_gen_upd AFTER UPDATE ON schedules
+    WHEN (OLD.home_score IS NOT NULL OR NEW.home_score IS NOT NULL)
+     AND (OLD.home_score IS NOT NEW.home_score OR OLD.away_score IS NOT NEW.away_score
+          OR OLD.match_status IS NOT NEW.match_status OR OLD.league_id IS NOT NEW.league_id
+          OR OLD.season IS NOT NEW.season
+          OR OLD.home_team_id IS NOT NEW.home_team_id OR OLD.away_team_id IS NOT NEW.away_team_id
+          OR OLD.home_team_name IS NOT NEW.home_team_name OR OLD.away_team_name IS NOT NEW.away_team_name)
+    BEGIN
+        INSERT INTO _standings_gen (league_id, gen) VALUES (COALESCE(NEW.league_id, ''), 1)
+        ON CONFLICT(league_id) DO UPDATE SET gen = gen + 1;
+        INSERT INTO _standings_gen (league_id, gen) VALUES (COALESCE(OLD.league_id, ''), 1)
+        ON CONFLICT(league_id) DO UPDATE SET gen = gen + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_standings_gen_del AFTER DELETE ON schedules
+    WHEN OLD.home_score IS NOT NULL
+    BEGIN
+        INSERT INTO _standings_gen (league_id, gen) VALUES (COALESCE(OLD.league_id, ''), 1)
+        ON CONFLICT(league_id) DO UPDATE SET gen = gen + 1;
+    END;
+"""
 
-    Returns:
-        List of dicts with: league_id, team_id, team_name, season,
-        played, wins, draws, losses, goals_for, goals_against,
-        goal_difference, points
-    """
-    conn = conn or init_db()
+
+def _create_standings_gen_triggers(conn: sqlite3.Connection):
+    conn.executescript(_STANDINGS_GEN_SQL)
+    conn.commit()
+
+
+def _standings_gen(conn, league_id: str) -> int:
+    row = conn.execute("SELECT gen FROM _standings_gen WHERE league_id = ?", (league_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def _query_standings(conn, league_id=None, season=None) -> List[Dict[str, Any]]:
     filters = ""
     params = []
     if league_id:
@@ -412,14 +446,92 @@ def computed_standings(conn=None, league_id=None, season=None):
     cursor = conn.execute(sql, params)
     columns = [d[0] for d in cursor.description]
     results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-    
+
     # Add rank/position since tag_generator expects it
     for i, res in enumerate(results):
         res["position"] = i + 1
-    
+
     return results
 
 
+def computed_standings(conn=None, league_id=None, season=None):
+    """Compute league standings on-the-fly from the schedules table.
+
+    Always up-to-date, even during live matches (if scores are propagated).
+    Replaces the old standings table (removed in v7.0). Per-league results are
+    served from the in-process cache until a schedules write touches the league.
+
+    Args:
+        conn: SQLite connection (optional, uses default)
+        league_id: Filter by league_id (optional)
+        season: Filter by season (optional)
+
+    Returns:
+        List of dicts with: league_id, team_id, team_name, season,
+        played, wins, draws, losses, goals_for, goals_against,
+        goal_difference, points, position
+    """
+    conn = conn or init_db()
+    if not league_id:
+        return _query_standings(conn, league_id, season)
+
+    key = (league_id, season or None)
+    gen = _standings_gen(conn, league_id)
+    cached = _standings_cache.get(key)
+    if cached is None or cached[0] != gen:
+        cached = (gen, _query_standings(conn, league_id, season))
+        _standings_cache[key] = cached
+    return [dict(r) for r in cached[1]]
+
+
+def rebuild_standings_cache(conn=None) -> Dict[str, int]:
+    """Full rebuild: drop every cached table and recompute each league/season
+    in one pass over schedules. Returns counts for logging."""
+    conn = conn or init_db()
+    gens = {r[0]: r[1] for r in conn.execute("SELECT league_id, gen FROM _standings_gen")}
+    _standings_cache.clear()
+
+    by_league: Dict[str, List[Dict[str, Any]]] = {}
+    for row in _query_standings(conn):
+        if row["league_id"]:
+            by_league.setdefault(row["league_id"], []).append(row)
+
+    for lid, rows in by_league.items():
+        gen = gens.get(lid, 0)
+        by_season: Dict[Any, List[Dict[str, Any]]] = {}
+        for i, row in enumerate(rows):
+            # League-wide key keeps the cross-season ordering of the unfiltered query
+            row["position"] = i + 1
+            by_season.setdefault(row["season"], []).append(dict(row))
+        _standings_cache[(lid, None)] = (gen, rows)
+        for season, season_rows in by_season.items():
+            if not season:
+                continue
+            for i, row in enumerate(season_rows):
+                row["position"] = i + 1
+            _standings_cache[(lid, season)] = (gen, season_rows)
+
+    return {"leagues": len(by_league), "entries": len(_standings_cache)}
+
+
+def verify_standings_cache(conn=None) -> List[tuple]:
+    """Consistency check: compare every cached entry with a fresh computation.
+    Returns the (league_id, season) keys whose team stats differ."""
+    conn = conn or init_db()
+
+    def _stats(rows):
+        return sorted(
+            tuple((k, v) for k, v in r.items() if k != "position") for r in rows
+        )
+
+    mismatched = []
+    for key, (_, rows) in list(_standings_cache.items()):
+        fresh = _query_standings(conn, key[0], key[1])
+        if _stats(rows) != _stats(fresh):
+            mismatched.append(key)
+    return mismatched
+
+
 def _run_alter_migrations(conn: sqlite3.Connection):
     """Add columns to existing tables. Silently skips if column already exists."""
     for table, column, col_type in _ALTER_MIGRATIONS:
@@ -500,6 +612,124 @@ def _create_post_alter_indexes(conn: sqlite3.Connection):
     conn.commit()
 
 
+# Composite indexes for the hot read paths (team form, H2H, per-league standings).
+# Scripts/check_query_plans.py fails if any of those queries falls back to a scan.
+_COMPOSITE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_schedules_home_date ON schedules(home_team_id, date)",
+    "CREATE INDEX IF NOT EXISTS idx_schedules_away_date ON schedules(away_team_id, date)",
+    "CREATE INDEX IF NOT EXISTS idx_schedules_league_season_status ON schedules(league_id, season, match_status)",
+]
+
+
+def _create_composite_indexes(conn: sqlite3.Connection):
+    for sql in _COMPOSITE_INDEXES:
+        conn.execute(sql)
+    conn.commit()
+
+
+def _create_status_index(conn: sqlite3.Connection):
+    """match_status lookups: the live streamer sweeps rows still marked 'live'
+    every cycle, which must not cost a schedules scan."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_schedules_status ON schedules(match_status)")
+    conn.commit()
+
+
+# ── Sync outbox (change data capture) ──────────────────────────────────────
+# Tables mirrored to Supabase and their conflict keys; sync_manager.TABLE_CONFIG
+# is built from this. Triggers on each table record every changed key in
+# _sync_outbox, and the push drains only that (see SyncManager._drain_outbox).
+SYNC_TABLE_KEYS = {
+    'predictions':      'fixture_id',
+    'schedules':        'fixture_id',
+    'teams':            'team_id',
+    'leagues':          'league_id',
+    'fb_matches':       'site_match_id',
+    'profiles':         'id',
+    'custom_rules':     'id',
+    'rule_executions':  'id',
+    'accuracy_reports': 'report_id',
+    'audit_log':        'id',
+    'live_scores':      'fixture_id',
+    'countries':        'code',
+}
+
+# One row per pending key. A re-changed key is deleted and re-inserted so it
+# gets a new AUTOINCREMENT id: acknowledging the id that was pushed never drops
+# a change made while the push was in flight.
+_SYNC_OUTBOX_SQL = """
+    CREATE TABLE IF NOT EXISTS _sync_outbox (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name      TEXT NOT NULL,
+        row_key         TEXT NOT NULL,
+        op              TEXT NOT NULL,
+        changed_at      TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+        attempts        INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at TEXT,
+        last_error      TEXT,
+        UNIQUE(table_name, row_key)
+    );
+    CREATE INDEX IF NOT EXISTS idx_sync_outbox_table ON _sync_outbox(table_name, id);
+"""
+
+# The triggers delete-then-insert rather than INSERT OR REPLACE: SQLite lets
+# the outer statement's conflict handling override a trigger's OR REPLACE, so
+# an UPSERT (INSERT ... ON CONFLICT DO UPDATE) on a key already queued would
+# abort on the outbox's UNIQUE constraint.
+_SYNC_OUTBOX_TRIGGERS = """
+    CREATE TRIGGER IF NOT EXISTS trg_outbox_{table}_ins AFTER INSERT ON {table}
+    WHEN NEW.{key} IS NOT NULL
+    BEGIN
+        DELETE FROM _sync_outbox WHERE table_name = '{table}' AND row_key = NEW.{key};
+        INSERT INTO _sync_outbox (table_name, row_key, op) VALUES ('{table}', NEW.{key}, 'upsert');
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_outbox_{table}_upd AFTER UPDATE ON {table}
+    WHEN NEW.{key} IS NOT NULL OR OLD.{key} IS NOT NULL
+    BEGIN
+        DELETE FROM _sync_outbox WHERE table_name = '{table}'
+            AND OLD.{key} IS NOT NULL AND OLD.{key} IS NOT NEW.{key} AND row_key = OLD.{key};
+        INSERT INTO _sync_outbox (table_name, row_key, op)
+        SELECT '{table}', OLD.{key}, 'delete' WHERE OLD.{key} IS NOT NULL AND OLD.{key} IS NOT NEW.{key};
+        DELETE FROM _sync_outbox WHERE table_name = '{table}' AND row_key = NEW.{key};
+        INSERT INTO _sync_outbox (table_name, row_key, op)
+        SELECT '{table}', NEW.{key}, 'upsert' WHERE NEW.{key} IS NOT NULL;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_outbox_{table}_del AFTER DELETE ON {table}
+    WHEN OLD.{key} IS NOT NULL
+    BEGIN
+        DELETE FROM _sync_outbox WHERE table_name = '{table}' AND row_key = OLD.{key};
+        INSERT INTO _sync_outbox (table_name, row_key, op) VALUES ('{table}', OLD.{key}, 'delete');
+    END;
+"""
+
+
+def _create_sync_outbox(conn: sqlite3.Connection):
+    """Outbox + capture triggers. Rows changed since each table's last push
+    (per _sync_watermarks) are queued once so nothing unsynced is lost; a
+    table that was never pushed is queued in full."""
+    conn.executescript(_SYNC_OUTBOX_SQL)
+    has_watermarks = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '_sync_watermarks'"
+    ).fetchone()
+    for table, key in SYNC_TABLE_KEYS.items():
+        conn.executescript(_SYNC_OUTBOX_TRIGGERS.format(table=table, key=key))
+        watermark = None
+        if has_watermarks:
+            row = conn.execute("SELECT last_sync FROM _sync_watermarks WHERE table_name = ?", (table,)).fetchone()
+            watermark = row[0] if row else None
+        where = f"{key} IS NOT NULL"
+        params = ()
+        if watermark and "last_updated" in _get_table_columns(conn, table):
+            where += " AND (last_updated > ? OR last_updated IS NULL)"
+            params = (watermark,)
+        conn.execute(
+            f"INSERT OR IGNORE INTO _sync_outbox (table_name, row_key, op) "
+            f"SELECT '{table}', {key}, 'upsert' FROM {table} WHERE {where}", params
+        )
+    conn.commit()
+
+
 def _reconstruct_teams_table_if_legacy_unique_exists(conn: sqlite3.Connection):
     """
     Remove legacy UNIQUE(name, country_code) constraint from teams table.
@@ -574,19 +804,93 @@ def _reconstruct_teams_table_if_legacy_unique_exists(conn: sqlite3.Connection):
 
 
 
-def init_db(conn: Optional[sqlite3.Connection] = None) -> sqlite3.Connection:
-    """Create all tables, run migrations, auto-import CSVs. Returns the connection."""
-    if conn is None:
-        conn = get_connection()
+def _recreate_sync_outbox_triggers(conn: sqlite3.Connection):
+    """Swap the v9 INSERT OR REPLACE capture triggers for delete-then-insert
+    ones, so UPSERTs on already-queued keys stop failing."""
+    for table, key in SYNC_TABLE_KEYS.items():
+        for suffix in ("ins", "upd", "del"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_outbox_{table}_{suffix}")
+        conn.executescript(_SYNC_OUTBOX_TRIGGERS.format(table=table, key=key))
+    conn.commit()
 
+
+def _migrate_base_schema(conn: sqlite3.Connection):
     conn.executescript(_SCHEMA_SQL)
     conn.commit()
 
-    _run_alter_migrations(conn)
-    _create_post_alter_indexes(conn)
-    _reconstruct_teams_table_if_legacy_unique_exists(conn)
-    _auto_import_csvs(conn)
 
+# Ordered, idempotent schema migrations. Each step runs once per database and
+# is recorded in schema_version; append new steps with the next version number.
+_MIGRATIONS = [
+    (1, "base schema", _migrate_base_schema),
+    (2, "add columns", _run_alter_migrations),
+    (3, "post-alter indexes", _create_post_alter_indexes),
+    (4, "drop legacy teams UNIQUE", _reconstruct_teams_table_if_legacy_unique_exists),
+    (5, "import legacy CSVs", _auto_import_csvs),
+    (6, "standings cache triggers", _create_standings_gen_triggers),
+    (7, "composite indexes", _create_composite_indexes),
+    (8, "schedules status index", _create_status_index),
+    (9, "sync outbox triggers", _create_sync_outbox),
+    (10, "outbox triggers survive upserts", _recreate_sync_outbox_triggers),
+]
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+# Database paths already migrated to SCHEMA_VERSION by this process.
+_initialized_dbs = set()
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the highest applied migration version (0 for a fresh/legacy DB)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version     INTEGER PRIMARY KEY,
+            name        TEXT,
+            applied_at  TEXT,
+            duration_ms REAL
+        )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """Apply pending migration steps in order. Returns the number applied."""
+    current = get_schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return 0
+
+    applied = 0
+    for version, name, step in _MIGRATIONS:
+        if version <= current:
+            continue
+        start = time.perf_counter()
+        step(conn)
+        duration_ms = (time.perf_counter() - start) * 1000
+        conn.execute(
+            "INSERT OR REPLACE INTO schema_version (version, name, applied_at, duration_ms) "
+            "VALUES (?, ?, ?, ?)",
+            (version, name, now_ng().isoformat(), round(duration_ms, 2)),
+        )
+        conn.commit()
+        applied += 1
+        print(f"  [Migration] v{version} {name}: {duration_ms:.1f} ms")
+    return applied
+
+
+def init_db(conn: Optional[sqlite3.Connection] = None) -> sqlite3.Connection:
+    """Bring the schema up to SCHEMA_VERSION. Returns the connection.
+
+    Migrations run at most once per process for the default database; later
+    calls return the pooled connection immediately. An explicitly passed
+    connection always gets the (single-query) version check."""
+    if conn is None:
+        conn = get_connection()
+        if DB_PATH in _initialized_dbs:
+            return conn
+        run_migrations(conn)
+        _initialized_dbs.add(DB_PATH)
+        return conn
+
+    run_migrations(conn)
     return conn
 
 
@@ -976,7 +1280,20 @@ def bulk_upsert_fixtures(conn: sqlite3.Connection, fixtures: List[Dict[str, Any]
 
 def upsert_prediction(conn: sqlite3.Connection, data: Dict[str, Any]):
     """Insert or update a prediction row."""
+    _upsert_prediction_row(conn, data, now_ng().isoformat())
+    conn.commit()
+
+
+def bulk_upsert_predictions(conn: sqlite3.Connection, rows: List[Dict[str, Any]]) -> int:
+    """upsert_prediction() for many rows in one write transaction."""
     now = now_ng().isoformat()
+    with get_pool(DB_PATH).transaction(conn):
+        for data in rows:
+            _upsert_prediction_row(conn, data, now)
+    return len(rows)
+
+
+def _upsert_prediction_row(conn: sqlite3.Connection, data: Dict[str, Any], now: str):
     # Normalize over_2.5 → over_2_5
     if "over_2.5" in data:
         data["over_2_5"] = data.pop("over_2.5")
@@ -1013,7 +1330,6 @@ def upsert_prediction(conn: sqlite3.Connection, data: Dict[str, Any]):
         f"ON CONFLICT(fixture_id) DO UPDATE SET {updates}",
         present,
     )
-    conn.commit()
 
 
 def get_predictions(conn: sqlite3.Connection, status: str = None) -> List[Dict[str, Any]]:
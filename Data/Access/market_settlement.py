@@ -0,0 +1,371 @@
+# market_settlement.py: Compiled, table-driven market settlement.
+# Part of LeoBook Data — Access Layer
+#
+# Classes: MarketSpec
+# Functions: compile_market(), settle_spec(), settle_outcome(), settle_table(), settle_rows()
+# Called by: db_helpers.py (evaluate_market_outcome) | fs_live_streamer.py | Scripts/check_market_settlement.py
+
+"""
+Market Settlement Engine
+Each distinct (prediction, home_team, away_team) is parsed once into a typed
+MarketSpec (memoized), and specs are evaluated against integer scores. The
+grammar mirrors the v5.0 evaluator rule for rule, including its fall-through
+order, so outcomes are identical ('1' won, '0' lost, '' unknown/void).
+
+settle_table() settles a whole predictions table in one pass: score
+columns are converted by numpy, specs are looked up from a memo keyed on the
+raw column values, and each spec's rows are evaluated as numpy arrays.
+Scripts/check_market_settlement.py compares this engine with the reference
+evaluator over leobook.db predictions and a fixed market corpus.
+"""
+
+import re
+import itertools
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+# Spec kinds
+RESULT = "result"            # side: home / away / draw
+DOUBLE_CHANCE = "dc"         # side: 1x / x2 / 12
+DRAW_NO_BET = "dnb"          # side: home / away, or None = void on draw else `fallback`
+TOTAL_OVER = "total_over"
+TOTAL_UNDER = "total_under"
+TEAM_OVER = "team_over"      # side: home / away
+TEAM_UNDER = "team_under"
+BTTS = "btts"                # side: yes / no
+WIN_BTTS = "win_btts"        # side: home / away
+CLEAN_SHEET = "clean_sheet"  # side: home / away (team that keeps it)
+UNKNOWN = "unknown"
+
+# match_status values meaning the game went past 90 min, i.e. was drawn at regulation FT
+REGULATION_DRAW_STATUSES = frozenset((
+    'aet', 'pen', 'after pen', 'after extra time', 'after penalties', 'ap',
+    'finished aet', 'finished ap', 'finished pen',
+))
+
+_DRAW_MARKETS = frozenset(('draw', 'x', '1x', 'x2', 'home or draw', 'home_or_draw',
+                           'away or draw', 'away_or_draw', 'draw or away',
+                           'double chance 1x', 'double chance x2'))
+_PURE_WIN = frozenset(('home win', 'home_win', '1', 'away win', 'away_win', '2'))
+
+# Fixed-string markets: p -> (kind, side, line)
+_EXACT = {}
+for _line in ("2.5", "1.5"):
+    _u = _line.replace(".", "_")
+    for _k in (f"over {_line}", f"over {_u}", f"over_{_line}", f"over_{_u}"):
+        _EXACT[_k] = (TOTAL_OVER, None, float(_line))
+    for _k in (f"under {_line}", f"under {_u}", f"under_{_line}", f"under_{_u}"):
+        _EXACT[_k] = (TOTAL_UNDER, None, float(_line))
+_EXACT.update({k: (BTTS, "yes", None) for k in ("btts yes", "btts_yes", "both teams to score yes", "both teams to score")})
+_EXACT.update({k: (BTTS, "no", None) for k in ("btts no", "btts_no", "both teams to score no")})
+_EXACT.update({k: (RESULT, "home", None) for k in ("home win", "home_win", "1")})
+_EXACT.update({k: (RESULT, "away", None) for k in ("away win", "away_win", "2")})
+_EXACT.update({k: (RESULT, "draw", None) for k in ("draw", "x")})
+_EXACT.update({k: (DOUBLE_CHANCE, "12", None) for k in ("home or away", "12", "1 2", "double chance 12")})
+_EXACT.update({k: (DOUBLE_CHANCE, "1x", None) for k in ("1x", "home or draw", "home_or_draw", "double chance 1x")})
+_EXACT.update({k: (DOUBLE_CHANCE, "x2", None) for k in ("x2", "away or draw", "away_or_draw", "draw or away", "double chance x2")})
+
+_WIN_BTTS_RE = re.compile(r'^(.+?)\s+to\s+win\s*&\s*btts\s+yes$')
+_OR_RE = re.compile(r'^(.+?)\s+or\s+(.+?)$')
+_OVER_RE = re.compile(r'over\s+([\d.]+)')
+_UNDER_RE = re.compile(r'under\s+([\d.]+)')
+
+
+@dataclass(frozen=True)
+class MarketSpec:
+    kind: str
+    side: Optional[str] = None
+    line: Optional[float] = None
+    on_extra_time: Optional[str] = None      # outcome when drawn at regulation FT (AET/pens), None = use score
+    fallback: Optional["MarketSpec"] = None  # DNB on an unrecognised team: evaluated when not a draw
+
+
+def _team_matches(candidate: str, reference: str) -> bool:
+    if not candidate or not reference:
+        return False
+    return candidate == reference or reference.startswith(candidate) or candidate.startswith(reference)
+
+
+def _side(team: str, home: str, away: str) -> Optional[str]:
+    if _team_matches(team, home):
+        return "home"
+    if _team_matches(team, away):
+        return "away"
+    return None
+
+
+def _on_extra_time(p: str) -> Optional[str]:
+    if p in _DRAW_MARKETS or ' or draw' in p or 'draw or ' in p:
+        return '1'
+    if p in _PURE_WIN:
+        return '0'
+    if p.endswith(' to win') and 'btts' not in p:
+        return '0'
+    if '(dnb)' in p:
+        return ''
+    return None
+
+
+def _compile_totals(p: str, home: str, away: str) -> MarketSpec:
+    """Steps after DNB: dynamic over/under (match or team) and clean sheet."""
+    for regex, team_kind, total_kind in ((_OVER_RE, TEAM_OVER, TOTAL_OVER), (_UNDER_RE, TEAM_UNDER, TOTAL_UNDER)):
+        m = regex.search(p)
+        if not m:
+            continue
+        line = float(m.group(1))
+        team_part = p[:m.start()].strip()
+        side = _side(team_part, home, away) if team_part else None
+        if side is None:
+            side = "away" if "away" in p else "home" if "home" in p else None
+        if side is None:
+            return MarketSpec(total_kind, None, line)
+        return MarketSpec(team_kind, side, line)
+
+    if "clean sheet" in p:
+        side = _side(p.replace(" clean sheet", "").strip(), home, away)
+        if side:
+            return MarketSpec(CLEAN_SHEET, side)
+    return MarketSpec(UNKNOWN)
+
+
+def _compile(p: str, home: str, away: str) -> MarketSpec:
+    m = _WIN_BTTS_RE.match(p)
+    if m:
+        side = _side(m.group(1).strip(), home, away)
+        if side:
+            return MarketSpec(WIN_BTTS, side)
+
+    if p in _EXACT:
+        return MarketSpec(*_EXACT[p])
+
+    if p.endswith(" to win"):
+        side = _side(p.replace(" to win", "").strip(), home, away)
+        if side:
+            return MarketSpec(RESULT, side)
+
+    if " or draw" in p:
+        side = _side(p.replace(" or draw", "").strip(), home, away)
+        if side:
+            return MarketSpec(DOUBLE_CHANCE, "1x" if side == "home" else "x2")
+    if "draw or " in p:
+        side = _side(p.replace("draw or ", "").strip(), home, away)
+        if side:
+            return MarketSpec(DOUBLE_CHANCE, "1x" if side == "home" else "x2")
+
+    m = _OR_RE.match(p)
+    if m and "draw" not in p:
+        t1, t2 = m.group(1).strip(), m.group(2).strip()
+        if ((_team_matches(t1, home) and _team_matches(t2, away))
+                or (_team_matches(t1, away) and _team_matches(t2, home))):
+            return MarketSpec(DOUBLE_CHANCE, "12")
+
+    if p.endswith(" (dnb)"):
+        side = _side(p.replace(" to win (dnb)", "").replace(" (dnb)", "").strip(), home, away)
+        if side:
+            return MarketSpec(DRAW_NO_BET, side)
+        return MarketSpec(DRAW_NO_BET, None, fallback=_compile_totals(p, home, away))
+
+    return _compile_totals(p, home, away)
+
+
+_interned: Dict[MarketSpec, MarketSpec] = {}
+
+
+@lru_cache(maxsize=65536)
+def _compile_cached(p: str, home: str, away: str) -> MarketSpec:
+    spec = _compile(p, home, away)
+    ot = _on_extra_time(p)
+    if ot is not None:
+        spec = MarketSpec(spec.kind, spec.side, spec.line, ot, spec.fallback)
+    # Equal specs share one object, so settle_table can group rows by id()
+    return _interned.setdefault(spec, spec)
+
+
+def compile_market(prediction: str, home_team: str = "", away_team: str = "") -> MarketSpec:
+    """Parse a prediction string (in the context of its teams) into a MarketSpec, memoized."""
+    return _compile_cached((prediction or '').strip().lower(),
+                           (home_team or '').strip().lower(),
+                           (away_team or '').strip().lower())
+
+
+@lru_cache(maxsize=65536)
+def _compile_raw(prediction, home_team, away_team) -> Optional[MarketSpec]:
+    """compile_market memoized on the raw column values; None for a malformed line."""
+    try:
+        return compile_market(prediction, home_team, away_team)
+    except ValueError:
+        return None
+
+
+def settle_spec(spec: MarketSpec, h: int, a: int, match_status: str = "") -> str:
+    """'1' won, '0' lost, '' unknown/void for one spec and regulation-time score."""
+    if spec.on_extra_time is not None and (match_status or '').strip().lower() in REGULATION_DRAW_STATUSES:
+        return spec.on_extra_time
+    kind, side = spec.kind, spec.side
+    if kind == RESULT:
+        won = h > a if side == "home" else a > h if side == "away" else h == a
+    elif kind == DOUBLE_CHANCE:
+        won = h >= a if side == "1x" else a >= h if side == "x2" else h != a
+    elif kind == TOTAL_OVER:
+        won = h + a > spec.line
+    elif kind == TOTAL_UNDER:
+        won = h + a < spec.line
+    elif kind == TEAM_OVER:
+        won = (h if side == "home" else a) > spec.line
+    elif kind == TEAM_UNDER:
+        won = (h if side == "home" else a) < spec.line
+    elif kind == BTTS:
+        won = (h > 0 and a > 0) == (side == "yes")
+    elif kind == WIN_BTTS:
+        won = (h > a if side == "home" else a > h) and h > 0 and a > 0
+    elif kind == CLEAN_SHEET:
+        won = (a if side == "home" else h) == 0
+    elif kind == DRAW_NO_BET:
+        if h == a:
+            return ''
+        if side is None:
+            return settle_spec(spec.fallback, h, a)
+        won = h > a if side == "home" else a > h
+    else:
+        return ''
+    return '1' if won else '0'
+
+
+def settle_outcome(prediction: str, home_score, away_score,
+                   home_team: str = "", away_team: str = "", match_status: str = "") -> str:
+    """Drop-in for evaluate_market_outcome (same arguments and results)."""
+    try:
+        h = int(home_score)
+        a = int(away_score)
+    except (ValueError, TypeError):
+        return ''
+    return settle_spec(compile_market(prediction, home_team, away_team), h, a, match_status)
+
+
+# ── Vectorized ──────────────────────────────────────────────
+
+def _settle_group(spec: MarketSpec, h: "np.ndarray", a: "np.ndarray") -> "np.ndarray":
+    """Outcome codes (1 won, 0 lost, -1 unknown/void) for one spec over score arrays."""
+    import numpy as np
+    kind, side = spec.kind, spec.side
+    if kind == RESULT:
+        won = h > a if side == "home" else a > h if side == "away" else h == a
+    elif kind == DOUBLE_CHANCE:
+        won = h >= a if side == "1x" else a >= h if side == "x2" else h != a
+    elif kind == TOTAL_OVER:
+        won = (h + a) > spec.line
+    elif kind == TOTAL_UNDER:
+        won = (h + a) < spec.line
+    elif kind == TEAM_OVER:
+        won = (h if side == "home" else a) > spec.line
+    elif kind == TEAM_UNDER:
+        won = (h if side == "home" else a) < spec.line
+    elif kind == BTTS:
+        both = (h > 0) & (a > 0)
+        won = both if side == "yes" else ~both
+    elif kind == WIN_BTTS:
+        won = (h > a if side == "home" else a > h) & (h > 0) & (a > 0)
+    elif kind == CLEAN_SHEET:
+        won = (a if side == "home" else h) == 0
+    elif kind == DRAW_NO_BET:
+        draw = h == a
+        if side is None:
+            out = _settle_group(spec.fallback, h, a)
+        else:
+            out = (h > a if side == "home" else a > h).astype(np.int8)
+        return np.where(draw, np.int8(-1), out).astype(np.int8)
+    else:
+        return np.full(h.shape, -1, dtype=np.int8)
+    return won.astype(np.int8)
+
+
+TABLE_MIN_ROWS = 128       # smaller tables settle faster row by row
+_NO_SCORE = -(2 ** 63)     # sentinel for a score int() rejects
+
+
+def _score_column(values: Sequence) -> "np.ndarray":
+    """int64 scores, _NO_SCORE where int() would fail. numpy's own int64
+    conversion accepts exactly what int() does; a column it rejects (blanks,
+    None, '2-1') is mapped through its few distinct values instead."""
+    import numpy as np
+    try:
+        return np.array(values, dtype=np.int64)
+    except (ValueError, TypeError, OverflowError):
+        pass
+    parsed = {}
+    for v in set(values):
+        try:
+            parsed[v] = int(v)
+        except (ValueError, TypeError):
+            parsed[v] = _NO_SCORE
+    return np.fromiter(map(parsed.__getitem__, values), dtype=np.int64, count=len(values))
+
+
+def _settle_row(prediction, home_score, away_score, home_team, away_team, match_status) -> str:
+    """settle_outcome, with a malformed line settled as '' like the table path does."""
+    try:
+        return settle_outcome(prediction, home_score, away_score, home_team, away_team, match_status)
+    except ValueError:
+        return ''
+
+
+def settle_table(predictions: Sequence[str], home_scores: Sequence, away_scores: Sequence,
+                 home_teams: Sequence[str], away_teams: Sequence[str],
+                 match_statuses: Optional[Sequence[str]] = None) -> List[str]:
+    """Settle parallel columns in one pass; returns '1' / '0' / '' per row.
+
+    No per-row Python frames: scores are converted as whole columns, specs
+    come from a C-level map() over the raw-key memo, and rows are grouped by
+    spec identity (specs are interned), so each spec settles its rows as one
+    numpy expression. Below TABLE_MIN_ROWS the fixed numpy overhead outweighs
+    that, and the rows are settled one by one with settle_outcome."""
+    n = len(predictions)
+    if n < TABLE_MIN_ROWS:
+        statuses = match_statuses if match_statuses is not None else [''] * n
+        return list(map(_settle_row, predictions, home_scores, away_scores, home_teams, away_teams, statuses))
+    import numpy as np      # only the table path needs it; keeps db_helpers light to import
+    h = _score_column(home_scores)
+    a = _score_column(away_scores)
+    valid = (h != _NO_SCORE) & (a != _NO_SCORE)
+
+    specs = list(map(_compile_raw, predictions, home_teams, away_teams))
+    first_of: Dict[int, int] = {}
+    firsts = np.fromiter(map(first_of.setdefault, map(id, specs), itertools.count()), dtype=np.int64, count=n)
+    reps, group = np.unique(firsts, return_inverse=True)
+    group = np.where(valid, group.reshape(-1), -1)
+
+    extra_time = None
+    if match_statuses is not None:
+        is_et = {st: (st or '').strip().lower() in REGULATION_DRAW_STATUSES for st in set(match_statuses)}
+        extra_time = np.fromiter(map(is_et.__getitem__, match_statuses), dtype=bool, count=n)
+
+    codes = np.full(n, -1, dtype=np.int8)
+    order = np.argsort(group, kind="stable")
+    bounds = np.searchsorted(group[order], np.arange(len(reps) + 1))
+    ot_code = {'1': 1, '0': 0, '': -1}
+    for k, r in enumerate(reps.tolist()):
+        spec, idx = specs[r], order[bounds[k]:bounds[k + 1]]
+        if spec is None or not len(idx):     # None: malformed line, e.g. "over 2.5.1"
+            continue
+        out = _settle_group(spec, h[idx], a[idx])
+        if spec.on_extra_time is not None and extra_time is not None:
+            out = np.where(extra_time[idx], np.int8(ot_code[spec.on_extra_time]), out)
+        codes[idx] = out
+
+    labels = np.array(['', '0', '1'])
+    return labels[codes + 1].tolist()
+
+
+def settle_rows(rows: Iterable[dict], status_key: str = "status") -> List[str]:
+    """settle_table over prediction dicts (prediction, home_score, away_score, home_team, away_team)."""
+    rows = list(rows)
+    return settle_table(
+        [r.get('prediction') or '' for r in rows],
+        [r.get('home_score') for r in rows],
+        [r.get('away_score') for r in rows],
+        [r.get('home_team') or '' for r in rows],
+        [r.get('away_team') or '' for r in rows],
+        [r.get(status_key) or '' for r in rows],
+    )
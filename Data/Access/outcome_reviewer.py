@@ -48,6 +48,7 @@ from .sync_manager import SyncManager
 from Core.Intelligence.selector_manager import SelectorManager
 from Core.Intelligence.selector_db import log_selector_failure
 from Core.Utils.constants import NAVIGATION_TIMEOUT
+from Core.System.metrics import traced_goto
 
 
 def _load_schedule_db() -> Dict[str, Dict]:
@@ -283,7 +284,7 @@ async def process_review_task_browser(page, match: Dict) -> Optional[Dict]:
 
     try:
         print(f"      [Fallback] Visiting {match.get('home_team')} vs {match.get('away_team')}...")
-        await page.goto(match_link, timeout=NAVIGATION_TIMEOUT)
+        await traced_goto(page, match_link, timeout=NAVIGATION_TIMEOUT)
         await page.wait_for_load_state("networkidle")
 
         final_score = await get_final_score(page)
@@ -11,6 +11,7 @@ Analyzes prediction accuracy and generates reports for the LeoBook system.
 import re
 import os
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Tuple
 from pathlib import Path
 from Core.Intelligence.aigo_suite import AIGOSuite
@@ -18,11 +19,21 @@ from Core.Intelligence.aigo_suite import AIGOSuite
 from .db_helpers import _get_conn
 from Data.Access.league_db import query_all
 
+_MATCH_LINE_START_RE = re.compile(r'^(over|under)\s+\d+(\.\d+)?')
+_MATCH_LINE_RE = re.compile(r'(over|under)\s+(\d+(\.\d+)?)')
+_TEAM_LINE_RE = re.compile(r'\s+(over|under)\s+(\d+(\.\d+)?)')
+
 
 def get_market_option(prediction: str, home_team: str, away_team: str) -> str:
     """
     Normalize prediction string into a generic market option.
+    Memoized per (prediction, home_team, away_team).
     """
+    return _market_option(prediction, home_team, away_team)
+
+
+@lru_cache(maxsize=16384)
+def _market_option(prediction: str, home_team: str, away_team: str) -> str:
     pred_lower = prediction.lower()
     home_lower = home_team.lower()
     away_lower = away_team.lower()
@@ -64,8 +75,8 @@ def get_market_option(prediction: str, home_team: str, away_team: str) -> str:
 
     # Match Over/Under (Starts with Over/Under)
     # e.g. "Over 2.5", "Under 3.5 Goals"
-    if re.match(r'^(over|under)\s+\d+(\.\d+)?', pred_lower):
-        match = re.search(r'(over|under)\s+(\d+(\.\d+)?)', pred_lower)
+    if _MATCH_LINE_START_RE.match(pred_lower):
+        match = _MATCH_LINE_RE.search(pred_lower)
         if match:
             type_ = match.group(1).title()
             val = match.group(2)
@@ -73,12 +84,11 @@ def get_market_option(prediction: str, home_team: str, away_team: str) -> str:
 
     # Team Over/Under (Ends with or contains " Over/Under value" but didn't start with it)
     # e.g. "Atletico-Mg U20 Over 0.5", "Team Over 1.5"
-    if re.search(r'\s+(over|under)\s+\d+(\.\d+)?', pred_lower):
-        match = re.search(r'\s+(over|under)\s+(\d+(\.\d+)?)', pred_lower)
-        if match:
-            type_ = match.group(1).title()
-            val = match.group(2)
-            return f"Team {type_} {val}"
+    match = _TEAM_LINE_RE.search(pred_lower)
+    if match:
+        type_ = match.group(1).title()
+        val = match.group(2)
+        return f"Team {type_} {val}"
 
     # Return the specific prediction name if no category matched
     return prediction.title()
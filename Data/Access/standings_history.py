@@ -0,0 +1,148 @@
+# standings_history.py: Point-in-time league standings rebuilt from schedules.
+# Part of LeoBook Data — Access Layer
+#
+# Classes: StandingsHistory
+# Called by: rl/trainer.py (train_from_fixtures) | progressive_backtester.py
+
+"""
+Historical standings for training and backtesting.
+One chronological pass over finished schedules produces, per (league, season),
+a sorted list of match dates and the table as it stood after each of them.
+as_of() then answers "standings before date D" with a bisect instead of
+re-aggregating schedules for every fixture.
+
+Snapshots live in memory only and are rebuilt per run — no standings table is
+ever written (RULEBOOK 2.5). Unchanged team rows are shared between snapshots,
+so a season costs O(match days x teams) tuple references.
+"""
+
+import time
+import sqlite3
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Same population as computed_standings(): finished matches with both scores
+_HISTORY_SQL = """
+    SELECT league_id, season, date,
+           home_team_id, home_team_name, away_team_id, away_team_name,
+           home_score, away_score
+    FROM schedules
+    WHERE match_status = 'finished'
+      AND home_score IS NOT NULL AND away_score IS NOT NULL
+      AND league_id IS NOT NULL AND date IS NOT NULL
+"""
+
+# Row layout inside a snapshot (tuples keep the memory footprint small)
+_FIELDS = ("team_id", "team_name", "played", "wins", "draws", "losses",
+           "goals_for", "goals_against", "goal_difference", "points")
+
+
+def _iso_date(value: str) -> Optional[str]:
+    """YYYY-MM-DD for either stored format (YYYY-MM-DD or DD.MM.YYYY)."""
+    if not value:
+        return None
+    if len(value) >= 10 and value[4] == "-":
+        return value[:10]
+    try:
+        return datetime.strptime(value, "%d.%m.%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _score(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _team_row(prev: Optional[tuple], team_id: str, team_name: str,
+              scored: int, conceded: int) -> tuple:
+    """A team's table row after one more match (prev=None for its first)."""
+    _, _, played, wins, draws, losses, gf, ga, _, pts = prev or (
+        team_id, team_name, 0, 0, 0, 0, 0, 0, 0, 0)
+    won, drawn, lost = scored > conceded, scored == conceded, scored < conceded
+    gf, ga = gf + scored, ga + conceded
+    return (team_id, team_name, played + 1, wins + won, draws + drawn, losses + lost,
+            gf, ga, gf - ga, pts + 3 * won + drawn)
+
+
+def _sort_key(row: tuple):
+    # ORDER BY points DESC, goal_difference DESC, goals_for DESC (name breaks ties)
+    return (-row[9], -row[8], -row[6], row[1] or "")
+
+
+class StandingsHistory:
+    """Per-(league, season) timelines of standings snapshots."""
+
+    def __init__(self):
+        # (league_id, season) -> (sorted ISO dates, snapshot per date)
+        self._timelines: Dict[Tuple[str, Any], Tuple[List[str], List[Tuple[tuple, ...]]]] = {}
+        self.stats: Dict[str, Any] = {"timelines": 0, "snapshots": 0, "matches": 0, "build_ms": 0.0}
+
+    def __len__(self) -> int:
+        return len(self._timelines)
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection) -> "StandingsHistory":
+        """One chronological pass over finished schedules."""
+        start = time.perf_counter()
+        history = cls()
+
+        by_key: Dict[Tuple[str, Any], List[tuple]] = {}
+        matches = 0
+        for league_id, season, date, h_id, h_name, a_id, a_name, hs, as_ in conn.execute(_HISTORY_SQL):
+            day = _iso_date(date)
+            hs, as_ = _score(hs), _score(as_)
+            if day is None or hs is None or as_ is None:
+                continue
+            by_key.setdefault((league_id, season), []).append(
+                (day, h_id or h_name, h_name, a_id or a_name, a_name, hs, as_))
+            matches += 1
+
+        snapshots = 0
+        for key, rows in by_key.items():
+            rows.sort(key=lambda r: r[0])
+            table: Dict[str, tuple] = {}
+            dates: List[str] = []
+            tables: List[Tuple[tuple, ...]] = []
+            for i, (day, h_id, h_name, a_id, a_name, hs, as_) in enumerate(rows):
+                table[h_id] = _team_row(table.get(h_id), h_id, h_name, hs, as_)
+                table[a_id] = _team_row(table.get(a_id), a_id, a_name, as_, hs)
+                # Close the snapshot once the day's last match is applied
+                if i + 1 == len(rows) or rows[i + 1][0] != day:
+                    dates.append(day)
+                    tables.append(tuple(sorted(table.values(), key=_sort_key)))
+            history._timelines[key] = (dates, tables)
+            snapshots += len(dates)
+
+        history.stats = {
+            "timelines": len(history._timelines),
+            "snapshots": snapshots,
+            "matches": matches,
+            "build_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        return history
+
+    def as_of(self, league_id: str, season: Any, date: str) -> List[Dict[str, Any]]:
+        """Standings from matches played strictly before date (no leakage).
+
+        Rows have the computed_standings() shape (position included); [] when
+        the league/season had no finished match before date."""
+        timeline = self._timelines.get((league_id, season))
+        day = _iso_date(date)
+        if timeline is None or day is None:
+            return []
+        dates, tables = timeline
+        idx = bisect_left(dates, day) - 1
+        if idx < 0:
+            return []
+        out = []
+        for pos, row in enumerate(tables[idx], 1):
+            entry = dict(zip(_FIELDS, row))
+            entry["league_id"] = league_id
+            entry["season"] = season
+            entry["position"] = pos
+            out.append(entry)
+        return out
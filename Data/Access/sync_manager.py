@@ -4,18 +4,24 @@
 # Classes: SyncManager
 # Functions: run_full_sync()
 
+import asyncio
+import json
 import logging
+import random
 import re
+import sqlite3
 import pandas as pd
 import numpy as np
 from tqdm import tqdm
 import os
+import httpx
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from Data.Access.supabase_client import get_supabase_client
-from Data.Access.league_db import get_connection, init_db, query_all
+from Data.Access.league_db import get_connection, init_db, SYNC_TABLE_KEYS
 from Core.Intelligence.aigo_suite import AIGOSuite
+from Core.System.metrics import get_metrics
 
 
 logger = logging.getLogger(__name__)
@@ -23,22 +29,19 @@ logger = logging.getLogger(__name__)
 # SQLite table -> Supabase table mapping
 # local_table: SQLite table name
 # remote_table: Supabase table name
-# key: primary key / conflict field
+# key: primary key / conflict field (league_db.SYNC_TABLE_KEYS — the outbox
+#      triggers are generated from the same map)
 TABLE_CONFIG = {
-    'predictions':      {'local_table': 'predictions',      'remote_table': 'predictions',      'key': 'fixture_id'},
-    'schedules':        {'local_table': 'schedules',        'remote_table': 'schedules',        'key': 'fixture_id'},
-    'teams':            {'local_table': 'teams',            'remote_table': 'teams',            'key': 'team_id'},
-    'leagues':          {'local_table': 'leagues',          'remote_table': 'leagues',          'key': 'league_id'},
-    'fb_matches':       {'local_table': 'fb_matches',       'remote_table': 'fb_matches',       'key': 'site_match_id'},
-    'profiles':         {'local_table': 'profiles',         'remote_table': 'profiles',         'key': 'id'},
-    'custom_rules':     {'local_table': 'custom_rules',     'remote_table': 'custom_rules',     'key': 'id'},
-    'rule_executions':  {'local_table': 'rule_executions',  'remote_table': 'rule_executions',  'key': 'id'},
-    'accuracy_reports': {'local_table': 'accuracy_reports', 'remote_table': 'accuracy_reports', 'key': 'report_id'},
-    'audit_log':        {'local_table': 'audit_log',        'remote_table': 'audit_log',        'key': 'id'},
-    'live_scores':      {'local_table': 'live_scores',      'remote_table': 'live_scores',      'key': 'fixture_id'},
-    'countries':        {'local_table': 'countries',        'remote_table': 'countries',        'key': 'code'},
+    table: {'local_table': table, 'remote_table': table, 'key': key}
+    for table, key in SYNC_TABLE_KEYS.items()
 }
 
+# Outbox drain: entries per round (one batch_upsert pipeline each), and retry
+# backoff (doubles per failed attempt)
+OUTBOX_BATCH = 50000
+OUTBOX_RETRY_BASE_S = 30
+OUTBOX_RETRY_MAX_S = 3600
+
 # ── Supabase auto-provisioning DDL ─────────────────────────────────────────
 # Postgres CREATE TABLE statements for each remote table.
 # Used by _ensure_remote_table() when PGRST205 (table not found) is detected.
@@ -168,6 +171,32 @@ for _tbl, _ddl in SUPABASE_SCHEMA.items():
     _cols.discard('DEFAULT')
     _ALLOWED_COLS[_tbl] = _cols
 
+# Pull tuning: rows requested per keyset page (PostgREST may cap it lower) and
+# how many tables pull_all() runs at once. Each table keeps one page in flight
+# while the previous one is written.
+PULL_PAGE_SIZE = 15000
+PULL_CONCURRENCY = 4
+
+# Push tuning: rows cleaned per pipeline stage, upload batch caps (JSON payload
+# bytes first, rows second — a 413 halves a table's byte budget down to the
+# floor), batches in flight per table, and tables pushed at once.
+PUSH_CLEAN_CHUNK = 10000
+PUSH_BATCH_BYTES = 4 * 1024 * 1024
+PUSH_BATCH_MIN_BYTES = 64 * 1024
+PUSH_BATCH_MAX_ROWS = 5000
+PUSH_CONCURRENCY = 4
+SYNC_TABLE_CONCURRENCY = 3
+
+# Retry for 429 / 5xx / transport errors: delay doubles per attempt (jittered)
+PUSH_RETRIES = 5
+PUSH_BACKOFF_BASE_S = 1.0
+PUSH_BACKOFF_MAX_S = 30.0
+
+# PostgREST / Postgres codes that mean "try again": connection and pool
+# errors, statement timeout, serialization failure, deadlock, too many connections
+_RETRYABLE_CODES = {'PGRST000', 'PGRST001', 'PGRST002', 'PGRST003',
+                    '57014', '40001', '40P01', '53300'}
+
 # Column remaps: local name → remote name (applied before schema filtering)
 _COL_REMAP = {
     'time': 'match_time',
@@ -176,13 +205,33 @@ _COL_REMAP = {
     'team_name': 'name',
 }
 
+
+
+def _error_status(err: Exception) -> Optional[str]:
+    """HTTP status or PostgREST code carried by a supabase error, as a string.
+    postgrest puts the HTTP status in .code when the body isn't JSON (gateway errors)."""
+    code = getattr(err, 'code', None)
+    if code is None:
+        code = getattr(getattr(err, 'response', None), 'status_code', None)
+    return str(code) if code is not None else None
+
+
+def _is_retryable(err: Exception) -> bool:
+    if isinstance(err, httpx.TransportError):
+        return True
+    code = _error_status(err) or ''
+    return code == '429' or (len(code) == 3 and code.startswith('5')) or code in _RETRYABLE_CODES
+
+
 class SyncManager:
     """Manages bi-directional sync between local SQLite and Supabase."""
 
-    def __init__(self):
-        self.supabase = get_supabase_client()
-        self.conn = init_db()
+    def __init__(self, supabase=None, conn=None):
+        self.supabase = supabase or get_supabase_client()
+        self.conn = conn or init_db()
         self._created_tables = set()
+        self._table_cols: Dict[str, set] = {}
+        self._push_bytes: Dict[str, int] = {}   # remote_table -> batch byte budget (shrinks on 413)
         self._ensure_watermark_table()
         if not self.supabase:
             logger.warning("[!] SyncManager initialized without Supabase connection. Sync disabled.")
@@ -194,6 +243,15 @@ class SyncManager:
                 last_sync TEXT NOT NULL DEFAULT '1970-01-01T00:00:00'
             )
         """)
+        # Keyset position of an unfinished pull (deleted once the pull completes)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS _sync_pull_cursors (
+                table_name TEXT PRIMARY KEY,
+                last_key   TEXT NOT NULL,
+                pulled     INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT
+            )
+        """)
         self.conn.commit()
 
     def _get_watermark(self, table_name: str) -> str:
@@ -202,6 +260,13 @@ class SyncManager:
         ).fetchone()
         return row[0] if row else '1970-01-01T00:00:00'
 
+    def _get_pull_cursor(self, table_name: str) -> Optional[tuple]:
+        """(last_key, rows pulled so far) of an interrupted pull, else None."""
+        row = self.conn.execute(
+            "SELECT last_key, pulled FROM _sync_pull_cursors WHERE table_name = ?", (table_name,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
     def _set_watermark(self, table_name: str, timestamp: str):
         self.conn.execute(
             "INSERT INTO _sync_watermarks (table_name, last_sync) VALUES (?, ?) "
@@ -232,13 +297,34 @@ class SyncManager:
             logger.warning(f"    [!] Table '{remote_table}' still missing after auto-create attempt.")
             return False
 
-    async def sync_on_startup(self, force_full: bool = True) -> None:
+    async def sync_on_startup(self, force_full: bool = False) -> None:
         if not self.supabase:
             return
         logger.info("Starting push-only sync on startup...")
         print("   [SYNC] Push-Only Sync — local SQLite → Supabase...")
-        for table_key, config in TABLE_CONFIG.items():
-            await self._sync_table(table_key, config, force_full=force_full)
+        errors = {k: e for k, e in (await self.push_all(force_full=force_full)).items() if e}
+        if errors:
+            table_key, err = next(iter(errors.items()))
+            raise RuntimeError(f"{len(errors)} table(s) failed to sync, first {table_key}: {err}") from err
+
+    async def push_all(self, force_full: bool = False,
+                       concurrency: int = SYNC_TABLE_CONCURRENCY) -> Dict[str, Optional[Exception]]:
+        """_sync_table() every table, at most `concurrency` at a time.
+
+        Tables are independent (own outbox entries, own batches), so one
+        failing doesn't stop the others. Returns table -> exception or None."""
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(table_key: str) -> Optional[Exception]:
+            async with sem:
+                try:
+                    await self._sync_table(table_key, TABLE_CONFIG[table_key], force_full=force_full)
+                    return None
+                except Exception as e:
+                    return e
+
+        results = await asyncio.gather(*(_one(k) for k in TABLE_CONFIG))
+        return dict(zip(TABLE_CONFIG, results))
 
     async def _sync_table(self, table_key: str, config: Dict[str, Any], force_full: bool = False) -> None:
         local_table = config['local_table']
@@ -252,7 +338,10 @@ class SyncManager:
         except Exception:
             local_count = 0
 
-        if local_count == 0:
+        # An emptied table with queued deletes is a local change, not a fresh install
+        queued_deletes = self.conn.execute(
+            "SELECT 1 FROM _sync_outbox WHERE table_name = ? LIMIT 1", (local_table,)).fetchone()
+        if local_count == 0 and not queued_deletes:
             print(f"   [{remote_table}] Empty local — bootstrapping from Supabase...")
             pulled = await self._bootstrap_from_remote(local_table, remote_table, key_field)
             if pulled > 0:
@@ -262,77 +351,150 @@ class SyncManager:
                 print(f"   [{remote_table}] ✓ Both local and remote empty")
             return
 
-        if force_full or local_count > 50000:
-            print(f"   [{remote_table}] FORCE FULL PUSH — {local_count:,} rows (watermark bypassed)")
-            local_rows = query_all(self.conn, local_table)
-            if not local_rows:
-                local_rows = []
-        else:
-            watermark = self._get_watermark(remote_table)
-            is_first_sync = watermark == '1970-01-01T00:00:00'
-            try:
-                if is_first_sync:
-                    local_rows = query_all(self.conn, local_table)
-                    if not local_rows:
-                        local_rows = []
-                else:
-                    local_rows = self.conn.execute(
-                        f"SELECT * FROM {local_table} WHERE last_updated > ? OR last_updated IS NULL",
-                        (watermark,)
-                    ).fetchall()
-                    local_rows = [dict(r) for r in local_rows]
-            except Exception as e:
-                logger.error(f"    [x] Failed to query local {local_table}: {e}")
-                return
+        if force_full:
+            queued = self.requeue_table(table_key)
+            print(f"   [{remote_table}] FORCE FULL PUSH — {queued:,} rows queued in outbox")
 
-        if not local_rows:
+        pending = self._outbox_counts(local_table)
+        if not pending:
             print(f"   [{remote_table}] ✓ Nothing to push")
             return
 
-        print(f"   [{remote_table}] Pushing {len(local_rows):,} rows to Supabase...")
-        upserted = await self.batch_upsert(table_key, local_rows)
+        print(f"   [{remote_table}] Pushing {sum(pending.values()):,} outbox changes to Supabase "
+              f"({pending.get('delete', 0):,} deletes)...")
+        pushed_ids, failed = await self._drain_outbox(table_key)
 
-        push_ids = [str(r.get(key_field, '')) for r in local_rows if r.get(key_field)]
-        if push_ids:
-            await self._verify_sync_parity(table_key, push_ids)
+        if pushed_ids:
+            await self._verify_sync_parity(table_key, pushed_ids)
+        if failed:
+            print(f"   [{remote_table}] [!] {failed:,} changes failed — kept in outbox for retry")
+        else:
+            self._set_watermark(remote_table, datetime.utcnow().isoformat())
 
-        self._set_watermark(remote_table, datetime.utcnow().isoformat())
+    # ── Outbox (change data capture) ────────────────────────────
+
+    def _outbox_counts(self, local_table: str) -> Dict[str, int]:
+        """Pending outbox entries for a table that are due now, by op."""
+        return dict(self.conn.execute(
+            "SELECT op, COUNT(*) FROM _sync_outbox WHERE table_name = ? "
+            "AND (next_attempt_at IS NULL OR next_attempt_at <= strftime('%Y-%m-%dT%H:%M:%f', 'now')) "
+            "GROUP BY op", (local_table,)
+        ).fetchall())
+
+    def requeue_table(self, table_key: str) -> int:
+        """Queue every row of a table for push (full re-sync). Returns rows queued."""
+        conf = TABLE_CONFIG[table_key]
+        local_table, key_field = conf['local_table'], conf['key']
+        cur = self.conn.execute(
+            f"INSERT OR REPLACE INTO _sync_outbox (table_name, row_key, op) "
+            f"SELECT ?, {key_field}, 'upsert' FROM {local_table} WHERE {key_field} IS NOT NULL",
+            (local_table,)
+        )
+        self.conn.commit()
+        return cur.rowcount
+
+    def _settle_outbox(self, acked: List[int], failed: List[int], error: str = None):
+        """Ack pushed entry ids; push back failed ones with exponential backoff.
+
+        Ids are per change, so a key re-changed during the push keeps its new entry."""
+        with self.conn:
+            for i in range(0, len(acked), 500):
+                chunk = acked[i:i + 500]
+                self.conn.execute(
+                    f"DELETE FROM _sync_outbox WHERE id IN ({','.join(['?'] * len(chunk))})", chunk)
+            for i in range(0, len(failed), 500):
+                chunk = failed[i:i + 500]
+                self.conn.execute(
+                    f"""UPDATE _sync_outbox SET
+                            attempts = attempts + 1,
+                            last_error = ?,
+                            next_attempt_at = strftime('%Y-%m-%dT%H:%M:%f', 'now',
+                                '+' || MIN(? * (1 << MIN(attempts, 16)), ?) || ' seconds')
+                        WHERE id IN ({','.join(['?'] * len(chunk))})""",
+                    [(error or '')[:500], OUTBOX_RETRY_BASE_S, OUTBOX_RETRY_MAX_S] + chunk)
+
+    async def _drain_outbox(self, table_key: str) -> tuple:
+        """Push due outbox entries for one table in OUTBOX_BATCH rounds.
+
+        Upserts send the current local row; deletes remove the remote row.
+        Returns (pushed upsert keys, number of failed entries)."""
+        conf = TABLE_CONFIG[table_key]
+        local_table, remote_table, key_field = conf['local_table'], conf['remote_table'], conf['key']
+        pushed_keys: List[str] = []
+        failed_total = 0
+        last_id = 0
+        # Changes captured while draining wait for the next cycle (a hot row can't pin the loop)
+        end_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM _sync_outbox").fetchone()[0]
 
-    async def _bootstrap_from_remote(self, local_table: str, remote_table: str, key_field: str) -> int:
-        """Legacy bootstrap — used only for empty-local startup fallback."""
-        total_pulled = 0
-        batch_size = 1000
-        offset = 0
         while True:
-            try:
-                res = self.supabase.table(remote_table).select("*").order(
-                    key_field, desc=False
-                ).range(offset, offset + batch_size - 1).execute()
-                rows = res.data
-                if not rows:
-                    break
-                self._upsert_rows_to_sqlite(local_table, key_field, rows)
-                total_pulled += len(rows)
-                if len(rows) < batch_size:
-                    break
-                offset += batch_size
-            except Exception as e:
-                err_str = str(e)
-                if 'PGRST205' in err_str or 'Could not find the table' in err_str:
-                    logger.info(f"      [AUTO] Table '{remote_table}' not found — creating...")
-                    if self._ensure_remote_table(remote_table):
-                        continue
-                    else:
-                        break
-                else:
-                    logger.error(f"      [Bootstrap] Pull failed at offset {offset}: {e}")
-                    break
+            entries = self.conn.execute(
+                "SELECT id, row_key, op FROM _sync_outbox WHERE table_name = ? AND id > ? AND id <= ? "
+                "AND (next_attempt_at IS NULL OR next_attempt_at <= strftime('%Y-%m-%dT%H:%M:%f', 'now')) "
+                "ORDER BY id LIMIT ?", (local_table, last_id, end_id, OUTBOX_BATCH)
+            ).fetchall()
+            if not entries:
+                break
+            last_id = entries[-1][0]
+            upserts = [(e[0], e[1]) for e in entries if e[2] == 'upsert']
+            deletes = [(e[0], e[1]) for e in entries if e[2] == 'delete']
+            acked, failed, error = [], [], None
+
+            if upserts:
+                keys = [k for _, k in upserts]
+                rows = []
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    rows.extend(dict(r) for r in self.conn.execute(
+                        f"SELECT * FROM {local_table} WHERE {key_field} IN ({','.join(['?'] * len(chunk))})",
+                        chunk))
+                try:
+                    sent_keys: List[str] = []
+                    if rows:
+                        await self.batch_upsert(table_key, rows, raise_errors=True, sent_keys=sent_keys)
+                    acked += [i for i, _ in upserts]
+                    pushed_keys += sent_keys   # cleaned rows actually sent, not the raw selection
+                except Exception as e:
+                    failed += [i for i, _ in upserts]
+                    error = str(e)
+
+            if deletes:
+                try:
+                    keys = [k for _, k in deletes]
+                    for i in range(0, len(keys), 200):
+                        chunk = keys[i:i + 200]
+                        await self._call_with_backoff(
+                            remote_table,
+                            lambda c=chunk: self.supabase.table(remote_table).delete().in_(key_field, c).execute())
+                    acked += [i for i, _ in deletes]
+                except Exception as e:
+                    failed += [i for i, _ in deletes]
+                    error = str(e)
+
+            self._settle_outbox(acked, failed, error)
+            failed_total += len(failed)
+
+        return pushed_keys, failed_total
+
+    async def _bootstrap_from_remote(self, local_table: str, remote_table: str, key_field: str) -> int:
+        """Empty-local startup fallback — same keyset pull as batch_pull()."""
+        try:
+            total_pulled = await self._keyset_pull(local_table, remote_table, key_field)
+        except Exception as e:
+            err_str = str(e)
+            if 'PGRST205' in err_str or 'Could not find the table' in err_str:
+                logger.info(f"      [AUTO] Table '{remote_table}' not found — creating...")
+                self._ensure_remote_table(remote_table)
+            else:
+                logger.error(f"      [Bootstrap] Pull failed for {remote_table}: {e}")
+            return 0
         if total_pulled > 0:
             logger.info(f"    [BOOTSTRAP] Pulled {total_pulled} rows into {local_table}.")
         return total_pulled
 
-    async def batch_pull(self, table_key: str) -> int:
-        """Force full pull from Supabase — mirrors the push pipeline."""
+    async def batch_pull(self, table_key: str, page_size: int = PULL_PAGE_SIZE) -> int:
+        """Force full pull from Supabase — keyset pages ordered on the table key.
+
+        Resumes from the persisted cursor if an earlier pull was interrupted."""
         conf = TABLE_CONFIG.get(table_key)
         if not conf or not self.supabase:
             return 0
@@ -344,7 +506,9 @@ class SyncManager:
         # Get remote count (may fail on large tables with 500)
         remote_count = None
         try:
-            count_res = self.supabase.table(remote_table).select("*", count="exact").limit(0).execute()
+            count_res = await asyncio.to_thread(
+                lambda: self.supabase.table(remote_table).select("*", count="exact").limit(0).execute()
+            )
             remote_count = count_res.count or 0
         except Exception:
             remote_count = None  # Unknown — will paginate until exhausted
@@ -358,94 +522,187 @@ class SyncManager:
         else:
             print(f"   [{remote_table}] FORCE FULL PULL -- counting... (paginating until exhausted)")
 
-        total_pulled = 0
-        page_size = 15000  # Supabase may return fewer; we paginate by actual len(rows)
-        offset = 0
+        cursor = self._get_pull_cursor(remote_table)
+        if cursor:
+            print(f"   [{remote_table}] Resuming after {key_field} = {cursor[0]} ({cursor[1]:,} rows already pulled)")
+
         disable_pbar = not logger.isEnabledFor(logging.INFO)
         pbar = tqdm(
             total=remote_count,  # None = indeterminate spinner
+            initial=cursor[1] if cursor else 0,
             desc=f"    Pulling {remote_table}",
             unit="row",
             disable=disable_pbar
         )
 
         try:
-            while True:
-                try:
-                    res = self.supabase.table(remote_table).select("*").order(
-                        key_field, desc=False
-                    ).limit(page_size).offset(offset).execute()
-                    rows = res.data
-                    if not rows:
-                        break
-
-                    self._upsert_rows_to_sqlite(local_table, key_field, rows)
-                    total_pulled += len(rows)
-                    pbar.update(len(rows))
-
-                    # Advance by ACTUAL rows received, not requested page_size
-                    offset += len(rows)
-                except Exception as batch_err:
-                    err_str = str(batch_err)
-                    if 'PGRST205' in err_str or 'Could not find the table' in err_str:
-                        logger.info(f"    [AUTO] Table '{remote_table}' missing -- skipping.")
-                        break
-                    else:
-                        raise batch_err
-
-            pbar.close()
-            if total_pulled > 0:
-                logger.info(f"    [SYNC] Pulled {total_pulled:,} rows from {remote_table}.")
-                self._set_watermark(remote_table, datetime.utcnow().isoformat())
-            else:
-                print(f"   [{remote_table}] [OK] Remote empty -- nothing to pull")
-            return total_pulled
-
+            total_pulled = await self._keyset_pull(local_table, remote_table, key_field, page_size, pbar)
         except Exception as e:
-            if 'pbar' in locals() and pbar:
-                pbar.close()
-            print(f"    [x] Pull failed for {remote_table}: {e}")
+            pbar.close()
+            err_str = str(e)
+            if 'PGRST205' in err_str or 'Could not find the table' in err_str:
+                logger.info(f"    [AUTO] Table '{remote_table}' missing -- skipping.")
+                return 0
+            print(f"    [x] Pull failed for {remote_table}: {e} (cursor kept -- rerun to resume)")
             logger.error(f"    [x] Pull failed: {e}")
             return 0
 
-    def _upsert_rows_to_sqlite(self, local_table: str, key_field: str, rows: list):
-        """Bulk upsert rows from Supabase into local SQLite."""
+        pbar.close()
+        if total_pulled > 0:
+            logger.info(f"    [SYNC] Pulled {total_pulled:,} rows from {remote_table}.")
+            self._set_watermark(remote_table, datetime.utcnow().isoformat())
+        else:
+            print(f"   [{remote_table}] [OK] Remote empty -- nothing to pull")
+        return total_pulled
+
+    async def pull_all(self, table_keys: Optional[List[str]] = None,
+                       concurrency: int = PULL_CONCURRENCY) -> Dict[str, int]:
+        """batch_pull() every table, at most `concurrency` at a time. Returns rows per table."""
+        table_keys = list(table_keys or TABLE_CONFIG)
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(table_key: str) -> int:
+            async with sem:
+                return await self.batch_pull(table_key)
+
+        counts = await asyncio.gather(*(_one(k) for k in table_keys))
+        return dict(zip(table_keys, counts))
+
+    def _fetch_page(self, remote_table: str, key_field: str, after: Optional[str], limit: int) -> list:
+        """One keyset page: rows with key > after, in key order (runs in a worker thread)."""
+        query = self.supabase.table(remote_table).select("*").order(key_field, desc=False).limit(limit)
+        if after is not None:
+            query = query.gt(key_field, after)
+        return query.execute().data
+
+    async def _keyset_pull(self, local_table: str, remote_table: str, key_field: str,
+                           page_size: int = PULL_PAGE_SIZE, pbar=None) -> int:
+        """Pull pages until an empty one, resuming from and advancing the cursor.
+
+        The next page is requested before the current one is written, so the
+        HTTP round-trip overlaps the SQLite transaction. Returns rows pulled by
+        this call (excluding any pulled before a resume)."""
+        cursor = self._get_pull_cursor(remote_table)
+        after, pulled = cursor if cursor else (None, 0)
+        total = 0
+
+        pending = asyncio.create_task(asyncio.to_thread(
+            self._fetch_page, remote_table, key_field, after, page_size))
+        try:
+            while True:
+                rows = await pending
+                if not rows:
+                    break
+                # Advance by the last key received — PostgREST may cap the page below page_size
+                after = str(rows[-1][key_field])
+                pending = asyncio.create_task(asyncio.to_thread(
+                    self._fetch_page, remote_table, key_field, after, page_size))
+
+                pulled += len(rows)
+                self._upsert_rows_to_sqlite(local_table, key_field, rows,
+                                            cursor=(remote_table, after, pulled))
+                total += len(rows)
+                if pbar is not None:
+                    pbar.update(len(rows))
+        finally:
+            if not pending.done():
+                pending.cancel()
+
+        self.conn.execute("DELETE FROM _sync_pull_cursors WHERE table_name = ?", (remote_table,))
+        self.conn.commit()
+        return total
+
+    def _local_columns(self, local_table: str) -> set:
+        cols = self._table_cols.get(local_table)
+        if cols is None:
+            cols = {c[1] for c in self.conn.execute(f"PRAGMA table_info({local_table})").fetchall()}
+            self._table_cols[local_table] = cols
+        return cols
+
+    def _upsert_rows_to_sqlite(self, local_table: str, key_field: str, rows: list,
+                               cursor: Optional[tuple] = None):
+        """Bulk upsert rows from Supabase into local SQLite in one transaction.
+
+        Rows are grouped by their non-null column set so each group is a single
+        executemany (NULLs never overwrite local values). cursor=(table, last_key,
+        pulled) is saved in the same transaction, so a resumed pull never skips
+        or re-counts a page.
+
+        Pending outbox upserts for a pulled key are dropped only if the local
+        row now matches the remote one. Where the remote has NULL and the local
+        row a value, the local edit survives the merge and stays queued."""
         if not rows:
             return
-        table_cols = [c[1] for c in self.conn.execute(
-            f"PRAGMA table_info({local_table})"
-        ).fetchall()]
+        table_cols = self._local_columns(local_table)
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        remote_nulls: Dict[Any, List[str]] = {}    # key -> columns the remote has as NULL
         for row in rows:
             if 'over_2.5' in row:
                 row['over_2_5'] = row.pop('over_2.5')
-            filtered = {k: v for k, v in row.items() if k in table_cols and v is not None}
+            filtered = {
+                k: (json.dumps(v) if isinstance(v, (dict, list)) else v)
+                for k, v in row.items() if k in table_cols and v is not None
+            }
             if not filtered or key_field not in filtered:
                 continue
-            cols = list(filtered.keys())
-            placeholders = ", ".join([f":{c}" for c in cols])
-            col_str = ", ".join(cols)
-            updates = ", ".join([f"{c} = excluded.{c}" for c in cols if c != key_field])
-            try:
+            groups.setdefault(tuple(filtered), []).append(filtered)
+            nulls = [k for k, v in row.items() if v is None and k in table_cols]
+            if nulls:
+                remote_nulls[filtered[key_field]] = nulls
+
+        with self.conn:
+            for cols, group in groups.items():
+                placeholders = ", ".join([f":{c}" for c in cols])
+                col_str = ", ".join(cols)
+                updates = ", ".join([f"{c} = excluded.{c}" for c in cols if c != key_field])
+                conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+                sql = (f"INSERT INTO {local_table} ({col_str}) VALUES ({placeholders}) "
+                       f"ON CONFLICT({key_field}) {conflict}")
+                try:
+                    self.conn.executemany(sql, group)
+                except sqlite3.Error:
+                    # Isolate the offending rows instead of dropping the whole group
+                    for row in group:
+                        try:
+                            self.conn.execute(sql, row)
+                        except sqlite3.Error as e:
+                            logger.warning(f"      [Pull] Row insert failed: {e}")
+            # Pulled rows that now match remote — drop the entries their triggers queued
+            keys = [row[key_field] for group in groups.values() for row in group]
+            diverged = self._keys_with_local_values(local_table, key_field, remote_nulls)
+            if diverged:
+                keys = [k for k in keys if k not in diverged]
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                self.conn.execute(
+                    f"DELETE FROM _sync_outbox WHERE table_name = ? AND op = 'upsert' "
+                    f"AND row_key IN ({','.join(['?'] * len(chunk))})", [local_table] + chunk)
+            if cursor:
                 self.conn.execute(
-                    f"INSERT INTO {local_table} ({col_str}) VALUES ({placeholders}) "
-                    f"ON CONFLICT({key_field}) DO UPDATE SET {updates}",
-                    filtered,
+                    "INSERT INTO _sync_pull_cursors (table_name, last_key, pulled, updated_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(table_name) DO UPDATE SET "
+                    "last_key = excluded.last_key, pulled = excluded.pulled, updated_at = excluded.updated_at",
+                    (*cursor, datetime.utcnow().isoformat()),
                 )
-            except Exception as e:
-                logger.warning(f"      [Pull] Row insert failed: {e}")
-        self.conn.commit()
 
-    async def batch_upsert(self, table_key: str, data: List[Dict[str, Any]]) -> int:
-        """Upsert a batch of data to Supabase with strict cleaning (pandas vectorized)."""
-        if not self.supabase or not data:
-            return 0
-
-        conf = TABLE_CONFIG.get(table_key)
-        if not conf:
-            return 0
-
-        remote_table = conf['remote_table']
-        conflict_key = conf['key']
+    def _keys_with_local_values(self, local_table: str, key_field: str,
+                                remote_nulls: Dict[Any, List[str]]) -> set:
+        """Keys whose local row holds a value in a column the remote has as NULL."""
+        diverged = set()
+        keys = list(remote_nulls)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            cur = self.conn.execute(
+                f"SELECT * FROM {local_table} WHERE {key_field} IN ({','.join(['?'] * len(chunk))})", chunk)
+            names = [d[0] for d in cur.description]
+            for values in cur:
+                r = dict(zip(names, values))
+                if any(r.get(c) is not None for c in remote_nulls.get(r[key_field], ())):
+                    diverged.add(r[key_field])
+        return diverged
+
+    def _clean_rows(self, remote_table: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Strict cleaning (pandas vectorized) — the CPU stage of batch_upsert()."""
         allowed = _ALLOWED_COLS.get(remote_table, set())
 
         df = pd.DataFrame(data)
@@ -484,49 +741,157 @@ class SyncManager:
         df = df.replace([np.nan, np.inf, -np.inf], None)
         df = df.where(pd.notna(df), None)
 
-        cleaned_data = df.to_dict('records')
-
-        # Deduplicate
-        keys = [k.strip() for k in conflict_key.split(',')]
-        seen = set()
-        deduped = []
-        for row in cleaned_data:
+        # Column-wise tolist() yields native Python scalars like to_dict('records')
+        # without its per-cell boxing (the dominant cost of this stage)
+        columns = list(df.columns)
+        return [dict(zip(columns, values)) for values in zip(*(df[c].tolist() for c in columns))]
+
+    def _prepare_batches(self, remote_table: str, keys: List[str],
+                         data: List[Dict[str, Any]], seen: set) -> List[List[Dict[str, Any]]]:
+        """Clean, deduplicate (first occurrence wins, across chunks via seen) and
+        cut into upload batches of at most the table's byte budget / PUSH_BATCH_MAX_ROWS.
+        Runs in a worker thread."""
+        limit = self._push_bytes.get(remote_table, PUSH_BATCH_BYTES)
+        batches: List[List[Dict[str, Any]]] = []
+        batch: List[Dict[str, Any]] = []
+        size = 0
+        for row in self._clean_rows(remote_table, data):
             kv = tuple(str(row.get(k, '')) for k in keys)
-            if kv and kv not in seen:
-                seen.add(kv)
-                deduped.append(row)
+            if kv in seen:
+                continue
+            seen.add(kv)
+            row_bytes = len(json.dumps(row, default=str)) + 1
+            if batch and (size + row_bytes > limit or len(batch) >= PUSH_BATCH_MAX_ROWS):
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(row)
+            size += row_bytes
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _call_with_backoff(self, remote_table: str, fn):
+        """Run a blocking supabase call in a worker thread, retrying 429 / 5xx /
+        transport errors with jittered exponential backoff (PUSH_RETRIES times)."""
+        for attempt in range(PUSH_RETRIES + 1):
+            try:
+                return await asyncio.to_thread(fn)
+            except Exception as e:
+                if attempt == PUSH_RETRIES or not _is_retryable(e):
+                    raise
+                delay = min(PUSH_BACKOFF_BASE_S * (2 ** attempt), PUSH_BACKOFF_MAX_S) * random.uniform(0.5, 1.0)
+                logger.warning(f"    [SYNC] {remote_table}: {_error_status(e) or type(e).__name__} — "
+                               f"retry {attempt + 1}/{PUSH_RETRIES} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _upload_batch(self, remote_table: str, conflict_key: str, batch: List[Dict[str, Any]]) -> None:
+        """Upsert one batch. A 413 shrinks the table's byte budget and splits the batch;
+        a missing table (PGRST205) is auto-created once."""
+        def _send():
+            self.supabase.table(remote_table).upsert(batch, on_conflict=conflict_key).execute()
+
+        try:
+            await self._call_with_backoff(remote_table, _send)
+        except Exception as e:
+            err_str = str(e)
+            if 'PGRST205' in err_str or 'Could not find the table' in err_str:
+                logger.info(f"    [AUTO] Table '{remote_table}' missing during upsert — auto-creating...")
+                if not await asyncio.to_thread(self._ensure_remote_table, remote_table):
+                    raise
+                await self._call_with_backoff(remote_table, _send)
+            elif _error_status(e) == '413' and len(batch) > 1:
+                # Budget follows the rejected payload, not the current budget, so
+                # concurrent 413s from one oversize round don't compound
+                rejected = len(json.dumps(batch, default=str))
+                budget = self._push_bytes.get(remote_table, PUSH_BATCH_BYTES)
+                new_budget = max(min(budget, rejected // 2), PUSH_BATCH_MIN_BYTES)
+                if new_budget < budget:
+                    self._push_bytes[remote_table] = new_budget
+                    logger.warning(f"    [SYNC] {remote_table}: payload too large — batch bytes now {new_budget:,}")
+                mid = len(batch) // 2
+                await self._upload_batch(remote_table, conflict_key, batch[:mid])
+                await self._upload_batch(remote_table, conflict_key, batch[mid:])
+            else:
+                raise
+
+    async def batch_upsert(self, table_key: str, data: List[Dict[str, Any]],
+                           raise_errors: bool = False, sent_keys: Optional[List[str]] = None) -> int:
+        """Upsert a batch of data to Supabase with strict cleaning (pandas vectorized).
 
-        if not deduped:
+        Pipelined: each PUSH_CLEAN_CHUNK of rows is cleaned and cut into
+        byte-bounded batches in a worker thread while up to PUSH_CONCURRENCY
+        earlier batches upload, so the event loop is never blocked on pandas
+        or HTTP. The first failed batch stops the rest.
+
+        raise_errors=True re-raises a failed push instead of returning 0, so the
+        outbox drain can tell "nothing to send" from "send failed". sent_keys,
+        if given, receives the conflict key of every row that was uploaded
+        (after cleaning, which may drop rows such as auto-increment audit ids)."""
+        if not self.supabase or not data:
             return 0
 
-        try:
-            api_batch_size = 5000
-            disable_pbar = not logger.isEnabledFor(logging.INFO)
-            pbar = tqdm(total=len(deduped), desc=f"    Pushing {remote_table}", unit="row", disable=disable_pbar)
-            for i in range(0, len(deduped), api_batch_size):
-                batch = deduped[i:i + api_batch_size]
+        conf = TABLE_CONFIG.get(table_key)
+        if not conf:
+            return 0
+
+        remote_table = conf['remote_table']
+        conflict_key = conf['key']
+        keys = [k.strip() for k in conflict_key.split(',')]
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PUSH_CONCURRENCY * 2)
+        errors: List[Exception] = []
+        sent = 0
+        disable_pbar = not logger.isEnabledFor(logging.INFO)
+        pbar = tqdm(total=len(data), desc=f"    Pushing {remote_table}", unit="row", disable=disable_pbar)
+
+        async def _produce():
+            seen: set = set()
+            try:
+                for start in range(0, len(data), PUSH_CLEAN_CHUNK):
+                    if errors:
+                        break
+                    chunk = data[start:start + PUSH_CLEAN_CHUNK]
+                    batches = await asyncio.to_thread(self._prepare_batches, remote_table, keys, chunk, seen)
+                    pbar.total -= len(chunk) - sum(len(b) for b in batches)
+                    for batch in batches:
+                        await queue.put(batch)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                for _ in range(PUSH_CONCURRENCY):
+                    await queue.put(None)
+
+        async def _upload():
+            nonlocal sent
+            while (batch := await queue.get()) is not None:
+                if errors:
+                    continue  # keep draining so the producer never blocks
                 try:
-                    self.supabase.table(remote_table).upsert(batch, on_conflict=conflict_key).execute()
-                except Exception as batch_err:
-                    err_str = str(batch_err)
-                    if 'PGRST205' in err_str or 'Could not find the table' in err_str:
-                        logger.info(f"    [AUTO] Table '{remote_table}' missing during upsert — auto-creating...")
-                        if self._ensure_remote_table(remote_table):
-                            self.supabase.table(remote_table).upsert(batch, on_conflict=conflict_key).execute()
-                        else:
-                            raise batch_err
-                    else:
-                        raise batch_err
-                pbar.update(len(batch))
-            pbar.close()
-            logger.info(f"    [SYNC] Upserted {len(deduped):,} rows to {remote_table}.")
-            return len(deduped)
-        except Exception as e:
-            if 'pbar' in locals() and pbar:
-                pbar.close()
-            print(f"    [x] Upsert failed for {remote_table}: {e}")
-            logger.error(f"    [x] Upsert failed: {e}")
+                    async with metrics.span("sync.batch", table=remote_table):
+                        await self._upload_batch(remote_table, conflict_key, batch)
+                    sent += len(batch)
+                    if sent_keys is not None:
+                        sent_keys.extend(",".join(str(r.get(k, '')) for k in keys) for r in batch)
+                    pbar.update(len(batch))
+                except Exception as e:
+                    errors.append(e)
+
+        metrics = get_metrics()
+        async with metrics.span("sync.upsert", table=remote_table):
+            await asyncio.gather(_produce(), *(_upload() for _ in range(PUSH_CONCURRENCY)))
+        pbar.close()
+        metrics.counter("leo_sync_rows_total", sent, table=remote_table, outcome="sent")
+
+        if errors:
+            metrics.counter("leo_sync_rows_total", len(data) - sent, table=remote_table, outcome="failed")
+            print(f"    [x] Upsert failed for {remote_table}: {errors[0]}")
+            logger.error(f"    [x] Upsert failed: {errors[0]}")
+            if raise_errors:
+                raise errors[0]
             return 0
+        if sent:
+            logger.info(f"    [SYNC] Upserted {sent:,} rows to {remote_table}.")
+        return sent
 
     async def _verify_sync_parity(self, table_key: str, pushed_ids: List[str], sample_size: int = 10) -> None:
         if not pushed_ids:
@@ -538,7 +903,8 @@ class SyncManager:
         sample_ids = pushed_ids[:sample_size] if len(pushed_ids) <= sample_size else np.random.choice(pushed_ids, sample_size, replace=False).tolist()
         logger.info(f"    Verifying parity for {len(sample_ids)} sample rows...")
         try:
-            res = self.supabase.table(remote_table).select("*").in_(key_field, sample_ids).execute()
+            res = await asyncio.to_thread(
+                lambda: self.supabase.table(remote_table).select("*").in_(key_field, sample_ids).execute())
             remote_rows = {str(r[key_field]): r for r in res.data}
             placeholders = ",".join(["?"] * len(sample_ids))
             local_data = self.conn.execute(
@@ -575,9 +941,11 @@ class SyncManager:
 
 
 @AIGOSuite.aigo_retry(max_retries=3, delay=2.0, use_aigo=False)
-async def run_full_sync(session_name: str = "Periodic", force_full: bool = False) -> bool:
+async def run_full_sync(session_name: str = "Periodic", force_full: bool = False,
+                        concurrency: int = SYNC_TABLE_CONCURRENCY) -> bool:
     """Wrapper to sync ALL tables with audit logging and AIGO protection.
-    force_full=True pushes every row (bypasses watermark)."""
+    Each table pushes only its outbox; force_full=True re-queues every row first.
+    Up to `concurrency` tables push at once (1 = one after another)."""
     from Data.Access.db_helpers import log_audit_event
     logger.info(f"Starting global full sync [{session_name}] {'(FULL)' if force_full else ''}...")
 
@@ -587,14 +955,13 @@ async def run_full_sync(session_name: str = "Periodic", force_full: bool = False
     fail_count = 0
     errors = []
 
-    for table_key, config in TABLE_CONFIG.items():
-        try:
-            await manager._sync_table(table_key, config, force_full=force_full)
+    for table_key, err in (await manager.push_all(force_full=force_full, concurrency=concurrency)).items():
+        if err is None:
             success_count += 1
-        except Exception as e:
-            logger.error(f"    [Sync Fatal] {table_key}: {e}")
+        else:
+            logger.error(f"    [Sync Fatal] {table_key}: {err}")
             fail_count += 1
-            errors.append(f"{table_key}: {str(e)}")
+            errors.append(f"{table_key}: {str(err)}")
 
     status = "success" if fail_count == 0 else "partial_failure" if success_count > 0 else "failed"
     msg = f"Full Chapter Sync ({session_name}): {success_count} passed, {fail_count} failed."
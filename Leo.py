@@ -9,7 +9,6 @@ import os
 import sys
 from datetime import datetime as dt
 from dotenv import load_dotenv
-from playwright.async_api import async_playwright
 
 # Apply nest_asyncio for nested loops
 nest_asyncio.apply()
@@ -45,36 +44,81 @@ def validate_config():
     
     print("[CONFIG] All required environment variables validated.")
 
-# Validate configuration on startup
-validate_config()
-
 # --- Modular Imports (all logic is external) ---
+# Only argument parsing and the retry decorator load eagerly; everything else is a
+# lazy proxy resolved on first use, so `--accuracy` never pays for torch or playwright.
 from Core.System.lifecycle import (
     log_state, log_audit_state, setup_terminal_logging, parse_args, state
 )
 from Core.Intelligence.aigo_suite import AIGOSuite
-from Core.System.withdrawal_checker import (
-    check_triggers, propose_withdrawal, calculate_proposed_amount, get_latest_win,
-    check_withdrawal_approval, execute_withdrawal
-)
-from Core.System.scheduler import (
-    TaskScheduler, TASK_WEEKLY_ENRICHMENT, TASK_DAY_BEFORE_PREDICT, TASK_RL_TRAINING
-)
-from Core.System.data_readiness import (
-    check_leagues_ready, check_seasons_ready, check_rl_ready, auto_remediate
-)
-from Data.Access.db_helpers import init_csvs, log_audit_event
-from Data.Access.sync_manager import SyncManager, run_full_sync
-from Data.Access.league_db import init_db
-from Scripts.enrich_all_schedules import enrich_all_schedules
-from Modules.Flashscore.fs_live_streamer import live_score_streamer
-from Modules.FootballCom.fb_manager import run_odds_harvesting, run_automated_booking
-from Scripts.recommend_bets import get_recommendations
-from Core.Intelligence.prediction_pipeline import run_predictions, get_weekly_fixtures
-from Scripts.enrich_leagues import main as run_league_enricher
-from Modules.Assets.asset_manager import sync_team_assets, sync_league_assets, sync_region_flags
-from Scripts.football_logos import download_all_logos
-from Scripts.upgrade_crests import upgrade_all_crests
+from Core.System.lazy_loader import lazy, CommandRegistry
+
+async_playwright = lazy("playwright.async_api:async_playwright")
+check_triggers = lazy("Core.System.withdrawal_checker:check_triggers")
+propose_withdrawal = lazy("Core.System.withdrawal_checker:propose_withdrawal")
+calculate_proposed_amount = lazy("Core.System.withdrawal_checker:calculate_proposed_amount")
+get_latest_win = lazy("Core.System.withdrawal_checker:get_latest_win")
+check_withdrawal_approval = lazy("Core.System.withdrawal_checker:check_withdrawal_approval")
+execute_withdrawal = lazy("Core.System.withdrawal_checker:execute_withdrawal")
+TaskScheduler = lazy("Core.System.scheduler:TaskScheduler")
+check_leagues_ready = lazy("Core.System.data_readiness:check_leagues_ready")
+check_seasons_ready = lazy("Core.System.data_readiness:check_seasons_ready")
+check_rl_ready = lazy("Core.System.data_readiness:check_rl_ready")
+init_csvs = lazy("Data.Access.db_helpers:init_csvs")
+log_audit_event = lazy("Data.Access.db_helpers:log_audit_event")
+SyncManager = lazy("Data.Access.sync_manager:SyncManager")
+run_full_sync = lazy("Data.Access.sync_manager:run_full_sync")
+init_db = lazy("Data.Access.league_db:init_db")
+print_accuracy_report = lazy("Data.Access.prediction_accuracy:print_accuracy_report")
+run_review_process = lazy("Data.Access.outcome_reviewer:run_review_process")
+enrich_all_schedules = lazy("Scripts.enrich_all_schedules:enrich_all_schedules")
+live_score_streamer = lazy("Modules.Flashscore.fs_live_streamer:live_score_streamer")
+run_flashscore_analysis = lazy("Modules.Flashscore.manager:run_flashscore_analysis")
+run_odds_harvesting = lazy("Modules.FootballCom.fb_manager:run_odds_harvesting")
+run_automated_booking = lazy("Modules.FootballCom.fb_manager:run_automated_booking")
+extract_balance = lazy("Modules.FootballCom.navigator:extract_balance")
+get_recommendations = lazy("Scripts.recommend_bets:get_recommendations")
+run_predictions = lazy("Core.Intelligence.prediction_pipeline:run_predictions")
+get_weekly_fixtures = lazy("Core.Intelligence.prediction_pipeline:get_weekly_fixtures")
+run_league_enricher = lazy("Scripts.enrich_leagues:main")
+build_search = lazy("Scripts.build_search_dict:main")
+enrich_batch_teams_search_dict = lazy("Scripts.build_search_dict:enrich_batch_teams_search_dict")
+sync_team_assets = lazy("Modules.Assets.asset_manager:sync_team_assets")
+sync_league_assets = lazy("Modules.Assets.asset_manager:sync_league_assets")
+sync_region_flags = lazy("Modules.Assets.asset_manager:sync_region_flags")
+download_all_logos = lazy("Scripts.football_logos:download_all_logos")
+upgrade_all_crests = lazy("Scripts.upgrade_crests:upgrade_all_crests")
+RuleEngineManager = lazy("Core.Intelligence.rule_engine_manager:RuleEngineManager")
+run_progressive_backtest = lazy("Core.Intelligence.progressive_backtester:run_progressive_backtest")
+RLTrainer = lazy("Core.Intelligence.rl.trainer:RLTrainer")
+Supervisor = lazy("Core.System.supervisor:Supervisor")
+
+# Every CLI target and what it runs on, in run_utility's precedence order.
+# Scripts/check_startup_budget.py preloads these to hold each mode to its budget.
+COMMANDS = CommandRegistry()
+COMMANDS.register("sync", init_csvs, run_full_sync)
+COMMANDS.register("reset_sync", init_csvs, init_db, SyncManager)
+COMMANDS.register("pull", init_csvs, init_db, SyncManager)
+COMMANDS.register("recommend", init_csvs, get_recommendations)
+COMMANDS.register("accuracy", init_csvs, print_accuracy_report)
+COMMANDS.register("search_dict", init_csvs, build_search)
+COMMANDS.register("review", init_csvs, async_playwright, run_review_process, print_accuracy_report)
+COMMANDS.register("streamer", init_csvs, async_playwright, live_score_streamer)
+COMMANDS.register("rule_engine", init_csvs, RuleEngineManager, run_progressive_backtest)
+COMMANDS.register("assets", init_csvs, sync_team_assets, sync_league_assets, sync_region_flags)
+COMMANDS.register("logos", init_csvs, download_all_logos)
+COMMANDS.register("enrich_leagues", init_csvs, run_league_enricher)
+COMMANDS.register("upgrade_crests", init_csvs, upgrade_all_crests)
+COMMANDS.register("train_rl", init_csvs, RLTrainer)
+COMMANDS.register("prologue", init_csvs, async_playwright, log_audit_event, check_leagues_ready,
+                  check_seasons_ready, run_league_enricher, mode="granular")
+COMMANDS.register("chapter_1", init_csvs, async_playwright, log_audit_event, get_weekly_fixtures,
+                  enrich_batch_teams_search_dict, run_odds_harvesting, run_predictions,
+                  get_recommendations, run_full_sync, flag="", mode="granular")
+COMMANDS.register("chapter_2", init_csvs, async_playwright, log_audit_event, run_automated_booking,
+                  extract_balance, check_triggers, check_withdrawal_approval, run_full_sync,
+                  flag="", mode="granular")
+COMMANDS.register("cycle", Supervisor, flag="", mode="cycle")
 
 # Configuration
 DEFAULT_CYCLE_HOURS = int(os.getenv('LEO_CYCLE_WAIT_HOURS', 6))
@@ -137,7 +181,6 @@ async def auto_remediate(target: str):
         elif target == "seasons":
             await run_league_enricher(num_seasons=2)
         elif target == "rl":
-            from Core.Intelligence.rl.trainer import RLTrainer
             trainer = RLTrainer()
             trainer.train_from_fixtures()
         print(f"  [AUTO] Remediation cycle completed.")
@@ -215,7 +258,6 @@ async def run_chapter_1_p1(p):
 
         # --- Smart SearchDict: only this week's unmatched teams ---
         try:
-            from Data.Access.league_db import init_db
             from Data.Access.db_helpers import _get_conn
             conn = _get_conn()
             weekly_fixtures = get_weekly_fixtures(conn)
@@ -248,7 +290,6 @@ async def run_chapter_1_p1(p):
                               for tid, tname in team_set if tid not in enriched_ids]
 
                 if unenriched:
-                    from Scripts.build_search_dict import enrich_batch_teams_search_dict
                     cap = min(len(unenriched), 100)
                     print(f"    [SearchDict] Retrying enrichment for {cap}/{len(unenriched)} teams needed for this week...")
                     await enrich_batch_teams_search_dict(unenriched[:cap])
@@ -346,7 +387,6 @@ async def run_chapter_2_p2(p):
         print("  CHAPTER 2 PAGE 2: Funds & Withdrawal Check")
         print("=" * 60)
         async with await p.chromium.launch(headless=True) as check_browser:
-            from Modules.FootballCom.navigator import extract_balance
             check_page = await check_browser.new_page()
             state["current_balance"] = await extract_balance(check_page)
 
@@ -371,6 +411,7 @@ async def run_chapter_2_p2(p):
 
 async def execute_scheduled_tasks(scheduler: TaskScheduler, p=None):
     """Execute all pending scheduled tasks."""
+    from Core.System.scheduler import TASK_WEEKLY_ENRICHMENT, TASK_DAY_BEFORE_PREDICT, TASK_RL_TRAINING
     pending = scheduler.get_pending_tasks()
     if not pending:
         return
@@ -422,22 +463,25 @@ async def run_utility(args):
 
     elif getattr(args, 'reset_sync', None):
         print(f"\n  --- LEO: Reset Sync Watermark [{args.reset_sync}] ---")
-        conn = init_db()
+        init_db()
         table = args.reset_sync.lower()
-        conn.execute("DELETE FROM _sync_watermarks WHERE table_name = ?", (table,))
-        conn.commit()
-        print(f"  [SUCCESS] Watermark for '{table}' reset. Run with --sync to push all rows.")
+        from Data.Access.sync_manager import TABLE_CONFIG
+        if table not in TABLE_CONFIG:
+            print(f"  [ERROR] Unknown table '{table}'. Choose from: {', '.join(TABLE_CONFIG)}")
+        else:
+            sync_mgr = SyncManager()
+            sync_mgr.conn.execute("DELETE FROM _sync_watermarks WHERE table_name = ?", (table,))
+            queued = sync_mgr.requeue_table(table)
+            print(f"  [SUCCESS] Watermark for '{table}' reset and {queued:,} rows queued. Run with --sync to push them.")
 
     elif getattr(args, 'pull', False):
         print("\n  --- LEO: FORCE FULL PULL -- Supabase -> local SQLite ---")
         init_db()
         sync_mgr = SyncManager()
         from Data.Access.sync_manager import TABLE_CONFIG
-        print("   [SYNC] Force Full Pull -- Supabase -> local SQLite...")
-        total = 0
-        for table_key in TABLE_CONFIG:
-            pulled = await sync_mgr.batch_pull(table_key)
-            total += pulled
+        print("   [SYNC] Force Full Pull -- Supabase -> local SQLite (keyset, resumable)...")
+        counts = await sync_mgr.pull_all()
+        total = sum(counts.values())
         print(f"\n  [SUCCESS] Total pulled: {total:,} rows across {len(TABLE_CONFIG)} tables")
 
     elif args.recommend:
@@ -450,13 +494,11 @@ async def run_utility(args):
 
     elif args.search_dict:
         print("\n  --- LEO: Rebuild Search Dictionary ---")
-        from Scripts.build_search_dict import main as build_search
         await build_search()
 
     elif args.review:
         print("\n  --- LEO: Outcome Review ---")
         async with async_playwright() as p:
-            from Data.Access.outcome_reviewer import run_review_process
             await run_review_process(p)
             print_accuracy_report()
 
@@ -466,7 +508,6 @@ async def run_utility(args):
             await live_score_streamer(p)
 
     elif args.rule_engine:
-        from Core.Intelligence.rule_engine_manager import RuleEngineManager
 
         if args.list:
             print("\n  --- LEO: Rule Engine Registry ---")
@@ -490,10 +531,9 @@ async def run_utility(args):
                 RuleEngineManager.print_engine_list()
 
         elif args.backtest:
-            from Core.Intelligence.progressive_backtester import run_progressive_backtest
             engine_id = args.id or RuleEngineManager.get_default()["id"]
             start_date = args.from_date or "2025-08-01"
-            await run_progressive_backtest(engine_id, start_date)
+            await run_progressive_backtest(engine_id, start_date, args.to_date, workers=args.workers)
 
         else:
             # Default: show current default engine
@@ -535,17 +575,16 @@ async def run_utility(args):
 
     elif args.train_rl:
         print("\n  --- LEO: RL Model Training ---")
-        from Core.Intelligence.rl.trainer import RLTrainer
         trainer = RLTrainer()
         league_id = getattr(args, 'league', None)
         if league_id:
             print(f"  [RL] Fine-tuning league adapter: {league_id}")
             # Load existing model, then fine-tune specific league
             trainer.load()
-            trainer.train_from_fixtures()  # Full retrain with league focus
+            trainer.train_from_fixtures(resume=args.rl_resume, per_match=args.rl_per_match)  # Full retrain with league focus
         else:
             print("  [RL] Full chronological training from historical fixtures...")
-            trainer.train_from_fixtures()
+            trainer.train_from_fixtures(resume=args.rl_resume, per_match=args.rl_per_match)
         print("  [SUCCESS] RL training complete.")
 
 
@@ -623,7 +662,6 @@ async def main():
         f.write(str(os.getpid()))
 
     try:
-        from Core.System.supervisor import Supervisor
         supervisor = Supervisor()
         await supervisor.run()
     finally:
@@ -639,17 +677,11 @@ async def main():
 
 if __name__ == "__main__":
     args = parse_args()
+    validate_config()
     log_file, original_stdout, original_stderr = setup_terminal_logging(args)
 
     # Determine which mode to run
-    is_utility = any([args.sync, getattr(args, 'pull', False),
-                      getattr(args, 'reset_sync', None),
-                      args.recommend, args.accuracy,
-                      args.search_dict, args.review,
-                      args.rule_engine, args.streamer,
-                      args.assets,
-                      args.logos, args.enrich_leagues, args.upgrade_crests,
-                      args.train_rl])
+    is_utility = COMMANDS.selected(args, mode="utility") is not None
     is_granular = args.prologue or args.chapter is not None
 
     try:
@@ -715,6 +747,56 @@ if __name__ == "__main__":
             print("=" * 80)
             sys.exit(0)
 
+        if args.standings_check:
+            import time
+            from Data.Access.league_db import rebuild_standings_cache, verify_standings_cache
+            print("\n[Standings] Full rebuild...")
+            t0 = time.time()
+            counts = rebuild_standings_cache()
+            print(f"  [Standings] {counts['leagues']} leagues, {counts['entries']} tables cached in {time.time() - t0:.2f}s")
+            mismatched = verify_standings_cache()
+            if mismatched:
+                for league_id, season in mismatched:
+                    print(f"  [Standings] MISMATCH {league_id} {season or '(all seasons)'}")
+                sys.exit(1)
+            print("  [Standings] Cache consistent with schedules.")
+            sys.exit(0)
+
+        if args.llm_cache_stats:
+            from Core.Intelligence.llm_cache import get_llm_cache
+            stats = get_llm_cache().stats()
+            if not stats["enabled"]:
+                print("\n[LLM Cache] Disabled (LLM_CACHE=0)")
+                sys.exit(0)
+            print(f"\n[LLM Cache] {stats['entries']} entries, {stats['size_mb']} / {stats['max_mb']} MB, TTL {stats['ttl_s'] // 3600}h")
+            print(f"{'CALLER':<60} | {'HITS':>6} | {'MISSES':>6} | {'RATE':>6} | {'SAVED':>8}")
+            print("-" * 100)
+            for caller, c in stats["callers"].items():
+                print(f"{caller:<60} | {c['hits']:>6} | {c['misses']:>6} | {c['hit_rate'] * 100:>5.1f}% | {c['saved_s']:>7.1f}s")
+            sys.exit(0)
+
+        if args.metrics_report:
+            from Core.System.metrics import get_metrics
+            report = get_metrics().report(args.metrics_report)
+            if not report["enabled"]:
+                print("\n[Metrics] Disabled (LEO_METRICS=0)")
+                sys.exit(0)
+            if not report["run_id"]:
+                print("\n[Metrics] No spans recorded yet.")
+                sys.exit(0)
+            print(f"\n[Metrics] Run {report['run_id']}")
+            print(f"{'SPAN':<20} | {'LABELS':<40} | {'COUNT':>6} | {'TOTAL':>9} | {'P50':>8} | {'P95':>8} | {'MAX':>8} | {'ERR':>4}")
+            print("-" * 122)
+            for sp in report["spans"]:
+                labels = ",".join(f"{k}={v}" for k, v in sp["labels"].items())[:40]
+                print(f"{sp['name']:<20} | {labels:<40} | {sp['count']:>6} | {sp['total_s']:>8.2f}s | "
+                      f"{sp['p50_ms']:>6.0f}ms | {sp['p95_ms']:>6.0f}ms | {sp['max_ms']:>6.0f}ms | {sp['errors']:>4}")
+            print(f"\n{'DB OP':<10} | {'TABLE':<30} | {'QUERIES':>8} | {'TOTAL':>9}")
+            print("-" * 66)
+            for q in report["queries"]:
+                print(f"{q['labels'].get('op', ''):<10} | {q['labels'].get('table', ''):<30} | {q['count']:>8} | {q['total_s']:>8.2f}s")
+            sys.exit(0)
+
         if args.set_expected_matches:
             from Data.Access.league_db import get_connection
             league_id, season, count = args.set_expected_matches
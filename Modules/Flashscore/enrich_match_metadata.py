@@ -19,6 +19,7 @@ import asyncio
 from playwright.async_api import Page
 from Core.Intelligence.selector_manager import SelectorManager
 from Data.Access.db_helpers import save_region_league_entry, save_team_entry, save_schedule_entry
+from Core.System.metrics import traced_goto
 
 
 def strip_league_stage(league_name: str):
@@ -99,7 +100,7 @@ async def extract_match_page_metadata(page: Page, match_data: dict) -> dict:
         if league_url:
             try:
                 # Navigate to the league page â€” JS injects the season hash into the URL
-                await page.goto(league_url, wait_until='domcontentloaded', timeout=30000)
+                await traced_goto(page, league_url, wait_until='domcontentloaded', timeout=30000)
                 await asyncio.sleep(5)  # Allow JS to update URL with season hash
 
                 final_url = page.url
@@ -136,7 +137,7 @@ async def extract_match_page_metadata(page: Page, match_data: dict) -> dict:
                 # --- Navigate back to match page for caller ---
                 match_link = match_data.get('match_link', '')
                 if match_link:
-                    await page.goto(match_link, wait_until='domcontentloaded', timeout=30000)
+                    await traced_goto(page, match_link, wait_until='domcontentloaded', timeout=30000)
                     await asyncio.sleep(1.5)
 
             except Exception as visit_e:
@@ -22,26 +22,32 @@ import os
 import re
 import subprocess
 import sys
+import time
 from datetime import datetime as dt, date, timedelta
+from typing import Dict
 from playwright.async_api import Playwright, Page
 
 from Data.Access.db_helpers import (
     save_live_score_entry, log_audit_event, evaluate_market_outcome,
     transform_streamer_match_to_schedule, save_schedule_entry, _get_conn,
 )
-from Data.Access.league_db import query_all, update_prediction, upsert_fixture
+from Data.Access.league_db import DB_PATH, query_all, update_prediction, upsert_fixture
+from Data.Access.db_pool import get_pool
+from Data.Access.market_settlement import settle_table
 from Data.Access.sync_manager import SyncManager
 from Core.Browser.site_helpers import fs_universal_popup_dismissal
-from Core.Utils.constants import NAVIGATION_TIMEOUT, WAIT_FOR_LOAD_STATE_TIMEOUT
+from Core.Utils.constants import NAVIGATION_TIMEOUT, WAIT_FOR_LOAD_STATE_TIMEOUT, now_ng
 from Core.Intelligence.selector_manager import SelectorManager
 from Core.Intelligence.aigo_suite import AIGOSuite
 from Modules.Flashscore.fs_extractor import extract_all_matches, expand_all_leagues as ensure_content_expanded
+from Core.System.metrics import traced_goto
 
 STREAM_INTERVAL = 60
 FLASHSCORE_URL = "https://www.flashscore.com/football/"
 _STREAMER_HEARTBEAT_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Data', 'Store', '.streamer_heartbeat'
 )
+_ID_CHUNK = 500  # fixture_ids per targeted IN (...) read
 _last_push_sig = None
 _missed_cycles = {}
 
@@ -85,8 +91,41 @@ def _parse_match_start(date_val, time_val):
         return None
 
 
+def _rows_by_fixture(conn, table: str, fixture_ids) -> Dict[str, Dict]:
+    """Targeted read of the given fixture_ids (chunked IN on the fixture_id index)."""
+    ids = [fid for fid in fixture_ids if fid]
+    rows = {}
+    for i in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[i:i + _ID_CHUNK]
+        placeholders = ",".join(["?"] * len(chunk))
+        for r in conn.execute(f"SELECT * FROM {table} WHERE fixture_id IN ({placeholders})", chunk):
+            rows[r['fixture_id']] = dict(r)
+    return rows
+
+
+def _expired(start, now) -> bool:
+    """Past the 2.5hr live window: the safety rule finishes such a match."""
+    return bool(start and now > start + timedelta(minutes=150))
+
+
+def _update_row(conn, table: str, fid: str, updates: Dict) -> None:
+    set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
+    conn.execute(f"UPDATE {table} SET {set_clause} WHERE fixture_id = ?", list(updates.values()) + [fid])
+
+
 def _propagate_status_updates(live_matches, resolved_matches, force_finished_ids=None):
-    """Propagate live scores and resolved results into fixtures and predictions tables."""
+    """Propagate live scores and resolved results into fixtures and predictions tables.
+
+    Targeted: only the scraped live/resolved/force-finished fixtures and rows
+    still marked live are read (chunked IN on fixture_id), each is diffed
+    against its own row so only real changes are written, and all UPDATEs run
+    in one transaction. Diffing the rows rather than last cycle's live_scores
+    also corrects rows written behind the streamer's back (a prediction saved
+    mid-match, a pull or enrichment overwriting a schedule). The 2.5hr rule
+    only finishes rows that are live; a scraped-live fixture whose row is not
+    live is promoted whatever its stored kickoff, since a rescheduled match
+    keeps a stale date. Returns (sched_updates, pred_updates, stats)."""
+    start = time.perf_counter()
     conn = _get_conn()
     resolved_matches = resolved_matches or []
     force_finished_ids = force_finished_ids or set()
@@ -95,122 +134,105 @@ def _propagate_status_updates(live_matches, resolved_matches, force_finished_ids
     resolved_ids = {m['fixture_id'] for m in resolved_matches}
     resolved_map = {m['fixture_id']: m for m in resolved_matches}
     now = dt.now()
-    now_iso = now.isoformat()
+    now_iso = now.isoformat()               # schedules: local clock, as before
+    pred_now_iso = now_ng().isoformat()     # predictions: update_prediction's clock
 
     NO_SCORE_STATUSES = {'cancelled', 'postponed', 'fro', 'abandoned'}
 
-    # --- Update fixtures (schedules) ---
-    sched_rows = query_all(conn, 'schedules')
-    sched_updates = []
-    existing_sched_ids = set()
-
-    for row in sched_rows:
-        fid = row.get('fixture_id', '')
-        existing_sched_ids.add(fid)
-        updates = {}
-
-        if fid in live_ids:
-            lm = live_map[fid]
-            if str(row.get('match_status', '')).lower() != 'live':
-                updates['match_status'] = 'live'
-            if lm.get('home_score') and str(lm['home_score']) != str(row.get('home_score')):
-                updates['home_score'] = lm['home_score']
-                updates['away_score'] = lm['away_score']
-
-        elif fid in resolved_ids:
-            rm = resolved_map[fid]
-            terminal_status = rm.get('status', 'finished')
-            if str(row.get('match_status', '')).lower() != terminal_status:
-                updates['match_status'] = terminal_status
-                if terminal_status in NO_SCORE_STATUSES:
-                    updates['home_score'] = ''
-                    updates['away_score'] = ''
-                else:
-                    updates['home_score'] = rm.get('home_score', row.get('home_score', ''))
-                    updates['away_score'] = rm.get('away_score', row.get('away_score', ''))
-
-        # Safety: 2.5hr rule
-        if str(row.get('match_status', '')).lower() == 'live':
-            match_start = _parse_match_start(row.get('date', ''), row.get('time', ''))
-            if match_start and now > match_start + timedelta(minutes=150):
-                updates['match_status'] = 'finished'
-                if fid in live_ids:
-                    live_ids.discard(fid)
-                    live_matches = [m for m in live_matches if m['fixture_id'] != fid]
-
-        if updates:
-            updates['last_updated'] = now_iso
-            set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-            vals = list(updates.values()) + [fid]
-            conn.execute(f"UPDATE schedules SET {set_clause} WHERE fixture_id = ?", vals)
-            row.update(updates)
-            sched_updates.append(dict(row))
-
-    # Add missing matches to fixtures
-    new_sched_entries = []
-    for m in live_matches + resolved_matches:
-        fid = m.get('fixture_id')
-        if fid and fid not in existing_sched_ids:
-            new_entry = transform_streamer_match_to_schedule(m)
-            save_schedule_entry(new_entry)
-            new_sched_entries.append(new_entry)
-            sched_updates.append(new_entry)
-
-    if new_sched_entries:
-        print(f"   [Streamer] Discovery: Found {len(new_sched_entries)} new matches. Adding them.")
+    with get_pool(DB_PATH).transaction(conn):
+        # --- Update fixtures (schedules) ---
+        sched_rows = _rows_by_fixture(conn, 'schedules', live_ids | resolved_ids)
+        for r in conn.execute("SELECT * FROM schedules WHERE match_status = 'live'"):
+            sched_rows.setdefault(r['fixture_id'], dict(r))
+        sched_updates = []
+
+        for fid, row in sched_rows.items():
+            updates = {}
+            if fid in live_ids:
+                lm = live_map[fid]
+                if str(row.get('match_status', '')).lower() != 'live':
+                    updates['match_status'] = 'live'
+                if lm.get('home_score') and str(lm['home_score']) != str(row.get('home_score')):
+                    updates['home_score'] = lm['home_score']
+                    updates['away_score'] = lm['away_score']
+
+            elif fid in resolved_ids:
+                rm = resolved_map[fid]
+                terminal_status = rm.get('status', 'finished')
+                if str(row.get('match_status', '')).lower() != terminal_status:
+                    updates['match_status'] = terminal_status
+                    if terminal_status in NO_SCORE_STATUSES:
+                        updates['home_score'] = ''
+                        updates['away_score'] = ''
+                    else:
+                        updates['home_score'] = rm.get('home_score', row.get('home_score', ''))
+                        updates['away_score'] = rm.get('away_score', row.get('away_score', ''))
 
-    conn.commit()
+            # Safety: 2.5hr rule
+            if str(row.get('match_status', '')).lower() == 'live' and \
+                    _expired(_parse_match_start(row.get('date', ''), row.get('time', '')), now):
+                updates['match_status'] = 'finished'
+                live_ids.discard(fid)
+
+            if updates:
+                updates['last_updated'] = now_iso
+                _update_row(conn, 'schedules', fid, updates)
+                row.update(updates)
+                sched_updates.append(dict(row))
+
+        # Scraped fixtures we have never seen (inserted after the transaction)
+        missing = [m for m in live_matches + resolved_matches
+                   if m.get('fixture_id') in (live_ids | resolved_ids) and m['fixture_id'] not in sched_rows]
+
+        # --- Update predictions ---
+        pred_rows = _rows_by_fixture(conn, 'predictions', live_ids | resolved_ids | force_finished_ids)
+        for r in conn.execute("SELECT * FROM predictions WHERE status = 'live'"):
+            pred_rows.setdefault(r['fixture_id'], dict(r))
+        pred_updates = []
+
+        for fid, row in pred_rows.items():
+            cur_status = str(row.get('status', '')).lower()
+            updates = {}
+            if fid in live_ids:
+                lm = live_map[fid]
+                if cur_status != 'live':
+                    updates['status'] = 'live'
+                h_score = lm.get('home_score')
+                a_score = lm.get('away_score')
+                if h_score is not None and str(h_score) != str(row.get('home_score')):
+                    updates['home_score'] = h_score
+                if a_score is not None and str(a_score) != str(row.get('away_score')):
+                    updates['away_score'] = a_score
+
+            elif fid in resolved_ids or fid in force_finished_ids:
+                terminal_status = resolved_map[fid].get('status', 'finished') if fid in resolved_ids else 'finished'
+                if cur_status != terminal_status:
+                    updates['status'] = terminal_status
+                    if fid in resolved_ids:
+                        rm = resolved_map[fid]
+                        if rm.get('home_score') is not None:
+                            updates['home_score'] = rm['home_score']
+                        if rm.get('away_score') is not None:
+                            updates['away_score'] = rm['away_score']
+                        updates['actual_score'] = f"{rm.get('home_score', '')}-{rm.get('away_score', '')}"
+                    else:
+                        updates['actual_score'] = f"{row.get('home_score', '')}-{row.get('away_score', '')}"
+
+                    if terminal_status not in NO_SCORE_STATUSES:
+                        oc = evaluate_market_outcome(
+                            row.get('prediction', ''),
+                            str(updates.get('home_score', row.get('home_score', ''))),
+                            str(updates.get('away_score', row.get('away_score', ''))),
+                            row.get('home_team', ''),
+                            row.get('away_team', ''),
+                            match_status=terminal_status,
+                        )
+                        if oc:
+                            updates['outcome_correct'] = oc
 
-    # --- Update predictions ---
-    pred_rows = query_all(conn, 'predictions')
-    pred_updates = []
-
-    for row in pred_rows:
-        fid = row.get('fixture_id', '')
-        cur_status = str(row.get('status', '')).lower()
-        updates = {}
-
-        if fid in live_ids:
-            lm = live_map[fid]
-            if cur_status != 'live':
-                updates['status'] = 'live'
-            h_score = lm.get('home_score')
-            a_score = lm.get('away_score')
-            if h_score is not None and str(h_score) != str(row.get('home_score')):
-                updates['home_score'] = h_score
-            if a_score is not None and str(a_score) != str(row.get('away_score')):
-                updates['away_score'] = a_score
-
-        elif fid in resolved_ids or fid in force_finished_ids:
-            terminal_status = resolved_map[fid].get('status', 'finished') if fid in resolved_ids else 'finished'
-            if cur_status != terminal_status:
-                updates['status'] = terminal_status
-                if fid in resolved_ids:
-                    rm = resolved_map[fid]
-                    if rm.get('home_score') is not None:
-                        updates['home_score'] = rm['home_score']
-                    if rm.get('away_score') is not None:
-                        updates['away_score'] = rm['away_score']
-                    updates['actual_score'] = f"{rm.get('home_score', '')}-{rm.get('away_score', '')}"
-                else:
-                    updates['actual_score'] = f"{row.get('home_score', '')}-{row.get('away_score', '')}"
-
-                if terminal_status not in NO_SCORE_STATUSES:
-                    oc = evaluate_market_outcome(
-                        row.get('prediction', ''),
-                        str(updates.get('home_score', row.get('home_score', ''))),
-                        str(updates.get('away_score', row.get('away_score', ''))),
-                        row.get('home_team', ''),
-                        row.get('away_team', ''),
-                        match_status=terminal_status,
-                    )
-                    if oc:
-                        updates['outcome_correct'] = oc
-
-        # Safety: 2.5hr rule for predictions
-        if cur_status == 'live':
-            match_start = _parse_match_start(row.get('date', ''), row.get('match_time', ''))
-            if match_start and now > match_start + timedelta(minutes=150):
+            # Safety: 2.5hr rule for predictions
+            if cur_status == 'live' and \
+                    _expired(_parse_match_start(row.get('date', ''), row.get('match_time', '')), now):
                 updates['status'] = 'finished'
                 oc = evaluate_market_outcome(
                     row.get('prediction', ''),
@@ -223,12 +245,28 @@ def _propagate_status_updates(live_matches, resolved_matches, force_finished_ids
                 if oc:
                     updates['outcome_correct'] = oc
 
-        if updates:
-            update_prediction(conn, fid, updates)
-            row.update(updates)
-            pred_updates.append(dict(row))
+            if updates:
+                updates['last_updated'] = pred_now_iso
+                _update_row(conn, 'predictions', fid, updates)
+                row.update(updates)
+                pred_updates.append(dict(row))
+
+    # Add missing matches to fixtures
+    for m in missing:
+        new_entry = transform_streamer_match_to_schedule(m)
+        save_schedule_entry(new_entry)
+        sched_updates.append(new_entry)
+
+    if missing:
+        print(f"   [Streamer] Discovery: Found {len(missing)} new matches. Adding them.")
 
-    return sched_updates, pred_updates
+    stats = {
+        "live": len(live_ids),
+        "rows_read": len(sched_rows) + len(pred_rows),
+        "rows_touched": len(sched_updates) + len(pred_updates),
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+    return sched_updates, pred_updates, stats
 
 
 def _review_pending_backlog():
@@ -238,9 +276,10 @@ def _review_pending_backlog():
     if not preds:
         return []
 
-    scheds = {r['fixture_id']: r for r in query_all(conn, 'schedules') if r.get('fixture_id')}
+    scheds = _rows_by_fixture(conn, 'schedules', [p.get('fixture_id') for p in preds])
     updates_list = []
 
+    resolvable = []
     for p in preds:
         fid = p.get('fixture_id')
         if fid in scheds:
@@ -250,24 +289,30 @@ def _review_pending_backlog():
             a_score = str(s.get('away_score', '')).strip()
 
             if s_status in ('finished', 'aet', 'pen') and h_score.isdigit() and a_score.isdigit():
-                upd = {
+                resolvable.append((p, {
                     'status': 'finished',
                     'home_score': h_score,
                     'away_score': a_score,
                     'actual_score': f"{h_score}-{a_score}",
-                }
-                oc = evaluate_market_outcome(
-                    p.get('prediction', ''), h_score, a_score,
-                    p.get('home_team', ''), p.get('away_team', ''),
-                    match_status=s_status,
-                )
-                if oc:
-                    upd['outcome_correct'] = oc
-
-                update_prediction(conn, fid, upd)
-                p.update(upd)
-                updates_list.append(dict(p))
-                print(f"   [Streamer-Review] Resolved: {p.get('home_team')} vs {p.get('away_team')} -> {upd['actual_score']}")
+                }, s_status))
+
+    # Settle the whole backlog in one vectorized pass
+    outcomes = settle_table(
+        [p.get('prediction') or '' for p, _, _ in resolvable],
+        [upd['home_score'] for _, upd, _ in resolvable],
+        [upd['away_score'] for _, upd, _ in resolvable],
+        [p.get('home_team') or '' for p, _, _ in resolvable],
+        [p.get('away_team') or '' for p, _, _ in resolvable],
+        [s_status for _, _, s_status in resolvable],
+    )
+    for (p, upd, _), oc in zip(resolvable, outcomes):
+        if oc:
+            upd['outcome_correct'] = oc
+
+        update_prediction(conn, p.get('fixture_id'), upd)
+        p.update(upd)
+        updates_list.append(dict(p))
+        print(f"   [Streamer-Review] Resolved: {p.get('home_team')} vs {p.get('away_team')} -> {upd['actual_score']}")
 
     if updates_list:
         print(f"   [Streamer-Review] Resolved {len(updates_list)} pending backlog predictions.")
@@ -450,7 +495,7 @@ async def _catch_up_from_live_stream(page: Page, sync: SyncManager):
         resolved = [m for m in all_matches if m.get('status') in RESOLVED_STATUSES]
 
         if live or resolved:
-            sched_upd, pred_upd = _propagate_status_updates(live, resolved)
+            sched_upd, pred_upd, _ = _propagate_status_updates(live, resolved)
             print(f"   [Streamer] Catch-up {current_date}: {len(live)} live, {len(resolved)} resolved → {len(sched_upd)} fixtures, {len(pred_upd)} predictions.")
 
             # Push to Supabase
@@ -521,7 +566,7 @@ async def live_score_streamer(playwright: Playwright, user_data_dir: str = None)
                 page = await context.new_page()
 
             print("   [Streamer] Navigating to Flashscore (Mobile view, up to 3 mins)...")
-            await page.goto(FLASHSCORE_URL, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+            await traced_goto(page, FLASHSCORE_URL, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
 
             try:
                 sport_sel = SelectorManager.get_selector_strict("fs_home_page", "sport_container")
@@ -569,13 +614,14 @@ async def live_score_streamer(playwright: Playwright, user_data_dir: str = None)
                         if force_finished_ids: msg += f" + {len(force_finished_ids)} force-finished"
                         print(msg + " entries.")
 
-                        for m in live_matches:
-                            save_live_score_entry(m)
-
-                        sched_upd, pred_upd = _propagate_status_updates(
+                        sched_upd, pred_upd, prop = _propagate_status_updates(
                             live_matches, resolved_matches, force_finished_ids=force_finished_ids
                         )
-                        print(f"   [Streamer] Propagation: {len(sched_upd)} schedules, {len(pred_upd)} predictions.")
+                        for m in live_matches:
+                            save_live_score_entry(m)
+                        print(f"   [Streamer] Propagation: {len(sched_upd)} schedules, {len(pred_upd)} predictions "
+                              f"({prop['live']} live, {prop['rows_read']} rows read, "
+                              f"{prop['rows_touched']} touched, {prop['ms']:.0f} ms).")
 
                         current_sig = (frozenset(current_live_ids), len(sched_upd), len(pred_upd))
                         if current_sig == _last_push_sig:
@@ -12,6 +12,7 @@ from Core.Browser.Extractors.standings_extractor import extract_standings_data,
 from Core.Utils.utils import log_error_state
 import re
 import os
+from Core.System.metrics import traced_goto
 
 def strip_league_stage(league_name: str):
     """Strips ' - Round X' etc. and returns (clean_league, stage)."""
@@ -52,7 +53,7 @@ async def process_match_task(match_data: dict, browser: Browser):
         print(f"    [Batch Start] {match_data['home_team']} vs {match_data['away_team']}")
 
         full_match_url = f"{match_data['match_link']}"
-        await page.goto(full_match_url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+        await traced_goto(page, full_match_url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
         await asyncio.sleep(2.0)
 
         await fs_universal_popup_dismissal(page, "fs_match_page")
@@ -163,7 +164,7 @@ async def process_match_task(match_data: dict, browser: Browser):
         match_link = match_data.get('match_link', '')
         if match_link:
             try:
-                await page.goto(match_link, wait_until='domcontentloaded', timeout=30000)
+                await traced_goto(page, match_link, wait_until='domcontentloaded', timeout=30000)
                 await asyncio.sleep(1.5)
             except Exception:
                 pass
@@ -27,6 +27,7 @@ from Core.Intelligence.aigo_suite import AIGOSuite
 from .fs_schedule import extract_matches_from_page
 from .fs_processor import process_match_task
 from .fs_offline import run_flashscore_offline_repredict
+from Core.System.metrics import traced_goto
 
 NIGERIA_TZ = ZoneInfo("Africa/Lagos")
 
@@ -60,7 +61,7 @@ async def run_flashscore_analysis(playwright: Playwright, refresh: bool = False,
         print("  [Navigation] Going to Flashscore...")
         for attempt in range(5):
             try:
-                await page.goto("https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+                await traced_goto(page, "https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
                 print("  [Navigation] Flashscore loaded successfully.")
                 break 
             except Exception as e:
@@ -101,7 +102,7 @@ async def run_flashscore_analysis(playwright: Playwright, refresh: bool = False,
                 # Navigation logic (compensate for day_offset if sequential, or diff_days if specific)
                 if target_dates:
                     # For specific dates, we reset to home and click diff_days times
-                    await page.goto("https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+                    await traced_goto(page, "https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
                     await asyncio.sleep(2)
                     await fs_universal_popup_dismissal(page, "fs_home_page")
                     if diff_days > 0:
@@ -320,7 +321,7 @@ async def run_flashscore_schedule_only(playwright: Playwright, refresh: bool = F
         print("  [Navigation] Going to Flashscore...")
         for attempt in range(5):
             try:
-                await page.goto("https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+                await traced_goto(page, "https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
                 print("  [Navigation] Flashscore loaded successfully.")
                 break
             except Exception as e:
@@ -359,7 +360,7 @@ async def run_flashscore_schedule_only(playwright: Playwright, refresh: bool = F
 
             if target_dates:
                 # Reset and jump for specific dates
-                await page.goto("https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+                await traced_goto(page, "https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
                 await asyncio.sleep(2)
                 await fs_universal_popup_dismissal(page, "fs_home_page")
                 if diff_days > 0:
@@ -436,7 +437,7 @@ async def run_flashscore_schedule_only(playwright: Playwright, refresh: bool = F
 
                 # Return to Flashscore home for the next day's navigation
                 if current_day_offset < days - 1:
-                    await page.goto("https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+                    await traced_goto(page, "https://www.flashscore.com/football/", wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
                     await asyncio.sleep(2)
                     await fs_universal_popup_dismissal(page, "fs_home_page")
                     # Re-advance to the correct day
@@ -3,12 +3,25 @@ Football.com Booking Package
 Main entry point for Football.com betting operations.
 """
 
-from .navigator import load_or_create_session, perform_login, extract_balance, navigate_to_schedule, select_target_date
-from .extractor import extract_league_matches, validate_match_data
-from .matcher import match_predictions_with_site, filter_pending_predictions
-from .booker import harvest_booking_codes, place_multi_bet_from_codes, force_clear_slip, check_and_perform_withdrawal
+from Core.System.lazy_loader import lazy_exports
 
-from .fb_manager import run_football_com_booking
+# Resolved on first access so a single submodule import stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'load_or_create_session': '.navigator',
+    'perform_login': '.navigator',
+    'extract_balance': '.navigator',
+    'navigate_to_schedule': '.navigator',
+    'select_target_date': '.navigator',
+    'extract_league_matches': '.extractor',
+    'validate_match_data': '.extractor',
+    'match_predictions_with_site': '.matcher',
+    'filter_pending_predictions': '.matcher',
+    'harvest_booking_codes': '.booker',
+    'place_multi_bet_from_codes': '.booker',
+    'force_clear_slip': '.booker',
+    'check_and_perform_withdrawal': '.booker',
+    'run_football_com_booking': '.fb_manager',
+})
 
 __all__ = [
     'run_football_com_booking',
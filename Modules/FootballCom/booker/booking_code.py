@@ -32,6 +32,7 @@ from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from .slip import force_clear_slip
 from Data.Access.sync_manager import run_full_sync
 from Core.Intelligence.aigo_suite import AIGOSuite
+from Core.System.metrics import traced_goto
 
 async def ensure_bet_insights_collapsed(page: Page):
     """Ensure the bet insights widget is collapsed to prevent obstruction."""
@@ -137,7 +138,7 @@ async def harvest_booking_codes(page: Page, matched_urls: Dict[str, str], day_pr
         processed_urls.add(match_url)
 
         # 1. Navigation
-        await page.goto(match_url, wait_until='domcontentloaded', timeout=30000)
+        await traced_goto(page, match_url, wait_until='domcontentloaded', timeout=30000)
         await asyncio.sleep(3)
         await PopupHandler().fb_universal_popup_dismissal(page, "fb_match_page")
         await ensure_bet_insights_collapsed(page)
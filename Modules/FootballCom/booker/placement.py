@@ -21,6 +21,7 @@ from .ui import wait_for_condition
 from .mapping import find_market_and_outcome
 from .slip import get_bet_slip_count, force_clear_slip
 from Data.Access.db_helpers import log_audit_event
+from Core.System.metrics import traced_goto
 
 # Confidence → probability mapping (matches data_validator.py)
 CONFIDENCE_TO_PROB = {
@@ -89,7 +90,7 @@ async def place_bets_for_matches(page: Page, matched_urls: Dict[str, str], day_p
 
         try:
             # 1. Navigation
-            await page.goto(match_url, wait_until='domcontentloaded', timeout=30000)
+            await traced_goto(page, match_url, wait_until='domcontentloaded', timeout=30000)
             await asyncio.sleep(3)
             await neo_popup_dismissal(page, match_url)
             await ensure_bet_insights_collapsed(page)
@@ -210,7 +211,7 @@ async def place_multi_bet_from_codes(page: Page, harvested_matches: List[Dict],
         if not code: continue
         url = f"https://www.football.com/ng/m?shareCode={code}"
         print(f"    [Execute] Injecting code {code}...")
-        await page.goto(url, timeout=30000, wait_until='domcontentloaded')
+        await traced_goto(page, url, timeout=30000, wait_until='domcontentloaded')
         await asyncio.sleep(1.5)
 
     # 3. Verify Count
@@ -20,6 +20,7 @@ from .navigator import load_or_create_session, extract_balance
 from Core.Utils.utils import log_error_state
 from Core.System.lifecycle import log_state
 from Core.Intelligence.aigo_suite import AIGOSuite
+from Core.System.metrics import traced_goto
 
 
 async def _create_session(playwright: Playwright):
@@ -51,7 +52,7 @@ async def _create_session_no_login(playwright: Playwright):
 
     current_url = page.url
     if "football.com" not in current_url or current_url == "about:blank":
-        await page.goto("https://www.football.com/ng", wait_until='domcontentloaded',
+        await traced_goto(page, "https://www.football.com/ng", wait_until='domcontentloaded',
                         timeout=30000)
 
     return context, page
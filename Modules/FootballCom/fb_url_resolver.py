@@ -22,7 +22,7 @@ matcher = GrokMatcher()
 async def resolve_urls(page: Page, target_date: str) -> dict:
     """
     Resolves URLs for predictions by matching Flashscore fixtures with Football.com matches.
-    Uses fuzzy matching and progressive synchronization (every 10 mappings).
+    Uses the local team-name index (LLM only for ambiguous pairings) and progressive synchronization.
     """
     print(f"\n    [URL Resolver] Resolving Football.com mappings for {target_date}...")
     
@@ -48,9 +48,10 @@ async def resolve_urls(page: Page, target_date: str) -> dict:
         print(f"    [URL Resolver] Failed to retrieve Football.com matches for {target_date}.")
         return {}
 
-    # 3. Fuzzy Matching & Progressive Sync
+    # 3. Local Index Matching & Progressive Sync
     resolved_count = 0
     mappings = {}
+    site_index = matcher.build_index(cached_site_matches)
     
     for fs_match in day_fs_matches:
         fs_home = fs_match.get('home_team', '').lower()
@@ -63,8 +64,8 @@ async def resolve_urls(page: Page, target_date: str) -> dict:
             mappings[fixture_id] = already_matched.get('url')
             continue
 
-        # Use GrokMatcher (LLM > Fuzzy > None)
-        best_match, highest_score = await matcher.resolve(f"{fs_home} vs {fs_away}", cached_site_matches)
+        # Use GrokMatcher (Trigram index > LLM for ambiguous > None)
+        best_match, highest_score = await matcher.resolve(fs_match, cached_site_matches, site_index)
         
         if best_match:
             print(f"    [Matched] {fs_home} vs {fs_away}  ==>  {best_match['home_team']} vs {best_match['away_team']} ({highest_score:.1f}%)")
@@ -1,111 +1,68 @@
-# match_resolver.py: match_resolver.py: Intelligent match resolution using Google GenAI (GrokMatcher)
+# match_resolver.py: match_resolver.py: Intelligent match resolution (GrokMatcher)
 # Part of LeoBook Modules — Football.com
 #
 # Classes: GrokMatcher
 
-import os
 from typing import List, Dict, Optional, Tuple
-from Levenshtein import distance
 
-# Try importing Google GenAI (New Package)
-try:
-    from google import genai
-    from google.genai import types
-    HAS_GEMINI = True
-except ImportError:
-    HAS_GEMINI = False
+from Core.Intelligence.team_name_index import FixtureMatcher, get_team_name_index
+
 
 class GrokMatcher:
-    def __init__(self):
-        self.use_llm = HAS_GEMINI
-        if not self.use_llm:
-            print("    [GrokMatcher] google-genai not available. Falling back to Fuzzy.")
+    """Trigram index first (team aliases, kick-off time); the LLM only settles ambiguous pairings."""
+
+    def __init__(self, use_llm: bool = True):
+        self.use_llm = use_llm
+
+    def build_index(self, fb_matches: List[Dict]) -> FixtureMatcher:
+        """Index one day's Football.com matches; pass the result to resolve() for each fixture."""
+        return FixtureMatcher(fb_matches, get_team_name_index())
 
-    async def resolve(self, fs_name: str, fb_matches: List[Dict]) -> Tuple[Optional[Dict], float]:
+    async def resolve(self, fs_match: Dict, fb_matches: List[Dict],
+                      index: Optional[FixtureMatcher] = None) -> Tuple[Optional[Dict], float]:
         """
-        Resolves a Flashscore match name against a list of Football.com matches.
-        Returns (best_match_dict, score).
+        Resolves a Flashscore fixture against a list of Football.com matches.
+        Returns (best_match_dict, score 0-100); (None, score) when nothing matches.
         """
-        # Quick exact/fuzzy pre-filter to avoid API costs limitations
-        best_fuzzy, fuzzy_score = self._fuzzy_resolve(fs_name, fb_matches)
-        if fuzzy_score > 90: # Slightly lower threshold for raw Levenshtein score mapping
-            return best_fuzzy, fuzzy_score
+        index = index or self.build_index(fb_matches)
+        match, score, candidates = index.resolve(fs_match)
+        if match is not None:
+            return match, score * 100
+        if not candidates or not self.use_llm:
+            return None, score * 100
 
-        if not self.use_llm:
-            return best_fuzzy, fuzzy_score
+        # Ambiguous: let the LLM choose among the top-k candidates only
+        return await self._llm_resolve(fs_match, candidates)
 
-        # Use LLM for difficult cases
-        return await self._llm_resolve(fs_name, fb_matches, best_fuzzy, fuzzy_score)
+    async def _llm_resolve(self, fs_match: Dict, candidates: List[Tuple[float, Dict]]) -> Tuple[Optional[Dict], float]:
+        """Ask the LLM (booking priority, via the scheduler) which candidate is the same match."""
+        from Core.Intelligence.api_manager import unified_api_call
+        from Core.Intelligence.llm_scheduler import Priority
 
-    def _fuzzy_resolve(self, fs_name: str, fb_matches: List[Dict]) -> Tuple[Optional[Dict], float]:
-        best_match = None
-        min_distance = 999
-        target = fs_name.lower()
-        
-        for m in fb_matches:
-            candidate = f"{m.get('home_team')} vs {m.get('away_team')}".lower()
-            dist = distance(target, candidate)
-            if dist < min_distance:
-                min_distance = dist
-                best_match = m
-        
-        # Convert distance to a pseudo-score (0-100)
-        # Score = 100 - (dist / max_len * 100)
-        max_len = max(len(target), 1)
-        score = max(0, 100 - (min_distance / max_len * 100))
-                
-        return best_match, score
+        fs_name = (f"{fs_match.get('home_team') or fs_match.get('home_team_name')} vs "
+                   f"{fs_match.get('away_team') or fs_match.get('away_team_name')}")
+        options = [f"{m.get('home_team') or m.get('home')} vs {m.get('away_team') or m.get('away')}"
+                   for _, m in candidates]
 
-    async def _llm_resolve(self, fs_name: str, fb_matches: List[Dict], fallback_match, fallback_score) -> Tuple[Optional[Dict], float]:
-        """Call Gemini via LLMHealthManager for multi-key/model rotation."""
-        from Core.Intelligence.llm_health_manager import health_manager
-        await health_manager.ensure_initialized()
-
-        candidates = [f"{m.get('home_team')} vs {m.get('away_team')}" for m in fb_matches]
-        
         prompt_text = (
             f"I have a football match named: '{fs_name}'.\n"
             f"Which of the following options represents the same match? Return ONLY the exact option string. "
             f"If none match clearly, return 'None'.\n\n"
-            f"Options:\n" + "\n".join([f"- {c}" for c in candidates])
+            f"Options:\n" + "\n".join([f"- {c}" for c in options])
         )
-        
-        # Use DESCENDING chain (intelligence-critical task)
-        model_chain = health_manager.get_model_chain("aigo")
 
-        for model_name in model_chain:
-            api_key = health_manager.get_next_gemini_key(model=model_name)
-            if not api_key:
-                continue
-            try:
-                import asyncio
-                client = genai.Client(api_key=api_key)
-                response = await asyncio.to_thread(
-                    client.models.generate_content,
-                    model=model_name,
-                    contents=prompt_text
-                )
-                
-                answer = response.text.strip().lower() if response.text else ""
-                
-                if "none" in answer or not answer:
-                    return fallback_match, fallback_score
-                
-                for i, cand in enumerate(candidates):
-                    if cand.lower() in answer or answer in cand.lower():
-                        return fb_matches[i], 99.0
-                
-                return fallback_match, fallback_score
-                
-            except Exception as e:
-                err_str = str(e)
-                if "429" in err_str or "RESOURCE_EXHAUSTED" in err_str:
-                    health_manager.on_gemini_429(api_key, model=model_name)
-                    continue  # Try next model
-                elif "403" in err_str:
-                    health_manager.on_gemini_403(api_key)
-                    continue
-                print(f"    [GrokMatcher] LLM error on {model_name}: {e}")
-                break
+        try:
+            response = await unified_api_call(prompt_text, priority=Priority.CRITICAL)
+        except Exception as e:
+            print(f"    [GrokMatcher] LLM error: {e}")
+            return None, candidates[0][0] * 100
+
+        answer = response.text.strip().lower() if response and response.text else ""
+        if not answer or "none" in answer:
+            return None, candidates[0][0] * 100
+
+        for (_, match), option in zip(candidates, options):
+            if option.lower() in answer or answer in option.lower():
+                return match, 99.0
 
-        return fallback_match, fallback_score
+        return None, candidates[0][0] * 100
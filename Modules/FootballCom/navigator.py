@@ -22,6 +22,7 @@ from Core.Intelligence.selector_manager import SelectorManager
 from Core.Utils.constants import NAVIGATION_TIMEOUT, WAIT_FOR_LOAD_STATE_TIMEOUT
 from Core.Utils.utils import capture_debug_snapshot, parse_date_robust
 from Core.Intelligence.aigo_suite import AIGOSuite
+from Core.System.metrics import traced_goto
 
 PHONE = cast(str, os.getenv("FB_PHONE"))
 PASSWORD = cast(str, os.getenv("FB_PASSWORD"))
@@ -71,7 +72,7 @@ async def perform_login(page: Page):
     print("  [Auth] Initiating Football.com login flow...")
     
     # 1. Navigate to main page
-    await page.goto("https://www.football.com/ng", wait_until='domcontentloaded', timeout=NAVIGATION_TIMEOUT)
+    await traced_goto(page, "https://www.football.com/ng", wait_until='domcontentloaded', timeout=NAVIGATION_TIMEOUT)
     await asyncio.sleep(2)
 
     # 2. Click Login Button to open modal/page
@@ -123,7 +124,7 @@ async def load_or_create_session(context: BrowserContext) -> Tuple[BrowserContex
     current_url = page.url
     if "football.com" not in current_url or current_url == "about:blank":
          # print("  [Auth] Initial navigation...")
-         await page.goto("https://www.football.com/ng", wait_until='networkidle', timeout=NAVIGATION_TIMEOUT)
+         await traced_goto(page, "https://www.football.com/ng", wait_until='networkidle', timeout=NAVIGATION_TIMEOUT)
          
     
     # Step 0: Pre-Booking State Validation
@@ -209,7 +210,7 @@ async def navigate_to_schedule(page: Page):
         await page.wait_for_load_state("domcontentloaded", timeout=10000)
     else:
         # Direct URL as fallback
-        await page.goto("https://www.football.com/ng/m/sport/football/", wait_until="domcontentloaded")
+        await traced_goto(page, "https://www.football.com/ng/m/sport/football/", wait_until="domcontentloaded")
         
     await hide_overlays(page)
     
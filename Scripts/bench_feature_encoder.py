@@ -0,0 +1,129 @@
+# bench_feature_encoder.py: Parity check + micro-benchmark for FeatureEncoder.encode_batch().
+# Part of LeoBook Scripts — Pipeline
+#
+# Functions: synthetic_vision_data(), check_parity(), benchmark(), main()
+# Called by: developers / CI  (python Scripts/bench_feature_encoder.py [--n N] [--seed S])
+
+"""
+Compares encode_batch() against the scalar encode() on deterministic synthetic
+fixtures (including malformed scores, dotted dates, empty forms and missing
+standings) and exits non-zero on any difference. Then times both paths.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+from Core.Intelligence.rl.feature_encoder import FeatureEncoder
+
+
+def _match(rng: random.Random, team: str, teams: list) -> dict:
+    opp = rng.choice(teams)
+    home = rng.random() < 0.5
+    roll = rng.random()
+    if roll < 0.04:
+        score = rng.choice(["", "-", "2-1-0", None, "x-y"])
+    else:
+        score = f"{rng.randint(0, 5)}{' ' if roll < 0.1 else ''}-{rng.randint(0, 5)}"
+    if rng.random() < 0.15:
+        date = f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.2024"
+    else:
+        date = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    return {
+        "home": team if home else opp,
+        "away": opp if home else team,
+        "score": score,
+        "date": date,
+        "fixture_id": f"f{rng.randint(0, 10**6)}",
+    }
+
+
+def synthetic_vision_data(n: int, seed: int = 7) -> list:
+    """n deterministic vision_data dicts; teams repeat so per-team caching is exercised."""
+    rng = random.Random(seed)
+    teams = [f"Team {i}" for i in range(max(20, n // 4))]
+    forms = {t: [_match(rng, t, teams) for _ in range(rng.randint(0, 12))] for t in teams}
+    out = []
+    for _ in range(n):
+        home, away = rng.sample(teams, 2)
+        table = rng.sample(teams, min(len(teams), 20))
+        standings = [] if rng.random() < 0.2 else [
+            {"team_name": t, "position": i + 1, "points": rng.randint(0, 90),
+             "goal_difference": rng.randint(-40, 40)}
+            for i, t in enumerate(table)
+        ]
+        out.append({
+            "h2h_data": {
+                "home_team": home,
+                "away_team": away,
+                "home_last_10_matches": forms[home],
+                "away_last_10_matches": forms[away],
+                "head_to_head": [_match(rng, home, [away]) for _ in range(rng.randint(0, 6))],
+            },
+            "standings": standings,
+        })
+    return out
+
+
+def check_parity(vision_datas: list) -> int:
+    """Number of fixtures whose batch encoding differs from encode()."""
+    batch = FeatureEncoder.encode_batch(vision_datas)
+    mismatches = 0
+    for i, vd in enumerate(vision_datas):
+        ref = FeatureEncoder.encode(vd).numpy()[0]
+        if not np.array_equal(ref, batch[i]):
+            mismatches += 1
+            cols = np.nonzero(ref != batch[i])[0].tolist()
+            print(f"  [Parity] fixture {i}: columns {cols[:8]} differ "
+                  f"(max abs {np.abs(ref - batch[i]).max():.3g})")
+    return mismatches
+
+
+def benchmark(vision_datas: list, repeats: int = 3) -> dict:
+    """Best-of-N wall time for both encoders."""
+    def best(fn):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000
+
+    scalar_ms = best(lambda: [FeatureEncoder.encode(vd) for vd in vision_datas])
+    batch_ms = best(lambda: FeatureEncoder.encode_batch(vision_datas))
+    return {
+        "fixtures": len(vision_datas),
+        "encode_ms": round(scalar_ms, 2),
+        "encode_batch_ms": round(batch_ms, 2),
+        "speedup": round(scalar_ms / max(batch_ms, 1e-9), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FeatureEncoder batch parity check and benchmark.")
+    parser.add_argument("--n", type=int, default=2000, help="Synthetic fixtures to encode")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    data = synthetic_vision_data(args.n, args.seed)
+    print(f"\n  [FeatureEncoder] Parity over {len(data)} synthetic fixtures...")
+    mismatches = check_parity(data)
+    if mismatches:
+        print(f"  [FeatureEncoder] FAIL: {mismatches} fixtures differ from encode().")
+        sys.exit(1)
+    print("  [FeatureEncoder] encode_batch() matches encode() exactly.")
+
+    stats = benchmark(data)
+    print(f"  [FeatureEncoder] encode: {stats['encode_ms']:.1f} ms | "
+          f"encode_batch: {stats['encode_batch_ms']:.1f} ms | {stats['speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
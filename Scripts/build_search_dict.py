@@ -2,13 +2,14 @@
 import os
 import json
 import time
-import requests
 import re
 import unicodedata
 import uuid
 from collections import defaultdict
 from Core.Intelligence.aigo_suite import AIGOSuite
 from Core.Intelligence.llm_health_manager import health_manager
+from Core.Intelligence.api_manager import unified_api_call
+from Core.Intelligence.llm_scheduler import Priority
 from supabase import create_client
 from dotenv import load_dotenv
 from Data.Access.db_helpers import _get_conn, save_team_entry, save_region_league_entry
@@ -39,7 +40,7 @@ LLM_PROVIDERS = [
     },
 ]
 BATCH_SIZE = 10
-SLEEP_BETWEEN_BATCHES = 2
+BATCHES_IN_FLIGHT = 8   # submitted together; the LLM scheduler paces them to quota
 
 if not SUPABASE_URL or not SUPABASE_KEY:
     raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY in .env")
@@ -164,130 +165,52 @@ Return ONLY the JSON array — no explanations, no markdown.
 """
 
 
-def _call_llm(provider: dict, prompt: str) -> list:
-    """Calls a single LLM provider and returns parsed results."""
-    headers = {
-        "Authorization": f"Bearer {provider['api_key']}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": provider["model"],
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.1,
-        "max_tokens": 4096
-    }
-    resp = requests.post(provider["api_url"], headers=headers, json=payload, timeout=60)
-    resp.raise_for_status()
-    content = resp.json()["choices"][0]["message"]["content"].strip()
-
-    data = extract_json_with_salvage(content)
-    if not data:
-        print(f"  [Warning] {provider['name']} response yielded no valid JSON: {content[:200]}...")
-        return []
-
-    validated = [item for item in data if isinstance(item, dict) and "input_name" in item]
-    return validated
+def _validated_items(text: str) -> list:
+    """Metadata objects of an LLM reply; empty if it has none usable."""
+    data = extract_json_with_salvage(text) if text else []
+    return [item for item in data if isinstance(item, dict) and "input_name" in item]
 
 
-def query_llm_for_metadata(items, item_type="team", retries=2):
+async def async_query_llm_for_metadata(items, item_type="team"):
     """
-    Queries LLM providers with ASCENDING model chain (cheapest first).
-    For Gemini: iterates model chain × key rotation.
-    On 429: try next key for same model, then downgrade model.
+    Metadata for a batch of team/league names. Submitted to the LLM scheduler
+    at BACKGROUND priority with the ASCENDING (cheapest-first) model chain, so
+    bulk enrichment only uses quota the booking path is not waiting for.
+    A reply with no valid items is rejected inside the scheduler, which moves
+    on to the next model/provider; only the validated list is cached.
     """
     if not items:
         return []
 
-    from Core.Intelligence.llm_health_manager import health_manager
-    ordered = health_manager.get_ordered_providers()
-    model_chain = health_manager.get_model_chain("search_dict")
-
+    from Core.Intelligence.llm_cache import get_llm_cache, cache_key
     prompt = _build_prompt(items, item_type)
 
-    for provider_name in ordered:
-        if not health_manager.is_provider_active(provider_name):
-            print(f"  [Skip] {provider_name} — inactive per health check.")
-            continue
-
-        if provider_name == "Gemini":
-            # Model-chain rotation: try each model, exhaust keys per model
-            for model_name in model_chain:
-                while True: # Try all available keys for this model
-                    api_key = health_manager.get_next_gemini_key(model=model_name)
-                    if not api_key:
-                        print(f"  [LLM] All keys exhausted for {model_name}, downgrading model...")
-                        break
-                    provider = {
-                        "name": "Gemini",
-                        "api_key": api_key,
-                        "api_url": health_manager.GEMINI_API_URL,
-                        "model": model_name,
-                    }
-                    for attempt in range(1, retries + 1):
-                        try:
-                            key_suffix = api_key[-4:]
-                            print(f"  [LLM] Gemini {model_name} (key ...{key_suffix}) attempt {attempt}/{retries}...")
-                            results = _call_llm(provider, prompt)
-                            if results:
-                                print(f"  [LLM] Gemini {model_name} returned {len(results)} items.")
-                                return results
-                        except Exception as e:
-                            err_str = str(e)
-                            if "429" in err_str:
-                                health_manager.on_gemini_429(api_key, model=model_name)
-                                print(f"  [LLM] Key ...{key_suffix} rate-limited on {model_name}, rotating...")
-                                break  # Try next key for this model
-                            elif "400" in err_str and "INVALID_ARGUMENT" in err_str:
-                                health_manager.on_gemini_fatal_error(api_key, "400 Invalid Argument")
-                                print(f"  [LLM] Key ...{key_suffix} permanently dead (400), removing...")
-                                break
-                            elif "401" in err_str or "UNAUTHORIZED" in err_str:
-                                health_manager.on_gemini_fatal_error(api_key, "401 Unauthorized")
-                                print(f"  [LLM] Key ...{key_suffix} permanently dead (401), removing...")
-                                break
-                            elif "403" in err_str:
-                                health_manager.on_gemini_fatal_error(api_key, "403 Forbidden")
-                                print(f"  [LLM] Key ...{key_suffix} permanently dead (403), removing...")
-                                break
-                            print(f"  [Warning] Gemini {model_name} attempt {attempt}/{retries} failed: {e}")
-                            time.sleep(3 * attempt)
-                    else:
-                        continue
-                    continue
-
-            print(f"  [Fallback] Gemini exhausted all models. Trying next provider...")
+    # Same batch, same prompt: reuse the validated answer from an earlier run
+    cache = get_llm_cache()
+    key = cache_key("search_dict", prompt, {"temperature": 0.1})
+    hit = cache.get(key, "Scripts.build_search_dict.async_query_llm_for_metadata")
+    if hit is not None:
+        print(f"  [LLM] Cache hit — {len(items)} {item_type}(s) served from the response cache.")
+        return json.loads(hit.text)
+    started = time.perf_counter()
+
+    try:
+        response = await unified_api_call(
+            prompt, {"temperature": 0.1},
+            llm_context="search_dict", priority=Priority.BACKGROUND,
+            validate=_validated_items, cache=False,
+        )
+    except Exception as e:
+        print(f"  [Error] All LLM providers failed for {len(items)} {item_type}(s): {e}")
+        return []
 
-        elif provider_name == "Grok":
-            grok_key = os.getenv("GROK_API_KEY", "")
-            if not grok_key:
-                print(f"  [Skip] Grok — no API key configured.")
-                continue
-            provider = {
-                "name": "Grok",
-                "api_key": grok_key,
-                "api_url": health_manager.GROK_API_URL,
-                "model": health_manager.GROK_MODEL,
-            }
-            for attempt in range(1, retries + 1):
-                try:
-                    print(f"  [LLM] Grok attempt {attempt}/{retries}...")
-                    results = _call_llm(provider, prompt)
-                    if results:
-                        print(f"  [LLM] Grok returned {len(results)} items.")
-                        return results
-                except Exception as e:
-                    print(f"  [Warning] Grok attempt {attempt}/{retries} failed: {e}")
-                    time.sleep(3 * attempt)
-            print(f"  [Fallback] Grok exhausted. Trying next provider...")
-
-    print(f"  [Error] All LLM providers failed for {len(items)} {item_type}(s).")
-    return []
-
-async def async_query_llm_for_metadata(items, item_type="team", retries=2):
-    """Async wrapper that ensures health manager is initialized before sync LLM call."""
-    from Core.Intelligence.llm_health_manager import health_manager
-    await health_manager.ensure_initialized()
-    return await asyncio.to_thread(query_llm_for_metadata, items, item_type, retries)
+    validated = _validated_items(response.text)
+    if not validated:
+        print(f"  [Warning] LLM response yielded no valid JSON: {response.text[:200]}...")
+        return []
+    print(f"  [LLM] {len(validated)} {item_type}(s) returned.")
+    cache.put(key, "search_dict", json.dumps(validated), (time.perf_counter() - started) * 1000)
+    return validated
 
 # Backward-compatible alias
 query_grok_for_metadata_with_retry = async_query_llm_for_metadata
@@ -448,15 +371,18 @@ async def main():
     for league_list, pass_name in [(empty_leagues, "PASS 1"), (incomplete_leagues_list, "PASS 2")]:
         if not league_list: continue
         print(f"\n--- {pass_name}: Leagues ---")
-        for i in range(0, len(league_list), BATCH_SIZE):
+        window = BATCH_SIZE * BATCHES_IN_FLIGHT
+        for w in range(0, len(league_list), window):
             # Circuit breaker: skip if all LLM providers are down
             if not health_manager._gemini_active and not getattr(health_manager, '_grok_active', False):
-                remaining = len(league_list) - i
+                remaining = len(league_list) - w
                 print(f"  [SearchDict] All LLM providers offline -- skipping {remaining} remaining leagues.")
                 break
-            batch = league_list[i:i + BATCH_SIZE]
-            print(f"  Processing batch of {len(batch)} leagues...")
-            results = await async_query_llm_for_metadata(batch, item_type="league")
+            batches = [league_list[i:i + BATCH_SIZE] for i in range(w, min(w + window, len(league_list)), BATCH_SIZE)]
+            print(f"  Processing {len(batches)} batch(es) of up to {BATCH_SIZE} leagues...")
+            batch_results = await asyncio.gather(
+                *(async_query_llm_for_metadata(batch, item_type="league") for batch in batches))
+            results = [item for batch_result in batch_results for item in batch_result]
             updates = {}
             for item in results:
                 input_name = item.get("input_name")
@@ -481,7 +407,6 @@ async def main():
                 print(f"  [Supabase] Upserting {len(updates)} leagues to 'leagues'...")
                 batch_upsert("leagues", list(updates.values()))
                 update_db_under_lock(updates, "league_id", "leagues")
-            await asyncio.sleep(SLEEP_BETWEEN_BATCHES)
 
     # --- Process Teams ---
     team_ids_all = list(teams_raw.keys())
@@ -491,43 +416,45 @@ async def main():
     for team_ids, pass_name in [(team_ids_pass1, "PASS 1"), (team_ids_pass2, "PASS 2")]:
         if not team_ids: continue
         print(f"\nâ”€â”€ {pass_name}: Teams â”€â”€")
-        for i in range(0, len(team_ids), BATCH_SIZE):
+        window = BATCH_SIZE * BATCHES_IN_FLIGHT
+        for w in range(0, len(team_ids), window):
             # Circuit breaker: skip if all LLM providers are down
             if not health_manager._gemini_active and not getattr(health_manager, '_grok_active', False):
-                remaining = len(team_ids) - i
+                remaining = len(team_ids) - w
                 print(f"  [SearchDict] All LLM providers offline -- skipping {remaining} remaining teams.")
                 break
-            batch_ids = team_ids[i:i + BATCH_SIZE]
-            batch_names = [list(teams_raw[tid]["names"])[0] for tid in batch_ids] # Use first name as input
-            print(f"  Processing batch of {len(batch_ids)} teams...")
-            results = await async_query_llm_for_metadata(batch_names, item_type="team")
-            updates = {}
-            for idx, item in enumerate(results):
-                if idx >= len(batch_ids): break # Safety break
-                tid = batch_ids[idx]
-                off_name = item.get("official_name") or list(teams_raw[tid]["names"])[0]
-                search_terms = {normalize_for_search(off_name)}
-                for n in teams_raw[tid]["names"]: search_terms.add(normalize_for_search(n))
-                for n in item.get("other_names", []): search_terms.add(normalize_for_search(n))
-                for a in item.get("abbreviations", []): search_terms.add(normalize_for_search(a))
+            id_batches = [team_ids[i:i + BATCH_SIZE] for i in range(w, min(w + window, len(team_ids)), BATCH_SIZE)]
+            name_batches = [[list(teams_raw[tid]["names"])[0] for tid in batch_ids] for batch_ids in id_batches] # Use first name as input
+            print(f"  Processing {len(id_batches)} batch(es) of up to {BATCH_SIZE} teams...")
+            batch_results = await asyncio.gather(
+                *(async_query_llm_for_metadata(batch_names, item_type="team") for batch_names in name_batches))
+            for batch_ids, results in zip(id_batches, batch_results):
+                updates = {}
+                for idx, item in enumerate(results):
+                    if idx >= len(batch_ids): break # Safety break
+                    tid = batch_ids[idx]
+                    off_name = item.get("official_name") or list(teams_raw[tid]["names"])[0]
+                    search_terms = {normalize_for_search(off_name)}
+                    for n in teams_raw[tid]["names"]: search_terms.add(normalize_for_search(n))
+                    for n in item.get("other_names", []): search_terms.add(normalize_for_search(n))
+                    for a in item.get("abbreviations", []): search_terms.add(normalize_for_search(a))
                 
-                upsert_data = clean_none_values({
-                    "team_id": tid,
-                    "name": off_name, # Standardized v7
-                    "other_names": item.get("other_names", []),
-                    "abbreviations": item.get("abbreviations", []),
-                    "search_terms": list(filter(None, search_terms)),
-                    "country_code": item.get("country_code") or item.get("country"), # Flex with v7
-                    "city": item.get("city"),
-                    "stadium": item.get("stadium"),
-                })
-                updates[tid] = upsert_data
-
-            if updates:
-                print(f"  [Supabase] Upserting {len(updates)} teams to 'teams'...")
-                batch_upsert("teams", list(updates.values()))
-                update_db_under_lock(updates, "team_id", "teams") # SQLite table is 'teams'
-            await asyncio.sleep(SLEEP_BETWEEN_BATCHES)
+                    upsert_data = clean_none_values({
+                        "team_id": tid,
+                        "name": off_name, # Standardized v7
+                        "other_names": item.get("other_names", []),
+                        "abbreviations": item.get("abbreviations", []),
+                        "search_terms": list(filter(None, search_terms)),
+                        "country_code": item.get("country_code") or item.get("country"), # Flex with v7
+                        "city": item.get("city"),
+                        "stadium": item.get("stadium"),
+                    })
+                    updates[tid] = upsert_data
+
+                if updates:
+                    print(f"  [Supabase] Upserting {len(updates)} teams to 'teams'...")
+                    batch_upsert("teams", list(updates.values()))
+                    update_db_under_lock(updates, "team_id", "teams") # SQLite table is 'teams'
 
     print("\nSearch dictionary built and local CSVs/Supabase synced!")
 
@@ -757,10 +684,6 @@ async def enrich_batch_teams_search_dict(team_pairs: list, batch_size: int = 10)
         except Exception as e:
             print(f"    [SearchDict Batch] Batch {i // batch_size + 1} error (non-fatal): {e}")
 
-        # Small delay between batches to avoid rate limiting
-        if i + batch_size < len(unenriched):
-            await asyncio.sleep(2)
-
     if total_enriched:
         print(f"    [SearchDict Batch] ✓ Total: {total_enriched}/{len(unenriched)} teams enriched")
 
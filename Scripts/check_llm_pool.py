@@ -0,0 +1,170 @@
+# check_llm_pool.py: LLM client-pool check against a local mock Gemini/Grok endpoint.
+# Part of LeoBook Scripts — Pipeline
+#
+# Classes: MockLLMHandler
+# Functions: start_mock(), run_calls(), main()
+# Called by: developers / CI  (python Scripts/check_llm_pool.py [--calls N] [--keys K])
+
+"""
+Serves the two wire formats api_manager speaks — Gemini generateContent and
+OpenAI-style chat completions (Grok) — over keep-alive HTTP/1.1 on localhost,
+points the pooled clients at it (GEMINI_BASE_URL / GROK_API_URL), and issues
+concurrent calls across several keys. One key is made to return 429s.
+
+Reports calls/s, TCP connections opened by the server, and the pool's per-key
+stats; the same Gemini load is then replayed with a fresh genai.Client per
+call (the previous behaviour) for comparison. Exits non-zero if pooled calls
+open more connections than the session pool size, or stats miss a key/error.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """POST /v1beta/models/<model>:generateContent | POST /v1/chat/completions"""
+
+    protocol_version = "HTTP/1.1"   # keep-alive, so connection reuse is observable
+    latency_s = 0.02
+    limited_key = None              # this key always gets 429 RESOURCE_EXHAUSTED
+    connections = 0
+    requests = 0
+    _lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self._lock:
+            type(self).connections += 1
+
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self._lock:
+            type(self).requests += 1
+        time.sleep(self.latency_s)
+        key = self.headers.get("x-goog-api-key") or self.headers.get("Authorization", "").replace("Bearer ", "")
+        if key == self.limited_key:
+            return self._send(429, {"error": {"code": 429, "message": "quota", "status": "RESOURCE_EXHAUSTED"}})
+        if ":generateContent" in self.path:
+            return self._send(200, {"candidates": [{"content": {"role": "model", "parts": [{"text": "{\"ok\": true}"}]},
+                                                    "finishReason": "STOP"}]})
+        if self.path.endswith("/chat/completions"):
+            return self._send(200, {"choices": [{"message": {"role": "assistant", "content": "{\"ok\": true}"}}]})
+        self._send(404, {"error": {"code": 404, "message": self.path}})
+
+
+def start_mock() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockLLMHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_calls(call, keys: list, calls: int, concurrency: int) -> tuple:
+    """calls requests round-robin over keys, `concurrency` at a time. Returns (ok, failed, seconds)."""
+    sem = asyncio.Semaphore(concurrency)
+    ok = failed = 0
+
+    async def _one(i: int):
+        nonlocal ok, failed
+        async with sem:
+            try:
+                await call(keys[i % len(keys)])
+                ok += 1
+            except Exception:
+                failed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_one(i) for i in range(calls)))
+    return ok, failed, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM client-pool check against a local mock endpoint.")
+    parser.add_argument("--calls", type=int, default=200, help="Gemini calls per run")
+    parser.add_argument("--keys", type=int, default=4, help="Distinct Gemini keys")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_mock()
+    base = f"http://127.0.0.1:{server.server_port}"
+    os.environ["GEMINI_BASE_URL"] = base
+    os.environ["GROK_API_URL"] = f"{base}/v1/chat/completions"
+    os.environ["GROK_API_KEY"] = "grok-mock-key-0000"
+    os.environ["LLM_CACHE"] = "0"   # every call must reach the endpoint
+
+    from google import genai
+    from google.genai import types
+    from Core.Intelligence.api_manager import gemini_api_call, grok_api_call
+    from Core.Intelligence.llm_client_pool import get_client_pool, HTTP_POOL_MAXSIZE
+
+    keys = [f"mock-gemini-key-{i:04d}" for i in range(args.keys)]
+    MockLLMHandler.limited_key = keys[-1]
+
+    async def pooled(key):
+        return await gemini_api_call("ping", {"temperature": 0}, api_key=key, model="gemini-2.5-flash")
+
+    async def fresh(key):
+        # Previous behaviour: a new client (and connection pool) per request
+        client = genai.Client(api_key=key, http_options=types.HttpOptions(base_url=base))
+        return await asyncio.to_thread(client.models.generate_content, model="gemini-2.5-flash", contents="ping")
+
+    async def grok(_key):
+        return await grok_api_call("ping", {"temperature": 0})
+
+    print(f"\n  [PoolCheck] Mock endpoint {base} | {args.calls} calls over {args.keys} keys "
+          f"(key ...{keys[-1][-4:]} rate-limited), concurrency {args.concurrency}")
+    results = {}
+    for label, call, n in (("fresh", fresh, args.calls), ("pooled", pooled, args.calls),
+                           ("grok", grok, max(1, args.calls // 4))):
+        MockLLMHandler.connections = 0
+        ok, failed, secs = asyncio.run(run_calls(call, keys, n, args.concurrency))
+        results[label] = MockLLMHandler.connections
+        print(f"  [PoolCheck] {label:<6} {ok:>4} ok / {failed:>3} failed in {secs:5.2f}s "
+              f"({n / secs:6.1f} calls/s), {MockLLMHandler.connections} TCP connections")
+
+    stats = get_client_pool().stats()
+    print(f"\n  {'KEY':<22} | {'CALLS':>5} | {'ERR':>4} | {'MEAN':>7} | {'P95':>7} | LAST ERROR")
+    print("  " + "-" * 90)
+    for label, s in stats.items():
+        print(f"  {label:<22} | {s['calls']:>5} | {s['errors']:>4} | {s['mean_ms']:>5.1f}ms | "
+              f"{s['p95_ms']:>5.1f}ms | {(s['last_error'] or '')[:40]}")
+    server.shutdown()
+
+    limited = stats.get(f"Gemini ...{keys[-1][-4:]}", {})
+    pooled_conn_cap = args.keys * min(args.concurrency, HTTP_POOL_MAXSIZE) * 2
+    problems = []
+    if results["pooled"] > pooled_conn_cap:
+        problems.append(f"pooled run opened {results['pooled']} connections (cap {pooled_conn_cap})")
+    if len([l for l in stats if l.startswith("Gemini")]) != args.keys:
+        problems.append("per-key stats missing a Gemini key")
+    if not limited.get("errors"):
+        problems.append("429s on the limited key were not recorded")
+    if problems:
+        print("  [PoolCheck] FAIL: " + "; ".join(problems))
+        sys.exit(1)
+    print(f"\n  [PoolCheck] Pooled clients reused connections "
+          f"({results['pooled']} vs {results['fresh']} with a client per call); per-key stats complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# check_market_settlement.py: Equivalence + speed check for the compiled market settlement engine.
+# Part of LeoBook Scripts — Pipeline
+#
+# Functions: build_corpus(), record_corpus(), check_corpus(), main()
+# Called by: developers / CI  (python Scripts/check_market_settlement.py [--db PATH] [--record FILE | --corpus FILE])
+
+"""
+Settles a corpus of (prediction, home_team, away_team, score, match_status)
+cases with the compiled engine, both per call (settle_outcome) and in one
+vectorized pass (settle_table), and exits non-zero on any difference from the
+expected outcome.
+
+Expected outcomes come from the v5.0 reference evaluator, or from a corpus
+recorded earlier with --record (so a change to the reference itself shows up
+too). The corpus is every distinct prediction in leobook.db plus FIXED_MARKETS,
+each crossed with scorelines 0-0..4-4 and regular / AET / penalty statuses.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+from Data.Access.league_db import DB_PATH
+from Data.Access.db_helpers import _reference_market_outcome
+from Data.Access.market_settlement import settle_outcome, settle_table
+
+HOME, AWAY = "Arsenal", "Chelsea"
+# Every rule of the grammar, including fall-through and malformed-looking cases
+FIXED_MARKETS = [
+    "Home Win", "home_win", "1", "Away Win", "away_win", "2", "Draw", "X",
+    "Over 2.5", "over_2_5", "Under 2.5", "under 2_5", "Over 1.5", "Under 1.5",
+    "Over 3.5", "Under 0.5", "Over 0.5 Goals",
+    "BTTS Yes", "btts_yes", "Both Teams To Score", "BTTS No", "both teams to score no",
+    "Home or Away", "12", "1 2", "1X", "Home or Draw", "X2", "Away or Draw", "Draw or Away",
+    "Double Chance 1X", "Double Chance X2", "Double Chance 12",
+    f"{HOME} to win", f"{AWAY} to win", "Arsen to win", "Madrid to win",
+    f"{HOME} or Draw", f"{AWAY} or draw", f"Draw or {HOME}", f"Draw or {AWAY}",
+    f"{HOME} or {AWAY}", f"{AWAY} or {HOME}", "Madrid or Barca",
+    f"{HOME} to win (DNB)", f"{AWAY} (DNB)", "Madrid to win (DNB)", "Madrid over 1.5 (DNB)",
+    f"{HOME} Over 0.5", f"{AWAY} Over 1.5", f"{HOME} Under 1.5", f"{AWAY} Under 0.5",
+    "Home Over 1.5", "Away Under 2.5", "Madrid Over 0.5",
+    f"{HOME} to win & BTTS Yes", f"{AWAY} to win & btts yes", "Madrid to win & BTTS Yes",
+    f"{HOME} clean sheet", f"{AWAY} Clean Sheet", "Madrid clean sheet",
+    "2-3 Goals", "", "PENDING", "  Over 2.5  ",
+]
+STATUSES = ["", "finished", "aet", "pen", "After Pen", "finished ap"]
+SCORES = [(h, a) for h in range(5) for a in range(5)]
+
+
+def build_corpus(db_path: str) -> list:
+    """[(prediction, home, away, h, a, status)] from FIXED_MARKETS and the predictions table."""
+    markets = {(m, HOME, AWAY) for m in FIXED_MARKETS}
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            markets |= {tuple(r) for r in conn.execute(
+                "SELECT DISTINCT prediction, COALESCE(home_team, ''), COALESCE(away_team, '') "
+                "FROM predictions WHERE prediction IS NOT NULL")}
+        except sqlite3.OperationalError:
+            pass
+        conn.close()
+    cases = [(p, ht, at, str(h), str(a), st)
+             for p, ht, at in sorted(markets) for h, a in SCORES for st in STATUSES]
+    # Unparseable scores are never settled
+    cases += [(p, ht, at, h, a, "") for p, ht, at in sorted(markets)[:5] for h, a in (("", "1"), ("2-1", ""), (None, "0"))]
+    return cases
+
+
+def _reference(cases: list) -> list:
+    out = []
+    for p, ht, at, h, a, st in cases:
+        try:
+            out.append(_reference_market_outcome(p, h, a, ht, at, match_status=st))
+        except ValueError:
+            out.append(None)
+    return out
+
+
+def record_corpus(cases: list, path: str) -> None:
+    expected = _reference(cases)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([list(c) + [e] for c, e in zip(cases, expected)], f)
+    print(f"  [Settlement] Recorded {len(cases)} cases to {path}")
+
+
+def check_corpus(cases: list, expected: list) -> int:
+    """Print timings and mismatches; returns the number of mismatching cases."""
+    keep = [i for i, e in enumerate(expected) if e is not None]   # reference raised: malformed line
+    cases = [cases[i] for i in keep]
+    expected = [expected[i] for i in keep]
+
+    import numpy  # noqa: F401 -- loaded up front so settle_table's timing excludes the import
+    t0 = time.perf_counter()
+    _reference(cases)
+    t_ref = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    scalar = [settle_outcome(p, h, a, ht, at, st) for p, ht, at, h, a, st in cases]
+    t_scalar = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    columns = list(zip(*cases))
+    table = settle_table(columns[0], columns[3], columns[4], columns[1], columns[2], columns[5])
+    t_table = time.perf_counter() - t0
+
+    mismatches = 0
+    for case, exp, s, t in zip(cases, expected, scalar, table):
+        if s != exp or t != exp:
+            mismatches += 1
+            if mismatches <= 20:
+                print(f"  [FAIL] {case!r}: expected {exp!r}, settle_outcome {s!r}, settle_table {t!r}")
+
+    n = len(cases)
+    print(f"  [Settlement] {n} cases | reference {t_ref * 1000:.0f} ms | "
+          f"settle_outcome {t_scalar * 1000:.0f} ms | settle_table {t_table * 1000:.0f} ms "
+          f"({n / max(t_table, 1e-9):,.0f} rows/s)")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the compiled market engine against the reference evaluator.")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite file to take predictions from (default: leobook.db)")
+    parser.add_argument("--record", metavar="FILE", help="Write the corpus with reference outcomes to FILE and exit")
+    parser.add_argument("--corpus", metavar="FILE", help="Check against a corpus recorded with --record")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            rows = json.load(f)
+        cases, expected = [tuple(r[:6]) for r in rows], [r[6] for r in rows]
+    else:
+        cases = build_corpus(args.db)
+        if args.record:
+            record_corpus(cases, args.record)
+            return
+        expected = _reference(cases)
+
+    mismatches = check_corpus(cases, expected)
+    if mismatches:
+        print(f"  [Settlement] {mismatches} case(s) differ from the expected outcome.")
+        sys.exit(1)
+    print("  [Settlement] Compiled engine matches the expected outcome on every case.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# check_query_plans.py: EXPLAIN QUERY PLAN regression check for hot SQLite queries.
+# Part of LeoBook Scripts — Pipeline
+#
+# Functions: full_scans(), check_query_plans(), main()
+# Called by: developers / CI  (python Scripts/check_query_plans.py [--db PATH])
+
+"""
+Runs EXPLAIN QUERY PLAN on every hot read query the pipeline issues and exits
+non-zero if any of them scans a whole table instead of searching an index.
+Keep HOT_QUERIES in step with the call sites listed next to each entry.
+"""
+
+import os
+import re
+import sys
+import argparse
+import sqlite3
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+from Data.Access.league_db import DB_PATH, _COMPUTED_STANDINGS_SQL, init_db
+
+# (name, call site, sql, sample params)
+HOT_QUERIES = [
+    ("weekly_fixtures", "prediction_pipeline.get_weekly_fixtures",
+     """SELECT * FROM schedules
+        WHERE date IN (?, ?)
+          AND (match_status IS NULL OR match_status = 'scheduled' OR match_status = '')
+        ORDER BY date, time""",
+     ("2025-01-01", "2025-01-02")),
+    ("team_form_batch", "prediction_pipeline.batch_team_form",
+     """WITH wanted(team_id) AS (VALUES (?), (?)),
+        ranked AS (
+            SELECT w.team_id AS for_team, s.*,
+                   ROW_NUMBER() OVER (PARTITION BY w.team_id ORDER BY s.date DESC) AS rn
+            FROM wanted w
+            JOIN schedules s ON (s.home_team_id = w.team_id OR s.away_team_id = w.team_id)
+            WHERE s.home_score IS NOT NULL AND s.away_score IS NOT NULL
+              AND s.home_score != '' AND s.away_score != ''
+        )
+        SELECT * FROM ranked WHERE rn <= ? ORDER BY for_team, rn""",
+     ("t1", "t2", 10)),
+    ("h2h_batch", "prediction_pipeline.batch_h2h",
+     """WITH wanted(team_a, team_b) AS (VALUES (?, ?)),
+        ranked AS (
+            SELECT w.team_a AS pair_a, w.team_b AS pair_b, s.*,
+                   ROW_NUMBER() OVER (PARTITION BY w.team_a, w.team_b ORDER BY s.date DESC) AS rn
+            FROM wanted w
+            JOIN schedules s ON ((s.home_team_id = w.team_a AND s.away_team_id = w.team_b)
+                              OR (s.home_team_id = w.team_b AND s.away_team_id = w.team_a))
+            WHERE s.home_score IS NOT NULL AND s.away_score IS NOT NULL
+              AND s.home_score != '' AND s.away_score != ''
+        )
+        SELECT * FROM ranked WHERE rn <= ? ORDER BY pair_a, pair_b, rn""",
+     ("t1", "t2", 10)),
+    ("standings_league_season", "league_db.computed_standings",
+     _COMPUTED_STANDINGS_SQL.format(filters=" AND league_id = ? AND season = ?"),
+     ("l1", "2024/2025")),
+    ("standings_league", "league_db.computed_standings",
+     _COMPUTED_STANDINGS_SQL.format(filters=" AND league_id = ?"),
+     ("l1",)),
+    ("existing_predictions", "prediction_pipeline._get_existing_prediction_ids",
+     "SELECT fixture_id FROM predictions WHERE fixture_id IS NOT NULL",
+     ()),
+    ("prediction_by_fixture", "db_helpers (prediction lookups)",
+     "SELECT * FROM predictions WHERE fixture_id = ?",
+     ("f1",)),
+    ("predictions_by_status", "league_db.get_predictions",
+     "SELECT * FROM predictions WHERE status = ?",
+     ("pending",)),
+    ("rl_result_dates", "RLTrainer.train_from_fixtures",
+     """SELECT DISTINCT date FROM schedules
+        WHERE date IS NOT NULL
+          AND home_score IS NOT NULL
+          AND away_score IS NOT NULL
+        ORDER BY date ASC""",
+     ()),
+    ("rl_day_fixtures", "RLTrainer.train_from_fixtures",
+     """SELECT fixture_id, league_id, home_team_id, home_team_name,
+               away_team_id, away_team_name, home_score, away_score, season
+        FROM schedules
+        WHERE date = ? AND home_score IS NOT NULL AND away_score IS NOT NULL""",
+     ("2025-01-01",)),
+    ("rl_team_form", "RLTrainer._get_team_form",
+     """SELECT date, home_team_name, away_team_name, home_score, away_score
+        FROM schedules
+        WHERE (home_team_id = ? OR away_team_id = ?)
+          AND date < ?
+          AND home_score IS NOT NULL
+        ORDER BY date DESC
+        LIMIT 10""",
+     ("t1", "t1", "2025-01-01")),
+    ("rl_h2h", "RLTrainer._get_h2h",
+     """SELECT date, home_team_name, away_team_name, home_score, away_score
+        FROM schedules
+        WHERE ((home_team_id = ? AND away_team_id = ?)
+            OR (home_team_id = ? AND away_team_id = ?))
+          AND date < ?
+          AND home_score IS NOT NULL
+        ORDER BY date DESC
+        LIMIT 10""",
+     ("t1", "t2", "t2", "t1", "2025-01-01")),
+    ("streamer_live_schedules", "fs_live_streamer._propagate_status_updates",
+     "SELECT * FROM schedules WHERE match_status = 'live'",
+     ()),
+    ("streamer_live_predictions", "fs_live_streamer._propagate_status_updates",
+     "SELECT * FROM predictions WHERE status = 'live'",
+     ()),
+    ("streamer_fixture_batch", "fs_live_streamer._rows_by_fixture",
+     "SELECT * FROM schedules WHERE fixture_id IN (?, ?, ?)",
+     ("f1", "f2", "f3")),
+    ("team_by_id", "db_helpers.get_team_crest",
+     "SELECT crest FROM teams WHERE team_id = ?",
+     ("t1",)),
+]
+
+_SCAN_RE = re.compile(r"^SCAN (\w+)")
+
+
+def full_scans(conn: sqlite3.Connection, sql: str, params=()) -> list:
+    """Plan lines that walk a whole table, even in index order (CTE scans are fine)."""
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    bad = []
+    for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params):
+        detail = row[3]
+        m = _SCAN_RE.match(detail)
+        if m and m.group(1) in tables:
+            bad.append(detail)
+    return bad
+
+
+def check_query_plans(conn: sqlite3.Connection, verbose: bool = False) -> int:
+    """Print a PASS/FAIL line per hot query. Returns the number of failures."""
+    failures = 0
+    for name, source, sql, params in HOT_QUERIES:
+        bad = full_scans(conn, sql, params)
+        status = "FAIL" if bad else "PASS"
+        print(f"  [{status}] {name:<26} ({source})")
+        for detail in bad:
+            print(f"         -> {detail}")
+        if verbose and not bad:
+            for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params):
+                print(f"         {row[3]}")
+        failures += bool(bad)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a hot query degrades to a full table scan.")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite file to check (default: leobook.db)")
+    parser.add_argument("--verbose", action="store_true", help="Print the full plan for passing queries")
+    args = parser.parse_args()
+
+    # Migrating first guarantees the plan reflects the current index set
+    init_db(sqlite3.connect(args.db)).close()
+    conn = sqlite3.connect(args.db)
+    print(f"\n  [QueryPlan] {len(HOT_QUERIES)} hot queries against {args.db}")
+    failures = check_query_plans(conn, verbose=args.verbose)
+    conn.close()
+    if failures:
+        print(f"  [QueryPlan] {failures} quer{'y' if failures == 1 else 'ies'} fell back to a full table scan.")
+        sys.exit(1)
+    print("  [QueryPlan] All hot queries use an index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# check_startup_budget.py: Per-mode CLI startup budget + import-time profile for Leo.py.
+# Part of LeoBook Scripts — Pipeline
+#
+# Functions: measure_mode(), parse_importtime(), print_profile(), main()
+# Called by: developers / CI  (python Scripts/check_startup_budget.py [--mode NAME] [--profile] [--top N])
+
+"""
+For each CLI target registered in Leo.COMMANDS, a fresh interpreter imports
+Leo and preloads that target's lazy imports (what the command resolves on its
+first call), without running it. The wall time is held to BUDGETS_S, and the
+heavy packages a mode must never load (torch outside RL, the browser outside
+browser modes) are checked from sys.modules.
+
+--profile adds the `python -X importtime` report for each mode: the most
+expensive modules by cumulative cost, and self time summed per top-level
+package. Modes whose imports need an optional dependency (torch) or
+configuration that is not present here are reported as SKIP; --strict makes
+them fail.
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+IMPORT_ONLY = "(import)"
+# Wall seconds to import Leo + resolve the mode's imports
+BUDGETS_S = {
+    IMPORT_ONLY: 0.3,
+    "accuracy": 0.5, "rule_engine": 0.5, "upgrade_crests": 0.5, "cycle": 0.5,
+    "enrich_leagues": 1.0, "prologue": 1.0, "recommend": 1.5,
+    "sync": 2.5, "reset_sync": 2.5, "pull": 2.5, "assets": 2.5, "search_dict": 2.5,
+    "review": 3.0, "streamer": 3.0, "logos": 3.0, "chapter_2": 3.0,
+    "train_rl": 8.0, "chapter_1": 8.0,
+}
+DEFAULT_BUDGET_S = 3.0
+RL_MODES = {"train_rl", "chapter_1"}
+BROWSER_MODES = {"review", "streamer", "logos", "enrich_leagues", "search_dict",
+                 "prologue", "chapter_1", "chapter_2"}
+HEAVY = ("torch", "playwright")
+
+# Leo.validate_config() runs before any mode; placeholders let the check run without a .env
+PLACEHOLDER_ENV = {"GROK_API_KEY": "x", "GEMINI_API_KEY": "x", "FB_PHONE": "x", "FB_PASSWORD": "x"}
+
+_CHILD = """
+import sys, json, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import Leo
+t_import = time.perf_counter() - t0
+error = None
+if {mode!r} != {import_only!r}:
+    try:
+        Leo.COMMANDS.preload({mode!r})
+    except Exception as e:
+        error = f"{{type(e).__name__}}: {{e}}"
+print("@@" + json.dumps({{"import_s": t_import, "total_s": time.perf_counter() - t0, "error": error,
+                         "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def forbidden_for(mode: str) -> set:
+    forbidden = set()
+    if mode not in RL_MODES:
+        forbidden.add("torch")
+    if mode not in BROWSER_MODES:
+        forbidden.add("playwright")
+    return forbidden
+
+
+def parse_importtime(stderr: str) -> list:
+    """[(self_us, cumulative_us, depth, module)] from `python -X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, self_us, cum_us, name = (part for part in line.replace("import time:", "|", 1).split("|"))
+        depth = max(0, len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((int(self_us), int(cum_us), depth, name.strip()))
+    return rows
+
+
+def measure_mode(mode: str, repeat: int = 1) -> dict:
+    """Fastest of `repeat` fresh-interpreter runs, with its import-time rows."""
+    env = dict(os.environ)
+    for key, value in PLACEHOLDER_ENV.items():
+        env.setdefault(key, value)
+    code = _CHILD.format(root=PROJECT_ROOT, mode=mode, import_only=IMPORT_ONLY, heavy=HEAVY)
+    best = None
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                              env=env, capture_output=True, text=True)
+        marker = [l for l in proc.stdout.splitlines() if l.startswith("@@")]
+        if not marker:
+            tail = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+            return {"mode": mode, "error": f"child failed: {tail}", "rows": parse_importtime(proc.stderr)}
+        result = json.loads(marker[-1][2:])
+        if best is None or result["total_s"] < best["total_s"]:
+            best = dict(result, mode=mode, rows=parse_importtime(proc.stderr))
+    return best
+
+
+def print_profile(result: dict, top: int) -> None:
+    rows = result["rows"]
+    print(f"\n  --- {result['mode']}: top {top} modules by cumulative import time ---")
+    for self_us, cum_us, depth, name in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"    {cum_us / 1000:>8.1f} ms  (self {self_us / 1000:>6.1f})  {'  ' * min(depth, 6)}{name}")
+    per_package = defaultdict(int)
+    for self_us, _, _, name in rows:
+        per_package[name.split(".")[0]] += self_us
+    print(f"  --- {result['mode']}: self time per top-level package ---")
+    for package, us in sorted(per_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {us / 1000:>8.1f} ms  {package}")
+
+
+def main():
+    import Leo
+
+    modes = [IMPORT_ONLY] + Leo.COMMANDS.names()
+    parser = argparse.ArgumentParser(description="Hold each Leo.py CLI mode to its startup budget.")
+    parser.add_argument("--mode", action="append", choices=modes, help="Only check these modes (repeatable)")
+    parser.add_argument("--profile", action="store_true", help="Print the import-time profile per mode")
+    parser.add_argument("--top", type=int, default=15, help="Rows per profile table (default 15)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the fastest counts (default 3)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow CI machines)")
+    parser.add_argument("--strict", action="store_true", help="Fail modes that cannot be imported here")
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"  {'MODE':<16} | {'IMPORT':>8} | {'TOTAL':>8} | {'BUDGET':>8} | STATUS")
+    print("  " + "-" * 70)
+    for mode in args.mode or modes:
+        result = measure_mode(mode, args.repeat)
+        budget = BUDGETS_S.get(mode, DEFAULT_BUDGET_S) * args.scale
+        if result.get("error"):
+            status = f"SKIP ({result['error'][:60]})"
+            failures += args.strict
+            print(f"  {mode:<16} | {'-':>8} | {'-':>8} | {budget:>7.2f}s | {status}")
+        else:
+            leaked = sorted(forbidden_for(mode) & set(result["heavy"]))
+            over = result["total_s"] > budget
+            status = "OK" if not (leaked or over) else "FAIL"
+            if over:
+                status += " over budget"
+            if leaked:
+                status += f" loads {', '.join(leaked)}"
+            failures += status != "OK"
+            print(f"  {mode:<16} | {result['import_s']:>7.3f}s | {result['total_s']:>7.3f}s | "
+                  f"{budget:>7.2f}s | {status}")
+        if args.profile and result.get("rows"):
+            print_profile(result, args.top)
+
+    if failures:
+        print(f"\n  [Startup] {failures} mode(s) failed the startup budget.")
+        sys.exit(1)
+    print("\n  [Startup] Every mode is within its startup budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# check_sync_pull.py: Keyset-pull check for SyncManager against a local Supabase stand-in.
+# Part of LeoBook Scripts — Pipeline
+#
+# Classes: StandInHandler
+# Functions: start_standin(), synthetic_rows(), main()
+# Called by: developers / CI  (python Scripts/check_sync_pull.py [--rows N] [--max-rows M])
+
+"""
+Serves a minimal PostgREST subset (select/order/limit/gt filters, exact counts,
+a server-side row cap) over plain HTTP on localhost, then pulls a synthetic
+schedules table into a throwaway SQLite file through the real supabase client:
+first with an injected failure mid-pull, then resuming from the saved cursor.
+Exits non-zero unless every remote row arrives exactly once.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+from supabase import create_client
+
+from Data.Access.league_db import init_db
+from Data.Access.sync_manager import SyncManager, TABLE_CONFIG
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """GET /rest/v1/<table>?select=*&order=<key>.asc&limit=N[&<key>=gt.<value>]"""
+
+    tables: dict = {}       # table -> rows sorted by its key
+    max_rows = 1000         # PostgREST db-max-rows cap
+    fail_after = None       # fail the Nth page request (simulated outage)
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body, headers: dict = None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        table = url.path.rsplit("/", 1)[-1]
+        if table not in self.tables:
+            return self._send(404, {"code": "PGRST205", "message": f"Could not find the table '{table}'"})
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        key = TABLE_CONFIG[table]["key"]
+        rows = self.tables[table]
+
+        if "count=exact" in self.headers.get("Prefer", ""):
+            return self._send(200, [], {"Content-Range": f"*/{len(rows)}"})
+
+        cls = type(self)
+        cls.requests += 1
+        if cls.fail_after is not None and cls.requests > cls.fail_after:
+            return self._send(503, {"message": "stand-in outage"})
+
+        after = params.get(key, "")
+        if after.startswith("gt."):
+            rows = [r for r in rows if str(r[key]) > after[3:]]
+        limit = min(int(params.get("limit", self.max_rows)), self.max_rows)
+        self._send(200, rows[:limit])
+
+
+def start_standin() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def synthetic_rows(n: int, seed: int = 3) -> list:
+    """n schedules rows in key order, with random (non-sequential) fixture ids."""
+    rng = random.Random(seed)
+    ids = sorted({f"{rng.getrandbits(40):010x}" for _ in range(n * 2)})[:n]
+    return [{
+        "fixture_id": fid,
+        "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "league_id": f"L{rng.randint(1, 40)}",
+        "home_team_name": f"Team {rng.randint(1, 800)}",
+        "away_team_name": f"Team {rng.randint(1, 800)}",
+        "home_score": rng.randint(0, 5),
+        "away_score": None if rng.random() < 0.1 else rng.randint(0, 5),
+        "match_status": "finished",
+        "extra": {"source": "standin"} if rng.random() < 0.05 else None,
+    } for fid in ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyset pull + resume check against a local PostgREST stand-in.")
+    parser.add_argument("--rows", type=int, default=50000, help="Remote schedules rows")
+    parser.add_argument("--max-rows", type=int, default=1000, help="Server-side page cap")
+    args = parser.parse_args()
+
+    remote = synthetic_rows(args.rows)
+    StandInHandler.tables = {"schedules": remote}
+    StandInHandler.max_rows = args.max_rows
+    pages = -(-len(remote) // args.max_rows)
+    StandInHandler.fail_after = max(1, pages // 2)
+
+    server = start_standin()
+    client = create_client(f"http://127.0.0.1:{server.server_port}", "standin.key.local")
+    db_path = os.path.join(tempfile.mkdtemp(prefix="leobook_pull_"), "pull.db")
+    conn = init_db(sqlite3.connect(db_path))
+    sync = SyncManager(supabase=client, conn=conn)
+
+    print(f"\n  [PullCheck] {len(remote):,} remote rows, {args.max_rows} per page, outage after page {StandInHandler.fail_after}")
+    asyncio.run(sync.batch_pull("schedules"))
+    cursor = sync._get_pull_cursor("schedules")
+    print(f"  [PullCheck] Interrupted: cursor {cursor}")
+
+    StandInHandler.fail_after = None
+    start = time.perf_counter()
+    resumed = asyncio.run(sync.batch_pull("schedules"))
+    elapsed = time.perf_counter() - start
+
+    local = [r[0] for r in conn.execute("SELECT fixture_id FROM schedules ORDER BY fixture_id")]
+    expected = [r["fixture_id"] for r in remote]
+    leftover = sync._get_pull_cursor("schedules")
+    extra_rows = conn.execute("SELECT COUNT(*) FROM schedules WHERE extra IS NOT NULL").fetchone()[0]
+    conn.close()
+    server.shutdown()
+
+    print(f"  [PullCheck] Resumed pull: {resumed:,} rows in {elapsed:.2f}s "
+          f"({resumed / max(elapsed, 1e-9):,.0f} rows/s), {extra_rows} JSON 'extra' values kept")
+    if cursor is None or local != expected or leftover is not None:
+        print(f"  [PullCheck] FAIL: {len(local):,} local vs {len(expected):,} remote rows "
+              f"(cursor after resume: {leftover})")
+        sys.exit(1)
+    print("  [PullCheck] Every remote row pulled exactly once; cursor cleared.")
+
+
+if __name__ == "__main__":
+    main()
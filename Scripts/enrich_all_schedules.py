@@ -49,6 +49,7 @@ from Core.Browser.Extractors.league_page_extractor import extract_league_match_u
 from Modules.Flashscore.fs_utils import retry_extraction
 from Core.Utils.constants import NAVIGATION_TIMEOUT, WAIT_FOR_LOAD_STATE_TIMEOUT
 from Core.Intelligence.aigo_suite import AIGOSuite
+from Core.System.metrics import traced_goto
 
 # Configuration
 _IS_CODESPACE = bool(os.getenv('CODESPACES') or os.getenv('CODESPACE_NAME'))
@@ -178,7 +179,7 @@ async def extract_match_enrichment(page, match_url: str, sel: Dict[str, str],
     try:
         # Use retry for navigation
         async def _navigate():
-            await page.goto(match_url, wait_until='domcontentloaded', timeout=NAVIGATION_TIMEOUT)
+            await traced_goto(page, match_url, wait_until='domcontentloaded', timeout=NAVIGATION_TIMEOUT)
             await asyncio.sleep(1.0)
         
         await retry_extraction(_navigate)
@@ -264,7 +265,7 @@ async def extract_match_enrichment(page, match_url: str, sel: Dict[str, str],
                 # real league ID into the URL hash (e.g. /#/21FuA3md/)
                 try:
                     await retry_extraction(
-                        lambda: page.goto(enriched['league_url'], wait_until='networkidle', timeout=30000)
+                        lambda: traced_goto(page, enriched['league_url'], wait_until='networkidle', timeout=30000)
                     )
                     await asyncio.sleep(2.5)  # Allow JS to update URL with season hash
                     
@@ -292,7 +293,7 @@ async def extract_match_enrichment(page, match_url: str, sel: Dict[str, str],
                     try:
                         from Core.Browser.Extractors.league_page_extractor import extract_league_metadata
                         l_results_url = enriched.get('league_url', '').rstrip('/') + '/results/'
-                        await page.goto(l_results_url, wait_until='domcontentloaded', timeout=20000)
+                        await traced_goto(page, l_results_url, wait_until='domcontentloaded', timeout=20000)
                         await asyncio.sleep(2)
                         
                         league_meta = await extract_league_metadata(page)
@@ -53,6 +53,7 @@ from Data.Access.league_db import (
     get_league_db_id, get_team_id,
 )
 from Core.Browser.site_helpers import fs_universal_popup_dismissal
+from Core.System.metrics import traced_goto
 
 # ── Selectors (Unified Knowledge Base) ───────────────────────────────────────
 selector_mgr = SelectorManager()
@@ -509,7 +510,7 @@ async def get_archive_seasons(page: Page, league_url: str) -> List[Dict]:
     archive_url = league_url.rstrip("/") + "/archive/"
     print(f"    [Archive] Navigating to {archive_url}")
     try:
-        await page.goto(archive_url, wait_until="domcontentloaded", timeout=60000)
+        await traced_goto(page, archive_url, wait_until="domcontentloaded", timeout=60000)
         await asyncio.sleep(3)
         await fs_universal_popup_dismissal(page)
         selectors = selector_mgr.get_all_selectors_for_context(CONTEXT_LEAGUE)
@@ -558,7 +559,7 @@ async def extract_tab(page: Page, league_url: str, tab: str, conn,
     print(f"    [{tab.upper()}] Navigating to {url}")
 
     try:
-        resp = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        resp = await traced_goto(page, url, wait_until="domcontentloaded", timeout=60000)
         await asyncio.sleep(3)
         await fs_universal_popup_dismissal(page)
 
@@ -789,7 +790,7 @@ async def enrich_single_league(context, league: Dict[str, Any], conn,
     page = await context.new_page()
     try:
         # ── Navigate to league page ──────────────────────────────────────
-        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        await traced_goto(page, url, wait_until="domcontentloaded", timeout=60000)
         await asyncio.sleep(4)
         await fs_universal_popup_dismissal(page)
 
@@ -1327,7 +1328,7 @@ async def resolve_id_via_search(context, table, lookup_key):
             search_query = f"{name} {country}"
             
         # 1. Search Flashscore
-        await page.goto(f"https://www.flashscore.com/search/?q={search_query.replace(' ', '+')}", timeout=60000)
+        await traced_goto(page, f"https://www.flashscore.com/search/?q={search_query.replace(' ', '+')}", timeout=60000)
         
         try:
             await page.wait_for_selector(".search__content", timeout=15000)
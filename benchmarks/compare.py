@@ -0,0 +1,88 @@
+# compare.py: Diff two run_benchmarks.py result files and flag regressions.
+# Part of LeoBook Benchmarks
+#
+# Functions: load(), compare(), main()
+# Called by: developers / CI  (python benchmarks/compare.py BASE.json HEAD.json [--threshold 0.15])
+
+"""
+Compares each benchmark present in both files by best wall time per item
+(so runs at different --rows stay comparable, though the dataset is noted).
+A benchmark whose per-item time grew by more than --threshold is a
+regression and makes the exit status 1; one that shrank by as much is
+reported as faster. Benchmarks skipped or missing on either side are listed
+but never fail the comparison.
+"""
+
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Tuple
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any], threshold: float) -> Tuple[List[tuple], int]:
+    """[(name, base_us, head_us, change, verdict)] and the number of regressions."""
+    rows, regressions = [], 0
+    names = list(base["results"]) + [n for n in head["results"] if n not in base["results"]]
+    for name in names:
+        b = base["results"].get(name, {})
+        h = head["results"].get(name, {})
+        if "per_item_us" not in b or "per_item_us" not in h:
+            missing = "skipped" if (b or h) else "missing"
+            rows.append((name, b.get("per_item_us"), h.get("per_item_us"), None, missing))
+            continue
+        change = h["per_item_us"] / b["per_item_us"] - 1 if b["per_item_us"] else 0.0
+        if change > threshold:
+            verdict = "REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            verdict = "faster"
+        else:
+            verdict = "ok"
+        rows.append((name, b["per_item_us"], h["per_item_us"], change, verdict))
+    return rows, regressions
+
+
+def _label(report: Dict[str, Any]) -> str:
+    meta = report.get("meta", {})
+    dataset = meta.get("dataset", {})
+    dirty = "+dirty" if meta.get("dirty") else ""
+    return f"{meta.get('commit', '?')}{dirty} ({dataset.get('rows', '?'):,} rows, seed {dataset.get('seed', '?')})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base", help="Result JSON of the baseline commit")
+    parser.add_argument("head", help="Result JSON of the commit under test")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative per-item slowdown that counts as a regression (default 0.15)")
+    args = parser.parse_args()
+
+    base, head = load(args.base), load(args.head)
+    print(f"\n  [Bench] base: {_label(base)}")
+    print(f"  [Bench] head: {_label(head)}")
+    b_set, h_set = base["meta"].get("dataset", {}), head["meta"].get("dataset", {})
+    if (b_set.get("rows"), b_set.get("seed")) != (h_set.get("rows"), h_set.get("seed")):
+        print("  [Bench] Warning: different datasets; per-item times may not scale linearly.")
+
+    rows, regressions = compare(base, head, args.threshold)
+    print(f"\n  {'BENCHMARK':<30} | {'BASE/ITEM':>12} | {'HEAD/ITEM':>12} | {'CHANGE':>8} | VERDICT")
+    print("  " + "-" * 84)
+    for name, b_us, h_us, change, verdict in rows:
+        b_txt = f"{b_us:>10.1f}us" if b_us is not None else f"{'-':>12}"
+        h_txt = f"{h_us:>10.1f}us" if h_us is not None else f"{'-':>12}"
+        c_txt = f"{change * 100:>+7.1f}%" if change is not None else f"{'-':>8}"
+        print(f"  {name:<30} | {b_txt} | {h_txt} | {c_txt} | {verdict}")
+
+    if regressions:
+        print(f"\n  [Bench] {regressions} benchmark(s) regressed by more than {args.threshold:.0%}.")
+        sys.exit(1)
+    print(f"\n  [Bench] No regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+# run_benchmarks.py: Times LeoBook's hot paths against a synthetic database and writes JSON results.
+# Part of LeoBook Benchmarks
+#
+# Classes: Benchmark, StubSupabase
+# Functions: build_benchmarks(), run_benchmark(), git_revision(), main()
+# Called by: developers / CI  (python benchmarks/run_benchmarks.py [--rows N] [--seed S] [--only NAME])
+
+"""
+Generates a fresh database with benchmarks/synthetic_data.py in a temporary
+directory (never Data/Store), points league_db at it, then times each hot
+path best-of --repeat:
+
+  standings.cold / .warm     computed_standings per league, cache empty / primed
+  rule_inputs.build          build_rule_engine_inputs for the week's fixtures
+  rule_engine.analyze        RuleEngine.analyze per fixture
+  feature_encoder.encode     FeatureEncoder.encode per fixture (+ encode_batch)
+  rl.predict                 RLPredictor.predict per fixture (untrained weights
+                             if no model file exists; only inference cost counts)
+  market.evaluate            evaluate_market_outcome over every prediction,
+                             market compile cache cleared
+  accuracy.generate          run_accuracy_generation (last-24h report)
+  streamer.propagate         _propagate_status_updates for the live fixtures,
+                             state restored before every run
+  sync.batch_upsert          SyncManager.batch_upsert of the predictions table
+                             into StubSupabase (no network)
+
+Paths whose optional dependency is missing (torch) are recorded as skipped.
+Results go to benchmarks/results/<commit>_<rows>.json; compare two runs with
+benchmarks/compare.py.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import contextlib
+from dataclasses import dataclass
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.synthetic_data import generate, live_fixture_ids, use_database
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+MAX_FIXTURES = 1000          # fixtures fed to the per-fixture paths (rule engine, encoder, RL)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    fn: Callable[[], Any]
+    items: int
+    setup: Optional[Callable[[], None]] = None
+    skip: Optional[str] = None
+
+
+class StubSupabase:
+    """Stands in for the supabase-py client in SyncManager.
+
+    table(...).upsert(rows, on_conflict=...).execute() JSON-encodes the batch,
+    as the HTTP client would for the request body, and counts it; nothing
+    leaves the process."""
+
+    def __init__(self):
+        self.requests = 0
+        self.rows = 0
+        self.bytes = 0
+
+    def table(self, name: str):
+        return _StubQuery(self, name)
+
+
+class _StubQuery:
+    def __init__(self, client: StubSupabase, name: str):
+        self.client = client
+        self.name = name
+        self._rows: List[Dict] = []
+
+    def upsert(self, rows, on_conflict: str = None):
+        self._rows = rows
+        return self
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def in_(self, *args, **kwargs):
+        return self
+
+    def execute(self):
+        body = json.dumps(self._rows, default=str)
+        self.client.requests += 1
+        self.client.rows += len(self._rows)
+        self.client.bytes += len(body)
+        return SimpleNamespace(data=[], count=0)
+
+
+def _quiet(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """Run fn with stdout discarded (the paths print progress lines)."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+
+def _torch_missing() -> Optional[str]:
+    try:
+        import torch  # noqa: F401
+    except ImportError:
+        return "torch not installed"
+    return None
+
+
+def build_benchmarks(conn, ds, stub: StubSupabase) -> List[Benchmark]:
+    from Data.Access import league_db
+    from Data.Access.db_helpers import evaluate_market_outcome
+    from Data.Access.market_settlement import _compile_cached
+    from Data.Access.outcome_reviewer import run_accuracy_generation
+    from Data.Access.sync_manager import SyncManager
+    from Core.Intelligence.prediction_pipeline import build_rule_engine_inputs, get_weekly_fixtures
+    from Core.Intelligence.rule_engine import RuleEngine
+    from Modules.Flashscore import fs_live_streamer
+
+    fs_live_streamer.DB_PATH = league_db.DB_PATH
+
+    fixtures = get_weekly_fixtures(conn)[:MAX_FIXTURES]
+    inputs, _ = build_rule_engine_inputs(conn, fixtures)
+    season = ds.current_season
+
+    def standings_all():
+        for league_id in ds.leagues:
+            league_db.computed_standings(conn=conn, league_id=league_id, season=season)
+
+    predictions = [dict(r) for r in conn.execute("SELECT * FROM predictions")]
+    settled = [p for p in predictions if p["home_score"] != ""]
+
+    def evaluate_all():
+        for p in settled:
+            evaluate_market_outcome(p["prediction"], p["home_score"], p["away_score"],
+                                    p["home_team"], p["away_team"], match_status="finished")
+
+    # Live fixtures: half score again and stay live, half finish
+    live_ids = live_fixture_ids(conn)
+    live_rows = {r["fixture_id"]: dict(r) for r in conn.execute(
+        "SELECT * FROM schedules WHERE match_status = 'live'")}
+    live_preds = {r["fixture_id"]: dict(r) for r in conn.execute(
+        "SELECT * FROM predictions WHERE status = 'live'")}
+    still_live, resolved = [], []
+    for i, fid in enumerate(live_ids):
+        row = live_rows[fid]
+        match = {"fixture_id": fid, "home_team": row["home_team_name"], "away_team": row["away_team_name"],
+                 "home_score": str(row["home_score"] + 1), "away_score": str(row["away_score"]),
+                 "status": "live" if i % 2 == 0 else "finished", "date": row["date"], "time": row["time"],
+                 "region_league": row["region_league"]}
+        (still_live if i % 2 == 0 else resolved).append(match)
+
+    def restore_live():
+        with conn:
+            conn.executemany(
+                "UPDATE schedules SET match_status = 'live', home_score = ?, away_score = ? WHERE fixture_id = ?",
+                [(r["home_score"], r["away_score"], fid) for fid, r in live_rows.items()])
+            conn.executemany(
+                "UPDATE predictions SET status = 'live', home_score = ?, away_score = ?, "
+                "actual_score = '', outcome_correct = '' WHERE fixture_id = ?",
+                [(r["home_score"], r["away_score"], fid) for fid, r in live_preds.items()])
+
+    sync = SyncManager(supabase=stub, conn=conn)
+
+    torch_missing = _torch_missing()
+    benches = [
+        Benchmark("standings.cold", standings_all, len(ds.leagues), setup=league_db._standings_cache.clear),
+        Benchmark("standings.warm", standings_all, len(ds.leagues), setup=standings_all),
+        Benchmark("rule_inputs.build", lambda: build_rule_engine_inputs(conn, fixtures), len(fixtures),
+                  setup=league_db._standings_cache.clear),
+        Benchmark("rule_engine.analyze", _quiet(lambda: [RuleEngine.analyze(vd) for vd in inputs]), len(inputs)),
+        Benchmark("market.evaluate", evaluate_all, len(settled), setup=_compile_cached.cache_clear),
+        Benchmark("accuracy.generate", _quiet(lambda: asyncio.run(run_accuracy_generation())), len(predictions)),
+        Benchmark("streamer.propagate",
+                  _quiet(lambda: fs_live_streamer._propagate_status_updates(still_live, resolved)),
+                  len(live_ids), setup=restore_live),
+        Benchmark("sync.batch_upsert", lambda: asyncio.run(sync.batch_upsert("predictions", predictions)),
+                  len(predictions)),
+    ]
+
+    if torch_missing:
+        benches += [Benchmark(name, None, len(inputs), skip=torch_missing)
+                    for name in ("feature_encoder.encode", "feature_encoder.encode_batch", "rl.predict")]
+        return benches
+
+    from Core.Intelligence.rl.feature_encoder import FeatureEncoder
+    from Core.Intelligence.rl.inference import RLPredictor
+    from Core.Intelligence.rl.model import LeoBookRLModel
+
+    predictor = RLPredictor()
+    if not predictor._ensure_loaded():
+        predictor.model = LeoBookRLModel().to(predictor.device).eval()
+        predictor._loaded = True
+    rl_calls = [dict(vision_data=vd, fs_league_id=f.get("league_id", "GLOBAL"),
+                     home_team_id=f.get("home_team_id", "GLOBAL"), away_team_id=f.get("away_team_id", "GLOBAL"))
+                for vd, f in zip(inputs, fixtures)]
+    benches += [
+        Benchmark("feature_encoder.encode", lambda: [FeatureEncoder.encode(vd) for vd in inputs], len(inputs)),
+        Benchmark("feature_encoder.encode_batch", lambda: FeatureEncoder.encode_batch(inputs), len(inputs)),
+        Benchmark("rl.predict", lambda: [predictor.predict(**c) for c in rl_calls], len(rl_calls)),
+    ]
+    return benches
+
+
+def run_benchmark(bench: Benchmark, repeat: int) -> Dict[str, Any]:
+    """Best / median wall time of `repeat` runs; setup is not timed."""
+    if bench.skip:
+        return {"items": bench.items, "skipped": bench.skip}
+    if not bench.items:
+        return {"items": 0, "skipped": "no input rows at this size"}
+    times = []
+    for _ in range(max(1, repeat)):
+        if bench.setup:
+            bench.setup()
+        start = time.perf_counter()
+        bench.fn()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "items": bench.items,
+        "repeat": len(times),
+        "best_s": round(best, 6),
+        "median_s": round(statistics.median(times), 6),
+        "per_item_us": round(best / bench.items * 1e6, 3),
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*args):
+        proc = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True)
+        return proc.stdout.strip() if proc.returncode == 0 else ""
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown",
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time LeoBook hot paths against synthetic data.")
+    parser.add_argument("--rows", type=int, default=10_000, help="Schedule rows to generate (10k-2M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark; best and median are kept")
+    parser.add_argument("--only", action="append", help="Only run benchmarks whose name starts with this")
+    parser.add_argument("--out", help="Result JSON path (default benchmarks/results/<commit>_<rows>.json)")
+    parser.add_argument("--keep-db", action="store_true", help="Print and keep the generated database")
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp(prefix="leobook_bench_")
+    db_path = use_database(db_dir)
+    if args.keep_db:
+        print(f"  [Bench] Database kept at {db_path}")
+    else:
+        atexit.register(shutil.rmtree, db_dir, True)     # runs after the metrics flush below
+
+    import Data.Access.sync_manager as sync_manager
+    from Data.Access.league_db import init_db
+    from Core.System import metrics
+
+    # Spans and DB timings stay on, as in production, but flush next to the bench database
+    metrics._registry = metrics.MetricsRegistry(db_path=os.path.join(db_dir, "metrics.db"))
+    metrics._describe_defaults(metrics._registry)
+
+    stub = StubSupabase()
+    sync_manager.get_supabase_client = lambda: stub    # SyncManager() inside the timed paths
+
+    conn = init_db()
+    t0 = time.perf_counter()
+    ds = generate(conn, args.rows, seed=args.seed)
+    gen_s = time.perf_counter() - t0
+    print(f"\n  [Bench] Generated {ds.schedules:,} schedules, {ds.predictions:,} predictions, "
+          f"{len(ds.leagues):,} leagues, {ds.teams:,} teams in {gen_s:.1f}s -> {db_path}")
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            **revision,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "generate_s": round(gen_s, 3),
+            "dataset": ds.summary(),
+        },
+        "results": {},
+    }
+
+    print(f"  {'BENCHMARK':<30} | {'ITEMS':>8} | {'BEST':>10} | {'MEDIAN':>10} | {'PER ITEM':>12}")
+    print("  " + "-" * 84)
+    for bench in build_benchmarks(conn, ds, stub):
+        if args.only and not any(bench.name.startswith(prefix) for prefix in args.only):
+            continue
+        result = run_benchmark(bench, args.repeat)
+        report["results"][bench.name] = result
+        if "skipped" in result:
+            print(f"  {bench.name:<30} | {result['items']:>8,} | SKIP ({result['skipped']})")
+        else:
+            print(f"  {bench.name:<30} | {result['items']:>8,} | {result['best_s'] * 1000:>8.1f}ms | "
+                  f"{result['median_s'] * 1000:>8.1f}ms | {result['per_item_us']:>10.1f}us")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{revision['commit']}_{args.rows}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n  [Bench] Results -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# synthetic_data.py: Deterministic synthetic leagues, teams, schedules and predictions for benchmarks.
+# Part of LeoBook Benchmarks
+#
+# Classes: SyntheticDataset
+# Functions: use_database(), generate(), live_fixture_ids()
+# Called by: benchmarks/run_benchmarks.py
+
+"""
+Builds a LeoBook database of any size (10k to 2M schedule rows) with the
+real schema (league_db.init_db), so the benchmarks exercise the same SQL,
+indexes and triggers as production.
+
+Every league has LEAGUE_TEAMS teams playing a double round-robin per
+season, one round a week. The current season is laid out around the anchor
+time: earlier rounds are finished with scores, about LIVE_SHARE of the
+anchor-week round is live and the rest of it plus the following round are
+scheduled. Fixtures from
+PREDICTED_FROM_ROUND on carry a prediction whose status follows the
+fixture (reviewed / live / pending). Older seasons fill the remaining rows.
+
+The same (rows, seed, anchor) always produces the same database; the
+anchor defaults to now so date-windowed paths (weekly fixtures, last-24h
+accuracy) see data.
+"""
+
+import os
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from Data.Access import league_db
+
+LEAGUE_TEAMS = 20
+ROUNDS = 2 * (LEAGUE_TEAMS - 1)
+PAST_ROUNDS = 30                 # current-season rounds played before the anchor week
+UPCOMING_ROUNDS = 2              # the anchor-week round and the one after it
+PREDICTED_FROM_ROUND = PAST_ROUNDS - 4
+RECENT_REVIEW_ROUNDS = 2         # reviewed predictions updated within the last 24h
+LIVE_SHARE = 0.5                 # of the anchor-week round, kicked off 45 minutes ago
+MAX_LIVE = 500
+SEASONS = 3                      # current season + two finished ones per league
+INSERT_CHUNK = 5000
+
+CONTINENTS = ["Europe", "South America", "Africa", "Asia", "North America"]
+MARKETS = [
+    "Home Win", "Away Win", "Draw", "Over 2.5", "Under 2.5", "Over 1.5", "Under 3.5",
+    "BTTS Yes", "BTTS No", "1X", "X2", "12", "Double Chance 1X",
+    "{home} to win", "{away} to win", "{home} or Draw", "{away} (DNB)",
+    "{home} Over 0.5", "{away} Under 1.5", "{home} to win & BTTS Yes", "{away} clean sheet",
+]
+
+
+@dataclass
+class SyntheticDataset:
+    """What generate() wrote; the benchmarks size their inputs from it."""
+    rows: int
+    seed: int
+    anchor: str
+    leagues: List[str] = field(default_factory=list)
+    teams: int = 0
+    schedules: int = 0
+    predictions: int = 0
+    live: int = 0
+    upcoming: int = 0
+    current_season: str = ""
+
+    def summary(self) -> Dict[str, object]:
+        return {"rows": self.rows, "seed": self.seed, "anchor": self.anchor,
+                "leagues": len(self.leagues), "teams": self.teams, "schedules": self.schedules,
+                "predictions": self.predictions, "live": self.live, "upcoming": self.upcoming}
+
+
+def use_database(db_dir: str) -> str:
+    """Point league_db (and everything that connects through it) at db_dir/leobook.db.
+
+    Must run before the first connection is opened; modules that copied
+    DB_PATH at import (fs_live_streamer) are patched by the caller."""
+    os.makedirs(db_dir, exist_ok=True)
+    league_db.DB_DIR = db_dir
+    league_db.DB_PATH = os.path.join(db_dir, "leobook.db")
+    return league_db.DB_PATH
+
+
+def _season_label(start_year: int) -> str:
+    return f"{start_year}/{start_year + 1}"
+
+
+def _round_robin(team_ids: List[str]) -> List[List[tuple]]:
+    """Circle-method double round-robin: ROUNDS rounds of (home, away) pairs."""
+    teams = list(team_ids)
+    half = len(teams) // 2
+    first_leg = []
+    for r in range(len(teams) - 1):
+        pairs = [(teams[i], teams[-1 - i]) for i in range(half)]
+        first_leg.append([p if r % 2 == 0 else (p[1], p[0]) for p in pairs])
+        teams = [teams[0]] + [teams[-1]] + teams[1:-1]
+    return first_leg + [[(a, h) for h, a in rnd] for rnd in first_leg]
+
+
+def _score(rng: random.Random) -> tuple:
+    return min(int(rng.expovariate(0.7)), 7), min(int(rng.expovariate(0.85)), 7)
+
+
+def _insert(conn, table: str, rows: Iterable[Dict]) -> int:
+    rows = list(rows)
+    if not rows:
+        return 0
+    cols = list(rows[0])
+    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+    for start in range(0, len(rows), INSERT_CHUNK):
+        conn.executemany(sql, [[r[c] for c in cols] for r in rows[start:start + INSERT_CHUNK]])
+    return len(rows)
+
+
+def _prediction(rng: random.Random, fixture: Dict, status: str, updated: datetime) -> Dict:
+    home, away = fixture["home_team_name"], fixture["away_team_name"]
+    played = status in ("reviewed", "live")
+    h, a = fixture["home_score"], fixture["away_score"]
+    return {
+        "fixture_id": fixture["fixture_id"],
+        "date": fixture["date"],
+        "match_time": fixture["time"],
+        "region_league": fixture["region_league"],
+        "home_team": home,
+        "away_team": away,
+        "home_team_id": fixture["home_team_id"],
+        "away_team_id": fixture["away_team_id"],
+        "prediction": rng.choice(MARKETS).format(home=home, away=away),
+        "confidence": rng.choice(["Low", "Medium", "High", "Very High"]),
+        "reason": "synthetic",
+        "xg_home": round(rng.uniform(0.3, 2.8), 2),
+        "xg_away": round(rng.uniform(0.2, 2.4), 2),
+        "odds": f"{rng.uniform(1.2, 4.5):.2f}",
+        "recommendation_score": round(rng.random(), 3),
+        "status": status,
+        "home_score": str(h) if played else "",
+        "away_score": str(a) if played else "",
+        "actual_score": f"{h}-{a}" if status == "reviewed" else "",
+        "outcome_correct": rng.choice(["1", "0"]) if status == "reviewed" else "",
+        "generated_at": (updated - timedelta(days=2)).isoformat(),
+        "last_updated": updated.isoformat(),
+    }
+
+
+def generate(conn, rows: int, seed: int = 42, anchor: Optional[datetime] = None,
+             seasons: int = SEASONS) -> SyntheticDataset:
+    """Write `rows` schedule rows plus their leagues, teams and predictions into conn."""
+    rng = random.Random(seed)
+    anchor = (anchor or datetime.now()).replace(second=0, microsecond=0)
+    per_league = LEAGUE_TEAMS // 2 * (PAST_ROUNDS + UPCOMING_ROUNDS + (seasons - 1) * ROUNDS)
+    n_leagues = max(1, -(-rows // per_league))
+    current_year = anchor.year if anchor.month >= 7 else anchor.year - 1
+    ds = SyntheticDataset(rows=rows, seed=seed, anchor=anchor.isoformat(),
+                          current_season=_season_label(current_year))
+
+    leagues, teams, schedules, predictions = [], [], [], []
+    live_cutoff = anchor - timedelta(minutes=45)
+    for li in range(n_leagues):
+        if len(schedules) >= rows:
+            break
+        country = f"C{li % 60:02d}"
+        league_id = f"L{li:05d}"
+        region_league = f"{country}: League {li}"
+        leagues.append({
+            "league_id": league_id, "fs_league_id": f"fs{li:05d}", "country_code": country,
+            "continent": CONTINENTS[li % len(CONTINENTS)], "name": f"League {li}",
+            "current_season": ds.current_season, "region": country,
+            "url": f"https://example.invalid/football/{country}/league-{li}/",
+        })
+        team_ids = [f"T{li:05d}{t:02d}" for t in range(LEAGUE_TEAMS)]
+        names = {tid: f"Team {li}-{t} {rng.choice(['FC', 'United', 'City', 'Athletic', 'Rovers'])}"
+                 for t, tid in enumerate(team_ids)}
+        teams.extend({"team_id": tid, "name": names[tid], "league_ids": json.dumps([league_id]),
+                      "country_code": country, "country": country} for tid in team_ids)
+        offset = timedelta(days=rng.randint(0, 6), hours=rng.choice([12, 14, 16, 18, 20]))
+        rounds = _round_robin(team_ids)
+
+        for s in range(seasons):
+            season = _season_label(current_year - s)
+            kickoff_0 = anchor.replace(hour=0, minute=0) - timedelta(weeks=PAST_ROUNDS + s * 52) + offset
+            last_round = PAST_ROUNDS + UPCOMING_ROUNDS if s == 0 else ROUNDS
+            for r, pairs in enumerate(rounds[:last_round]):
+                kickoff = kickoff_0 + timedelta(weeks=r)
+                for h_id, a_id in pairs:
+                    if len(schedules) >= rows:
+                        break
+                    h, a = _score(rng)
+                    start = kickoff
+                    if s == 0 and r == PAST_ROUNDS and ds.live < MAX_LIVE and rng.random() < LIVE_SHARE:
+                        start, status = live_cutoff, "live"
+                    elif kickoff < anchor:
+                        status = "finished"
+                    else:
+                        status, h, a = "scheduled", None, None
+                    fixture = {
+                        "fixture_id": f"{league_id}{s}{r:02d}{h_id[-2:]}{a_id[-2:]}",
+                        "date": start.strftime("%Y-%m-%d"), "time": start.strftime("%H:%M"),
+                        "league_id": league_id, "home_team_id": h_id, "home_team_name": names[h_id],
+                        "away_team_id": a_id, "away_team_name": names[a_id],
+                        "home_score": h, "away_score": a, "league_stage": f"Round {r + 1}",
+                        "match_status": status, "season": season, "region_league": region_league,
+                        "match_link": f"https://example.invalid/match/{league_id}{s}{r:02d}{h_id[-2:]}{a_id[-2:]}",
+                    }
+                    schedules.append(fixture)
+                    ds.live += status == "live"
+                    ds.upcoming += status == "scheduled"
+                    if s == 0 and r >= PREDICTED_FROM_ROUND:
+                        if status == "finished":
+                            recent = r >= PAST_ROUNDS - RECENT_REVIEW_ROUNDS
+                            updated = anchor - (timedelta(hours=rng.randint(1, 20)) if recent
+                                                else timedelta(days=rng.randint(2, 20)))
+                            predictions.append(_prediction(rng, fixture, "reviewed", updated))
+                        else:
+                            predictions.append(_prediction(
+                                rng, fixture, "live" if status == "live" else "pending", anchor))
+        ds.leagues.append(league_id)
+
+    with conn:
+        _insert(conn, "leagues", leagues)
+        ds.teams = _insert(conn, "teams", teams)
+        ds.schedules = _insert(conn, "schedules", schedules)
+        ds.predictions = _insert(conn, "predictions", predictions)
+    return ds
+
+
+def live_fixture_ids(conn) -> List[str]:
+    return [r[0] for r in conn.execute(
+        "SELECT fixture_id FROM schedules WHERE match_status = 'live' ORDER BY fixture_id")]